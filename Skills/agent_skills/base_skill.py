@@ -9,6 +9,8 @@ import logging
 from typing import Dict, Any, Optional
 from pathlib import Path
 
+import frontmatter_codec
+
 
 class AIModelClient:
     """
@@ -166,18 +168,34 @@ class BaseSkill:
         Returns:
             Dictionary of frontmatter fields
         """
-        import re
-        import yaml
+        return frontmatter_codec.parse(content)
+    
+    def retrieve_context(self, query: str, vault_path: str = ".", limit: int = 3) -> str:
+        """
+        Find related vault notes to include in a prompt.
+        
+        Args:
+            query: Text to search for (e.g. a task subject)
+            vault_path: Path to vault root
+            limit: Maximum number of notes
+            
+        Returns:
+            Markdown list of matching notes with snippets (empty if none)
+        """
+        from vault_search import VaultSearch
         
-        # Match frontmatter between --- delimiters
-        match = re.match(r'^---\n(.*?)\n---\n', content, re.DOTALL)
-        if match:
+        try:
+            index = VaultSearch(vault_path, logger=self.logger)
             try:
-                return yaml.safe_load(match.group(1))
-            except yaml.YAMLError as e:
-                self.logger.warning(f"Failed to parse frontmatter: {e}")
-                return {}
-        return {}
+                index.refresh_if_stale()
+                results = index.search(query, limit=limit)
+            finally:
+                index.close()
+        except Exception as e:
+            self.logger.warning(f"Context retrieval failed: {e}")
+            return ""
+        
+        return "\n".join(f"- {r.title} ({r.path.name}): {r.snippet}" for r in results)
     
     def extract_body(self, content: str) -> str:
         """
@@ -189,8 +207,5 @@ class BaseSkill:
         Returns:
             Body content without frontmatter
         """
-        import re
-        
-        # Remove frontmatter
-        content_without_frontmatter = re.sub(r'^---\n.*?\n---\n', '', content, flags=re.DOTALL)
+        _, content_without_frontmatter = frontmatter_codec.split(content)
         return content_without_frontmatter.strip()
@@ -14,12 +14,10 @@ import json
 import logging
 import shutil
 
-
-class RiskLevel(Enum):
-    """Risk levels for actions requiring approval."""
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
+from dashboard_renderer import record_event
+from vault_catalog import VaultCatalog
+from vault_layout import VaultLayout
+from risk_classifier import DEFAULT_ACTION_LEVELS, RiskClassifier, RiskLevel
 
 
 class ApprovalStatus(Enum):
@@ -70,18 +68,17 @@ class ApprovalWorkflow:
         self.needs_action_dir.mkdir(parents=True, exist_ok=True)
         self.done_dir.mkdir(parents=True, exist_ok=True)
         
+        # Flat or date-sharded folder layout for Done
+        self.layout = VaultLayout(str(self.vault_path), logger=self.logger)
+        
+        # Metadata catalog for pending approval listings
+        self.catalog = VaultCatalog(str(self.vault_path), layout=self.layout, logger=self.logger)
+        
         # Define approval thresholds
-        self.approval_thresholds = {
-            "send_email": RiskLevel.MEDIUM,
-            "post_to_linkedin": RiskLevel.MEDIUM,
-            "post_to_facebook": RiskLevel.MEDIUM,
-            "post_to_instagram": RiskLevel.MEDIUM,
-            "post_to_twitter": RiskLevel.MEDIUM,
-            "create_invoice_draft": RiskLevel.MEDIUM,
-            "create_payment_draft": RiskLevel.HIGH,
-            "delete_account": RiskLevel.HIGH,
-            "sign_contract": RiskLevel.HIGH,
-        }
+        self.approval_thresholds = dict(DEFAULT_ACTION_LEVELS)
+        
+        # Shared risk classifier (same rules as the planner and executor)
+        self.classifier = RiskClassifier(action_levels=self.approval_thresholds)
     
     def assess_risk_level(self, action_type: str, arguments: Dict[str, Any]) -> RiskLevel:
         """
@@ -94,25 +91,10 @@ class ApprovalWorkflow:
         Returns:
             RiskLevel enum value
         """
-        # Get default risk level for action type
-        default_risk = self.approval_thresholds.get(action_type, RiskLevel.LOW)
-        
-        # Additional risk assessment logic can be added here
-        # For example, check email recipients, payment amounts, etc.
-        
-        if action_type == "send_email":
-            # Check if sending to external domain
-            to_address = arguments.get("to", "")
-            if "@" in to_address and not to_address.endswith("@internal.com"):
-                return RiskLevel.MEDIUM
-        
-        elif action_type == "create_payment_draft":
-            # Check payment amount
-            amount = arguments.get("amount", 0)
-            if amount > 10000:
-                return RiskLevel.HIGH
-        
-        return default_risk
+        assessment = self.classifier.classify_action(action_type, arguments)
+        if assessment.reasons:
+            self.logger.debug(f"Risk {assessment.level.value} for {action_type}: {', '.join(assessment.reasons)}")
+        return assessment.level
     
     def requires_approval(self, action_type: str, arguments: Dict[str, Any]) -> bool:
         """
@@ -150,6 +132,7 @@ class ApprovalWorkflow:
         
         # Write file
         filepath.write_text(content, encoding='utf-8')
+        record_event(self.vault_path, "created", filepath)
         
         self.logger.info(f"Created approval request: {filepath}")
         return filepath
@@ -231,6 +214,7 @@ status: {action.status.value}
             # Move file to Needs_Action
             destination = self.needs_action_dir / approval_file.name
             shutil.move(str(approval_file), str(destination))
+            record_event(self.vault_path, "approved", destination, approval_file)
             
             self.logger.info(f"Approved: {approval_file.name}")
             return True
@@ -270,8 +254,10 @@ status: {action.status.value}
             approval_file.write_text(content, encoding='utf-8')
             
             # Move to Done
-            destination = self.done_dir / approval_file.name
+            destination = self.layout.shard_path("Done", approval_file.name)
+            destination.parent.mkdir(parents=True, exist_ok=True)
             shutil.move(str(approval_file), str(destination))
+            record_event(self.vault_path, "rejected", destination, approval_file)
             
             self.logger.info(f"Rejected: {approval_file.name}")
             return True
@@ -304,7 +290,8 @@ status: {action.status.value}
         Returns:
             List of paths to pending approval files
         """
-        return list(self.pending_approval_dir.glob("approval_*.md"))
+        self.catalog.refresh(["Pending_Approval"])
+        return self.catalog.list_files("Pending_Approval", pattern="approval_*.md")
     
     def get_approval_count(self) -> int:
         """
@@ -313,7 +300,8 @@ status: {action.status.value}
         Returns:
             Number of pending approval requests
         """
-        return len(self.get_pending_approvals())
+        self.catalog.refresh(["Pending_Approval"])
+        return self.catalog.count("Pending_Approval", pattern="approval_*.md")
 
 
 # Example usage
@@ -9,11 +9,16 @@ inbox files in the Obsidian vault.
 import logging
 import time
 from abc import ABC, abstractmethod
+from contextlib import nullcontext
 from datetime import datetime, UTC
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
+from dashboard_renderer import record_event
+from similarity_index import SimilarityIndex, append_duplicate_reference
+from vault_writer import VaultWriter, sanitize_slug
+
 
 @dataclass
 class WatcherConfig:
@@ -24,6 +29,10 @@ class WatcherConfig:
     log_folder: str = "Logs"
     index_path: str = ".index"
     dry_run: bool = False
+    dedup_enabled: bool = True
+    dedup_window_seconds: int = 86400  # Collapse repeats seen within 24 hours
+    dedup_max_distance: int = 3  # Max SimHash bit difference for a near-duplicate
+    group_commit: bool = False  # fsync folders once per poll instead of per file
 
 
 class BaseWatcher(ABC):
@@ -48,9 +57,20 @@ class BaseWatcher(ABC):
         self.watcher_name = watcher_name
         self.logger = self._setup_logging()
         self.processed_items: Dict[str, Dict] = {}
+        self.duplicates_collapsed = 0
+        self.writer = VaultWriter(logger=self.logger)
         
         # Ensure directories exist
         self._ensure_directories()
+        
+        # Near-duplicate index shared across polls
+        self.similarity_index = SimilarityIndex(
+            str(Path(self.config.index_path) / f"{self.watcher_name.lower()}-similarity.json"),
+            window_seconds=self.config.dedup_window_seconds,
+            max_distance=self.config.dedup_max_distance,
+            dry_run=self.config.dry_run,
+            logger=self.logger
+        )
     
     def _setup_logging(self) -> logging.Logger:
         """Configure logging for the watcher"""
@@ -179,14 +199,8 @@ class BaseWatcher(ABC):
         Returns:
             Path to created file, or None if failed
         """
-        # Generate filename
-        timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
-        
-        # Get safe title from item
+        # Get title from item
         title = item.get('title', item.get('subject', 'untitled'))
-        safe_title = self._sanitize_filename(title)
-        
-        filename = f"{timestamp}_{safe_title}.md"
         
         # Determine folder based on priority
         priority = item.get('priority', 'low')
@@ -195,14 +209,14 @@ class BaseWatcher(ABC):
         else:
             folder = Path(self.config.inbox_folder)
         
-        filepath = folder / filename
-        
         if self.config.dry_run:
+            filepath = folder / self.writer.make_filename(title, content)
             self.logger.info(f"[DRY RUN] Would create file: {filepath}")
             return str(filepath)
         
         try:
-            filepath.write_text(content, encoding='utf-8')
+            filepath = self.writer.create_task_file(folder, title, content)
+            record_event(folder.absolute().parent, "created", filepath)
             self.logger.info(f"Created inbox file: {filepath}")
             return str(filepath)
         except Exception as e:
@@ -220,24 +234,7 @@ class BaseWatcher(ABC):
         Returns:
             Sanitized filename-safe string
         """
-        import re
-        
-        # Convert to lowercase
-        text = text.lower()
-        
-        # Remove special characters
-        text = re.sub(r'[^\w\s-]', '', text)
-        
-        # Replace spaces and multiple dashes with single dash
-        text = re.sub(r'[-\s]+', '-', text)
-        
-        # Trim to max length
-        text = text[:max_length]
-        
-        # Remove leading/trailing dashes
-        text = text.strip('-')
-        
-        return text or 'untitled'
+        return sanitize_slug(text, max_length)
     
     def is_duplicate(self, item_id: str) -> bool:
         """
@@ -264,6 +261,67 @@ class BaseWatcher(ABC):
             "processed_at": datetime.now(UTC).isoformat() + "Z"
         }
     
+    def get_similarity_text(self, item: Dict[str, Any]) -> str:
+        """
+        Build the text used for near-duplicate detection.
+        
+        Subclasses can override this if their items use other field names.
+        
+        Args:
+            item: Item metadata and content
+            
+        Returns:
+            Subject plus body text of the item
+        """
+        subject = item.get('title') or item.get('subject') or item.get('chat_name', '')
+        body_parts = [
+            item.get('body', ''),
+            item.get('message', ''),
+            item.get('post_text', ''),
+            ' '.join(item.get('messages', []))
+        ]
+        return f"{subject} {' '.join(p for p in body_parts if p)}"
+    
+    def collapse_duplicate(self, item_id: str, item: Dict[str, Any]) -> bool:
+        """
+        Fold a near-duplicate item into the task file that already exists.
+        
+        Args:
+            item_id: Unique identifier for the item
+            item: Item metadata and content
+            
+        Returns:
+            True if the item was collapsed, False if it should get its own file
+        """
+        if not self.config.dedup_enabled:
+            return False
+        
+        match = self.similarity_index.find_similar(self.get_similarity_text(item))
+        if not match:
+            return False
+        
+        title = item.get('title', item.get('subject', item.get('chat_name', 'untitled')))
+        reference = f"{datetime.now(UTC).isoformat()}Z: {title} (`{item_id}`)"
+        
+        if self.config.dry_run:
+            self.logger.info(f"[DRY RUN] Would collapse {item_id} into {match.filepath}")
+        elif not append_duplicate_reference(match.filepath, reference):
+            # The original task has moved on; treat this item as new
+            self.similarity_index.forget(match.filepath)
+            return False
+        
+        self.logger.info(
+            f"Collapsed near-duplicate {item_id} into {Path(match.filepath).name} "
+            f"(distance: {match.distance})"
+        )
+        self.mark_as_processed(item_id, {
+            "filename": Path(match.filepath).name,
+            "priority": item.get('priority', 'low'),
+            "duplicate_of": match.item_id
+        })
+        self.duplicates_collapsed += 1
+        return True
+    
     def process_item(self, item_id: str) -> bool:
         """
         Process a single item through the Ralph Loop.
@@ -293,6 +351,10 @@ class BaseWatcher(ABC):
         priority = self.detect_priority(item)
         item['priority'] = priority
         
+        # REASONING: Collapse near-duplicates into the existing task
+        if self.collapse_duplicate(item_id, item):
+            return False
+        
         self.logger.info(f"Processing item: {item_id} (Priority: {priority})")
         
         # ACTION: Create markdown file
@@ -300,6 +362,9 @@ class BaseWatcher(ABC):
         filepath = self.create_inbox_file(item, markdown_content)
         
         if filepath:
+            if self.config.dedup_enabled:
+                self.similarity_index.add(self.get_similarity_text(item), item_id, filepath)
+            
             # Mark as processed
             self.mark_as_processed(item_id, {
                 "filename": Path(filepath).name,
@@ -324,6 +389,7 @@ class BaseWatcher(ABC):
             "processed": 0,
             "filtered": 0,
             "created": 0,
+            "duplicates": 0,
             "errors": 0
         }
         
@@ -332,17 +398,21 @@ class BaseWatcher(ABC):
             item_ids = self.check_for_new_items()
             stats["retrieved"] = len(item_ids)
             
-            # Process each item
-            for item_id in item_ids:
-                try:
-                    if self.process_item(item_id):
-                        stats["processed"] += 1
-                        stats["created"] += 1
-                    else:
-                        stats["filtered"] += 1
-                except Exception as e:
-                    self.logger.error(f"Error processing item {item_id}: {e}")
-                    stats["errors"] += 1
+            # Process each item (one directory fsync per poll in group-commit mode)
+            with self.writer.batch() if self.config.group_commit else nullcontext():
+                for item_id in item_ids:
+                    try:
+                        collapsed_before = self.duplicates_collapsed
+                        if self.process_item(item_id):
+                            stats["processed"] += 1
+                            stats["created"] += 1
+                        elif self.duplicates_collapsed > collapsed_before:
+                            stats["duplicates"] += 1
+                        else:
+                            stats["filtered"] += 1
+                    except Exception as e:
+                        self.logger.error(f"Error processing item {item_id}: {e}")
+                        stats["errors"] += 1
             
             elapsed = time.time() - start_time
             self.logger.info(f"Polling cycle completed in {elapsed:.2f}s: {stats}")
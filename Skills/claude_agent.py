@@ -7,12 +7,18 @@ Implements the reasoning loop for processing inbox items and updating the dashbo
 
 import logging
 import json
-import re
 from pathlib import Path
 from datetime import datetime, UTC
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 
+import frontmatter_codec
+from dashboard_renderer import DashboardRenderer, record_event
+from vault_layout import VaultLayout
+from vault_search import SearchResult, VaultSearch
+from vault_stats import VaultStats
+from work_claims import WorkClaims
+
 
 @dataclass
 class ClaudeAgentConfig:
@@ -53,6 +59,18 @@ class ClaudeCodeAgent:
         
         # Ensure directories exist
         self._ensure_directories()
+        
+        # Flat or date-sharded folder layout (Done/YYYY/MM/DD)
+        self.layout = VaultLayout(str(self.vault_path), logger=self.logger)
+        
+        # Folder statistics, cached per directory mtime
+        self.stats = VaultStats(str(self.vault_path), layout=self.layout, logger=self.logger)
+        
+        # Leases so parallel workers never process the same item
+        self.claims = WorkClaims(str(self.vault_path), logger=self.logger)
+        
+        # Full-text search index, opened on first search
+        self._search_index: Optional[VaultSearch] = None
     
     def _setup_logging(self) -> logging.Logger:
         """Configure logging for the agent"""
@@ -204,10 +222,14 @@ class ClaudeCodeAgent:
             if not dest_path.is_absolute():
                 dest_path = self.vault_path / dest_path
             
+            # Files moved into a sharded folder go to today's shard
+            dest_path = self.layout.resolve_destination(dest_path)
+            
             # Ensure destination directory exists
             dest_path.parent.mkdir(parents=True, exist_ok=True)
             
             source_path.rename(dest_path)
+            record_event(self.vault_path, "moved", dest_path, source_path)
             self.logger.info(f"Moved file: {source} -> {destination}")
             return True
         
@@ -225,17 +247,7 @@ class ClaudeCodeAgent:
         Returns:
             Dictionary of frontmatter fields
         """
-        import yaml
-        
-        # Match frontmatter between --- delimiters
-        match = re.match(r'^---\n(.*?)\n---\n', content, re.DOTALL)
-        if match:
-            try:
-                return yaml.safe_load(match.group(1))
-            except yaml.YAMLError as e:
-                self.logger.warning(f"Failed to parse frontmatter: {e}")
-                return {}
-        return {}
+        return frontmatter_codec.parse(content)
     
     def update_frontmatter(self, content: str, updates: Dict[str, Any]) -> str:
         """
@@ -248,26 +260,7 @@ class ClaudeCodeAgent:
         Returns:
             Updated markdown content
         """
-        import yaml
-        
-        # Extract existing frontmatter
-        frontmatter = self.extract_frontmatter(content)
-        
-        # Update fields
-        frontmatter.update(updates)
-        
-        # Remove old frontmatter
-        content_without_frontmatter = re.sub(
-            r'^---\n.*?\n---\n',
-            '',
-            content,
-            flags=re.DOTALL
-        )
-        
-        # Generate new frontmatter
-        new_frontmatter = "---\n" + yaml.dump(frontmatter, default_flow_style=False) + "---\n"
-        
-        return new_frontmatter + content_without_frontmatter
+        return frontmatter_codec.update(content, updates)
     
     def process_inbox(self) -> Dict[str, int]:
         """
@@ -296,14 +289,14 @@ class ClaudeCodeAgent:
             
             for file_path in inbox_files:
                 try:
-                    # Read file content
-                    content = self.read_file(str(file_path))
-                    if not content:
+                    # Routing only needs the header, not the (possibly large) body
+                    try:
+                        frontmatter = frontmatter_codec.read_header(file_path)
+                    except OSError as e:
+                        self.logger.warning(f"Failed to read {file_path}: {e}")
                         stats["errors"] += 1
                         continue
                     
-                    # Extract frontmatter
-                    frontmatter = self.extract_frontmatter(content)
                     priority = frontmatter.get('priority', 'low')
                     
                     # Determine destination
@@ -335,60 +328,30 @@ class ClaudeCodeAgent:
     
     def update_dashboard(self, updates: Optional[Dict[str, Any]] = None) -> bool:
         """
-        Update Dashboard.md with current statistics.
+        Update Dashboard.md from pipeline events.
+        
+        Only events recorded since the last update are applied, and the
+        file is rewritten only if its content changed.
         
         Args:
-            updates: Optional dictionary of specific updates to make
+            updates: Optional metrics to show in the System Status section
             
         Returns:
             True if successful, False otherwise
         """
-        dashboard_path = self.vault_path / self.config.dashboard_file
-        
-        if not dashboard_path.exists():
-            self.logger.warning("Dashboard.md does not exist")
-            return False
-        
         if self.config.dry_run:
             self.logger.info("[DRY RUN] Would update dashboard")
             return True
         
-        try:
-            # Read current dashboard
-            content = self.read_file(str(dashboard_path))
-            if not content:
-                return False
-            
-            # Update timestamp
-            content = re.sub(
-                r'\*\*Last Updated\*\*: .*',
-                f'**Last Updated**: {datetime.now(UTC).strftime("%Y-%m-%d %H:%M:%S")}',
-                content
-            )
-            
-            # Get folder statistics
-            inbox_count = len(self.list_files(self.config.inbox_folder))
-            needs_action_count = len(self.list_files(self.config.needs_action_folder))
-            pending_approval_count = len(self.list_files(self.config.pending_approval_folder))
-            done_count = len(self.list_files(self.config.done_folder))
-            
-            # Update counts (if sections exist)
-            if updates:
-                for key, value in updates.items():
-                    # Try to update specific fields
-                    pattern = rf'(\*\*{key}\*\*:)\s*\d+'
-                    replacement = rf'\1 {value}'
-                    content = re.sub(pattern, replacement, content)
-            
-            # Write back
-            self.write_file(str(dashboard_path), content)
-            
-            self.logger.info("Dashboard updated successfully")
-            return True
-        
-        except Exception as e:
-            self.logger.error(f"Failed to update dashboard: {e}")
-            return False
+        renderer = DashboardRenderer(
+            str(self.vault_path),
+            dashboard_file=self.config.dashboard_file,
+            logger=self.logger,
+            stats=self.stats
+        )
+        if updates:
+            renderer.set_metrics(updates)
+        return renderer.update()
     
     def get_vault_stats(self) -> Dict[str, int]:
         """
@@ -397,16 +360,51 @@ class ClaudeCodeAgent:
         Returns:
             Dictionary with folder file counts
         """
-        stats = {
-            "inbox": len(self.list_files(self.config.inbox_folder)),
-            "needs_action": len(self.list_files(self.config.needs_action_folder)),
-            "done": len(self.list_files(self.config.done_folder)),
-            "plans": len(self.list_files(self.config.plans_folder)),
-            "pending_approval": len(self.list_files(self.config.pending_approval_folder))
+        folders = {
+            "inbox": self.config.inbox_folder,
+            "needs_action": self.config.needs_action_folder,
+            "done": self.config.done_folder,
+            "plans": self.config.plans_folder,
+            "pending_approval": self.config.pending_approval_folder
         }
         
+        counts = self.stats.counts(folders.values())
+        stats = {name: counts[folder] for name, folder in folders.items()}
+        
         return stats
     
+    def search(self, query: str, limit: int = 10, folder: Optional[str] = None) -> List[SearchResult]:
+        """
+        Full-text search over vault notes, ranked by relevance.
+        
+        The index is kept current by vault events; a full refresh only runs
+        when the last one is older than the index's refresh interval.
+        
+        Args:
+            query: Free-text query
+            limit: Maximum number of results
+            folder: Only search this folder
+            
+        Returns:
+            Ranked search results
+        """
+        if self._search_index is None:
+            self._search_index = VaultSearch(
+                str(self.vault_path),
+                folders=[
+                    self.config.inbox_folder,
+                    self.config.needs_action_folder,
+                    self.config.plans_folder,
+                    self.config.pending_approval_folder,
+                    "Approved",
+                    self.config.done_folder
+                ],
+                logger=self.logger
+            )
+        
+        self._search_index.refresh_if_stale()
+        return self._search_index.search(query, limit=limit, folder=folder)
+    
     def read_handbook(self) -> Optional[str]:
         """
         Read the Company Handbook.
@@ -424,12 +422,23 @@ class ClaudeCodeAgent:
         This is a placeholder for AI-driven processing logic.
         In production, this would call Claude Code or another AI model.
         
+        The item is claimed first; if another worker holds it, it is
+        skipped.
+        
         Args:
             filepath: Path to the file to process
             
         Returns:
             True if processed successfully, False otherwise
         """
+        with self.claims.hold(filepath) as lease:
+            if lease is None:
+                self.logger.info(f"Skipping {filepath}: claimed by another worker")
+                return False
+            return self._process_claimed_item(filepath)
+    
+    def _process_claimed_item(self, filepath: str) -> bool:
+        """Process a Needs_Action item this worker has claimed"""
         self.logger.info(f"Processing needs action item: {filepath}")
         
         try:
@@ -484,7 +493,7 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Claude Code Agent for Vault Operations")
     parser.add_argument(
         "action",
-        choices=["process-inbox", "update-dashboard", "stats", "read"],
+        choices=["process-inbox", "update-dashboard", "stats", "read", "search"],
         help="Action to perform"
     )
     parser.add_argument(
@@ -496,6 +505,16 @@ if __name__ == "__main__":
         "--file",
         help="File path for read action"
     )
+    parser.add_argument(
+        "--query",
+        help="Search query for search action"
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=10,
+        help="Maximum number of search results"
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -557,3 +576,16 @@ if __name__ == "__main__":
             print(content)
         else:
             print(f"Failed to read file: {args.file}")
+    
+    elif args.action == "search":
+        if not args.query:
+            print("Error: --query argument required for search action")
+            exit(1)
+        
+        results = agent.search(args.query, limit=args.limit)
+        if not results:
+            print("No matches")
+        
+        for result in results:
+            print(f"{result.score:6.2f}  {result.path.relative_to(agent.vault_path).as_posix()}  {result.title}")
+            print(f"        {result.snippet}")
@@ -0,0 +1,146 @@
+"""
+Cursor Store
+
+Persisted high-water marks for incremental polling. A watcher reads the mark
+for each endpoint, pages through results only until it reaches the mark, and
+stages the newest position seen. Staged marks are committed after the poll
+has been handled so a failed poll is re-scanned next time.
+"""
+
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, Mapping, Optional
+
+
+def counter_delta(previous: Optional[Mapping[str, int]], current: Mapping[str, int],
+                  fields: Iterable[str]) -> Dict[str, int]:
+    """
+    Difference between two counter snapshots.
+
+    Args:
+        previous: Last recorded counters (None if never seen)
+        current: Counters just fetched
+        fields: Counter names to compare
+
+    Returns:
+        Mapping of field to change (only fields that changed)
+    """
+    previous = previous or {}
+    delta = {}
+    for field in fields:
+        change = int(current.get(field, 0) or 0) - int(previous.get(field, 0) or 0)
+        if change:
+            delta[field] = change
+    return delta
+
+
+def reached_mark(element_id: str, element_time: Optional[int], mark: Mapping[str, Any]) -> bool:
+    """
+    Check whether an element is at or before a high-water mark.
+
+    Elements are expected newest first. Timestamps are compared when both
+    sides have one; otherwise the last seen ID is matched.
+
+    Args:
+        element_id: ID of the element
+        element_time: Creation time of the element (epoch ms), if known
+        mark: High-water mark with 'last_id' and/or 'last_time'
+
+    Returns:
+        True if the element was already seen
+    """
+    if not mark:
+        return False
+    if element_id and element_id == mark.get('last_id'):
+        return True
+    last_time = mark.get('last_time')
+    return element_time is not None and last_time is not None and element_time <= last_time
+
+
+class CursorStore:
+    """
+    Thread-safe, JSON-backed store of named cursors.
+    """
+
+    def __init__(self, cursor_file: str, dry_run: bool = False,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize the store.
+
+        Args:
+            cursor_file: Path to the JSON file backing the store
+            dry_run: If True, never write cursors to disk
+            logger: Logger to use (defaults to "CursorStore")
+        """
+        self.cursor_file = Path(cursor_file)
+        self.dry_run = dry_run
+        self.logger = logger or logging.getLogger("CursorStore")
+        self.cursors: Dict[str, Any] = {}
+        self._staged: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+        self._load()
+
+    def _load(self):
+        """Load cursors from disk"""
+        if not self.cursor_file.exists():
+            return
+
+        try:
+            with open(self.cursor_file, 'r', encoding='utf-8') as f:
+                self.cursors = json.load(f)
+        except Exception as e:
+            self.logger.error(f"Failed to load cursors: {e}")
+            self.cursors = {}
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """
+        Committed value of a cursor.
+
+        Args:
+            name: Cursor name (e.g. endpoint)
+            default: Value returned when the cursor is unset
+
+        Returns:
+            Cursor value
+        """
+        with self._lock:
+            return self.cursors.get(name, default)
+
+    def stage(self, name: str, value: Any):
+        """
+        Record a new cursor value to be written on ``commit()``.
+
+        Args:
+            name: Cursor name
+            value: New value (JSON serialisable)
+        """
+        with self._lock:
+            self._staged[name] = value
+
+    def commit(self):
+        """Apply staged cursors and persist them"""
+        with self._lock:
+            if not self._staged:
+                return
+            self.cursors.update(self._staged)
+            self._staged = {}
+            snapshot = json.dumps(self.cursors, indent=2)
+
+        if self.dry_run:
+            return
+
+        try:
+            self.cursor_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cursor_file.with_suffix('.tmp')
+            tmp_file.write_text(snapshot, encoding='utf-8')
+            tmp_file.replace(self.cursor_file)
+        except Exception as e:
+            self.logger.error(f"Failed to save cursors: {e}")
+
+    def discard(self):
+        """Drop staged cursors (the poll will be re-scanned)"""
+        with self._lock:
+            self._staged = {}
@@ -0,0 +1,580 @@
+"""
+Dashboard Renderer
+
+Event-sourced Dashboard.md. Pipeline components append small events
+(created, moved, approved, rejected, completed, archived) to
+``.index/dashboard_events.jsonl`` with ``record_event``; the renderer folds
+new events into counters and recent-activity lists kept in
+``.index/dashboard_state.json`` and re-renders Dashboard.md (plus a
+``dashboard.json`` snapshot for dashboard.html) only when something
+visible changed.
+
+Folder counts are taken from a scan when no state exists yet (or on
+``rebuild``); after that, refreshing the dashboard reads only the events
+appended since the last refresh. Files moved outside the pipeline record
+no events, so ``reconcile`` corrects the counts from a VaultStats scan the
+first time each process updates the dashboard and every
+``RECONCILE_INTERVAL`` seconds after that.
+
+The generated dashboard lives between ``SECTION_BEGIN`` and ``SECTION_END``
+markers. Only that section is replaced, so anything written around it in
+a hand-curated Dashboard.md is kept; a file without markers gets the
+section appended, unless it is an unfilled template (``{{date}}``-style
+placeholders), which is replaced.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from vault_layout import VaultLayout
+from vault_stats import VaultStats
+from work_claims import WorkClaims
+
+
+EVENTS_FILE = ".index/dashboard_events.jsonl"
+STATE_FILE = ".index/dashboard_state.json"
+SNAPSHOT_FILE = "dashboard.json"
+TEMPLATE_FILE = "config/dashboard_template.md"
+
+# Vault stages with a live file count
+STAGES = ("Inbox", "Needs_Action", "Plans", "Pending_Approval", "Approved", "Done")
+RECENT_LIMIT = 10
+# Rotate the event log once this much of it has been applied
+ROTATE_BYTES = 1024 * 1024
+# A rotated log is read until its size holds still this long
+ROTATE_SETTLE_SECONDS = 0.05
+# Seconds between reconciling counts with a folder scan
+RECONCILE_INTERVAL = 15 * 60
+
+# Markers around the generated section of Dashboard.md
+SECTION_BEGIN = "<!-- ai-employee-dashboard:begin -->"
+SECTION_END = "<!-- ai-employee-dashboard:end -->"
+# Unfilled placeholder of a stock dashboard template
+TEMPLATE_PLACEHOLDER = re.compile(r'\{\{\s*\w+\s*\}\}')
+
+DEFAULT_TEMPLATE = """# AI Employee Dashboard
+
+**Last Updated**: {last_updated}
+
+## System Status
+
+{status}
+
+## Folder Status
+
+| Folder | Items |
+|--------|-------|
+{folder_rows}
+
+## Today's Activity
+
+{today}
+
+## Pending Actions
+
+{pending}
+
+## Recent Completions
+
+{completions}
+
+## Recent Activity
+
+{activity}
+
+---
+
+## Quick Links
+
+- [Inbox](Inbox/) - New items from watchers
+- [Needs Action](Needs_Action/) - Items requiring action
+- [Plans](Plans/) - Execution plans
+- [Pending Approval](Pending_Approval/) - Items awaiting approval
+- [Done](Done/) - Completed items
+
+---
+
+*Auto-generated by DashboardRenderer*
+"""
+
+logger = logging.getLogger("dashboard_renderer")
+
+# Vaults whose counts this process has reconciled (startup reconcile)
+_reconciled: Set[Path] = set()
+
+
+def _stage_of(vault_path: Path, path: Optional[Path]) -> Optional[str]:
+    """Top-level vault stage a path lives in (None if not a stage)"""
+    if path is None:
+        return None
+    try:
+        parts = Path(path).absolute().relative_to(vault_path).parts
+    except ValueError:
+        return None
+    return parts[0] if len(parts) > 1 and parts[0] in STAGES else None
+
+
+def record_event(vault_path, event: str, destination: Optional[Path] = None,
+                 source: Optional[Path] = None):
+    """
+    Append a pipeline event for the dashboard.
+
+    Never raises: a failure to record only makes the dashboard lag until
+    the next rebuild.
+
+    Args:
+        vault_path: Path to vault root
+        event: Event type (created, moved, approved, rejected, completed, archived)
+        destination: Where the file is now (None if it left the vault)
+        source: Where the file was before (None if it is new)
+    """
+    vault = Path(vault_path).absolute()
+    named = destination if destination is not None else source
+    entry = {
+        "ts": datetime.now().isoformat(timespec='seconds'),
+        "event": event,
+        "name": Path(named).name if named is not None else "",
+        "from": _stage_of(vault, source),
+        "to": _stage_of(vault, destination),
+    }
+
+    try:
+        events_path = vault / EVENTS_FILE
+        events_path.parent.mkdir(parents=True, exist_ok=True)
+        # One short O_APPEND write per event, so concurrent writers do not interleave
+        fd = os.open(events_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (json.dumps(entry) + "\n").encode('utf-8'))
+        finally:
+            os.close(fd)
+    except OSError as e:
+        logger.warning(f"Failed to record dashboard event: {e}")
+
+
+def _bullets(lines: List[str], empty: str) -> str:
+    """Markdown bullet list, or a placeholder when empty"""
+    return "\n".join(f"- {line}" for line in lines) if lines else empty
+
+
+def _is_stock_template(document: str) -> bool:
+    """True for the shipped Dashboard.md template that was never filled in"""
+    title = DEFAULT_TEMPLATE.split("\n", 1)[0]
+    return document.lstrip().startswith(title) and bool(TEMPLATE_PLACEHOLDER.search(document))
+
+
+def splice_section(document: str, section: str) -> str:
+    """
+    Replace the generated section of a document.
+
+    Args:
+        document: Current file content ("" if the file is new)
+        section: Rendered dashboard markdown
+
+    Returns:
+        The document with its marked section replaced, or with the section
+        appended if it has no markers. An empty document or an unfilled
+        stock template becomes just the section.
+    """
+    block = f"{SECTION_BEGIN}\n{section.rstrip()}\n{SECTION_END}"
+    start = document.find(SECTION_BEGIN)
+    end = document.find(SECTION_END, start + 1) if start != -1 else -1
+    if start != -1 and end != -1:
+        return document[:start] + block + document[end + len(SECTION_END):]
+    if not document.strip() or _is_stock_template(document):
+        return block + "\n"
+    return document.rstrip() + "\n\n" + block + "\n"
+
+
+class DashboardRenderer:
+    """
+    Folds dashboard events into state and renders Dashboard.md on change.
+    """
+
+    def __init__(self, vault_path: str = ".", dashboard_file: str = "Dashboard.md",
+                 dry_run: bool = False, logger: Optional[logging.Logger] = None,
+                 stats: Optional[VaultStats] = None,
+                 reconcile_interval: float = RECONCILE_INTERVAL):
+        """
+        Initialize the renderer.
+
+        Args:
+            vault_path: Path to vault root
+            dashboard_file: Dashboard file relative to the vault root
+            dry_run: Log instead of writing files
+            logger: Logger to use (defaults to "dashboard_renderer")
+            stats: Folder statistics used to reconcile counts (created on
+                first use if omitted)
+            reconcile_interval: Seconds between reconciles
+        """
+        self.vault_path = Path(vault_path).absolute()
+        self.dashboard_path = self.vault_path / dashboard_file
+        self.snapshot_path = self.vault_path / SNAPSHOT_FILE
+        self.events_path = self.vault_path / EVENTS_FILE
+        self.state_path = self.vault_path / STATE_FILE
+        self.dry_run = dry_run
+        self.logger = logger or logging.getLogger("dashboard_renderer")
+        self.stats = stats
+        self.reconcile_interval = reconcile_interval
+        self.state = self._load_state()
+
+    def _load_state(self) -> Optional[Dict[str, Any]]:
+        """Read saved state (None if missing or unreadable)"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_atomic(self, path: Path, text: str):
+        """Write a file through a temp file and rename"""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name(f".{path.name}.tmp")
+        temp_path.write_text(text, encoding='utf-8')
+        os.replace(temp_path, path)
+
+    def _save_state(self):
+        """Persist state"""
+        if not self.dry_run:
+            self._write_atomic(self.state_path, json.dumps(self.state, indent=2))
+
+    def rebuild(self):
+        """Reset counts from a scan of the stage folders"""
+        layout = VaultLayout(str(self.vault_path), logger=self.logger)
+        previous = self.state or {}
+        try:
+            offset = self.events_path.stat().st_size
+        except FileNotFoundError:
+            offset = 0
+
+        pending_dir = self.vault_path / "Pending_Approval"
+        self.state = {
+            "counts": {stage: layout.count(stage) for stage in STAGES},
+            "pending": sorted(p.name for p in pending_dir.glob("*.md")) if pending_dir.exists() else [],
+            "today": previous.get("today", {"date": datetime.now().date().isoformat(), "events": {}}),
+            "recent_activity": previous.get("recent_activity", []),
+            "recent_completions": previous.get("recent_completions", []),
+            "status": previous.get("status", {}),
+            "metrics": previous.get("metrics", {}),
+            "updated_at": datetime.now().isoformat(timespec='seconds'),
+            "offset": offset,
+            "rendered_hash": None,
+            "reconciled_at": time.time(),
+        }
+        _reconciled.add(self.vault_path)
+        self.logger.info("Dashboard counters rebuilt from a folder scan")
+
+    def reconcile(self) -> Dict[str, int]:
+        """
+        Correct folder counts and pending approvals from a folder scan.
+
+        Events recorded so far are applied first, so the scan only
+        overrides drift from files moved outside the pipeline.
+
+        Returns:
+            Stage -> count difference that was corrected (empty if none)
+        """
+        self.apply_pending()
+        if self.stats is None:
+            self.stats = VaultStats(str(self.vault_path), logger=self.logger)
+
+        scanned = self.stats.counts(STAGES)
+        drift = {stage: scanned[stage] - self.state["counts"].get(stage, 0)
+                 for stage in STAGES if scanned[stage] != self.state["counts"].get(stage, 0)}
+        self.state["counts"] = scanned
+
+        pending_dir = self.vault_path / "Pending_Approval"
+        self.state["pending"] = sorted(p.name for p in pending_dir.glob("*.md")) if pending_dir.exists() else []
+        self.state["reconciled_at"] = time.time()
+        _reconciled.add(self.vault_path)
+
+        if drift:
+            self.logger.info(f"Dashboard counts reconciled with the folders: {drift}")
+        return drift
+
+    def reconcile_due(self) -> bool:
+        """True if this process has not reconciled yet or the interval has passed"""
+        if self.state is None or self.vault_path not in _reconciled:
+            return True
+        return time.time() - self.state.get("reconciled_at", 0) >= self.reconcile_interval
+
+    def _apply(self, entry: Dict[str, Any]):
+        """Fold one event into state"""
+        state = self.state
+        counts = state["counts"]
+        source, destination, name = entry.get("from"), entry.get("to"), entry.get("name", "")
+
+        if source in counts:
+            counts[source] = max(0, counts[source] - 1)
+        if destination in counts:
+            counts[destination] += 1
+
+        if source == "Pending_Approval" and name in state["pending"]:
+            state["pending"].remove(name)
+        if destination == "Pending_Approval" and name not in state["pending"]:
+            state["pending"].append(name)
+
+        day = entry["ts"][:10]
+        if state["today"]["date"] != day:
+            state["today"] = {"date": day, "events": {}}
+        events = Counter(state["today"]["events"])
+        events[entry["event"]] += 1
+        state["today"]["events"] = dict(events)
+
+        state["recent_activity"] = ([entry] + state["recent_activity"])[:RECENT_LIMIT]
+        if destination == "Done":
+            completion = {"ts": entry["ts"], "name": name}
+            state["recent_completions"] = ([completion] + state["recent_completions"])[:RECENT_LIMIT]
+        state["updated_at"] = entry["ts"]
+
+    def _read_events(self, path: Path, offset: int) -> Tuple[int, int]:
+        """Apply complete event lines from ``offset``; returns (new offset, events applied)"""
+        with open(path, 'rb') as f:
+            f.seek(offset)
+            data = f.read()
+        # Leave a partially written last line for the next refresh
+        end = data.rfind(b"\n") + 1
+        applied = 0
+        for line in data[:end].splitlines():
+            if not line.strip():
+                continue
+            try:
+                self._apply(json.loads(line))
+                applied += 1
+            except (ValueError, KeyError) as e:
+                self.logger.warning(f"Skipping bad dashboard event: {e}")
+        return offset + end, applied
+
+    def apply_pending(self) -> int:
+        """
+        Fold events appended since the last refresh into state.
+
+        Returns:
+            Number of events applied
+        """
+        if self.state is None:
+            self.rebuild()
+        try:
+            size = self.events_path.stat().st_size
+        except FileNotFoundError:
+            return 0
+        if size < self.state["offset"]:
+            # Log was rotated by another renderer
+            self.state["offset"] = 0
+
+        try:
+            self.state["offset"], applied = self._read_events(self.events_path, self.state["offset"])
+        except FileNotFoundError:
+            # Rotated away by another renderer between the stat and the read
+            return 0
+
+        if self.state["offset"] >= ROTATE_BYTES and not self.dry_run:
+            applied += self._rotate()
+
+        return applied
+
+    def _rotate(self) -> int:
+        """
+        Move the applied event log aside and delete it.
+
+        One renderer rotates at a time (it claims the log). A writer that
+        opened the log just before the rename still appends to the moved
+        file, so that file is read until its size stops changing before it
+        is deleted.
+
+        Returns:
+            Number of late events applied
+        """
+        claims = WorkClaims(str(self.vault_path), logger=self.logger)
+        lease = claims.try_claim(self.events_path)
+        if lease is None:
+            return 0
+        try:
+            rotated = self.events_path.with_name(f"{self.events_path.name}.{os.getpid()}.old")
+            try:
+                os.replace(self.events_path, rotated)
+            except FileNotFoundError:
+                return 0
+
+            offset, applied, settled_size = self.state["offset"], 0, None
+            while True:
+                offset, late = self._read_events(rotated, offset)
+                applied += late
+                size = rotated.stat().st_size
+                if size == settled_size:
+                    break
+                settled_size = size
+                time.sleep(ROTATE_SETTLE_SECONDS)
+
+            rotated.unlink()
+            self.state["offset"] = 0
+            return applied
+        finally:
+            claims.release(lease)
+
+    def set_status(self, name: str, value: str):
+        """Set a line in the System Status section"""
+        if self.state is None:
+            self.rebuild()
+        self.state["status"][name] = value
+
+    def set_metrics(self, metrics: Dict[str, Any]):
+        """Set free-form metric lines shown under System Status"""
+        if self.state is None:
+            self.rebuild()
+        self.state["metrics"].update(metrics)
+
+    def _template(self) -> str:
+        """Dashboard template (vault override or the default)"""
+        override = self.vault_path / TEMPLATE_FILE
+        if override.exists():
+            return override.read_text(encoding='utf-8')
+        return DEFAULT_TEMPLATE
+
+    def render_markdown(self) -> str:
+        """
+        Render Dashboard.md from the current state.
+
+        The timestamp is the time of the last change, so rendering the same
+        state twice gives the same text.
+
+        Returns:
+            Markdown content
+        """
+        state = self.state
+        counts = state["counts"]
+        status_lines = [f"**{k}**: {v}" for k, v in state["status"].items()]
+        status_lines += [f"**{k}**: {v}" for k, v in state["metrics"].items()]
+        status_lines.append(f"**Pending Approvals**: {counts['Pending_Approval']}")
+
+        today_events = state["today"]["events"]
+        today_lines = [f"**{event.title()}**: {count}" for event, count in sorted(today_events.items())]
+
+        activity_lines = []
+        for entry in state["recent_activity"]:
+            route = " -> ".join(s for s in (entry.get("from"), entry.get("to")) if s)
+            activity_lines.append(
+                f"{entry['ts'].replace('T', ' ')} {entry['event']}: {entry['name']}"
+                + (f" ({route})" if route else "")
+            )
+
+        return self._template().format_map({
+            "last_updated": state["updated_at"].replace('T', ' '),
+            "status": _bullets(status_lines, "(No status)"),
+            "folder_rows": "\n".join(f"| {stage.replace('_', ' ')} | {counts[stage]} |" for stage in STAGES),
+            "today": _bullets(today_lines, "(No activity today)"),
+            "pending": _bullets([f"[[{name[:-3] if name.endswith('.md') else name}]]" for name in state["pending"]],
+                                "(No pending actions)"),
+            "completions": _bullets(
+                [f"{c['ts'].replace('T', ' ')} {c['name']}" for c in state["recent_completions"]],
+                "(No recent completions)"
+            ),
+            "activity": _bullets(activity_lines, "(No recent activity)"),
+        })
+
+    def snapshot(self) -> Dict[str, Any]:
+        """JSON view of the dashboard for dashboard.html"""
+        state = self.state
+        return {
+            "updated_at": state["updated_at"],
+            "counts": state["counts"],
+            "pending": state["pending"],
+            "today": state["today"],
+            "status": state["status"],
+            "metrics": state["metrics"],
+            "recent_activity": state["recent_activity"],
+            "recent_completions": state["recent_completions"],
+        }
+
+    def update(self, force: bool = False) -> bool:
+        """
+        Apply new events and re-render if anything visible changed.
+
+        Counts are reconciled with a folder scan when one is due. Only the
+        marked section of the dashboard file is rewritten.
+
+        Args:
+            force: Render even if nothing changed
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            if self.reconcile_due():
+                self.reconcile()
+            else:
+                self.apply_pending()
+            content = self.render_markdown()
+            content_hash = hashlib.sha1(content.encode('utf-8')).hexdigest()
+
+            changed = force or content_hash != self.state["rendered_hash"] or not self.dashboard_path.exists()
+            if changed:
+                if self.dry_run:
+                    self.logger.info("[DRY RUN] Would render Dashboard.md")
+                else:
+                    try:
+                        document = self.dashboard_path.read_text(encoding='utf-8')
+                    except FileNotFoundError:
+                        document = ""
+                    self._write_atomic(self.dashboard_path, splice_section(document, content))
+                    self._write_atomic(self.snapshot_path, json.dumps(self.snapshot(), indent=2))
+                    self.state["rendered_hash"] = content_hash
+                    self.logger.info("Dashboard rendered")
+            else:
+                self.logger.debug("Dashboard unchanged")
+
+            self._save_state()
+            return True
+
+        except Exception as e:
+            self.logger.error(f"Failed to update dashboard: {e}", exc_info=True)
+            return False
+
+
+# CLI interface
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Render the AI Employee dashboard")
+    parser.add_argument(
+        "--vault-path",
+        default=".",
+        help="Path to vault root directory"
+    )
+    parser.add_argument(
+        "--rebuild",
+        action="store_true",
+        help="Recount folders instead of trusting the event log"
+    )
+    parser.add_argument(
+        "--reconcile",
+        action="store_true",
+        help="Correct counts from a folder scan, keeping recent activity"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Run in dry-run mode (no modifications)"
+    )
+
+    args = parser.parse_args()
+
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    renderer = DashboardRenderer(args.vault_path, dry_run=args.dry_run)
+    if args.rebuild:
+        renderer.rebuild()
+    elif args.reconcile:
+        renderer.reconcile()
+    renderer.update(force=args.rebuild)
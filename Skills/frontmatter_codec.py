@@ -0,0 +1,419 @@
+"""
+Frontmatter Codec
+
+Shared reader and writer for the YAML frontmatter at the top of vault
+markdown files.
+
+- Serializer: emits only safe scalars and flow lists, quoting any string
+  that YAML could misread (quotes, colons, leading symbols, etc.).
+- Parser: flat ``key: value`` headers (what the watchers and planners
+  generate) take a fast path without YAML; anything else goes through the
+  libyaml ``CSafeLoader`` when available.
+- Header reads: listing and routing code can read just the header of a
+  file, in small chunks up to a byte limit, instead of the whole body.
+- Cache: parsed files are kept in a process-wide LRU keyed by path, mtime
+  and size, so unchanged files are never parsed twice.
+"""
+
+import json
+import os
+import re
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import yaml
+
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:
+    from yaml import SafeLoader as _SafeLoader
+
+
+FRONTMATTER_PATTERN = re.compile(r'^---\r?\n(?:(.*?)\r?\n)?---[ \t]*(?:\r?\n|$)', re.DOTALL)
+
+_FLAT_LINE = re.compile(r'^([A-Za-z_][\w-]*):(?:[ \t]+(.*?))?[ \t]*$')
+_INT_VALUE = re.compile(r'^[-+]?(?:0|[1-9]\d*)$')
+# Plain strings that YAML reads back unchanged (no indicators, no type tags)
+_PLAIN_STRING = re.compile(r'^[A-Za-z_/][\w .,/()@+-]*$')
+# Plain words YAML 1.1 turns into booleans or null
+_RESERVED_WORDS = frozenset({
+    'true', 'false', 'yes', 'no', 'on', 'off', 'y', 'n', 'null', '~'
+})
+
+CACHE_SIZE = 4096
+HEADER_MAX_BYTES = 8192
+HEADER_CHUNK_SIZE = 1024
+
+_CLOSING_FENCE = re.compile(rb'\n---[ \t]*\r?\n')
+_CLOSING_FENCE_AT_EOF = re.compile(rb'\n---[ \t]*$')
+
+
+def _is_plain(text: str) -> bool:
+    """True if a string can be written without quotes"""
+    return (
+        bool(_PLAIN_STRING.match(text))
+        and text.lower() not in _RESERVED_WORDS
+        and not text.endswith(' ')
+        and ' #' not in text
+    )
+
+
+def _parse_flat_value(raw: Optional[str]) -> Tuple[bool, Any]:
+    """
+    Parse a scalar from a flat header line without YAML.
+
+    Returns:
+        (True, value) if handled, (False, None) if YAML is needed
+    """
+    if raw is None or raw == '' or raw in ('null', '~'):
+        return True, None
+
+    first = raw[0]
+    if first == '"':
+        if raw.endswith('"') and len(raw) >= 2 and '\\' not in raw and '"' not in raw[1:-1]:
+            return True, raw[1:-1]
+        if raw.endswith('"'):
+            # JSON escapes are a subset of YAML double-quoted escapes
+            try:
+                return True, json.loads(raw)
+            except ValueError:
+                return False, None
+        return False, None
+
+    if first == "'":
+        if raw.endswith("'") and len(raw) >= 2 and "'" not in raw[1:-1]:
+            return True, raw[1:-1]
+        return False, None
+
+    if first == '[':
+        try:
+            value = json.loads(raw)
+        except ValueError:
+            return False, None
+        if all(isinstance(v, (str, int)) and not isinstance(v, bool) for v in value):
+            return True, value
+        return False, None
+
+    lowered = raw.lower()
+    if lowered == 'true':
+        return True, True
+    if lowered == 'false':
+        return True, False
+    if _INT_VALUE.match(raw):
+        return True, int(raw)
+    if _is_plain(raw):
+        return True, raw
+
+    return False, None
+
+
+def parse_header(text: str) -> Dict[str, Any]:
+    """
+    Parse frontmatter text (without the ``---`` fences).
+
+    Args:
+        text: YAML header text
+
+    Returns:
+        Frontmatter dictionary (empty if invalid or not a mapping)
+    """
+    result: Dict[str, Any] = {}
+    for line in text.splitlines():
+        match = _FLAT_LINE.match(line)
+        if not match:
+            break
+        handled, value = _parse_flat_value(match.group(2))
+        if not handled:
+            break
+        result[match.group(1)] = value
+    else:
+        return result
+
+    # Nested, multi-line or unusual values: use the real YAML parser
+    try:
+        data = yaml.load(text, Loader=_SafeLoader)
+    except yaml.YAMLError:
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def split(content: str) -> Tuple[Optional[str], str]:
+    """
+    Split markdown into header text and body.
+
+    Args:
+        content: Markdown content
+
+    Returns:
+        (header text or None if there is no frontmatter, body)
+    """
+    match = FRONTMATTER_PATTERN.match(content)
+    if not match:
+        return None, content
+    return match.group(1) or '', content[match.end():]
+
+
+def parse(content: str) -> Dict[str, Any]:
+    """
+    Parse the frontmatter of markdown content.
+
+    Args:
+        content: Markdown content
+
+    Returns:
+        Frontmatter dictionary (empty if missing or invalid)
+    """
+    header, _ = split(content)
+    return parse_header(header) if header is not None else {}
+
+
+def extract(content: str) -> Tuple[Dict[str, Any], str]:
+    """
+    Parse frontmatter and return it together with the body.
+
+    Args:
+        content: Markdown content
+
+    Returns:
+        (frontmatter dictionary, body without frontmatter)
+    """
+    header, body = split(content)
+    if header is None:
+        return {}, content
+    return parse_header(header), body
+
+
+def format_value(value: Any, quote_strings: bool = False) -> str:
+    """
+    Serialize one frontmatter value.
+
+    Args:
+        value: Scalar, list or mapping
+        quote_strings: Always double-quote strings
+
+    Returns:
+        YAML text for the value
+    """
+    if value is None:
+        return 'null'
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, (datetime, date)):
+        value = value.isoformat()
+    if isinstance(value, (list, tuple, dict)):
+        # JSON flow collections are valid YAML
+        return json.dumps(value, ensure_ascii=False, default=str)
+
+    text = str(value)
+    if not quote_strings and _is_plain(text):
+        return text
+    return json.dumps(text, ensure_ascii=False)
+
+
+def serialize(fields: Dict[str, Any], quote_strings: bool = False) -> str:
+    """
+    Build a frontmatter block.
+
+    Args:
+        fields: Ordered frontmatter fields
+        quote_strings: Always double-quote strings
+
+    Returns:
+        Text from the opening ``---`` through the closing ``---`` line
+    """
+    lines = ['---']
+    for key, value in fields.items():
+        lines.append(f"{key}: {format_value(value, quote_strings)}")
+    lines.append('---')
+    return '\n'.join(lines) + '\n'
+
+
+def render(fields: Dict[str, Any], body: str, quote_strings: bool = False) -> str:
+    """
+    Build a markdown document from frontmatter fields and a body.
+
+    Args:
+        fields: Ordered frontmatter fields
+        body: Markdown body
+        quote_strings: Always double-quote strings
+
+    Returns:
+        Full markdown content
+    """
+    return serialize(fields, quote_strings) + body
+
+
+def update(content: str, updates: Dict[str, Any]) -> str:
+    """
+    Merge fields into a document's frontmatter, keeping the body intact.
+
+    Args:
+        content: Markdown content
+        updates: Fields to set
+
+    Returns:
+        Updated markdown content
+    """
+    fields, body = extract(content)
+    fields.update(updates)
+    return render(fields, body)
+
+
+def read_header_bytes(path, max_bytes: int = HEADER_MAX_BYTES) -> Optional[bytes]:
+    """
+    Read a file only as far as the end of its frontmatter.
+
+    Args:
+        path: File path
+        max_bytes: Maximum number of bytes to read
+
+    Returns:
+        Bytes through the closing fence, b'' if the file has no frontmatter,
+        or None if the header is longer than ``max_bytes``
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    data = b''
+    with open(path, 'rb') as f:
+        while len(data) < max_bytes:
+            chunk = f.read(min(HEADER_CHUNK_SIZE, max_bytes - len(data)))
+            data += chunk
+            if not data.startswith(b'---'[:len(data)]):
+                return b''
+
+            # Search from the newline after the opening fence
+            match = _CLOSING_FENCE.search(data, 3)
+            if match is None and not chunk:
+                match = _CLOSING_FENCE_AT_EOF.search(data, 3)
+            if match:
+                header = data[:match.end()]
+                return header if FRONTMATTER_PATTERN.match(header.decode('utf-8', errors='replace')) else b''
+            if not chunk:
+                return b''
+    return None
+
+
+def read_header(path, max_bytes: int = HEADER_MAX_BYTES) -> Dict[str, Any]:
+    """
+    Parse the frontmatter of a file without reading its body.
+
+    Headers longer than ``max_bytes`` fall back to a full (cached) read.
+
+    Args:
+        path: File path
+        max_bytes: Maximum number of bytes to read for the header
+
+    Returns:
+        Frontmatter dictionary (empty if missing or invalid)
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    raw = read_header_bytes(path, max_bytes)
+    if raw is None:
+        fields, _ = load_file(path)
+        return fields
+    return parse(raw.decode('utf-8', errors='replace'))
+
+
+class _ParseCache:
+    """Thread-safe LRU of parsed files keyed by (path, mtime_ns, size)"""
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, mtime_ns: int, size: int) -> Optional[tuple]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != mtime_ns or entry[1] != size:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[2:]
+
+    def put(self, key: str, mtime_ns: int, size: int, *value):
+        with self._lock:
+            self._entries[key] = (mtime_ns, size, *value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+_cache = _ParseCache(CACHE_SIZE)
+
+
+def load_document(path) -> Tuple[Dict[str, Any], str, str]:
+    """
+    Read and parse a markdown file, using the shared parse cache.
+
+    The returned dictionary is a copy, so callers may modify it.
+
+    Args:
+        path: File path
+
+    Returns:
+        (frontmatter dictionary, body, full content)
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    key = os.path.abspath(path)
+    stat = os.stat(key)
+
+    cached = _cache.get(key, stat.st_mtime_ns, stat.st_size)
+    if cached is None:
+        content = Path(key).read_text(encoding='utf-8')
+        header, body = split(content)
+        fields = parse_header(header) if header is not None else {}
+        body_offset = len(content) - len(body)
+        _cache.put(key, stat.st_mtime_ns, stat.st_size, fields, content, body_offset)
+    else:
+        fields, content, body_offset = cached
+    return dict(fields), content[body_offset:], content
+
+
+def load_file(path) -> Tuple[Dict[str, Any], str]:
+    """
+    Read and parse a markdown file, using the shared parse cache.
+
+    Args:
+        path: File path
+
+    Returns:
+        (frontmatter dictionary, body)
+
+    Raises:
+        OSError: If the file cannot be read
+    """
+    fields, body, _ = load_document(path)
+    return fields, body
+
+
+def cache_info() -> Dict[str, int]:
+    """Hit/miss counters and size of the parse cache"""
+    return {'hits': _cache.hits, 'misses': _cache.misses, 'size': len(_cache)}
+
+
+def clear_cache():
+    """Empty the parse cache"""
+    _cache.clear()
@@ -21,6 +21,12 @@ from dataclasses import dataclass, asdict
 import re
 import yaml
 from enum import Enum
+from contextlib import nullcontext
+
+import frontmatter_codec
+from dashboard_renderer import record_event
+from similarity_index import SimilarityIndex, append_duplicate_reference
+from vault_writer import VaultWriter
 
 # Third-party imports (install via: pip install google-auth google-auth-oauthlib google-auth-httplib2 google-api-python-client pyyaml html2text)
 try:
@@ -76,6 +82,10 @@ class GmailWatcherConfig:
     token_path: str = "config/gmail-token.json"
     index_path: str = ".index/gmail-watcher-processed.json"
     mark_as_read: bool = False
+    dedup_enabled: bool = True
+    dedup_window_seconds: int = 86400  # Collapse repeats seen within 24 hours
+    dedup_max_distance: int = 3  # Max SimHash bit difference for a near-duplicate
+    group_commit: bool = False  # fsync the folder once per poll instead of per file
     
     def __post_init__(self):
         if self.importance_criteria is None:
@@ -118,6 +128,19 @@ class GmailWatcher:
         self._load_processed_index()
         self._ensure_directories()
         
+        # Near-duplicate index (job alerts and newsletters arrive in bursts)
+        self.similarity_index = SimilarityIndex(
+            str(Path(self.config.index_path).parent / "gmail-watcher-similarity.json"),
+            window_seconds=config.dedup_window_seconds,
+            max_distance=config.dedup_max_distance,
+            dry_run=dry_run,
+            logger=self.logger
+        )
+        self.duplicates_collapsed = 0
+        self.writer = VaultWriter(logger=self.logger)
+        self._defer_index_save = False
+        self._index_dirty = False
+        
     def _setup_logging(self) -> logging.Logger:
         """Configure logging with file and console handlers"""
         logger = logging.getLogger("GmailWatcher")
@@ -167,6 +190,11 @@ class GmailWatcher:
     
     def _save_processed_index(self):
         """Save the processed email index to disk"""
+        if self._defer_index_save:
+            # Group commit: written once at the end of the poll
+            self._index_dirty = True
+            return
+        
         if self.dry_run:
             self.logger.info(f"[DRY RUN] Would save processed index with {len(self.processed_index)} entries")
             return
@@ -432,6 +460,53 @@ class GmailWatcher:
         """Check if email has already been processed"""
         return email_id in self.processed_index
     
+    def _similarity_text(self, email: EmailMetadata) -> str:
+        """Subject plus body used for near-duplicate detection"""
+        return f"{email.subject} {email.body_text or email.body_html}"
+    
+    def collapse_duplicate(self, email: EmailMetadata) -> bool:
+        """
+        Fold a near-duplicate email into the task file that already exists.
+        
+        Returns:
+            True if the email was collapsed, False if it should get its own file
+        """
+        if not self.config.dedup_enabled:
+            return False
+        
+        match = self.similarity_index.find_similar(self._similarity_text(email))
+        if not match:
+            return False
+        
+        reference = (
+            f"{datetime.now(UTC).isoformat()}Z: {email.subject} from {email.sender} "
+            f"([View in Gmail](https://mail.google.com/mail/u/0/#inbox/{email.email_id}))"
+        )
+        
+        if self.dry_run:
+            self.logger.info(f"[DRY RUN] Would collapse {email.email_id} into {match.filepath}")
+            self.duplicates_collapsed += 1
+            return True
+        
+        if not append_duplicate_reference(match.filepath, reference):
+            # The original task has moved on; treat this email as new
+            self.similarity_index.forget(match.filepath)
+            return False
+        
+        self.logger.info(
+            f"Collapsed near-duplicate email {email.email_id} into {Path(match.filepath).name} "
+            f"(distance: {match.distance})"
+        )
+        self.processed_index[email.email_id] = {
+            "filename": Path(match.filepath).name,
+            "processedAt": datetime.now(UTC).isoformat() + "Z",
+            "priority": email.priority,
+            "duplicateOf": match.item_id
+        }
+        self._save_processed_index()
+        self.duplicates_collapsed += 1
+        return True
+    
     def generate_markdown(self, email: EmailMetadata) -> str:
         """Generate markdown content for email"""
         # Convert HTML to markdown if available
@@ -449,22 +524,23 @@ class GmailWatcher:
             Priority.LOW.value: "🟢"
         }
         
-        # Generate frontmatter
-        frontmatter = f"""---
-email_id: "{email.email_id}"
-sender: "{email.sender}"
-sender_email: "{email.sender_email}"
-sender_name: "{email.sender_name}"
-subject: "{email.subject}"
-date: "{email.date}"
-priority: "{email.priority}"
-labels: {json.dumps(email.labels)}
-processed_at: "{datetime.now(UTC).isoformat()}Z"
-source: "gmail"
-type: "email_task"
-status: "pending"
----
-
+        # Generate frontmatter (values are escaped, so quotes in subjects are safe)
+        frontmatter = frontmatter_codec.serialize({
+            'email_id': email.email_id,
+            'sender': email.sender,
+            'sender_email': email.sender_email,
+            'sender_name': email.sender_name,
+            'subject': email.subject,
+            'date': email.date,
+            'priority': email.priority,
+            'labels': email.labels,
+            'processed_at': f"{datetime.now(UTC).isoformat()}Z",
+            'source': 'gmail',
+            'type': 'email_task',
+            'status': 'pending'
+        }, quote_strings=True)
+        
+        frontmatter += f"""
 # Email: {email.subject}
 
 **From**: {email.sender}  
@@ -494,21 +570,16 @@ status: "pending"
     
     def create_markdown_file(self, email: EmailMetadata, content: str) -> Optional[str]:
         """Create markdown file in Needs_Action folder"""
-        # Generate filename
-        timestamp = datetime.now(UTC).strftime("%Y%m%d_%H%M%S")
-        safe_subject = re.sub(r'[^\w\s-]', '', email.subject.lower())
-        safe_subject = re.sub(r'[-\s]+', '-', safe_subject)[:50]
-        filename = f"{timestamp}_{safe_subject}.md"
-        filepath = Path(self.config.needs_action_folder) / filename
+        folder = Path(self.config.needs_action_folder)
         
         if self.dry_run:
+            filepath = folder / self.writer.make_filename(email.subject, content)
             self.logger.info(f"[DRY RUN] Would create file: {filepath}")
             return str(filepath)
         
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
-            
+            filepath = self.writer.create_task_file(folder, email.subject, content)
+            record_event(folder.absolute().parent, "created", filepath)
             self.logger.info(f"Created markdown file: {filepath}")
             return str(filepath)
             
@@ -562,6 +633,11 @@ status: "pending"
         priority = self.detect_priority(email)
         email.priority = priority.value
         
+        # REASONING: Collapse near-duplicates into the existing task
+        if self.collapse_duplicate(email):
+            self.mark_as_read(email_id)
+            return False
+        
         self.logger.info(f"Important email detected: {email.subject} (Priority: {priority.value})")
         
         # ACTION: Create markdown and update index
@@ -569,6 +645,9 @@ status: "pending"
         filepath = self.create_markdown_file(email, markdown_content)
         
         if filepath:
+            if self.config.dedup_enabled:
+                self.similarity_index.add(self._similarity_text(email), email_id, filepath)
+            
             # Update processed index
             self.processed_index[email_id] = {
                 "filename": Path(filepath).name,
@@ -594,6 +673,7 @@ status: "pending"
             "processed": 0,
             "filtered": 0,
             "created": 0,
+            "duplicates": 0,
             "errors": 0
         }
         
@@ -602,17 +682,27 @@ status: "pending"
             email_ids = self.fetch_unread_emails()
             stats["retrieved"] = len(email_ids)
             
-            # Process each email
-            for email_id in email_ids:
-                try:
-                    if self.process_email(email_id):
-                        stats["processed"] += 1
-                        stats["created"] += 1
-                    else:
-                        stats["filtered"] += 1
-                except Exception as e:
-                    self.logger.error(f"Error processing email {email_id}: {e}")
-                    stats["errors"] += 1
+            # Process each email (one directory fsync and index save per poll in group-commit mode)
+            self._defer_index_save = self.config.group_commit
+            with self.writer.batch() if self.config.group_commit else nullcontext():
+                for email_id in email_ids:
+                    try:
+                        collapsed_before = self.duplicates_collapsed
+                        if self.process_email(email_id):
+                            stats["processed"] += 1
+                            stats["created"] += 1
+                        elif self.duplicates_collapsed > collapsed_before:
+                            stats["duplicates"] += 1
+                        else:
+                            stats["filtered"] += 1
+                    except Exception as e:
+                        self.logger.error(f"Error processing email {email_id}: {e}")
+                        stats["errors"] += 1
+            
+            self._defer_index_save = False
+            if self._index_dirty:
+                self._index_dirty = False
+                self._save_processed_index()
             
             elapsed = time.time() - start_time
             self.logger.info(f"Polling cycle completed in {elapsed:.2f}s: {stats}")
@@ -660,7 +750,11 @@ def load_config(config_path: str) -> GmailWatcherConfig:
             credentials_path=config_dict.get('credentialsPath', 'config/gmail-credentials.json'),
             token_path=config_dict.get('tokenPath', 'config/gmail-token.json'),
             index_path=config_dict.get('indexPath', '.index/gmail-watcher-processed.json'),
-            mark_as_read=config_dict.get('markAsRead', False)
+            mark_as_read=config_dict.get('markAsRead', False),
+            dedup_enabled=config_dict.get('dedupEnabled', True),
+            dedup_window_seconds=config_dict.get('dedupWindowSeconds', 86400),
+            dedup_max_distance=config_dict.get('dedupMaxDistance', 3),
+            group_commit=config_dict.get('groupCommit', False)
         )
     except FileNotFoundError:
         print(f"Config file not found: {config_path}")
@@ -708,6 +802,7 @@ def main():
         print(f"  Processed: {stats['processed']}")
         print(f"  Filtered: {stats['filtered']}")
         print(f"  Created: {stats['created']}")
+        print(f"  Duplicates: {stats['duplicates']}")
         print(f"  Errors: {stats['errors']}")
     
     elif args.command == 'start':
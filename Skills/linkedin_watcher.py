@@ -8,15 +8,40 @@ Note: Requires LinkedIn API access and proper OAuth2 setup.
 """
 
 import logging
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime, UTC
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass
 import json
 import requests
+from requests.adapters import HTTPAdapter
 
+try:
+    import httpx
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+import frontmatter_codec
 from base_watcher import BaseWatcher, WatcherConfig
+from response_cache import ResponseCache, cache_key, parse_retry_after
+from cursor_store import CursorStore, counter_delta, reached_mark
+
+
+class LinkedInRequestError(RuntimeError):
+    """Raised when a collection page could not be fetched (network error, 5xx, exhausted 429)"""
+
+
+def _element_time(element: Dict[str, Any]) -> Optional[int]:
+    """Creation time (epoch ms) of an API element, if present"""
+    created = element.get('createdAt', element.get('created'))
+    if isinstance(created, dict):
+        created = created.get('time')
+    return created if isinstance(created, int) else None
 
 
 @dataclass
@@ -29,6 +54,13 @@ class LinkedInWatcherConfig(WatcherConfig):
     monitor_messages: bool = True
     monitor_connections: bool = True
     monitor_engagement: bool = True
+    max_concurrent_requests: int = 4  # Parallel API calls per poll (still rate limited)
+    use_http2: bool = True  # Use HTTP/2 via httpx when it is installed
+    request_timeout: int = 10
+    max_retries: int = 3  # Retries after 429 Too Many Requests
+    max_retry_after_seconds: int = 300  # Cap on a single Retry-After wait
+    page_size: int = 50  # Elements per page when paginating collections
+    max_pages: int = 10  # Safety cap on pages read per endpoint per poll
 
 
 class LinkedInWatcher(BaseWatcher):
@@ -46,12 +78,69 @@ class LinkedInWatcher(BaseWatcher):
         self.config: LinkedInWatcherConfig = config
         self.access_token = config.access_token
         self.api_base = "https://api.linkedin.com/v2"
-        self.processed_items: set = set()
         
-        # Rate limiting
+        # Rate limiting (shared by all worker threads)
         self.request_count = 0
         self.last_request_time = time.time()
         self.max_requests_per_minute = 60
+        self._rate_lock = threading.Lock()
+        
+        # Pooled keep-alive connection reused by every request
+        self.session = self._create_session()
+        
+        # Item details prefetched during check_for_new_items
+        self._item_cache: Dict[str, Dict[str, Any]] = {}
+        self._cache_lock = threading.Lock()
+        
+        # ETag / Last-Modified validators for conditional polling
+        self.response_cache = ResponseCache(
+            str(Path(self.config.index_path) / "linkedin-response-cache.json"),
+            dry_run=self.config.dry_run,
+            logger=self.logger
+        )
+        
+        # High-water marks per endpoint and last engagement counts per share
+        self.cursors = CursorStore(
+            str(Path(self.config.index_path) / "linkedin-cursors.json"),
+            dry_run=self.config.dry_run,
+            logger=self.logger
+        )
+        self._engagement_deltas: Dict[str, Dict[str, int]] = {}
+        
+        # Why the item being processed failed (fetch or file write), if it did
+        self._item_failure: Optional[str] = None
+        # Why this poll's scan is incomplete (failed page, page cap), if it is
+        self._scan_failure: Optional[str] = None
+    
+    def _create_session(self):
+        """
+        Create the pooled HTTP client.
+        
+        Uses an HTTP/2 httpx client when available (one multiplexed
+        connection), otherwise a requests Session with a keep-alive pool
+        sized for the worker threads.
+        
+        Returns:
+            httpx.Client or requests.Session
+        """
+        headers = {
+            'Authorization': f'Bearer {self.access_token}',
+            'Content-Type': 'application/json'
+        }
+        
+        if self.config.use_http2 and HTTP2_AVAILABLE:
+            self.logger.debug("Using HTTP/2 client")
+            return httpx.Client(http2=True, headers=headers, timeout=self.config.request_timeout)
+        
+        session = requests.Session()
+        session.headers.update(headers)
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=max(1, self.config.max_concurrent_requests)
+        )
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
     
     def authenticate(self) -> bool:
         """
@@ -67,15 +156,9 @@ class LinkedInWatcher(BaseWatcher):
         
         try:
             # Test authentication by getting user profile
-            headers = {
-                'Authorization': f'Bearer {self.access_token}',
-                'Content-Type': 'application/json'
-            }
-            
-            response = requests.get(
+            response = self.session.get(
                 f"{self.api_base}/me",
-                headers=headers,
-                timeout=10
+                timeout=self.config.request_timeout
             )
             
             if response.status_code == 200:
@@ -91,51 +174,88 @@ class LinkedInWatcher(BaseWatcher):
             return False
     
     def _rate_limit_check(self):
-        """Check and enforce rate limits"""
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
-        
-        # Reset counter every minute
-        if time_since_last >= 60:
-            self.request_count = 0
-            self.last_request_time = current_time
+        """Check and enforce rate limits (thread-safe)"""
+        with self._rate_lock:
+            current_time = time.time()
+            time_since_last = current_time - self.last_request_time
+            
+            # Reset counter every minute
+            if time_since_last >= 60:
+                self.request_count = 0
+                self.last_request_time = current_time
+            
+            # Check if we're over the limit; other workers wait on the lock
+            if self.request_count >= self.max_requests_per_minute:
+                sleep_time = 60 - time_since_last
+                self.logger.warning(f"Rate limit reached, sleeping for {sleep_time:.1f}s")
+                time.sleep(sleep_time)
+                self.request_count = 0
+                self.last_request_time = time.time()
+            
+            self.request_count += 1
+    
+    def _make_request(self, endpoint: str, params: Dict = None,
+                      unchanged_as_none: bool = False, raise_on_error: bool = False) -> Optional[Dict]:
+        """
+        Make a conditional, rate-limited API request.
         
-        # Check if we're over the limit
-        if self.request_count >= self.max_requests_per_minute:
-            sleep_time = 60 - time_since_last
-            self.logger.warning(f"Rate limit reached, sleeping for {sleep_time:.1f}s")
-            time.sleep(sleep_time)
-            self.request_count = 0
-            self.last_request_time = time.time()
+        Cached validators are sent as If-None-Match / If-Modified-Since. A 304
+        returns the cached body, or None when ``unchanged_as_none`` is set so
+        collection checks can treat it as "no new items". A 429 waits for
+        Retry-After and retries.
         
-        self.request_count += 1
-    
-    def _make_request(self, endpoint: str, params: Dict = None) -> Optional[Dict]:
-        """Make authenticated API request with rate limiting"""
-        self._rate_limit_check()
+        Args:
+            endpoint: API endpoint relative to the API base
+            params: Query parameters
+            unchanged_as_none: Return None instead of the cached body on 304
+            raise_on_error: Raise LinkedInRequestError on failure, so None
+                only ever means "not modified"
+            
+        Returns:
+            Decoded JSON body, or None
+        """
+        key = cache_key(endpoint, params)
         
-        try:
-            headers = {
-                'Authorization': f'Bearer {self.access_token}',
-                'Content-Type': 'application/json'
-            }
+        for attempt in range(self.config.max_retries + 1):
+            self._rate_limit_check()
             
-            response = requests.get(
-                f"{self.api_base}/{endpoint}",
-                headers=headers,
-                params=params,
-                timeout=10
-            )
+            try:
+                response = self.session.get(
+                    f"{self.api_base}/{endpoint}",
+                    params=params,
+                    headers=self.response_cache.conditional_headers(key),
+                    timeout=self.config.request_timeout
+                )
+            except Exception as e:
+                self.logger.error(f"API request error: {e}")
+                if raise_on_error:
+                    raise LinkedInRequestError(f"{endpoint}: {e}") from e
+                return None
             
             if response.status_code == 200:
-                return response.json()
-            else:
-                self.logger.warning(f"API request failed: {response.status_code}")
-                return None
-        
-        except Exception as e:
-            self.logger.error(f"API request error: {e}")
+                data = response.json()
+                self.response_cache.store(key, data, response.headers)
+                return data
+            
+            if response.status_code == 304:
+                self.logger.debug(f"Not modified: {endpoint}")
+                return None if unchanged_as_none else self.response_cache.get(key)
+            
+            if response.status_code == 429 and attempt < self.config.max_retries:
+                delay = min(
+                    parse_retry_after(response.headers.get('Retry-After')),
+                    self.config.max_retry_after_seconds
+                )
+                self.logger.warning(f"Rate limited on {endpoint}, retrying in {delay:.0f}s")
+                time.sleep(delay)
+                continue
+            
+            self.logger.warning(f"API request failed: {response.status_code}")
+            if raise_on_error:
+                raise LinkedInRequestError(f"{endpoint}: HTTP {response.status_code}")
             return None
+        
+        return None
     
     def check_for_new_items(self) -> List[str]:
         """
@@ -146,107 +266,196 @@ class LinkedInWatcher(BaseWatcher):
         """
         item_ids = []
         
+        checks = []
+        if self.config.monitor_messages:
+            checks.append(self._check_messages)
+        if self.config.monitor_connections:
+            checks.append(self._check_connections)
+        if self.config.monitor_engagement:
+            checks.append(self._check_engagement)
+        
         try:
-            # Check messages
-            if self.config.monitor_messages:
-                message_ids = self._check_messages()
-                item_ids.extend(message_ids)
-            
-            # Check connection requests
-            if self.config.monitor_connections:
-                connection_ids = self._check_connections()
-                item_ids.extend(connection_ids)
-            
-            # Check engagement
-            if self.config.monitor_engagement:
-                engagement_ids = self._check_engagement()
-                item_ids.extend(engagement_ids)
+            with ThreadPoolExecutor(max_workers=max(1, self.config.max_concurrent_requests)) as pool:
+                # Query all endpoints at once
+                for ids in pool.map(lambda check: check(), checks):
+                    item_ids.extend(ids)
+                
+                # Prefetch details so get_item_content is a cache lookup
+                for item_id, item in zip(item_ids, pool.map(self._fetch_item_content, item_ids)):
+                    if item:
+                        with self._cache_lock:
+                            self._item_cache[item_id] = item
             
             self.logger.info(f"Found {len(item_ids)} new items")
             return item_ids
         
         except Exception as e:
             self.logger.error(f"Failed to check for new items: {e}")
+            self._scan_failure = str(e)
+            # Re-scan from the old marks and validators next poll
+            self.cursors.discard()
+            self.response_cache.discard()
             return []
     
+    def _iter_pages(self, endpoint: str):
+        """
+        Yield pages of a collection endpoint.
+        
+        Stops at a short page, a 304 (the rest was seen before) or
+        ``max_pages``. A failed request raises LinkedInRequestError, so a
+        partial scan is never mistaken for the end of the collection.
+        
+        Args:
+            endpoint: Collection endpoint
+            
+        Yields:
+            List of elements per page
+        """
+        for page_number in range(self.config.max_pages):
+            params = {'start': page_number * self.config.page_size, 'count': self.config.page_size}
+            data = self._make_request(endpoint, params, unchanged_as_none=True, raise_on_error=True)
+            if data is None:
+                return
+            
+            elements = data.get('elements', [])
+            yield elements
+            if len(elements) < self.config.page_size:
+                return
+    
+    def _scan_collection(self, endpoint: str, prefix: str) -> List[str]:
+        """
+        Collect item IDs newer than the endpoint's high-water mark.
+        
+        Collections are returned newest first, so paging stops as soon as an
+        element at or before the mark is seen. The newest element becomes the
+        staged mark, committed once the poll is handled. If ``max_pages`` runs
+        out before the mark or the end of the collection, the mark is not
+        staged and the poll is flagged as incomplete, so nothing between the
+        last page read and the old mark is skipped.
+        
+        Args:
+            endpoint: Collection endpoint ("messages" or "invitations")
+            prefix: Item ID prefix for this endpoint
+            
+        Returns:
+            List of item IDs
+        """
+        mark = self.cursors.get(endpoint, {})
+        newest = None
+        item_ids = []
+        reached = False
+        pages = 0
+        last_page_size = 0
+        
+        for elements in self._iter_pages(endpoint):
+            pages += 1
+            last_page_size = len(elements)
+            for element in elements:
+                element_id = str(element.get('id', ''))
+                element_time = _element_time(element)
+                if newest is None:
+                    newest = {'last_id': element_id, 'last_time': element_time}
+                
+                if reached_mark(element_id, element_time, mark):
+                    reached = True
+                    break
+                
+                item_id = f"{prefix}_{element_id}"
+                if item_id not in self.processed_items:
+                    item_ids.append(item_id)
+            
+            if reached:
+                break
+        
+        if not reached and pages == self.config.max_pages and last_page_size >= self.config.page_size:
+            self._scan_failure = f"{endpoint}: mark not reached within {self.config.max_pages} pages"
+            self.logger.warning(f"{self._scan_failure}; keeping the old mark")
+        elif newest:
+            self.cursors.stage(endpoint, newest)
+        return item_ids
+    
     def _check_messages(self) -> List[str]:
         """Check for new direct messages"""
         try:
             # Note: This is a simplified implementation
             # Real implementation would use LinkedIn Messaging API
-            data = self._make_request("messages")
-            
-            if not data:
-                return []
-            
-            message_ids = []
-            for message in data.get('elements', []):
-                msg_id = f"message_{message.get('id', '')}"
-                if msg_id not in self.processed_items:
-                    message_ids.append(msg_id)
-            
-            return message_ids
+            return self._scan_collection("messages", "message")
         
         except Exception as e:
             self.logger.error(f"Failed to check messages: {e}")
-            return []
+            raise
     
     def _check_connections(self) -> List[str]:
         """Check for new connection requests"""
         try:
             # Note: This is a simplified implementation
-            data = self._make_request("invitations")
-            
-            if not data:
-                return []
-            
-            connection_ids = []
-            for invitation in data.get('elements', []):
-                inv_id = f"connection_{invitation.get('id', '')}"
-                if inv_id not in self.processed_items:
-                    connection_ids.append(inv_id)
-            
-            return connection_ids
+            return self._scan_collection("invitations", "connection")
         
         except Exception as e:
             self.logger.error(f"Failed to check connections: {e}")
-            return []
+            raise
     
     def _check_engagement(self) -> List[str]:
-        """Check for post engagement (likes, comments)"""
+        """Check for post engagement (likes, comments) that changed since the last poll"""
         try:
             # Note: This is a simplified implementation
             # Real implementation would check recent posts for engagement
-            data = self._make_request("shares")
-            
-            if not data:
-                return []
-            
+            snapshots = self.cursors.get("shares", {})
+            updated = dict(snapshots)
             engagement_ids = []
-            for share in data.get('elements', []):
-                # Check if post has new engagement
-                engagement_count = share.get('totalShareStatistics', {}).get('likeCount', 0)
-                if engagement_count > 0:
-                    eng_id = f"engagement_{share.get('id', '')}"
+            
+            for elements in self._iter_pages("shares"):
+                for share in elements:
+                    share_id = str(share.get('id', ''))
+                    stats = share.get('totalShareStatistics', {})
+                    counts = {
+                        'likes': stats.get('likeCount', 0),
+                        'comments': stats.get('commentCount', 0),
+                        'shares': stats.get('shareCount', 0)
+                    }
+                    
+                    # Only emit when likes or comments actually moved
+                    delta = counter_delta(snapshots.get(share_id), counts, ('likes', 'comments'))
+                    if not delta:
+                        continue
+                    
+                    updated[share_id] = counts
+                    eng_id = f"engagement_{share_id}@{counts['likes']}.{counts['comments']}"
                     if eng_id not in self.processed_items:
+                        self._engagement_deltas[eng_id] = delta
                         engagement_ids.append(eng_id)
             
+            if engagement_ids:
+                self.cursors.stage("shares", updated)
             return engagement_ids
         
         except Exception as e:
             self.logger.error(f"Failed to check engagement: {e}")
-            return []
+            raise
     
     def get_item_content(self, item_id: str) -> Optional[Dict[str, Any]]:
         """
         Fetch full content for a specific LinkedIn item.
         
+        Details prefetched during check_for_new_items are served from the
+        cache; anything else is fetched now.
+        
         Args:
             item_id: Item identifier (format: type_id)
             
         Returns:
             Dictionary with item metadata and content
         """
+        with self._cache_lock:
+            item = self._item_cache.pop(item_id, None)
+        if item is None:
+            item = self._fetch_item_content(item_id)
+        if item is None:
+            self._item_failure = f"Failed to get content for item: {item_id}"
+        return item
+    
+    def _fetch_item_content(self, item_id: str) -> Optional[Dict[str, Any]]:
+        """Fetch item details from the API"""
         try:
             item_type, item_ref = item_id.split('_', 1)
             
@@ -297,22 +506,27 @@ class LinkedInWatcher(BaseWatcher):
             'source': 'linkedin'
         }
     
-    def _get_engagement_content(self, share_id: str) -> Optional[Dict]:
+    def _get_engagement_content(self, item_ref: str) -> Optional[Dict]:
         """Get post engagement details"""
+        # item_ref is "<share id>@<likes>.<comments>"
+        share_id = item_ref.split('@', 1)[0]
         data = self._make_request(f"shares/{share_id}")
         
         if not data:
             return None
         
         stats = data.get('totalShareStatistics', {})
+        delta = self._engagement_deltas.pop(f"engagement_{item_ref}", {})
         
         return {
-            'id': f"engagement_{share_id}",
+            'id': f"engagement_{item_ref}",
             'type': 'engagement',
             'post_text': data.get('text', {}).get('text', ''),
             'likes': stats.get('likeCount', 0),
             'comments': stats.get('commentCount', 0),
             'shares': stats.get('shareCount', 0),
+            'new_likes': delta.get('likes', 0),
+            'new_comments': delta.get('comments', 0),
             'timestamp': datetime.now(UTC).isoformat() + 'Z',
             'source': 'linkedin'
         }
@@ -391,17 +605,17 @@ class LinkedInWatcher(BaseWatcher):
         }
         
         if item_type == 'message':
-            content = f"""---
-type: linkedin_message
-sender: "{item.get('sender', 'Unknown')}"
-subject: "{item.get('subject', 'No Subject')}"
-timestamp: "{item.get('timestamp', '')}"
-priority: "{priority}"
-status: "pending"
-source: "linkedin"
-item_id: "{item.get('id', '')}"
----
-
+            content = frontmatter_codec.serialize({
+                'type': 'linkedin_message',
+                'sender': item.get('sender', 'Unknown'),
+                'subject': item.get('subject', 'No Subject'),
+                'timestamp': item.get('timestamp', ''),
+                'priority': priority,
+                'status': 'pending',
+                'source': 'linkedin',
+                'item_id': item.get('id', '')
+            }, quote_strings=True)
+            content += f"""
 # LinkedIn Message: {item.get('subject', 'No Subject')}
 
 **From**: {item.get('sender', 'Unknown')}  
@@ -425,17 +639,17 @@ item_id: "{item.get('id', '')}"
 """
         
         elif item_type == 'connection':
-            content = f"""---
-type: linkedin_connection
-from_name: "{item.get('from_name', 'Unknown')}"
-from_headline: "{item.get('from_headline', '')}"
-timestamp: "{item.get('timestamp', '')}"
-priority: "{priority}"
-status: "pending"
-source: "linkedin"
-item_id: "{item.get('id', '')}"
----
-
+            content = frontmatter_codec.serialize({
+                'type': 'linkedin_connection',
+                'from_name': item.get('from_name', 'Unknown'),
+                'from_headline': item.get('from_headline', ''),
+                'timestamp': item.get('timestamp', ''),
+                'priority': priority,
+                'status': 'pending',
+                'source': 'linkedin',
+                'item_id': item.get('id', '')
+            }, quote_strings=True)
+            content += f"""
 # LinkedIn Connection Request
 
 **From**: {item.get('from_name', 'Unknown')}  
@@ -459,23 +673,25 @@ item_id: "{item.get('id', '')}"
 """
         
         elif item_type == 'engagement':
-            content = f"""---
-type: linkedin_engagement
-likes: {item.get('likes', 0)}
-comments: {item.get('comments', 0)}
-shares: {item.get('shares', 0)}
-timestamp: "{item.get('timestamp', '')}"
-priority: "{priority}"
-status: "pending"
-source: "linkedin"
-item_id: "{item.get('id', '')}"
----
-
+            content = frontmatter_codec.serialize({
+                'type': 'linkedin_engagement',
+                'likes': item.get('likes', 0),
+                'comments': item.get('comments', 0),
+                'shares': item.get('shares', 0),
+                'new_likes': item.get('new_likes', 0),
+                'new_comments': item.get('new_comments', 0),
+                'timestamp': item.get('timestamp', ''),
+                'priority': priority,
+                'status': 'pending',
+                'source': 'linkedin',
+                'item_id': item.get('id', '')
+            }, quote_strings=True)
+            content += f"""
 # LinkedIn Post Engagement
 
 **Priority**: {priority_emoji.get(priority, '⚪')} {priority.capitalize()}  
-**Likes**: {item.get('likes', 0)}  
-**Comments**: {item.get('comments', 0)}  
+**Likes**: {item.get('likes', 0)} ({item.get('new_likes', 0):+d} since last check)  
+**Comments**: {item.get('comments', 0)} ({item.get('new_comments', 0):+d} since last check)  
 **Shares**: {item.get('shares', 0)}
 
 ## Post Content
@@ -495,20 +711,79 @@ item_id: "{item.get('id', '')}"
 """
         
         else:
-            content = f"""---
-type: linkedin_item
-timestamp: "{item.get('timestamp', '')}"
-priority: "{priority}"
-status: "pending"
-source: "linkedin"
----
-
+            content = frontmatter_codec.serialize({
+                'type': 'linkedin_item',
+                'timestamp': item.get('timestamp', ''),
+                'priority': priority,
+                'status': 'pending',
+                'source': 'linkedin'
+            }, quote_strings=True)
+            content += f"""
 # LinkedIn Item
 
 {json.dumps(item, indent=2)}
 """
         
         return content
+    
+    def create_inbox_file(self, item: Dict[str, Any], content: str) -> Optional[str]:
+        """Create the task file, recording a failed write for process_item"""
+        filepath = super().create_inbox_file(item, content)
+        if filepath is None:
+            self._item_failure = f"Failed to create file for item: {item.get('id')}"
+        return filepath
+    
+    def process_item(self, item_id: str) -> bool:
+        """
+        Process a single item.
+        
+        A failed detail fetch or file write raises, so the poll counts it
+        as an error instead of a filtered item and keeps the old marks.
+        
+        Args:
+            item_id: Item identifier
+            
+        Returns:
+            True if a task file was created, False if the item was skipped
+        """
+        self._item_failure = None
+        if super().process_item(item_id):
+            return True
+        if self._item_failure:
+            raise RuntimeError(self._item_failure)
+        return False
+    
+    def poll_once(self) -> Dict[str, int]:
+        """
+        Execute one polling cycle and advance the high-water marks.
+        
+        Marks and response validators are only committed when every item
+        was handled and every collection was read up to its mark, so a
+        failed poll is re-scanned from the old position (with fresh
+        downloads instead of 304s) next time.
+        
+        Returns:
+            Dictionary with statistics about the poll
+        """
+        self._scan_failure = None
+        stats = super().poll_once()
+        if self._scan_failure:
+            stats['errors'] += 1
+        
+        if stats['errors']:
+            self.cursors.discard()
+            self.response_cache.discard()
+        else:
+            self.cursors.commit()
+            # One cache write per poll, after the marks it depends on
+            self.response_cache.save()
+        
+        return stats
+    
+    def stop(self):
+        """Stop the watcher and close pooled connections"""
+        super().stop()
+        self.session.close()
 
 
 # CLI interface
@@ -578,6 +853,7 @@ if __name__ == "__main__":
         print(f"  Processed: {stats['processed']}")
         print(f"  Filtered: {stats['filtered']}")
         print(f"  Created: {stats['created']}")
+        print(f"  Duplicates: {stats['duplicates']}")
         print(f"  Errors: {stats['errors']}")
     
     elif args.command == "start":
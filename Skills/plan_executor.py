@@ -1,17 +1,54 @@
 """
 Plan Executor
 
-Reads Plan.md files and executes steps sequentially, updating progress.
+Reads Plan.md files and executes their steps in dependency order, running
+independent steps (and many plans) concurrently through pluggable async
+step runners, and updating progress.
 Integrates with the Ralph Wiggum loop for autonomous multi-step task completion.
 """
 
+import asyncio
 import logging
 import re
 from pathlib import Path
 from datetime import datetime, UTC
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
-import yaml
+from dataclasses import dataclass, field
+
+import frontmatter_codec
+from dashboard_renderer import record_event
+from plan_journal import PlanJournal
+from plan_reasoning_loop import ExecutionPlan, load_plan, plan_frontmatter, sidecar_path, write_plan
+from plan_scheduler import DEFAULT_MAX_PARALLEL, PlanScheduler
+from risk_classifier import DEFAULT_CLASSIFIER
+from step_runners import (
+    DEFAULT_MAX_CONCURRENCY, DEFAULT_STEP_TIMEOUT, AsyncRunner, StepDispatcher, StepRunnerRegistry, mcp_tool_runner
+)
+from vault_catalog import VaultCatalog
+from vault_layout import VaultLayout
+from vault_writer import write_atomic
+from work_claims import WorkClaims
+
+
+# Checkbox step line: indent and dash, box, spacing, step text
+CHECKBOX_LINE = re.compile(r'^([ \t]*(?:-|\d+\.)[ \t]+)\[[ x]\]([ \t]+)(.+?)[ \t]*$', re.MULTILINE)
+
+# Outcomes of executing one plan (also the execute_all_plans statistics keys)
+PLAN_COMPLETED = "completed"
+PLAN_PENDING_APPROVAL = "pending_approval"
+PLAN_FAILED = "failed"
+
+# MCP tools plan steps can call, by server; steps name them in 'action_type'
+MCP_TOOLS = {
+    "email": ["send_email"],
+    "social_media": ["post_to_linkedin", "post_to_facebook", "post_to_instagram", "post_to_twitter"],
+}
+
+# Agent skills run on the plan's task file, with the words that route steps to them
+SKILL_KEYWORDS = {
+    "summarize_task": ["analyze", "summarize"],
+    "draft_reply": ["draft reply"],
+}
 
 
 @dataclass
@@ -22,15 +59,23 @@ class PlanExecutorConfig:
     done_folder: str = "Done"
     log_folder: str = "Logs/plan_executor"
     dry_run: bool = False
+    max_parallel_steps: int = DEFAULT_MAX_PARALLEL
+    max_concurrent_plans: int = 4
+    max_concurrent_steps: int = DEFAULT_MAX_CONCURRENCY
+    tool_limits: Dict[str, int] = field(default_factory=dict)
+    step_timeout: float = DEFAULT_STEP_TIMEOUT
 
 
 class PlanExecutor:
     """
     Executes plans from Plan.md files.
     
-    Reads plans, executes steps sequentially, and updates progress.
+    Reads plans, executes steps in dependency order, and updates progress.
     """
     
+    # Flag the plan reasoning loop puts on sensitive steps
+    SENSITIVE_MARKER = "SENSITIVE"
+    
     def __init__(self, config: PlanExecutorConfig):
         """
         Initialize the Plan Executor.
@@ -46,6 +91,75 @@ class PlanExecutor:
         
         # Ensure directories exist
         self._ensure_directories()
+        
+        # Flat or date-sharded folder layout for Done
+        self.layout = VaultLayout(str(self.vault_path), logger=self.logger)
+        
+        # Metadata catalog for plan listings
+        self.catalog = VaultCatalog(str(self.vault_path), layout=self.layout, logger=self.logger)
+        
+        # Leases so parallel workers never execute the same plan
+        self.claims = WorkClaims(str(self.vault_path), logger=self.logger)
+        
+        # Runs independent steps of a plan concurrently
+        self.scheduler = PlanScheduler(max_parallel=config.max_parallel_steps, logger=self.logger)
+        
+        # Step handlers by action type: MCP tools and agent skills
+        self.runners = StepRunnerRegistry(logger=self.logger)
+        self._mcp_servers = {}
+        self._register_runners()
+        self.dispatcher = StepDispatcher(
+            self.runners,
+            max_concurrency=config.max_concurrent_steps,
+            tool_limits=config.tool_limits,
+            timeout=config.step_timeout,
+            logger=self.logger
+        )
+    
+    def _register_runners(self):
+        """Register the MCP tools and agent skills that plan steps can run"""
+        for server_name, tool_names in MCP_TOOLS.items():
+            for tool_name in tool_names:
+                self.runners.register(tool_name, self._mcp_runner(server_name, tool_name), tool=server_name)
+        
+        for skill_name, keywords in SKILL_KEYWORDS.items():
+            self.runners.register(skill_name, self._skill_runner(skill_name), tool="skills", keywords=keywords)
+    
+    def _mcp_server(self, server_name: str):
+        """
+        MCP server for a tool group, created on first use.
+        
+        Imported lazily so the executor runs without the servers' API clients
+        installed; steps that need a missing server fail when they run.
+        """
+        if server_name not in self._mcp_servers:
+            if server_name == "email":
+                from mcp_servers.email_mcp_server import EmailMCPServer
+                self._mcp_servers[server_name] = EmailMCPServer()
+            else:
+                from mcp_servers.social_media_mcp_server import SocialMediaMCPServer
+                self._mcp_servers[server_name] = SocialMediaMCPServer(vault_path=str(self.vault_path))
+        return self._mcp_servers[server_name]
+    
+    def _mcp_runner(self, server_name: str, tool_name: str) -> AsyncRunner:
+        """Runner calling an MCP tool with the step's arguments"""
+        async def run(step: Dict) -> bool:
+            return await mcp_tool_runner(self._mcp_server(server_name), tool_name)(step)
+        return run
+    
+    def _skill_runner(self, skill_name: str):
+        """Runner applying an agent skill to the plan's task file"""
+        def run(step: Dict) -> bool:
+            import agent_skills
+            
+            task_file = step.get('task_file')
+            if not task_file:
+                self.logger.warning(f"Step {step['number']} has no task file for {skill_name}")
+                return False
+            output = getattr(agent_skills, skill_name)(task_file, **(step.get('arguments') or {}))
+            step['output'] = output
+            return bool(output)
+        return run
     
     def _setup_logging(self) -> logging.Logger:
         """Configure logging"""
@@ -90,7 +204,8 @@ class PlanExecutor:
             List of plan file paths
         """
         try:
-            plans = list(self.plans_folder.glob("*.md"))
+            self.catalog.refresh([self.config.plans_folder])
+            plans = self.catalog.list_files(self.config.plans_folder)
             self.logger.info(f"Found {len(plans)} plan files")
             return plans
         except Exception as e:
@@ -101,6 +216,11 @@ class PlanExecutor:
         """
         Read and parse a plan file.
         
+        Plans written by PlanReasoningLoop are loaded from their JSON
+        sidecar; hand-written plans, or plans whose markdown was edited
+        since, are parsed from the markdown. Step completions still in the
+        plan's journal (not yet materialised) are replayed on top.
+        
         Args:
             plan_path: Path to plan file
             
@@ -108,50 +228,82 @@ class PlanExecutor:
             Dictionary with plan metadata and steps
         """
         try:
-            content = plan_path.read_text(encoding='utf-8')
-            
-            # Extract frontmatter
-            frontmatter = self._extract_frontmatter(content)
+            execution_plan = load_plan(plan_path)
+            if execution_plan is not None:
+                plan = {
+                    'path': plan_path,
+                    'name': plan_path.stem,
+                    'frontmatter': plan_frontmatter(execution_plan),
+                    'steps': [self._step_from_plan(step) for step in execution_plan.steps],
+                    'content': None,
+                    'plan': execution_plan
+                }
+            else:
+                # Parsed through the shared cache; unchanged plans are not re-parsed
+                frontmatter, _, content = frontmatter_codec.load_document(plan_path)
+                
+                plan = {
+                    'path': plan_path,
+                    'name': plan_path.stem,
+                    'frontmatter': frontmatter,
+                    'steps': self._extract_steps(content),
+                    'content': content,
+                    'plan': None
+                }
             
-            # Extract steps
-            steps = self._extract_steps(content)
+            # Resume from the journal of an interrupted run
+            events = PlanJournal(plan_path, logger=self.logger).replay()
+            for step in plan['steps']:
+                if events.get(step['number']) == "completed":
+                    step['completed'] = True
+            plan['journaled'] = len(events)
             
-            return {
-                'path': plan_path,
-                'name': plan_path.stem,
-                'frontmatter': frontmatter,
-                'steps': steps,
-                'content': content
-            }
+            return plan
         
         except Exception as e:
             self.logger.error(f"Failed to read plan {plan_path}: {e}")
             return None
     
+    def _step_from_plan(self, step) -> Dict:
+        """Step dictionary for a PlanStep from a sidecar"""
+        return {
+            'number': step.number,
+            'text': step.description,
+            'completed': step.completed,
+            'sensitive': step.is_sensitive or step.requires_approval,
+            'type': 'numbered',
+            'estimated_time': step.estimated_time,
+            'dependencies': step.dependencies,
+            'action_type': step.action_type,
+            'arguments': step.arguments
+        }
+    
     def _extract_frontmatter(self, content: str) -> Dict:
         """Extract YAML frontmatter from plan"""
-        match = re.match(r'^---\n(.*?)\n---\n', content, re.DOTALL)
-        if match:
-            try:
-                return yaml.safe_load(match.group(1))
-            except yaml.YAMLError as e:
-                self.logger.warning(f"Failed to parse frontmatter: {e}")
-                return {}
-        return {}
+        return frontmatter_codec.parse(content)
     
     def _extract_steps(self, content: str) -> List[Dict]:
         """
         Extract steps from plan content.
         
-        Steps are identified by numbered lines or checkboxes.
+        Steps are identified by numbered lines or checkboxes. Hand-written
+        plans may hold several numbered lists; a step whose number is taken
+        gets the next free one, so step numbers stay unique.
         
         Returns:
             List of step dictionaries
         """
         steps = []
+        used = set()
+        
+        def unique_number(number: int) -> int:
+            if number in used:
+                number = max(used) + 1
+            used.add(number)
+            return number
         
         # Remove frontmatter
-        content_without_frontmatter = re.sub(r'^---\n.*?\n---\n', '', content, flags=re.DOTALL)
+        _, content_without_frontmatter = frontmatter_codec.split(content)
         
         # Find numbered steps (e.g., "1. Step description")
         numbered_pattern = r'^\s*(\d+)\.\s+(.+?)$'
@@ -159,22 +311,32 @@ class PlanExecutor:
         # Find checkbox steps (e.g., "- [ ] Step description")
         checkbox_pattern = r'^\s*-\s+\[([ x])\]\s+(.+?)$'
         
+        # Find dependency notes under a step (e.g., "   - Depends on: Step(s) 1, 2")
+        depends_pattern = r'^\s*-\s+Depends on: Step\(s\)\s+(.+?)$'
+        
         for line in content_without_frontmatter.split('\n'):
+            # Attach dependency notes to the step above
+            match = re.match(depends_pattern, line)
+            if match and steps:
+                steps[-1]['dependencies'] = [int(n) for n in re.findall(r'\d+', match.group(1))]
+                continue
+            
             # Check for numbered steps
             match = re.match(numbered_pattern, line)
             if match:
-                step_num = int(match.group(1))
+                step_num = unique_number(int(match.group(1)))
                 step_text = match.group(2).strip()
                 
-                # Check if step is sensitive
-                is_sensitive = self._is_sensitive_step(step_text)
+                # Numbered checkbox (e.g., "1. [ ] Step description")
+                box = re.match(r'\[([ x])\]\s+(.+)$', step_text)
                 
                 steps.append({
                     'number': step_num,
-                    'text': step_text,
-                    'completed': False,
-                    'sensitive': is_sensitive,
-                    'type': 'numbered'
+                    'text': box.group(2) if box else step_text,
+                    'completed': bool(box) and box.group(1) == 'x',
+                    'sensitive': False,
+                    'type': 'checkbox' if box else 'numbered',
+                    'dependencies': None
                 })
                 continue
             
@@ -184,29 +346,25 @@ class PlanExecutor:
                 is_completed = match.group(1) == 'x'
                 step_text = match.group(2).strip()
                 
-                # Check if step is sensitive
-                is_sensitive = self._is_sensitive_step(step_text)
-                
                 steps.append({
-                    'number': len(steps) + 1,
+                    'number': unique_number(len(steps) + 1),
                     'text': step_text,
                     'completed': is_completed,
-                    'sensitive': is_sensitive,
-                    'type': 'checkbox'
+                    'sensitive': False,
+                    'type': 'checkbox',
+                    'dependencies': None
                 })
         
+        # Classify all steps in one pass
+        assessments = DEFAULT_CLASSIFIER.classify_all(step['text'] for step in steps)
+        for step, assessment in zip(steps, assessments):
+            step['sensitive'] = assessment.is_sensitive or self.SENSITIVE_MARKER in step['text']
+        
         return steps
     
     def _is_sensitive_step(self, step_text: str) -> bool:
-        """Check if step contains sensitive keywords"""
-        sensitive_keywords = [
-            'send', 'email', 'post', 'publish', 'delete', 'remove',
-            'pay', 'payment', 'transfer', 'invoice', 'charge',
-            'approve', 'authorize', 'confirm', 'execute'
-        ]
-        
-        text_lower = step_text.lower()
-        return any(keyword in text_lower for keyword in sensitive_keywords)
+        """Check if step is sensitive (or marked sensitive by the planner)"""
+        return self.SENSITIVE_MARKER in step_text or DEFAULT_CLASSIFIER.classify(step_text).is_sensitive
     
     def get_next_step(self, plan: Dict) -> Optional[Dict]:
         """
@@ -227,65 +385,96 @@ class PlanExecutor:
         """
         Execute a plan file step by step.
         
+        The plan is claimed first; if another worker holds it, it is
+        skipped.
+        
         Args:
             plan_path: Path to plan file
             
         Returns:
             True if plan completed successfully
         """
+        with self.claims.hold(plan_path) as lease:
+            if lease is None:
+                self.logger.info(f"Skipping {plan_path.name}: claimed by another worker")
+                return False
+            return self._execute_claimed_plan(plan_path) == PLAN_COMPLETED
+    
+    def _execute_claimed_plan(self, plan_path: Path) -> str:
+        """Execute a plan this worker has claimed"""
+        return asyncio.run(self._execute_claimed_plan_async(plan_path))
+    
+    async def _execute_claimed_plan_async(self, plan_path: Path) -> str:
+        """
+        Execute a claimed plan on the running event loop.
+        
+        Returns:
+            PLAN_COMPLETED, PLAN_PENDING_APPROVAL (only sensitive steps and
+            the steps after them are left) or PLAN_FAILED
+        """
         self.logger.info(f"Executing plan: {plan_path.name}")
         
         # Read plan
-        plan = self.read_plan(plan_path)
+        plan = await asyncio.to_thread(self.read_plan, plan_path)
         if not plan:
-            return False
+            return PLAN_FAILED
         
-        # Execute steps
         total_steps = len(plan['steps'])
         completed_steps = sum(1 for s in plan['steps'] if s['completed'])
         
         self.logger.info(f"Plan has {total_steps} steps, {completed_steps} already complete")
         
-        while True:
-            # Get next step
-            next_step = self.get_next_step(plan)
-            
-            if not next_step:
-                self.logger.info("All steps completed!")
-                self._mark_plan_complete(plan_path)
-                return True
-            
-            # Execute step
-            self.logger.info(f"Executing step {next_step['number']}: {next_step['text']}")
-            
-            if next_step['sensitive']:
-                self.logger.warning(f"⚠️  Step {next_step['number']} is SENSITIVE - requires approval")
-                # In a real implementation, this would create an approval request
-                # For now, we'll just log and mark as needing approval
-                return False
-            
-            # Execute the step (placeholder - in real implementation, this would call Claude or MCP)
-            success = self._execute_step(next_step)
-            
-            if success:
-                # Mark step as complete
-                next_step['completed'] = True
-                self._update_plan_progress(plan_path, plan)
-                self.logger.info(f"✓ Step {next_step['number']} completed")
-            else:
-                self.logger.error(f"✗ Step {next_step['number']} failed")
-                return False
+        # Skills work on the task the plan was made for
+        task_file = self._task_file(plan)
+        if task_file:
+            for step in plan['steps']:
+                step.setdefault('task_file', task_file)
         
-        return True
+        # Completions go to the journal; the plan file is written once at the end
+        journal = PlanJournal(plan_path, logger=self.logger)
+        
+        def on_complete(step: Dict):
+            if not self.config.dry_run:
+                journal.append(step['number'])
+            self.logger.info(f"✓ Step {step['number']} completed")
+        
+        # Run steps in dependency order; independent steps run concurrently
+        try:
+            result = await self.scheduler.run(plan['steps'], self._run_step, on_complete)
+        except ValueError as e:
+            self.logger.error(f"Cannot schedule {plan_path.name}: {e}")
+            return PLAN_FAILED
+        finally:
+            journal.close()
+            materialized = await asyncio.to_thread(self._materialize, plan_path, plan, journal)
+        
+        for number in result.failed:
+            self.logger.error(f"✗ Step {number} failed")
+        if result.blocked:
+            self.logger.info(f"Steps {result.blocked} wait on unfinished steps")
+        
+        if result.finished and materialized:
+            self.logger.info("All steps completed!")
+            await asyncio.to_thread(self._mark_plan_complete, plan_path)
+            return PLAN_COMPLETED
+        
+        if result.failed or not materialized:
+            return PLAN_FAILED
+        return PLAN_PENDING_APPROVAL
+    
+    def _task_file(self, plan: Dict) -> Optional[str]:
+        """The plan's task file, resolved against the vault when relative"""
+        task_file = plan['frontmatter'].get('task_file')
+        if not task_file:
+            return None
+        path = Path(task_file)
+        if not path.is_absolute() and (self.vault_path / path).exists():
+            path = self.vault_path / path
+        return str(path)
     
-    def _execute_step(self, step: Dict) -> bool:
+    async def _run_step(self, step: Dict) -> bool:
         """
-        Execute a single step.
-        
-        This is a placeholder. In a real implementation, this would:
-        1. Parse the step text to determine action
-        2. Call appropriate MCP server or Claude Code
-        3. Verify completion
+        Execute a single step with the runner registered for its action type.
         
         Args:
             step: Step dictionary
@@ -297,39 +486,85 @@ class PlanExecutor:
             self.logger.info(f"[DRY RUN] Would execute: {step['text']}")
             return True
         
-        # Placeholder: In real implementation, this would execute the actual step
-        # For now, we just log it
-        self.logger.info(f"Executing: {step['text']}")
+        self.logger.info(f"Executing step {step['number']}: {step['text']}")
+        return await self.dispatcher.run(step)
+    
+    def _materialize(self, plan_path: Path, plan: Dict, journal: PlanJournal) -> bool:
+        """
+        Write journaled progress into the plan file and drop the journal.
         
-        # Simulate execution
-        import time
-        time.sleep(0.5)
+        Args:
+            plan_path: Path to plan file
+            plan: Plan dictionary with updated steps
+            journal: The plan's journal
+            
+        Returns:
+            True if the plan file is up to date (the journal is kept otherwise)
+        """
+        if not (journal.appended or plan.get('journaled')):
+            return True
+        if not self._update_plan_progress(plan_path, plan):
+            return False
         
+        # Plain numbered steps have no checkbox to record completion in, so
+        # the journal stays the record of their progress
+        persisted = plan.get('plan') is not None or all(
+            step['type'] == 'checkbox' for step in plan['steps'] if step['completed']
+        )
+        if persisted and not self.config.dry_run:
+            journal.discard()
         return True
     
-    def _update_plan_progress(self, plan_path: Path, plan: Dict):
+    def materialize_plan(self, plan_path: Path) -> bool:
+        """
+        Fold a plan's journal into its markdown and sidecar on demand.
+        
+        Args:
+            plan_path: Path to plan file
+            
+        Returns:
+            True if successful
+        """
+        plan = self.read_plan(plan_path)
+        if not plan:
+            return False
+        return self._materialize(plan_path, plan, PlanJournal(plan_path, logger=self.logger))
+    
+    def _update_plan_progress(self, plan_path: Path, plan: Dict) -> bool:
         """
         Update plan file with current progress.
         
         Args:
             plan_path: Path to plan file
             plan: Plan dictionary with updated steps
+            
+        Returns:
+            True if successful
         """
         if self.config.dry_run:
             self.logger.info(f"[DRY RUN] Would update plan progress")
-            return
+            return True
+        
+        if plan.get('plan') is not None:
+            return self._update_plan_sidecar(plan_path, plan)
         
         try:
-            content = plan['content']
-            
-            # Update checkbox steps
+            # Update checkbox steps (bulleted or numbered) in one pass over
+            # the body; steps sharing a text are matched in order
+            checked: Dict[str, List[bool]] = {}
             for step in plan['steps']:
                 if step['type'] == 'checkbox':
-                    # Find the checkbox line and update it
-                    checkbox_char = 'x' if step['completed'] else ' '
-                    old_pattern = rf'(-\s+\[[ x]\]\s+{re.escape(step["text"])})'
-                    new_text = f'- [{checkbox_char}] {step["text"]}'
-                    content = re.sub(old_pattern, new_text, content)
+                    checked.setdefault(step['text'], []).append(step['completed'])
+            
+            def tick(match):
+                text = match.group(3)
+                if not checked.get(text):
+                    return match.group(0)
+                mark = 'x' if checked[text].pop(0) else ' '
+                return f"{match.group(1)}[{mark}]{match.group(2)}{text}"
+            
+            _, content_without_frontmatter = frontmatter_codec.split(plan['content'])
+            content_without_frontmatter = CHECKBOX_LINE.sub(tick, content_without_frontmatter)
             
             # Update frontmatter with progress
             frontmatter = plan['frontmatter']
@@ -339,17 +574,46 @@ class PlanExecutor:
             frontmatter['progress'] = f"{completed_steps}/{total_steps}"
             frontmatter['last_updated'] = datetime.now(UTC).isoformat() + 'Z'
             
-            # Reconstruct content with updated frontmatter
-            new_frontmatter = yaml.dump(frontmatter, default_flow_style=False)
-            content_without_frontmatter = re.sub(r'^---\n.*?\n---\n', '', content, flags=re.DOTALL)
-            new_content = f"---\n{new_frontmatter}---\n{content_without_frontmatter}"
-            
-            # Write back
-            plan_path.write_text(new_content, encoding='utf-8')
+            # Write back atomically
+            new_content = frontmatter_codec.render(frontmatter, content_without_frontmatter)
+            write_atomic(plan_path, new_content)
+            plan['content'] = new_content
             self.logger.info(f"Updated plan progress: {completed_steps}/{total_steps}")
+            return True
         
         except Exception as e:
             self.logger.error(f"Failed to update plan progress: {e}")
+            return False
+    
+    def _update_plan_sidecar(self, plan_path: Path, plan: Dict) -> bool:
+        """
+        Record progress on a sidecar-backed plan and re-render its markdown.
+        
+        Args:
+            plan_path: Path to plan file
+            plan: Plan dictionary with updated steps
+            
+        Returns:
+            True if successful
+        """
+        try:
+            execution_plan: ExecutionPlan = plan['plan']
+            completed = {step['number'] for step in plan['steps'] if step['completed']}
+            for step in execution_plan.steps:
+                step.completed = step.number in completed
+            
+            execution_plan.current_step = len(completed)
+            execution_plan.status = "in_progress"
+            execution_plan.updated_at = datetime.now(UTC).isoformat() + 'Z'
+            
+            write_plan(plan_path, execution_plan, fsync=True)
+            plan['frontmatter'] = plan_frontmatter(execution_plan)
+            self.logger.info(f"Updated plan progress: {len(completed)}/{len(execution_plan.steps)}")
+            return True
+        
+        except Exception as e:
+            self.logger.error(f"Failed to update plan progress: {e}")
+            return False
     
     def _mark_plan_complete(self, plan_path: Path):
         """
@@ -364,8 +628,14 @@ class PlanExecutor:
         
         try:
             # Move to Done folder
-            dest_path = self.done_folder / plan_path.name
+            dest_path = self.layout.shard_path(self.config.done_folder, plan_path.name)
+            dest_path.parent.mkdir(parents=True, exist_ok=True)
             plan_path.rename(dest_path)
+            if sidecar_path(plan_path).exists():
+                sidecar_path(plan_path).rename(sidecar_path(dest_path))
+            # A finished plan has nothing left to resume
+            PlanJournal(plan_path, logger=self.logger).discard()
+            record_event(self.vault_path, "completed", dest_path, plan_path)
             self.logger.info(f"Plan completed and moved to Done: {dest_path}")
         
         except Exception as e:
@@ -375,6 +645,18 @@ class PlanExecutor:
         """
         Execute all plans in the Plans folder.
         
+        Returns:
+            Dictionary with execution statistics
+        """
+        return asyncio.run(self.execute_all_plans_async())
+    
+    async def execute_all_plans_async(self) -> Dict[str, int]:
+        """
+        Execute all plans in the Plans folder concurrently.
+        
+        Up to max_concurrent_plans plans run at once; their steps share the
+        dispatcher's global and per-tool limits.
+        
         Returns:
             Dictionary with execution statistics
         """
@@ -382,24 +664,34 @@ class PlanExecutor:
         
         stats = {
             'total': 0,
-            'completed': 0,
-            'failed': 0,
-            'pending_approval': 0
+            PLAN_COMPLETED: 0,
+            PLAN_FAILED: 0,
+            PLAN_PENDING_APPROVAL: 0,
+            'claimed_elsewhere': 0
         }
         
-        plans = self.list_plans()
+        plans = await asyncio.to_thread(self.list_plans)
         stats['total'] = len(plans)
-        
-        for plan_path in plans:
-            try:
-                success = self.execute_plan(plan_path)
-                if success:
-                    stats['completed'] += 1
-                else:
-                    stats['pending_approval'] += 1
-            except Exception as e:
-                self.logger.error(f"Failed to execute plan {plan_path.name}: {e}")
-                stats['failed'] += 1
+        plan_limit = asyncio.Semaphore(max(1, self.config.max_concurrent_plans))
+        
+        async def run_plan(plan_path: Path):
+            async with plan_limit:
+                # Claiming and releasing touch the disk; keep them off the event loop
+                hold = self.claims.hold(plan_path)
+                lease = await asyncio.to_thread(hold.__enter__)
+                try:
+                    if lease is None:
+                        stats['claimed_elsewhere'] += 1
+                        return
+                    try:
+                        stats[await self._execute_claimed_plan_async(plan_path)] += 1
+                    except Exception as e:
+                        self.logger.error(f"Failed to execute plan {plan_path.name}: {e}")
+                        stats[PLAN_FAILED] += 1
+                finally:
+                    await asyncio.to_thread(hold.__exit__, None, None, None)
+        
+        await asyncio.gather(*(run_plan(plan_path) for plan_path in plans))
         
         self.logger.info(f"Plan execution complete: {stats}")
         return stats
@@ -412,12 +704,12 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Plan Executor for AI Employee")
     parser.add_argument(
         "command",
-        choices=["list", "execute", "execute-all"],
+        choices=["list", "execute", "execute-all", "materialize"],
         help="Command to execute"
     )
     parser.add_argument(
         "--plan",
-        help="Plan file name (for execute command)"
+        help="Plan file name (for execute and materialize commands)"
     )
     parser.add_argument(
         "--vault-path",
@@ -494,3 +786,10 @@ if __name__ == "__main__":
         print(f"  Completed: {stats['completed']}")
         print(f"  Pending approval: {stats['pending_approval']}")
         print(f"  Failed: {stats['failed']}")
+    
+    elif args.command == "materialize":
+        plan_paths = [Path(args.vault_path) / "Plans" / args.plan] if args.plan else executor.list_plans()
+        
+        for plan_path in plan_paths:
+            status = "✓" if executor.materialize_plan(plan_path) else "✗"
+            print(f"{status} {plan_path.name}")
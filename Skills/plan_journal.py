@@ -0,0 +1,134 @@
+"""
+Plan Journal
+
+Append-only progress journal for a plan. While a plan runs, each step
+completion is appended as one JSON line instead of rewriting the plan
+file; the plan's markdown (and sidecar) are materialised from the journal
+once, at the end of the execution cycle.
+
+fsync is batched: a line is flushed to the OS immediately, but only forced
+to disk every ``sync_every`` entries or ``sync_interval`` seconds, and on
+close. After a power loss the last few completions may be missing, so
+those steps run again; a process crash loses nothing. A torn last line is
+ignored on replay.
+
+The journal lives next to the plan (``Plans/x_plan.journal.jsonl``) and is
+deleted once its entries are folded into the plan.
+"""
+
+import json
+import logging
+import os
+import time
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Dict, Optional
+
+
+JOURNAL_SUFFIX = ".journal.jsonl"
+DEFAULT_SYNC_EVERY = 16
+DEFAULT_SYNC_INTERVAL = 1.0
+
+
+def journal_path(plan_path) -> Path:
+    """Journal for a plan markdown file (Plans/x_plan.md -> Plans/x_plan.journal.jsonl)"""
+    plan_path = Path(plan_path)
+    return plan_path.with_name(plan_path.stem + JOURNAL_SUFFIX)
+
+
+class PlanJournal:
+    """
+    Append-only step progress log for one plan.
+    """
+
+    def __init__(self, plan_path, sync_every: int = DEFAULT_SYNC_EVERY,
+                 sync_interval: float = DEFAULT_SYNC_INTERVAL,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize the journal (the file is created on first append).
+
+        Args:
+            plan_path: Plan markdown path
+            sync_every: Force entries to disk after this many appends
+            sync_interval: Force entries to disk after this many seconds
+            logger: Logger to use (defaults to "plan_journal")
+        """
+        self.path = journal_path(plan_path)
+        self.sync_every = max(1, sync_every)
+        self.sync_interval = sync_interval
+        self.logger = logger or logging.getLogger("plan_journal")
+        self.appended = 0
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def exists(self) -> bool:
+        """True if the journal has entries on disk"""
+        return self.path.exists()
+
+    def append(self, step: int, event: str = "completed"):
+        """
+        Record a step event.
+
+        Args:
+            step: Step number
+            event: Event name (e.g. "completed", "failed")
+        """
+        if self._file is None:
+            self._file = open(self.path, 'a', encoding='utf-8')
+
+        entry = {"ts": datetime.now(UTC).isoformat(), "step": step, "event": event}
+        self._file.write(json.dumps(entry, separators=(',', ':')) + "\n")
+        self._file.flush()
+        self.appended += 1
+        self._unsynced += 1
+
+        if self._unsynced >= self.sync_every or time.monotonic() - self._last_sync >= self.sync_interval:
+            self.sync()
+
+    def sync(self):
+        """Force appended entries to disk"""
+        if self._file is not None and self._unsynced:
+            os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self):
+        """Sync and close the journal file"""
+        if self._file is not None:
+            self.sync()
+            self._file.close()
+            self._file = None
+
+    def replay(self) -> Dict[int, str]:
+        """
+        Read the journal.
+
+        Returns:
+            Step number -> last recorded event
+        """
+        events: Dict[int, str] = {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        events[int(entry["step"])] = entry["event"]
+                    except (ValueError, KeyError, TypeError):
+                        # Torn write at the end of a crashed run
+                        self.logger.warning(f"Skipping unreadable journal line in {self.path.name}")
+        except FileNotFoundError:
+            pass
+        return events
+
+    def discard(self):
+        """Close and delete the journal (after its entries are materialised)"""
+        self.close()
+        self.path.unlink(missing_ok=True)
+        self.appended = 0
+
+    def __enter__(self) -> "PlanJournal":
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
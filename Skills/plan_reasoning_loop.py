@@ -6,12 +6,47 @@ into steps, identifies sensitive actions, and saves structured plans.
 """
 
 import re
+import os
+import json
+import hashlib
 import logging
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
-import yaml
+from dataclasses import asdict, dataclass
+
+import frontmatter_codec
+from dashboard_renderer import record_event
+from plan_journal import journal_path
+from risk_classifier import DEFAULT_CLASSIFIER, RiskLevel
+from vault_layout import VaultLayout
+from vault_writer import write_atomic
+from work_claims import ClaimError, WorkClaims
+
+
+# Stale tasks below this count are planned in-process
+PARALLEL_THRESHOLD = 64
+
+# Machine-readable copy of each plan, next to its markdown
+SIDECAR_SUFFIX = ".plan.json"
+SIDECAR_VERSION = 1
+
+# Folder executed plans are moved to (may be date-sharded)
+DONE_FOLDER = "Done"
+
+
+def task_hash(content: str) -> str:
+    """
+    Content hash of a task, stored in its plan to detect changes.
+    
+    Args:
+        content: Task file content
+        
+    Returns:
+        SHA-1 hex digest
+    """
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()
 
 
 @dataclass
@@ -23,6 +58,9 @@ class PlanStep:
     requires_approval: bool
     estimated_time: Optional[str] = None
     dependencies: Optional[List[int]] = None
+    completed: bool = False
+    action_type: Optional[str] = None
+    arguments: Optional[Dict] = None
 
 
 @dataclass
@@ -35,6 +73,186 @@ class ExecutionPlan:
     created_at: str
     status: str = "pending"
     current_step: int = 0
+    task_hash: Optional[str] = None
+    updated_at: Optional[str] = None
+
+
+def sidecar_path(plan_path) -> Path:
+    """JSON sidecar for a plan markdown file (Plans/x_plan.md -> Plans/x_plan.plan.json)"""
+    plan_path = Path(plan_path)
+    return plan_path.with_name(plan_path.stem + SIDECAR_SUFFIX)
+
+
+def plan_frontmatter(plan: ExecutionPlan) -> Dict:
+    """
+    Frontmatter fields of a rendered plan.
+    
+    Args:
+        plan: Execution plan
+        
+    Returns:
+        Frontmatter dictionary
+    """
+    fields = {
+        'task_id': plan.task_id,
+        'task_file': plan.task_file,
+        'created': plan.created_at,
+        'status': plan.status,
+        'current_step': plan.current_step,
+        'total_steps': len(plan.steps),
+    }
+    if plan.task_hash:
+        fields['task_hash'] = plan.task_hash
+    if plan.updated_at:
+        completed = sum(1 for step in plan.steps if step.completed)
+        fields['progress'] = f"{completed}/{len(plan.steps)}"
+        fields['last_updated'] = plan.updated_at
+    return fields
+
+
+def write_plan(filepath, plan: ExecutionPlan, fsync: bool = False):
+    """
+    Write a plan's markdown view and its JSON sidecar.
+    
+    Both files are replaced atomically. The sidecar records the size and
+    mtime of the markdown it was written with, so a hand-edited markdown
+    file is detected by load_plan().
+    
+    Args:
+        filepath: Plan markdown path
+        plan: Execution plan
+        fsync: Flush both files to disk before they replace the old ones
+    """
+    filepath = Path(filepath)
+    write_atomic(filepath, render_plan(plan), fsync=fsync)
+    
+    markdown = filepath.stat()
+    record = {
+        'version': SIDECAR_VERSION,
+        'markdown_size': markdown.st_size,
+        'markdown_mtime_ns': markdown.st_mtime_ns,
+        'plan': asdict(plan)
+    }
+    write_atomic(
+        sidecar_path(filepath),
+        json.dumps(record, ensure_ascii=False, separators=(',', ':')),
+        fsync=fsync
+    )
+
+
+def load_plan(filepath) -> Optional[ExecutionPlan]:
+    """
+    Load a plan from its JSON sidecar.
+    
+    Args:
+        filepath: Plan markdown path
+        
+    Returns:
+        Execution plan, or None if there is no sidecar or the markdown has
+        changed since the sidecar was written
+    """
+    filepath = Path(filepath)
+    try:
+        with open(sidecar_path(filepath), 'r', encoding='utf-8') as f:
+            record = json.load(f)
+        markdown = filepath.stat()
+    except (OSError, ValueError):
+        return None
+    
+    if (record.get('version') != SIDECAR_VERSION
+            or record.get('markdown_size') != markdown.st_size
+            or record.get('markdown_mtime_ns') != markdown.st_mtime_ns):
+        return None
+    
+    try:
+        data = dict(record['plan'])
+        data['steps'] = [PlanStep(**step) for step in data['steps']]
+        return ExecutionPlan(**data)
+    except (KeyError, TypeError):
+        return None
+
+
+def render_plan(plan: ExecutionPlan) -> str:
+    """
+    Render a plan as markdown.
+    
+    Args:
+        plan: Execution plan
+        
+    Returns:
+        Formatted markdown content
+    """
+    # Frontmatter
+    frontmatter = frontmatter_codec.serialize(plan_frontmatter(plan)) + "\n"
+    
+    # Goal
+    goal_section = f"""# Execution Plan: {plan.goal}
+
+## Goal
+{plan.goal}
+
+"""
+    
+    # Steps
+    steps_section = "## Steps\n\n"
+    
+    for step in plan.steps:
+        # Step number and description
+        checkbox = "[x]" if step.completed else "[ ]"
+        steps_section += f"{step.number}. {checkbox} {step.description}"
+        
+        # Add flags
+        flags = []
+        if step.is_sensitive:
+            flags.append("⚠️ SENSITIVE")
+        if step.requires_approval:
+            flags.append("🔒 REQUIRES APPROVAL")
+        
+        if flags:
+            steps_section += f" - {' | '.join(flags)}"
+        
+        steps_section += "\n"
+        
+        # Add estimated time if available
+        if step.estimated_time:
+            steps_section += f"   - Estimated time: {step.estimated_time}\n"
+        
+        # Add dependencies if available
+        if step.dependencies:
+            deps = ", ".join(str(d) for d in step.dependencies)
+            steps_section += f"   - Depends on: Step(s) {deps}\n"
+        
+        steps_section += "\n"
+    
+    # Sensitive actions summary
+    sensitive_steps = [s for s in plan.steps if s.is_sensitive]
+    if sensitive_steps:
+        summary_section = f"""## Sensitive Actions Summary
+
+This plan contains {len(sensitive_steps)} sensitive action(s) that require approval:
+
+"""
+        for step in sensitive_steps:
+            summary_section += f"- Step {step.number}: {step.description}\n"
+        
+        summary_section += "\n**⚠️ These steps will require explicit approval before execution.**\n\n"
+    else:
+        summary_section = "## Sensitive Actions Summary\n\nNo sensitive actions detected. All steps can be executed automatically.\n\n"
+    
+    # Execution notes
+    notes_section = """## Execution Notes
+
+- Review each step before execution
+- Sensitive steps will pause for approval
+- Update this file as steps are completed
+- Mark completed steps with [x]
+
+---
+
+*Generated by Plan Reasoning Loop*
+"""
+    
+    return frontmatter + goal_section + steps_section + summary_section + notes_section
 
 
 class PlanReasoningLoop:
@@ -45,21 +263,6 @@ class PlanReasoningLoop:
     sensitive action detection.
     """
     
-    # Sensitive action keywords that require approval
-    SENSITIVE_KEYWORDS = [
-        'send', 'email', 'post', 'publish', 'delete', 'remove',
-        'pay', 'payment', 'invoice', 'transfer', 'purchase',
-        'share', 'forward', 'reply', 'respond', 'commit',
-        'deploy', 'release', 'approve', 'reject', 'cancel'
-    ]
-    
-    # High-risk actions that always require approval
-    HIGH_RISK_ACTIONS = [
-        'delete', 'remove', 'cancel', 'reject',
-        'pay', 'payment', 'transfer', 'purchase',
-        'deploy', 'release', 'publish'
-    ]
-    
     def __init__(self, plans_dir: str = "Plans", needs_action_dir: str = "Needs_Action"):
         """
         Initialize the Plan Reasoning Loop.
@@ -75,6 +278,12 @@ class PlanReasoningLoop:
         # Ensure directories exist
         self.plans_dir.mkdir(parents=True, exist_ok=True)
         
+        # Leases so parallel workers never plan the same task
+        self.claims = WorkClaims(str(self.plans_dir.parent), logger=self.logger)
+        
+        # Executed plans live in Done/, flat or date-sharded
+        self.layout = VaultLayout(str(self.plans_dir.parent), logger=self.logger)
+        
         # Configure logging if not already configured
         if not logging.getLogger().handlers:
             logging.basicConfig(
@@ -93,20 +302,7 @@ class PlanReasoningLoop:
             Dictionary with metadata and content
         """
         try:
-            with open(task_filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            # Extract frontmatter
-            metadata = {}
-            body = content
-            
-            frontmatter_match = re.match(r'^---\n(.*?)\n---\n', content, re.DOTALL)
-            if frontmatter_match:
-                try:
-                    metadata = yaml.safe_load(frontmatter_match.group(1))
-                    body = content[frontmatter_match.end():]
-                except yaml.YAMLError as e:
-                    self.logger.warning(f"Failed to parse frontmatter: {e}")
+            metadata, body, content = frontmatter_codec.load_document(task_filepath)
             
             return {
                 'metadata': metadata,
@@ -241,14 +437,7 @@ class PlanReasoningLoop:
         Returns:
             True if sensitive, False otherwise
         """
-        description_lower = description.lower()
-        
-        # Check for sensitive keywords
-        for keyword in self.SENSITIVE_KEYWORDS:
-            if keyword in description_lower:
-                return True
-        
-        return False
+        return DEFAULT_CLASSIFIER.classify(description).is_sensitive
     
     def _is_high_risk_action(self, description: str) -> bool:
         """
@@ -260,32 +449,25 @@ class PlanReasoningLoop:
         Returns:
             True if high-risk, False otherwise
         """
-        description_lower = description.lower()
-        
-        for keyword in self.HIGH_RISK_ACTIONS:
-            if keyword in description_lower:
-                return True
-        
-        return False
+        return DEFAULT_CLASSIFIER.classify(description).level is RiskLevel.HIGH
     
     def mark_sensitive_steps(self, steps: List[PlanStep]) -> List[PlanStep]:
         """
         Mark sensitive steps that require approval.
         
+        All steps are classified in one pass; a step already marked
+        sensitive stays sensitive.
+        
         Args:
             steps: List of plan steps
             
         Returns:
             Updated list with sensitive flags
         """
-        for step in steps:
-            if not step.is_sensitive:
-                step.is_sensitive = self._is_sensitive_action(step.description)
-            
-            # High-risk actions always require approval
-            if self._is_high_risk_action(step.description):
+        assessments = DEFAULT_CLASSIFIER.classify_all(step.description for step in steps)
+        for step, assessment in zip(steps, assessments):
+            if assessment.is_sensitive:
                 step.is_sensitive = True
-                step.requires_approval = True
             
             # Sensitive actions require approval
             if step.is_sensitive:
@@ -293,10 +475,78 @@ class PlanReasoningLoop:
         
         return steps
     
+    def plan_path_for(self, task_id: str) -> Path:
+        """Plan file for a task id"""
+        return self.plans_dir / f"{task_id}_plan.md"
+    
+    def done_plans(self) -> Dict[str, Path]:
+        """
+        Executed plans in Done/, by file name.
+        
+        Lists Done/ (every shard) once, so a batch can look plans up
+        instead of searching Done/ for each task.
+        
+        Returns:
+            Plan file name -> path (the newest shard wins)
+        """
+        return {path.name: path for path in self.layout.iter_files(DONE_FOLDER, pattern="*_plan.md")}
+    
+    def current_plan_path(self, task_filepath: str, content_hash: str,
+                          done_plans: Optional[Dict[str, Path]] = None) -> Optional[Path]:
+        """
+        Find a plan generated from a task's current content.
+        
+        The plan in Plans/ is checked first, then an executed copy in Done/,
+        so finished tasks are not planned (and executed) again. Only
+        frontmatter headers are read.
+        
+        Args:
+            task_filepath: Path to task file
+            content_hash: task_hash() of the task's current content
+            done_plans: Result of done_plans() for a batch of tasks
+                (Done/ is searched for this task if omitted)
+            
+        Returns:
+            Path of the current plan, or None if there is none
+        """
+        plan_path = self.plan_path_for(Path(task_filepath).stem)
+        if done_plans is not None:
+            done_path = done_plans.get(plan_path.name)
+        else:
+            done_path = self.layout.find(DONE_FOLDER, plan_path.name)
+        for candidate in (plan_path, done_path):
+            if candidate is None:
+                continue
+            try:
+                header = frontmatter_codec.read_header(candidate)
+            except OSError:
+                continue
+            if header.get('task_hash') == content_hash:
+                return candidate
+        return None
+    
+    def is_plan_current(self, task_filepath: str, content_hash: str,
+                        done_plans: Optional[Dict[str, Path]] = None) -> bool:
+        """
+        Check whether a task's plan was generated from its current content.
+        
+        Args:
+            task_filepath: Path to task file
+            content_hash: task_hash() of the task's current content
+            done_plans: Result of done_plans() for a batch of tasks
+            
+        Returns:
+            True if a plan in Plans/ or Done/ records the same hash
+        """
+        return self.current_plan_path(task_filepath, content_hash, done_plans) is not None
+    
     def save_plan(self, plan: ExecutionPlan) -> str:
         """
         Save execution plan to file.
         
+        Writes the markdown plan and a JSON sidecar holding the full
+        ExecutionPlan, which PlanExecutor loads instead of parsing markdown.
+        
         Args:
             plan: Execution plan to save
             
@@ -304,16 +554,18 @@ class PlanReasoningLoop:
             Path to saved plan file
         """
         # Generate filename
-        filename = f"{plan.task_id}_plan.md"
-        filepath = self.plans_dir / filename
-        
-        # Format plan content
-        content = self._format_plan(plan)
+        filepath = self.plan_path_for(plan.task_id)
+        replacing = filepath.exists()
         
-        # Write file
+        # Write markdown view and JSON sidecar
         try:
-            with open(filepath, 'w', encoding='utf-8') as f:
-                f.write(content)
+            write_plan(filepath, plan)
+            if replacing:
+                # Progress journaled against the old plan no longer applies
+                journal_path(filepath).unlink(missing_ok=True)
+                record_event(self.plans_dir.parent, "updated", filepath, filepath)
+            else:
+                record_event(self.plans_dir.parent, "created", filepath)
             
             self.logger.info(f"Saved plan: {filepath}")
             return str(filepath)
@@ -332,88 +584,9 @@ class PlanReasoningLoop:
         Returns:
             Formatted markdown content
         """
-        # Frontmatter
-        frontmatter = f"""---
-task_id: {plan.task_id}
-task_file: {plan.task_file}
-created: {plan.created_at}
-status: {plan.status}
-current_step: {plan.current_step}
-total_steps: {len(plan.steps)}
----
-
-"""
-        
-        # Goal
-        goal_section = f"""# Execution Plan: {plan.goal}
-
-## Goal
-{plan.goal}
-
-"""
-        
-        # Steps
-        steps_section = "## Steps\n\n"
-        
-        for step in plan.steps:
-            # Step number and description
-            checkbox = "[ ]"
-            steps_section += f"{step.number}. {checkbox} {step.description}"
-            
-            # Add flags
-            flags = []
-            if step.is_sensitive:
-                flags.append("⚠️ SENSITIVE")
-            if step.requires_approval:
-                flags.append("🔒 REQUIRES APPROVAL")
-            
-            if flags:
-                steps_section += f" - {' | '.join(flags)}"
-            
-            steps_section += "\n"
-            
-            # Add estimated time if available
-            if step.estimated_time:
-                steps_section += f"   - Estimated time: {step.estimated_time}\n"
-            
-            # Add dependencies if available
-            if step.dependencies:
-                deps = ", ".join(str(d) for d in step.dependencies)
-                steps_section += f"   - Depends on: Step(s) {deps}\n"
-            
-            steps_section += "\n"
-        
-        # Sensitive actions summary
-        sensitive_steps = [s for s in plan.steps if s.is_sensitive]
-        if sensitive_steps:
-            summary_section = f"""## Sensitive Actions Summary
-
-This plan contains {len(sensitive_steps)} sensitive action(s) that require approval:
-
-"""
-            for step in sensitive_steps:
-                summary_section += f"- Step {step.number}: {step.description}\n"
-            
-            summary_section += "\n**⚠️ These steps will require explicit approval before execution.**\n\n"
-        else:
-            summary_section = "## Sensitive Actions Summary\n\nNo sensitive actions detected. All steps can be executed automatically.\n\n"
-        
-        # Execution notes
-        notes_section = """## Execution Notes
-
-- Review each step before execution
-- Sensitive steps will pause for approval
-- Update this file as steps are completed
-- Mark completed steps with [x]
-
----
-
-*Generated by Plan Reasoning Loop*
-"""
-        
-        return frontmatter + goal_section + steps_section + summary_section + notes_section
+        return render_plan(plan)
     
-    def create_plan(self, task_filepath: str) -> str:
+    def create_plan(self, task_filepath: str, force: bool = False) -> str:
         """
         Create execution plan for a task.
         
@@ -424,16 +597,36 @@ This plan contains {len(sensitive_steps)} sensitive action(s) that require appro
         4. Mark sensitive steps
         5. Save plan
         
+        If the existing plan was generated from the task's current content,
+        it is kept (with its progress) and its path is returned.
+        
         Args:
             task_filepath: Path to task file
+            force: Regenerate the plan even if it is current
             
         Returns:
             Path to created plan file
+            
+        Raises:
+            ClaimError: If another worker is planning the same task
         """
-        self.logger.info(f"Creating plan for task: {task_filepath}")
-        
+        with self.claims.hold(task_filepath) as lease:
+            if lease is None:
+                raise ClaimError(f"Task is claimed by another worker: {task_filepath}")
+            return self._create_claimed_plan(task_filepath, force)
+    
+    def _create_claimed_plan(self, task_filepath: str, force: bool = False) -> str:
+        """Create the plan for a task this worker has claimed"""
         # 1. Read task
         task_data = self.read_task(task_filepath)
+        content_hash = task_hash(task_data['full_content'])
+        
+        current = None if force else self.current_plan_path(task_filepath, content_hash)
+        if current is not None:
+            self.logger.info(f"Plan is current, skipping: {current}")
+            return str(current)
+        
+        self.logger.info(f"Creating plan for task: {task_filepath}")
         
         # 2. Analyze intent
         goal = self.analyze_intent(task_data)
@@ -459,7 +652,8 @@ This plan contains {len(sensitive_steps)} sensitive action(s) that require appro
             steps=steps,
             created_at=datetime.now().isoformat(),
             status="pending",
-            current_step=0
+            current_step=0,
+            task_hash=content_hash
         )
         
         # 5. Save plan
@@ -467,6 +661,73 @@ This plan contains {len(sensitive_steps)} sensitive action(s) that require appro
         
         self.logger.info(f"Plan created successfully: {plan_path}")
         return plan_path
+    
+    def create_plans_for_all(self, workers: Optional[int] = None, force: bool = False) -> Dict[str, int]:
+        """
+        Create plans for every task in Needs_Action.
+        
+        Tasks whose plan (in Plans/ or Done/) records their current content
+        hash are skipped, so a steady-state run only hashes task files. Stale tasks are
+        planned in a process pool when there are many of them.
+        
+        Args:
+            workers: Worker processes (defaults to the CPU count)
+            force: Regenerate every plan
+            
+        Returns:
+            Dictionary with planning statistics
+        """
+        stats = {
+            'total': 0,
+            'created': 0,
+            'current': 0,
+            'claimed_elsewhere': 0,
+            'failed': 0
+        }
+        
+        stale = []
+        # One listing of Done/ for the whole batch
+        done_plans = {} if force else self.done_plans()
+        for task_path in sorted(self.needs_action_dir.glob("*.md")):
+            stats['total'] += 1
+            try:
+                _, _, content = frontmatter_codec.load_document(task_path)
+            except OSError as e:
+                self.logger.error(f"Failed to read task file {task_path}: {e}")
+                stats['failed'] += 1
+                continue
+            if not force and self.is_plan_current(str(task_path), task_hash(content), done_plans):
+                stats['current'] += 1
+            else:
+                stale.append(str(task_path))
+        
+        workers = workers or os.cpu_count() or 1
+        jobs = [(str(self.plans_dir), str(self.needs_action_dir), task, force) for task in stale]
+        if len(stale) < PARALLEL_THRESHOLD or workers <= 1:
+            outcomes = [_plan_task(job) for job in jobs]
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                outcomes = list(pool.map(_plan_task, jobs, chunksize=16))
+        
+        for outcome in outcomes:
+            stats[outcome] += 1
+        
+        self.logger.info(f"Batch planning complete: {stats}")
+        return stats
+
+
+def _plan_task(job: Tuple[str, str, str, bool]) -> str:
+    """Plan one task (runs in a worker process); returns the stats key"""
+    plans_dir, needs_action_dir, task_filepath, force = job
+    loop = PlanReasoningLoop(plans_dir=plans_dir, needs_action_dir=needs_action_dir)
+    try:
+        loop.create_plan(task_filepath, force=force)
+    except ClaimError:
+        return 'claimed_elsewhere'
+    except Exception as e:
+        loop.logger.error(f"Failed to create plan for {task_filepath}: {e}")
+        return 'failed'
+    return 'created'
 
 
 def create_execution_plan(task_filepath: str, plans_dir: str = "Plans") -> str:
@@ -496,9 +757,15 @@ if __name__ == "__main__":
     import sys
     
     if len(sys.argv) < 2:
-        print("Usage: python plan_reasoning_loop.py <task_file>")
+        print("Usage: python plan_reasoning_loop.py <task_file> | --all")
         sys.exit(1)
     
+    if sys.argv[1] == "--all":
+        stats = PlanReasoningLoop().create_plans_for_all()
+        print(f"\n✓ Planned {stats['created']} task(s), {stats['current']} already current, "
+              f"{stats['claimed_elsewhere']} claimed elsewhere, {stats['failed']} failed")
+        sys.exit(1 if stats['failed'] else 0)
+    
     task_file = sys.argv[1]
     
     try:
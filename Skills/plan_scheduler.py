@@ -0,0 +1,202 @@
+"""
+Plan Scheduler
+
+Runs the steps of a plan as a dependency graph instead of strictly in
+order. Each step lists the steps it depends on; a step without a
+dependency list depends on the step before it, so plans that never
+declare dependencies keep running one step at a time.
+
+Independent steps run concurrently, up to a per-plan limit. A sensitive
+step is never run: it waits for approval, and only the steps that depend
+on it (directly or not) wait with it. Other branches carry on, so a plan
+finishes in critical-path time rather than the sum of its steps.
+
+Usage:
+
+    scheduler = PlanScheduler(max_parallel=4)
+    result = asyncio.run(scheduler.run(steps, run_step, on_complete))
+"""
+
+import asyncio
+import logging
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, List, Optional
+
+
+DEFAULT_MAX_PARALLEL = 4
+
+
+class DependencyCycleError(ValueError):
+    """Raised when plan steps depend on each other in a cycle"""
+
+
+class DuplicateStepError(ValueError):
+    """Raised when two plan steps share a step number"""
+
+
+@dataclass
+class ScheduleResult:
+    """Outcome of running a plan's steps"""
+    completed: List[int] = field(default_factory=list)
+    awaiting_approval: List[int] = field(default_factory=list)
+    failed: List[int] = field(default_factory=list)
+    blocked: List[int] = field(default_factory=list)
+
+    @property
+    def finished(self) -> bool:
+        """True if every step is complete"""
+        return not (self.awaiting_approval or self.failed or self.blocked)
+
+
+def resolve_dependencies(steps: List[Dict], logger: Optional[logging.Logger] = None) -> Dict[int, List[int]]:
+    """
+    Dependency lists of a plan's steps, keyed by step number.
+
+    A step whose 'dependencies' is None depends on the previous step.
+    Dependencies on step numbers that do not exist are dropped.
+
+    Args:
+        steps: Step dictionaries with 'number' and optional 'dependencies'
+        logger: Logger for dropped dependencies
+
+    Returns:
+        Step number -> numbers of the steps it depends on
+
+    Raises:
+        DuplicateStepError: If two steps share a number
+        DependencyCycleError: If the dependencies contain a cycle
+    """
+    logger = logger or logging.getLogger("plan_scheduler")
+    numbers = {step['number'] for step in steps}
+    if len(numbers) != len(steps):
+        seen = set()
+        duplicates = sorted({n for n in (step['number'] for step in steps) if n in seen or seen.add(n)})
+        raise DuplicateStepError(f"Duplicate step numbers {duplicates}")
+    graph = {}
+    previous = None
+
+    for step in steps:
+        declared = step.get('dependencies')
+        if declared is None:
+            deps = [previous] if previous is not None else []
+        else:
+            deps = []
+            for dep in declared:
+                if dep in numbers:
+                    deps.append(dep)
+                else:
+                    logger.warning(f"Step {step['number']} depends on unknown step {dep}; ignoring")
+        graph[step['number']] = deps
+        previous = step['number']
+
+    # Kahn's algorithm: every step must be reachable from steps without dependencies
+    remaining = {number: len(set(deps)) for number, deps in graph.items()}
+    dependents: Dict[int, List[int]] = {number: [] for number in graph}
+    for number, deps in graph.items():
+        for dep in set(deps):
+            dependents[dep].append(number)
+    ready = [number for number, count in remaining.items() if count == 0]
+    seen = 0
+    while ready:
+        number = ready.pop()
+        seen += 1
+        for dependent in dependents[number]:
+            remaining[dependent] -= 1
+            if remaining[dependent] == 0:
+                ready.append(dependent)
+
+    if seen != len(graph):
+        cycle = sorted(number for number, count in remaining.items() if count > 0)
+        raise DependencyCycleError(f"Dependency cycle among steps {cycle}")
+
+    return graph
+
+
+class PlanScheduler:
+    """
+    Runs plan steps concurrently in dependency order.
+    """
+
+    def __init__(self, max_parallel: int = DEFAULT_MAX_PARALLEL,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_parallel: Most steps of one plan running at once
+            logger: Logger to use (defaults to "plan_scheduler")
+        """
+        self.max_parallel = max(1, max_parallel)
+        self.logger = logger or logging.getLogger("plan_scheduler")
+
+    async def run(self, steps: List[Dict],
+                  run_step: Callable[[Dict], Awaitable[bool]],
+                  on_complete: Optional[Callable[[Dict], None]] = None) -> ScheduleResult:
+        """
+        Run every runnable step of a plan.
+
+        Steps already marked 'completed' are not run again. Sensitive steps
+        are reported as awaiting approval instead of being run.
+
+        Args:
+            steps: Step dictionaries ('number', 'completed', 'sensitive',
+                optional 'dependencies')
+            run_step: Coroutine function running one step, True on success
+            on_complete: Called (in the event loop) after each step completes
+
+        Returns:
+            Schedule result
+
+        Raises:
+            DuplicateStepError: If two steps share a number
+            DependencyCycleError: If the dependencies contain a cycle
+        """
+        graph = resolve_dependencies(steps, self.logger)
+        by_number = {step['number']: step for step in steps}
+        done = {step['number'] for step in steps if step['completed']}
+        result = ScheduleResult(completed=sorted(done))
+        stopped = set()
+        running: Dict[asyncio.Task, int] = {}
+
+        def ready_steps() -> List[int]:
+            return [
+                number for number in graph
+                if number not in done and number not in stopped
+                and number not in running.values()
+                and all(dep in done for dep in graph[number])
+            ]
+
+        while True:
+            for number in ready_steps():
+                step = by_number[number]
+                if step.get('sensitive'):
+                    self.logger.warning(f"⚠️  Step {number} is SENSITIVE - requires approval")
+                    stopped.add(number)
+                    result.awaiting_approval.append(number)
+                elif len(running) < self.max_parallel:
+                    running[asyncio.ensure_future(run_step(step))] = number
+
+            if not running:
+                break
+
+            finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+            for task in finished:
+                number = running.pop(task)
+                try:
+                    success = task.result()
+                except Exception as e:
+                    self.logger.error(f"✗ Step {number} raised: {e}")
+                    success = False
+
+                if success:
+                    by_number[number]['completed'] = True
+                    done.add(number)
+                    result.completed.append(number)
+                    if on_complete:
+                        on_complete(by_number[number])
+                else:
+                    stopped.add(number)
+                    result.failed.append(number)
+
+        result.blocked = sorted(set(graph) - done - stopped)
+        return result
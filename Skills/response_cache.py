@@ -0,0 +1,195 @@
+"""
+Response Cache
+
+Persistent HTTP response cache for polling watchers. Stores the body and
+validators (ETag / Last-Modified) of each GET keyed by endpoint and params,
+so the next poll can send a conditional request and skip the download when
+the server answers 304 Not Modified.
+"""
+
+import json
+import logging
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional
+
+
+def cache_key(endpoint: str, params: Optional[Mapping[str, Any]] = None) -> str:
+    """
+    Build a stable cache key for a request.
+
+    Args:
+        endpoint: API endpoint (relative path)
+        params: Query parameters
+
+    Returns:
+        Key string (params sorted so order does not matter)
+    """
+    if not params:
+        return endpoint
+    query = '&'.join(f"{k}={params[k]}" for k in sorted(params))
+    return f"{endpoint}?{query}"
+
+
+def parse_retry_after(value: Optional[str], default: float = 60.0,
+                      now: Optional[float] = None) -> float:
+    """
+    Parse a Retry-After header.
+
+    Args:
+        value: Header value, either delay-seconds or an HTTP date
+        default: Delay to use when the header is missing or invalid
+        now: Current time as epoch seconds (defaults to time.time())
+
+    Returns:
+        Seconds to wait (never negative)
+    """
+    if not value:
+        return default
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return default
+    return max(0.0, retry_at - (now or time.time()))
+
+
+class ResponseCache:
+    """
+    Thread-safe cache of GET responses with their validators.
+
+    Entries are held in memory and written to disk by ``save()``, which
+    callers invoke once per poll rather than once per request. A failed
+    poll calls ``discard()`` instead, so its validators are not reused and
+    the next poll downloads (and re-scans) the same responses.
+    """
+
+    def __init__(self, cache_file: str, dry_run: bool = False,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_file: Path to the JSON file backing the cache
+            dry_run: If True, never write the cache to disk
+            logger: Logger to use (defaults to "ResponseCache")
+        """
+        self.cache_file = Path(cache_file)
+        self.dry_run = dry_run
+        self.logger = logger or logging.getLogger("ResponseCache")
+        self.entries: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+        # Entries replaced since the last save, for discard()
+        self._previous: Dict[str, Optional[Dict[str, Any]]] = {}
+
+        self._load()
+
+    def _load(self):
+        """Load entries from disk"""
+        if not self.cache_file.exists():
+            return
+
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except Exception as e:
+            self.logger.error(f"Failed to load response cache: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Persist entries to disk if anything changed"""
+        with self._lock:
+            self._previous = {}
+            if self.dry_run or not self._dirty:
+                return
+            snapshot = json.dumps(self.entries)
+            self._dirty = False
+
+        try:
+            self.cache_file.parent.mkdir(parents=True, exist_ok=True)
+            tmp_file = self.cache_file.with_suffix('.tmp')
+            tmp_file.write_text(snapshot, encoding='utf-8')
+            tmp_file.replace(self.cache_file)
+        except Exception as e:
+            self.logger.error(f"Failed to save response cache: {e}")
+
+    def conditional_headers(self, key: str) -> Dict[str, str]:
+        """
+        Validator headers for a conditional GET.
+
+        Args:
+            key: Cache key from ``cache_key``
+
+        Returns:
+            If-None-Match / If-Modified-Since headers (empty if not cached)
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+        if not entry:
+            return {}
+
+        headers = {}
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+        return headers
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Cached body for a key.
+
+        Args:
+            key: Cache key from ``cache_key``
+
+        Returns:
+            Decoded JSON body, or None if not cached
+        """
+        with self._lock:
+            entry = self.entries.get(key)
+        return entry.get('body') if entry else None
+
+    def store(self, key: str, body: Any, headers: Mapping[str, str]):
+        """
+        Record a 200 response.
+
+        Responses without an ETag or Last-Modified cannot be revalidated
+        and are not cached.
+
+        Args:
+            key: Cache key from ``cache_key``
+            body: Decoded JSON body
+            headers: Response headers (case-insensitive mapping)
+        """
+        etag = headers.get('ETag')
+        last_modified = headers.get('Last-Modified')
+        if not etag and not last_modified:
+            return
+
+        with self._lock:
+            self._previous.setdefault(key, self.entries.get(key))
+            self.entries[key] = {
+                'etag': etag,
+                'last_modified': last_modified,
+                'body': body,
+                'stored_at': time.time()
+            }
+            self._dirty = True
+
+    def discard(self):
+        """Drop entries stored since the last save (the poll failed)"""
+        with self._lock:
+            for key, entry in self._previous.items():
+                if entry is None:
+                    self.entries.pop(key, None)
+                else:
+                    self.entries[key] = entry
+            self._previous = {}
+            self._dirty = False
@@ -0,0 +1,519 @@
+"""
+Retention Engine
+
+Enforces the Company Handbook retention policy (logs kept for 90 days,
+completed tasks archived after 30 days) by packing aged files into
+compressed tar archives under Archive/ and removing the originals.
+
+- Packs are written to a temporary file, fsynced and renamed into place
+  before anything is deleted, so an interrupted run never loses files.
+- Archive/index.jsonl records one line per archived file (pack, original
+  path, name and item ID), so any item can be found and extracted without
+  opening every pack.
+- Packs use zstd when the ``zstandard`` package is installed and the policy
+  asks for it, gzip otherwise.
+
+The policy is read from ``<vault>/config/retention.yaml``:
+
+    compression: gzip
+    rules:
+      - folder: Done
+        maxAgeDays: 30
+      - folder: Logs
+        maxAgeDays: 90
+        recursive: true
+"""
+
+import fnmatch
+import json
+import logging
+import os
+import tarfile
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+import yaml
+
+import frontmatter_codec
+from dashboard_renderer import STAGES, record_event
+from vault_layout import VaultLayout
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
+
+RETENTION_CONFIG_FILE = "config/retention.yaml"
+ARCHIVE_FOLDER = "Archive"
+INDEX_FILE = "index.jsonl"
+
+# Frontmatter fields that identify an item, in order of preference
+ID_FIELDS = ("task_id", "email_id", "message_id", "item_id", "post_id", "id")
+
+# Frontmatter fields holding when an item was finished, in order of preference
+COMPLETED_FIELDS = ("completed", "completed_at", "last_updated")
+
+
+def completed_date(path: Path) -> Optional[date]:
+    """
+    Date an item was finished, from its frontmatter.
+
+    Args:
+        path: Markdown file
+
+    Returns:
+        Date of the first COMPLETED_FIELDS timestamp, or None if there is none
+    """
+    try:
+        header = frontmatter_codec.read_header(path)
+    except OSError:
+        return None
+
+    for key in COMPLETED_FIELDS:
+        value = header.get(key)
+        if isinstance(value, datetime):
+            return value.date()
+        if isinstance(value, date):
+            return value
+        if isinstance(value, str):
+            text = value.strip()
+            # Timestamps written as isoformat() + 'Z' can carry both an offset and 'Z'
+            for candidate in (text, text[:-1] if text.endswith('Z') else None):
+                try:
+                    return datetime.fromisoformat(candidate).date()
+                except (TypeError, ValueError):
+                    continue
+    return None
+
+
+@dataclass
+class RetentionRule:
+    """Archive files in a folder once they are older than max_age_days"""
+    folder: str
+    max_age_days: int
+    pattern: str = "*"
+    recursive: bool = False
+
+    @property
+    def label(self) -> str:
+        """Name of the rule in logs and run() statistics"""
+        return self.folder if self.pattern == "*" else f"{self.folder} ({self.pattern})"
+
+
+@dataclass
+class RetentionPolicy:
+    """Retention rules and pack compression"""
+    rules: List[RetentionRule] = field(default_factory=lambda: [
+        RetentionRule(folder="Done", max_age_days=30),
+        RetentionRule(folder="Logs", max_age_days=90, recursive=True),
+    ])
+    compression: str = "gzip"  # "gzip" or "zstd"
+
+
+def load_retention_policy(vault_path: str = ".") -> RetentionPolicy:
+    """
+    Load the retention policy of a vault.
+
+    Args:
+        vault_path: Path to vault root
+
+    Returns:
+        Retention policy (handbook defaults if the file is missing)
+    """
+    config_path = Path(vault_path) / RETENTION_CONFIG_FILE
+    if not config_path.exists():
+        return RetentionPolicy()
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config_dict = yaml.safe_load(f) or {}
+
+    policy = RetentionPolicy(compression=config_dict.get('compression', 'gzip'))
+    if 'rules' in config_dict:
+        policy.rules = [
+            RetentionRule(
+                folder=rule['folder'],
+                max_age_days=int(rule['maxAgeDays']),
+                pattern=rule.get('pattern', '*'),
+                recursive=bool(rule.get('recursive', False))
+            )
+            for rule in config_dict['rules']
+        ]
+    return policy
+
+
+def item_id(path: Path) -> str:
+    """
+    Identifier recorded for an archived file.
+
+    Args:
+        path: File path
+
+    Returns:
+        The first ID field found in the frontmatter, else the file stem
+    """
+    if path.suffix == '.md':
+        try:
+            fields = frontmatter_codec.read_header(path)
+        except OSError:
+            fields = {}
+        for key in ID_FIELDS:
+            if fields.get(key):
+                return str(fields[key])
+    return path.stem
+
+
+class RetentionEngine:
+    """
+    Packs aged vault files into compressed archives.
+    """
+
+    def __init__(self, vault_path: str = ".", policy: Optional[RetentionPolicy] = None,
+                 dry_run: bool = False, logger: Optional[logging.Logger] = None):
+        """
+        Initialize the retention engine.
+
+        Args:
+            vault_path: Path to vault root
+            policy: Retention policy (loaded from the vault if omitted)
+            dry_run: Log what would be archived without changing anything
+            logger: Logger to use (defaults to "retention")
+        """
+        self.vault_path = Path(vault_path).absolute()
+        self.policy = policy or load_retention_policy(str(self.vault_path))
+        self.dry_run = dry_run
+        self.logger = logger or logging.getLogger("retention")
+        self.layout = VaultLayout(str(self.vault_path), logger=self.logger)
+        self.archive_dir = self.vault_path / ARCHIVE_FOLDER
+        self.index_path = self.archive_dir / INDEX_FILE
+
+        if self.policy.compression == "zstd" and not ZSTD_AVAILABLE:
+            self.logger.warning("zstandard not installed, falling back to gzip")
+            self.policy.compression = "gzip"
+
+    @property
+    def pack_suffix(self) -> str:
+        """File extension of new packs"""
+        return ".tar.zst" if self.policy.compression == "zstd" else ".tar.gz"
+
+    def aged_files(self, rule: RetentionRule, now: Optional[datetime] = None) -> Iterator[Path]:
+        """
+        Files covered by a rule that are older than its age limit.
+
+        Sharded folders are selected by day directory. Files directly in a
+        flat folder are dated by their frontmatter completion timestamp
+        (modification time if they have none); recursive rules use
+        modification time.
+
+        Args:
+            rule: Retention rule
+            now: Reference time (defaults to now)
+
+        Yields:
+            Absolute file paths
+        """
+        cutoff = (now or datetime.now()) - timedelta(days=rule.max_age_days)
+        root = self.vault_path / rule.folder
+
+        if not rule.recursive:
+            # Whole days strictly before the cutoff day
+            last_day = cutoff.date() - timedelta(days=1)
+            for path in self.layout.iter_files(rule.folder, end=last_day, pattern=rule.pattern,
+                                               date_of=completed_date):
+                if not path.name.startswith('.'):
+                    yield path
+            return
+
+        cutoff_ts = cutoff.timestamp()
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for name in filenames:
+                if name.startswith('.') or not fnmatch.fnmatch(name, rule.pattern):
+                    continue
+                path = Path(dirpath) / name
+                try:
+                    if path.stat().st_mtime < cutoff_ts:
+                        yield path
+                except FileNotFoundError:
+                    continue
+
+    @contextmanager
+    def _pack_writer(self, path: Path):
+        """Open a streaming tar writer for a new pack"""
+        with open(path, 'wb') as raw:
+            if self.policy.compression == "zstd":
+                with zstandard.ZstdCompressor().stream_writer(raw, closefd=False) as compressed:
+                    with tarfile.open(fileobj=compressed, mode='w|') as tar:
+                        yield tar
+            else:
+                with tarfile.open(fileobj=raw, mode='w|gz') as tar:
+                    yield tar
+            raw.flush()
+            os.fsync(raw.fileno())
+
+    @contextmanager
+    def _pack_reader(self, path: Path):
+        """Open a streaming tar reader for an existing pack"""
+        with open(path, 'rb') as raw:
+            if path.name.endswith('.zst'):
+                if not ZSTD_AVAILABLE:
+                    raise RuntimeError(f"zstandard is required to read {path.name}")
+                with zstandard.ZstdDecompressor().stream_reader(raw) as decompressed:
+                    with tarfile.open(fileobj=decompressed, mode='r|') as tar:
+                        yield tar
+            else:
+                with tarfile.open(fileobj=raw, mode='r|gz') as tar:
+                    yield tar
+
+    def _append_index(self, entries: List[Dict[str, Any]]):
+        """Append entries to the archive index and flush them to disk"""
+        with open(self.index_path, 'a', encoding='utf-8') as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _remove_empty_dirs(self, root: Path, paths: List[Path]):
+        """Remove shard directories emptied by archiving"""
+        parents = sorted({p.parent for p in paths}, key=lambda p: len(p.parts), reverse=True)
+        for directory in parents:
+            while directory.name.isdigit() and root in directory.parents:
+                try:
+                    directory.rmdir()
+                except OSError:
+                    break
+                directory = directory.parent
+
+    def archive_rule(self, rule: RetentionRule, now: Optional[datetime] = None) -> int:
+        """
+        Archive the aged files of one rule into a new pack.
+
+        Args:
+            rule: Retention rule
+            now: Reference time (defaults to now)
+
+        Returns:
+            Number of files archived (or that would be archived)
+        """
+        now = now or datetime.now()
+        paths = sorted(self.aged_files(rule, now))
+        if not paths:
+            return 0
+
+        if self.dry_run:
+            for path in paths:
+                self.logger.info(f"[DRY RUN] Would archive {path.relative_to(self.vault_path).as_posix()}")
+            return len(paths)
+
+        self.archive_dir.mkdir(parents=True, exist_ok=True)
+        pack_stem = f"{rule.folder.replace('/', '_')}-{now.strftime('%Y%m%d-%H%M%S')}"
+        temp_path = self.archive_dir / f".{pack_stem}.{uuid.uuid4().hex}.tmp"
+
+        entries = []
+        archived = []
+        try:
+            with self._pack_writer(temp_path) as tar:
+                for path in paths:
+                    rel_path = path.relative_to(self.vault_path).as_posix()
+                    try:
+                        stat = path.stat()
+                        tar.add(str(path), arcname=rel_path, recursive=False)
+                    except OSError as e:
+                        self.logger.warning(f"Skipping {rel_path}: {e}")
+                        continue
+                    archived.append(path)
+                    entries.append({
+                        "pack": None,
+                        "path": rel_path,
+                        "name": path.name,
+                        "id": item_id(path),
+                        "size": stat.st_size,
+                        "mtime": datetime.fromtimestamp(stat.st_mtime).isoformat(),
+                        "archived_at": now.isoformat()
+                    })
+            pack_name = self._publish_pack(temp_path, pack_stem)
+        except Exception:
+            temp_path.unlink(missing_ok=True)
+            raise
+
+        for entry in entries:
+            entry["pack"] = pack_name
+
+        # Only delete originals once the pack and its index entries are durable
+        self._append_index(entries)
+        for path in archived:
+            path.unlink(missing_ok=True)
+            if rule.folder in STAGES:
+                record_event(self.vault_path, "archived", source=path)
+        self._remove_empty_dirs(self.vault_path / rule.folder, archived)
+
+        self.logger.info(f"Archived {len(archived)} file(s) from {rule.label} into {pack_name}")
+        return len(archived)
+
+    def _publish_pack(self, temp_path: Path, pack_stem: str) -> str:
+        """
+        Move a finished pack into place under a name no other pack has.
+
+        Several rules (or runs) in the same second share a timestamp, so a
+        counter is added; an existing pack is never replaced.
+
+        Args:
+            temp_path: Fsynced temporary pack
+            pack_stem: Folder and timestamp part of the pack name
+
+        Returns:
+            Pack file name
+        """
+        for attempt in range(1, 1000):
+            suffix = f"-{attempt}" if attempt > 1 else ""
+            pack_name = f"{pack_stem}{suffix}{self.pack_suffix}"
+            pack_path = self.archive_dir / pack_name
+            try:
+                # link() fails instead of overwriting an existing pack
+                os.link(temp_path, pack_path)
+            except FileExistsError:
+                continue
+            except OSError:
+                # No hard links on this filesystem
+                if pack_path.exists():
+                    continue
+                os.replace(temp_path, pack_path)
+                return pack_name
+            temp_path.unlink()
+            return pack_name
+        raise FileExistsError(f"No free pack name for {pack_stem}")
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """
+        Apply every rule of the policy.
+
+        Args:
+            now: Reference time (defaults to now)
+
+        Returns:
+            Number of files archived per rule, keyed by rule label (with
+            the rule's position appended if two rules share a label)
+        """
+        stats = {}
+        for index, rule in enumerate(self.policy.rules, start=1):
+            label = rule.label if rule.label not in stats else f"{rule.label} #{index}"
+            try:
+                stats[label] = self.archive_rule(rule, now)
+            except Exception as e:
+                self.logger.error(f"Failed to archive {label}: {e}")
+                stats[label] = 0
+        return stats
+
+    def find(self, query: str) -> List[Dict[str, Any]]:
+        """
+        Look up archived files in the index.
+
+        Args:
+            query: File name, item ID or original vault-relative path
+
+        Returns:
+            Matching index entries, oldest first
+        """
+        if not self.index_path.exists():
+            return []
+        matches = []
+        with open(self.index_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                entry = json.loads(line)
+                if query in (entry['name'], entry['id'], entry['path']):
+                    matches.append(entry)
+        return matches
+
+    def extract(self, query: str, dest_dir: Optional[Path] = None) -> List[Path]:
+        """
+        Extract archived files from their packs.
+
+        Args:
+            query: File name, item ID or original vault-relative path
+            dest_dir: Directory to extract into (defaults to the vault root,
+                which restores files to their original paths)
+
+        Returns:
+            Paths of the extracted files
+        """
+        dest_dir = Path(dest_dir) if dest_dir else self.vault_path
+        by_pack: Dict[str, set] = {}
+        for entry in self.find(query):
+            by_pack.setdefault(entry['pack'], set()).add(entry['path'])
+
+        extracted = []
+        for pack_name, members in by_pack.items():
+            with self._pack_reader(self.archive_dir / pack_name) as tar:
+                for member in tar:
+                    if member.name not in members:
+                        continue
+                    target = dest_dir / member.name
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    source = tar.extractfile(member)
+                    with open(target, 'wb') as out:
+                        out.write(source.read())
+                    os.utime(target, (member.mtime, member.mtime))
+                    extracted.append(target)
+                    self.logger.info(f"Extracted {member.name} from {pack_name}")
+        return extracted
+
+
+# CLI interface
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Retention engine for AI Employee")
+    parser.add_argument(
+        "command",
+        choices=["run", "find", "extract"],
+        help="Command to execute"
+    )
+    parser.add_argument(
+        "query",
+        nargs="?",
+        help="File name, item ID or path (for find and extract)"
+    )
+    parser.add_argument(
+        "--vault-path",
+        default=".",
+        help="Path to vault root directory"
+    )
+    parser.add_argument(
+        "--dest",
+        help="Directory to extract into (default: original location)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show what would be archived without changing anything"
+    )
+
+    args = parser.parse_args()
+
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    engine = RetentionEngine(args.vault_path, dry_run=args.dry_run)
+
+    if args.command == "run":
+        stats = engine.run()
+        for label, count in stats.items():
+            print(f"{label}: {count} file(s) archived")
+    elif not args.query:
+        parser.error(f"{args.command} requires a query")
+    elif args.command == "find":
+        for entry in engine.find(args.query):
+            print(f"{entry['pack']}: {entry['path']} (id: {entry['id']})")
+    elif args.command == "extract":
+        for path in engine.extract(args.query, Path(args.dest) if args.dest else None):
+            print(path)
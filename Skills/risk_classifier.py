@@ -0,0 +1,277 @@
+"""
+Risk Classifier
+
+One classifier for how risky an action is, shared by the plan reasoning
+loop, the plan executor and the approval workflow.
+
+Risk keywords (with their inflections) and the high-amount threshold are
+compiled into a single word-boundary regex, so a step is classified in one
+pass and only whole words count: "Send email reply" is sensitive, "Read
+email" is not. Words that are both a noun and a verb ("email") only count
+when used as a verb: at the start of a step, after "then"/"please", or
+followed by a recipient. Each assessment carries the level and the
+matches that produced it.
+"""
+
+import re
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Optional
+
+
+class RiskLevel(Enum):
+    """Risk levels for actions requiring approval."""
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+
+
+_RANK = {RiskLevel.LOW: 0, RiskLevel.MEDIUM: 1, RiskLevel.HIGH: 2}
+
+# Words that make a step sensitive (approval required)
+MEDIUM_RISK_KEYWORDS = [
+    'send', 'post', 'share', 'forward', 'reply', 'respond',
+    'invoice', 'commit', 'approve', 'authorize'
+]
+
+# Words that make a step high-risk (irreversible or financial)
+HIGH_RISK_KEYWORDS = [
+    'delete', 'remove', 'cancel', 'reject',
+    'pay', 'payment', 'transfer', 'purchase', 'charge',
+    'deploy', 'release', 'publish'
+]
+
+# Words that make a step sensitive only when used as a verb
+# ("Email the client", not "Read email")
+MEDIUM_RISK_VERBS = ['email']
+
+# Words that mark the next word as a verb
+_VERB_LEADS = ['then', 'please']
+
+# Recipients that follow a verb: pronouns or a capitalised name
+_RECIPIENT = r'(?:(?:him|her|them|us|me)\b|(?-i:[A-Z]))'
+
+# Inflections the suffix rules below do not produce
+_IRREGULAR_FORMS = {
+    'send': ['sent'],
+    'pay': ['paid'],
+    'commit': ['committed', 'committing'],
+    'transfer': ['transferred', 'transferring'],
+}
+
+# Default risk per MCP action type
+DEFAULT_ACTION_LEVELS = {
+    "send_email": RiskLevel.MEDIUM,
+    "post_to_linkedin": RiskLevel.MEDIUM,
+    "post_to_facebook": RiskLevel.MEDIUM,
+    "post_to_instagram": RiskLevel.MEDIUM,
+    "post_to_twitter": RiskLevel.MEDIUM,
+    "create_invoice_draft": RiskLevel.MEDIUM,
+    "create_payment_draft": RiskLevel.HIGH,
+    "delete_account": RiskLevel.HIGH,
+    "sign_contract": RiskLevel.HIGH,
+}
+
+# Amounts above this are high-risk
+HIGH_AMOUNT = 10000
+
+# Recipients in this domain are internal
+INTERNAL_EMAIL_DOMAIN = "@internal.com"
+
+
+def max_level(*levels: RiskLevel) -> RiskLevel:
+    """Highest of several risk levels"""
+    return max(levels, key=_RANK.__getitem__, default=RiskLevel.LOW)
+
+
+def word_forms(word: str) -> List[str]:
+    """
+    Common inflections of an English verb or noun.
+
+    Args:
+        word: Base form, e.g. "delete"
+
+    Returns:
+        The word and its -s/-ed/-ing forms
+    """
+    forms = {word, word + 's'}
+    if word.endswith('e'):
+        forms |= {word + 'd', word[:-1] + 'ing'}
+    elif word.endswith('y') and word[-2:-1] not in ('a', 'e', 'i', 'o', 'u'):
+        forms |= {word[:-1] + 'ies', word[:-1] + 'ied', word + 'ing'}
+    else:
+        forms |= {word + 'es', word + 'ed', word + 'ing'}
+    forms.update(_IRREGULAR_FORMS.get(word, []))
+    return sorted(forms)
+
+
+@dataclass
+class RiskAssessment:
+    """Risk level of an action and the matches behind it"""
+    level: RiskLevel = RiskLevel.LOW
+    reasons: List[str] = field(default_factory=list)
+
+    @property
+    def is_sensitive(self) -> bool:
+        """True if the action needs approval (medium or high risk)"""
+        return self.level is not RiskLevel.LOW
+
+    @property
+    def is_high_risk(self) -> bool:
+        """True if the action is high risk"""
+        return self.level is RiskLevel.HIGH
+
+    def add(self, level: RiskLevel, reason: str):
+        """Record a match, raising the level if needed"""
+        self.level = max_level(self.level, level)
+        self.reasons.append(reason)
+
+
+class RiskClassifier:
+    """
+    Classifies step text and MCP actions into risk levels.
+    """
+
+    def __init__(self, medium_keywords: Iterable[str] = MEDIUM_RISK_KEYWORDS,
+                 high_keywords: Iterable[str] = HIGH_RISK_KEYWORDS,
+                 medium_verbs: Iterable[str] = MEDIUM_RISK_VERBS,
+                 action_levels: Optional[Dict[str, RiskLevel]] = None,
+                 high_amount: float = HIGH_AMOUNT):
+        """
+        Compile the classifier.
+
+        Args:
+            medium_keywords: Words that make text medium risk
+            high_keywords: Words that make text high risk
+            medium_verbs: Words that make text medium risk when used as a verb
+            action_levels: Default risk per action type (used by reference)
+            high_amount: Amounts above this are high risk
+        """
+        self.action_levels = dict(DEFAULT_ACTION_LEVELS) if action_levels is None else action_levels
+        self.high_amount = high_amount
+
+        # Inflected form -> (keyword, level); high risk wins on overlap
+        self._forms: Dict[str, tuple] = {}
+        for level, keywords in ((RiskLevel.MEDIUM, medium_keywords), (RiskLevel.HIGH, high_keywords)):
+            for keyword in keywords:
+                for form in word_forms(keyword.lower()):
+                    self._forms[form] = (keyword, level)
+
+        # Inflected verb form -> verb
+        self._verb_forms: Dict[str, str] = {}
+        for verb in medium_verbs:
+            for form in word_forms(verb.lower()):
+                self._verb_forms.setdefault(form, verb)
+
+        alternation = '|'.join(re.escape(f) for f in sorted(self._forms, key=len, reverse=True))
+        parts = [rf'\b(?P<word>{alternation})\b']
+        if self._verb_forms:
+            verbs = '|'.join(re.escape(f) for f in sorted(self._verb_forms, key=len, reverse=True))
+            leads = '|'.join(_VERB_LEADS)
+            parts.append(
+                rf'(?:^[^\w$\n]*|\b(?:{leads})[ \t]+)(?P<verb>{verbs})\b'
+                rf'|\b(?P<verb_to>{verbs})(?=[ \t]+{_RECIPIENT})'
+            )
+        parts.append(r'(?P<amount>\$\s?\d[\d,]*(?:\.\d+)?)')
+        # MULTILINE so "^" is the start of each text in a batch
+        self._pattern = re.compile('|'.join(parts), re.IGNORECASE | re.MULTILINE)
+
+    def _apply(self, match: "re.Match", assessment: RiskAssessment):
+        """Fold one regex match into an assessment"""
+        word = match.group('word')
+        if word is not None:
+            keyword, level = self._forms[word.lower()]
+            assessment.add(level, f"'{keyword}' ({level.value})")
+            return
+
+        groups = match.groupdict()
+        verb = groups.get('verb') or groups.get('verb_to')
+        if verb is not None:
+            assessment.add(RiskLevel.MEDIUM, f"'{self._verb_forms[verb.lower()]}' ({RiskLevel.MEDIUM.value})")
+            return
+
+        text = match.group('amount')
+        amount = float(re.sub(r'[^\d.]', '', text))
+        if amount > self.high_amount:
+            assessment.add(RiskLevel.HIGH, f"amount {text} over {self.high_amount:,.0f}")
+
+    def classify(self, text: str) -> RiskAssessment:
+        """
+        Classify one piece of text (e.g. a plan step).
+
+        Args:
+            text: Text to classify
+
+        Returns:
+            Risk assessment
+        """
+        assessment = RiskAssessment()
+        for match in self._pattern.finditer(text.replace('\n', ' ')):
+            self._apply(match, assessment)
+        return assessment
+
+    def classify_all(self, texts: Iterable[str]) -> List[RiskAssessment]:
+        """
+        Classify many texts (e.g. every step of a plan) in one regex pass.
+
+        Args:
+            texts: Texts to classify
+
+        Returns:
+            One assessment per text, in order
+        """
+        texts = [text.replace('\n', ' ') for text in texts]
+        assessments = [RiskAssessment() for _ in texts]
+        if not texts:
+            return assessments
+
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+
+        for match in self._pattern.finditer('\n'.join(texts)):
+            self._apply(match, assessments[bisect_right(starts, match.start()) - 1])
+        return assessments
+
+    def classify_action(self, action_type: str, arguments: Dict[str, Any]) -> RiskAssessment:
+        """
+        Classify an MCP action by its type and arguments.
+
+        Args:
+            action_type: Type of action (e.g. "send_email")
+            arguments: Action arguments
+
+        Returns:
+            Risk assessment
+        """
+        assessment = RiskAssessment()
+        level = self.action_levels.get(action_type)
+        if level is not None:
+            assessment.add(level, f"action {action_type} ({level.value})")
+
+        to_address = str(arguments.get("to", ""))
+        if "@" in to_address and not to_address.endswith(INTERNAL_EMAIL_DOMAIN):
+            assessment.add(RiskLevel.MEDIUM, f"external recipient {to_address}")
+
+        amount = arguments.get("amount")
+        if isinstance(amount, (int, float)) and amount > self.high_amount:
+            assessment.add(RiskLevel.HIGH, f"amount {amount} over {self.high_amount:,.0f}")
+
+        return assessment
+
+
+# Shared default classifier (compiled once)
+DEFAULT_CLASSIFIER = RiskClassifier()
+
+
+def classify(text: str) -> RiskAssessment:
+    """Classify text with the default classifier"""
+    return DEFAULT_CLASSIFIER.classify(text)
+
+
+def classify_all(texts: Iterable[str]) -> List[RiskAssessment]:
+    """Classify many texts with the default classifier"""
+    return DEFAULT_CLASSIFIER.classify_all(texts)
@@ -0,0 +1,307 @@
+"""
+Similarity Index
+
+Detects near-duplicate watcher items (for example the same job alert delivered
+several times) using 64-bit SimHash fingerprints over normalised subject and
+body text. Fingerprints are bucketed into bands so lookups only compare against
+candidates that share at least one band, and entries older than the configured
+window are pruned.
+"""
+
+import hashlib
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+
+
+FINGERPRINT_BITS = 64
+BAND_COUNT = 4
+BAND_BITS = FINGERPRINT_BITS // BAND_COUNT
+BAND_MASK = (1 << BAND_BITS) - 1
+
+_URL_PATTERN = re.compile(r'https?://\S+|www\.\S+')
+_TAG_PATTERN = re.compile(r'<[^>]+>')
+_DIGIT_PATTERN = re.compile(r'\d+')
+_TOKEN_PATTERN = re.compile(r'[a-z0-9#]+')
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalise text before fingerprinting.
+
+    Lowercases, strips HTML tags and URLs, and folds digit runs so that
+    tracking numbers and counters do not make repeats look different.
+
+    Args:
+        text: Raw subject and body text
+
+    Returns:
+        Normalised, whitespace-separated token string
+    """
+    text = text.lower()
+    text = _TAG_PATTERN.sub(' ', text)
+    text = _URL_PATTERN.sub(' ', text)
+    text = _DIGIT_PATTERN.sub('#', text)
+    return ' '.join(_TOKEN_PATTERN.findall(text))
+
+
+def _feature_hash(feature: str) -> int:
+    """Stable 64-bit hash of a single feature"""
+    digest = hashlib.blake2b(feature.encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def simhash(text: str, shingle_size: int = 3) -> int:
+    """
+    Compute a 64-bit SimHash fingerprint.
+
+    Args:
+        text: Text to fingerprint (normalised internally)
+        shingle_size: Number of tokens per shingle
+
+    Returns:
+        Fingerprint as an integer
+    """
+    tokens = normalize_text(text).split()
+    if not tokens:
+        return 0
+
+    if len(tokens) < shingle_size:
+        features = tokens
+    else:
+        features = [
+            ' '.join(tokens[i:i + shingle_size])
+            for i in range(len(tokens) - shingle_size + 1)
+        ]
+
+    weights: Dict[str, int] = {}
+    for feature in features:
+        weights[feature] = weights.get(feature, 0) + 1
+
+    vector = [0] * FINGERPRINT_BITS
+    for feature, weight in weights.items():
+        feature_hash = _feature_hash(feature)
+        for bit in range(FINGERPRINT_BITS):
+            if feature_hash & (1 << bit):
+                vector[bit] += weight
+            else:
+                vector[bit] -= weight
+
+    fingerprint = 0
+    for bit, value in enumerate(vector):
+        if value > 0:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """Number of differing bits between two fingerprints"""
+    return (a ^ b).bit_count()
+
+
+def _bands(fingerprint: int) -> List[int]:
+    """Split a fingerprint into band keys (band index folded into the key)"""
+    return [
+        (band << BAND_BITS) | ((fingerprint >> (band * BAND_BITS)) & BAND_MASK)
+        for band in range(BAND_COUNT)
+    ]
+
+
+@dataclass
+class SimilarityMatch:
+    """An existing item that a new item is a near-duplicate of"""
+    item_id: str
+    filepath: str
+    fingerprint: int
+    distance: int
+    seen_at: float
+
+
+class SimilarityIndex:
+    """
+    Windowed near-duplicate index persisted as JSON.
+
+    Items whose fingerprints are within ``max_distance`` bits of an entry
+    seen in the last ``window_seconds`` are reported as duplicates.
+    """
+
+    def __init__(self, index_file: str, window_seconds: int = 86400,
+                 max_distance: int = 3, dry_run: bool = False,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize the similarity index.
+
+        Args:
+            index_file: Path to the JSON file backing the index
+            window_seconds: How long an item can absorb duplicates
+            max_distance: Maximum Hamming distance treated as a duplicate
+            dry_run: If True, never write the index to disk
+            logger: Logger to use (defaults to "SimilarityIndex")
+        """
+        if max_distance >= BAND_COUNT:
+            # Band lookup only guarantees recall when at least one band is exact
+            raise ValueError(f"max_distance must be less than {BAND_COUNT}")
+
+        self.index_file = Path(index_file)
+        self.window_seconds = window_seconds
+        self.max_distance = max_distance
+        self.dry_run = dry_run
+        self.logger = logger or logging.getLogger("SimilarityIndex")
+        self.entries: List[Dict] = []
+        self._bands: Dict[int, Set[int]] = {}
+
+        self._load()
+
+    def _load(self):
+        """Load entries from disk"""
+        if not self.index_file.exists():
+            return
+
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f)
+        except Exception as e:
+            self.logger.error(f"Failed to load similarity index: {e}")
+            self.entries = []
+
+        self.prune()
+
+    def save(self):
+        """Persist entries to disk"""
+        if self.dry_run:
+            return
+
+        try:
+            self.index_file.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.index_file, 'w', encoding='utf-8') as f:
+                json.dump(self.entries, f)
+        except Exception as e:
+            self.logger.error(f"Failed to save similarity index: {e}")
+
+    def _rebuild_bands(self):
+        """Rebuild the band lookup table from entries"""
+        self._bands = {}
+        for position, entry in enumerate(self.entries):
+            for key in _bands(int(entry['fingerprint'], 16)):
+                self._bands.setdefault(key, set()).add(position)
+
+    def prune(self, now: Optional[float] = None):
+        """
+        Drop entries older than the window.
+
+        Args:
+            now: Current time as epoch seconds (defaults to time.time())
+        """
+        cutoff = (now or time.time()) - self.window_seconds
+        self.entries = [e for e in self.entries if e['seen_at'] >= cutoff]
+        self._rebuild_bands()
+
+    def find_similar(self, text: str, now: Optional[float] = None) -> Optional[SimilarityMatch]:
+        """
+        Find the closest near-duplicate of ``text`` within the window.
+
+        Args:
+            text: Subject plus body of the new item
+            now: Current time as epoch seconds (defaults to time.time())
+
+        Returns:
+            Closest match, or None if the item is new
+        """
+        fingerprint = simhash(text)
+        if fingerprint == 0:
+            return None
+
+        cutoff = (now or time.time()) - self.window_seconds
+
+        candidates: Set[int] = set()
+        for key in _bands(fingerprint):
+            candidates |= self._bands.get(key, set())
+
+        best: Optional[SimilarityMatch] = None
+        for position in candidates:
+            entry = self.entries[position]
+            if entry['seen_at'] < cutoff:
+                continue
+
+            entry_fingerprint = int(entry['fingerprint'], 16)
+            distance = hamming_distance(fingerprint, entry_fingerprint)
+            if distance <= self.max_distance and (best is None or distance < best.distance):
+                best = SimilarityMatch(
+                    item_id=entry['item_id'],
+                    filepath=entry['filepath'],
+                    fingerprint=entry_fingerprint,
+                    distance=distance,
+                    seen_at=entry['seen_at']
+                )
+
+        return best
+
+    def add(self, text: str, item_id: str, filepath: str, now: Optional[float] = None):
+        """
+        Record a newly written item.
+
+        Args:
+            text: Subject plus body of the item
+            item_id: Source identifier of the item
+            filepath: Path of the task file created for the item
+            now: Current time as epoch seconds (defaults to time.time())
+        """
+        fingerprint = simhash(text)
+        if fingerprint == 0:
+            return
+
+        self.entries.append({
+            'fingerprint': f"{fingerprint:016x}",
+            'item_id': item_id,
+            'filepath': str(filepath),
+            'seen_at': now or time.time()
+        })
+        position = len(self.entries) - 1
+        for key in _bands(fingerprint):
+            self._bands.setdefault(key, set()).add(position)
+
+        self.save()
+
+    def forget(self, filepath: str):
+        """
+        Remove entries pointing at a task file (e.g. one that was moved away).
+
+        Args:
+            filepath: Path of the task file
+        """
+        self.entries = [e for e in self.entries if e['filepath'] != str(filepath)]
+        self._rebuild_bands()
+        self.save()
+
+
+def append_duplicate_reference(filepath: str, reference: str) -> bool:
+    """
+    Append a reference to a collapsed duplicate onto an existing task file.
+
+    Adds a "## Related Items" section on first use, then one bullet per
+    duplicate.
+
+    Args:
+        filepath: Existing task file
+        reference: Single-line description of the duplicate
+
+    Returns:
+        True if the reference was written, False if the file is gone
+    """
+    path = Path(filepath)
+    if not path.exists():
+        return False
+
+    content = path.read_text(encoding='utf-8')
+    addition = ""
+    if "## Related Items" not in content:
+        addition += "\n## Related Items\n\n"
+    addition += f"- {reference}\n"
+
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write(addition)
+    return True
@@ -15,6 +15,7 @@ import re
 from approval_workflow import ApprovalWorkflow, Action, RiskLevel, ApprovalStatus
 from mcp_servers.social_media_mcp_server import SocialMediaMCPServer
 from mcp_servers.base_mcp_server import TextContent
+from vault_catalog import VaultCatalog
 
 
 class SocialMediaWithApproval:
@@ -36,6 +37,7 @@ class SocialMediaWithApproval:
         self.approval_workflow = ApprovalWorkflow(vault_path)
         self.social_media_server = SocialMediaMCPServer(vault_path=vault_path)
         self.logger = logging.getLogger("social_media_with_approval")
+        self.catalog = VaultCatalog(str(self.vault_path), logger=self.logger)
         
         # Draft storage
         self.drafts_dir = self.vault_path / "Social_Media_Drafts"
@@ -203,6 +205,8 @@ status: draft
             
             # Write updated content
             tracking_file.write_text(content, encoding='utf-8')
+            # Edited in place, so a catalog refresh would not notice
+            self.catalog.update_file(tracking_file, read_body=True)
             
             self.logger.info(f"Updated engagement metrics for post: {post_id}")
             return True
@@ -235,41 +239,18 @@ status: draft
         Returns:
             Markdown formatted summary
         """
-        # Get all tracking files
-        tracking_files = list(self.social_media_server.tracking_dir.glob("*.md"))
+        # Bring tracking files into the catalog; only changed files are
+        # re-read, through the memory-mapped bulk scanner
+        tracking_folder = self.social_media_server.tracking_dir.absolute().relative_to(
+            self.catalog.vault_path
+        ).as_posix()
+        self.catalog.refresh([tracking_folder], read_body=True)
         
         # Count posts by platform
-        platform_counts = {}
-        total_engagement = {
-            'likes': 0,
-            'comments': 0,
-            'shares': 0,
-            'views': 0
-        }
-        
-        for tracking_file in tracking_files:
-            content = tracking_file.read_text()
-            
-            # Extract platform
-            platform_match = re.search(r'platform: (\w+)', content)
-            if platform_match:
-                platform = platform_match.group(1)
-                platform_counts[platform] = platform_counts.get(platform, 0) + 1
-            
-            # Extract engagement metrics
-            likes_match = re.search(r'Likes: (\d+)', content)
-            comments_match = re.search(r'Comments: (\d+)', content)
-            shares_match = re.search(r'Shares: (\d+)', content)
-            views_match = re.search(r'Views: (\d+)', content)
-            
-            if likes_match:
-                total_engagement['likes'] += int(likes_match.group(1))
-            if comments_match:
-                total_engagement['comments'] += int(comments_match.group(1))
-            if shares_match:
-                total_engagement['shares'] += int(shares_match.group(1))
-            if views_match:
-                total_engagement['views'] += int(views_match.group(1))
+        platform_counts = self.catalog.group_counts(tracking_folder, 'platform')
+        
+        # Total engagement metrics
+        total_engagement = self.catalog.sum_metrics(tracking_folder)
         
         # Generate summary
         summary = f"""# Weekly Social Media Summary
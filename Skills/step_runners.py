@@ -0,0 +1,232 @@
+"""
+Step Runners
+
+Pluggable, async execution of plan steps. Handlers (MCP tools, agent
+skills, plain functions) are registered by action type; each step is
+dispatched to the handler for its action type, or to the first handler
+whose keywords appear in the step text.
+
+The dispatcher bounds concurrency with a global semaphore and one
+semaphore per tool, and gives every step a timeout, so many plans can run
+at once without flooding any single service.
+
+Usage:
+
+    registry = StepRunnerRegistry()
+    registry.register("send_email", mcp_tool_runner(email_server, "send_email"),
+                      tool="email", keywords=["email", "reply"])
+    dispatcher = StepDispatcher(registry, max_concurrency=8, tool_limits={"email": 2})
+    success = await dispatcher.run(step)
+"""
+
+import asyncio
+import inspect
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable, Dict, Iterable, List, Optional, Pattern, Union
+
+
+# Action type of the fallback runner
+DEFAULT_ACTION = "default"
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_STEP_TIMEOUT = 300.0
+
+AsyncRunner = Callable[[Dict], Awaitable[bool]]
+Runner = Union[AsyncRunner, Callable[[Dict], bool]]
+
+
+async def log_only_runner(step: Dict) -> bool:
+    """Fallback runner: no handler does this step, so it fails and is left for a person"""
+    logging.getLogger("step_runners").warning(f"No runner for step {step.get('number')}: {step.get('text')}")
+    return False
+
+
+def mcp_tool_runner(server, tool_name: str) -> AsyncRunner:
+    """
+    Runner that calls a tool on an MCP server.
+
+    The step's 'arguments' are passed to the tool. Tool errors are returned
+    by the server as "Error..." text and count as failure.
+
+    Args:
+        server: BaseMCPServer instance
+        tool_name: Tool to call
+
+    Returns:
+        Async runner
+    """
+    async def run(step: Dict) -> bool:
+        result = await server.execute_tool(tool_name, step.get('arguments') or {})
+        return not result.text.startswith("Error")
+    return run
+
+
+@dataclass
+class RunnerSpec:
+    """A registered step runner"""
+    action_type: str
+    runner: AsyncRunner
+    tool: str
+    keywords: List[str] = field(default_factory=list)
+    timeout: Optional[float] = None
+
+
+class StepRunnerRegistry:
+    """
+    Maps action types to step runners.
+    """
+
+    def __init__(self, logger: Optional[logging.Logger] = None):
+        """
+        Initialize the registry with the log-only fallback runner.
+
+        Args:
+            logger: Logger to use (defaults to "step_runners")
+        """
+        self.logger = logger or logging.getLogger("step_runners")
+        self._specs: Dict[str, RunnerSpec] = {}
+        self._keyword_pattern: Optional[Pattern] = None
+        self._keyword_actions: Dict[str, str] = {}
+        self.register(DEFAULT_ACTION, log_only_runner)
+
+    def register(self, action_type: str, runner: Runner, tool: Optional[str] = None,
+                 keywords: Iterable[str] = (), timeout: Optional[float] = None):
+        """
+        Register (or replace) the runner for an action type.
+
+        Synchronous runners are run in a worker thread.
+
+        Args:
+            action_type: Action type the runner handles
+            runner: Callable taking a step dict and returning True on success
+            tool: Tool name for per-tool concurrency limits (defaults to action_type)
+            keywords: Words in step text that route untyped steps to this runner
+            timeout: Per-step timeout overriding the dispatcher default
+        """
+        if not inspect.iscoroutinefunction(runner):
+            runner = self._in_thread(runner)
+
+        self._specs[action_type] = RunnerSpec(
+            action_type=action_type,
+            runner=runner,
+            tool=tool or action_type,
+            keywords=[k.lower() for k in keywords],
+            timeout=timeout
+        )
+        self._keyword_pattern = None
+
+    @staticmethod
+    def _in_thread(sync_runner: Callable[[Dict], bool]) -> AsyncRunner:
+        """Wrap a synchronous runner to run in a worker thread"""
+        async def run(step: Dict) -> bool:
+            return await asyncio.to_thread(sync_runner, step)
+        return run
+
+    def _compile_keywords(self):
+        """Compile all runner keywords into one word-boundary regex"""
+        self._keyword_actions = {}
+        for spec in self._specs.values():
+            for keyword in spec.keywords:
+                self._keyword_actions.setdefault(keyword, spec.action_type)
+
+        if self._keyword_actions:
+            alternation = '|'.join(re.escape(k) for k in sorted(self._keyword_actions, key=len, reverse=True))
+            self._keyword_pattern = re.compile(rf'\b(?:{alternation})\b', re.IGNORECASE)
+        else:
+            self._keyword_pattern = re.compile(r'(?!)')
+
+    def resolve(self, step: Dict) -> RunnerSpec:
+        """
+        Runner for a step.
+
+        Args:
+            step: Step dictionary ('action_type' and/or 'text')
+
+        Returns:
+            The step's runner, a keyword match, or the fallback runner
+        """
+        action_type = step.get('action_type')
+        if action_type:
+            if action_type in self._specs:
+                return self._specs[action_type]
+            self.logger.warning(f"No runner registered for action type {action_type}")
+
+        if self._keyword_pattern is None:
+            self._compile_keywords()
+        match = self._keyword_pattern.search(step.get('text', ''))
+        if match:
+            return self._specs[self._keyword_actions[match.group(0).lower()]]
+
+        return self._specs[DEFAULT_ACTION]
+
+
+class StepDispatcher:
+    """
+    Runs steps through their runners under concurrency limits and timeouts.
+    """
+
+    def __init__(self, registry: StepRunnerRegistry,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 tool_limits: Optional[Dict[str, int]] = None,
+                 timeout: float = DEFAULT_STEP_TIMEOUT,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            registry: Step runner registry
+            max_concurrency: Most steps running at once, across all plans
+            tool_limits: Most steps running at once per tool (unlisted tools
+                are only bound by max_concurrency)
+            timeout: Default per-step timeout in seconds
+            logger: Logger to use (defaults to "step_runners")
+        """
+        self.registry = registry
+        self.max_concurrency = max(1, max_concurrency)
+        self.tool_limits = dict(tool_limits or {})
+        self.timeout = timeout
+        self.logger = logger or logging.getLogger("step_runners")
+        self._loop = None
+        self._global: Optional[asyncio.Semaphore] = None
+        self._tools: Dict[str, asyncio.Semaphore] = {}
+
+    def _semaphores(self, tool: str):
+        """Global and per-tool semaphores for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:
+            # Semaphores belong to one event loop; each asyncio.run gets new ones
+            self._loop = loop
+            self._global = asyncio.Semaphore(self.max_concurrency)
+            self._tools = {}
+        if tool not in self._tools:
+            self._tools[tool] = asyncio.Semaphore(self.tool_limits.get(tool, self.max_concurrency))
+        return self._global, self._tools[tool]
+
+    async def run(self, step: Dict) -> bool:
+        """
+        Run one step.
+
+        A timed-out step counts as failed. A synchronous runner that times
+        out keeps running in its worker thread, but its result is ignored.
+
+        Args:
+            step: Step dictionary
+
+        Returns:
+            True if the step succeeded
+        """
+        spec = self.registry.resolve(step)
+        timeout = spec.timeout if spec.timeout is not None else self.timeout
+        global_limit, tool_limit = self._semaphores(spec.tool)
+
+        # Tool first, so steps queued on a busy tool do not hold global slots
+        async with tool_limit, global_limit:
+            try:
+                return bool(await asyncio.wait_for(spec.runner(step), timeout))
+            except asyncio.TimeoutError:
+                self.logger.error(f"Step {step.get('number')} timed out after {timeout}s ({spec.action_type})")
+                return False
+            except Exception as e:
+                self.logger.error(f"Step {step.get('number')} failed in {spec.action_type} runner: {e}")
+                return False
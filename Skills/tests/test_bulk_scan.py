@@ -0,0 +1,81 @@
+"""
+Unit tests for the bulk scanner
+
+Tests byte-level matching, header extraction, digests, empty files and the
+process pool path.
+"""
+
+import pytest
+import sys
+import re
+import hashlib
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import bulk_scan
+
+
+METRICS = re.compile(rb'^- (Likes|Comments|Shares|Views): (\d+)\s*$', re.MULTILINE)
+
+
+class TestBulkScan:
+    """Test suite for bulk_scan."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory with tracking files."""
+        temp_dir = tempfile.mkdtemp()
+        root = Path(temp_dir)
+        for i in range(12):
+            (root / f"post_{i:02d}.md").write_text(
+                f"---\nplatform: linkedin\npost_id: \"{i}\"\n---\n\n# Post\n\n- Likes: {i}\n- Views: {i * 10}\n",
+                encoding='utf-8'
+            )
+        yield root
+        shutil.rmtree(temp_dir)
+
+    def test_scan_file(self, temp_dir):
+        """Test header, matches and digest for a single file."""
+        path = temp_dir / "post_03.md"
+
+        result = bulk_scan.scan_file(str(path), {"metrics": METRICS}, digest=True)
+
+        assert result.header == b'---\nplatform: linkedin\npost_id: "3"\n---\n'
+        assert result.matches["metrics"] == [(b"Likes", b"3"), (b"Views", b"30")]
+        assert result.digest == hashlib.sha1(path.read_bytes()).hexdigest()
+        assert result.size == path.stat().st_size
+
+    def test_empty_and_headerless_files(self, temp_dir):
+        """Test that empty files are handled without mmap and headers are optional."""
+        empty = temp_dir / "empty.md"
+        empty.write_bytes(b"")
+        plain = temp_dir / "plain.md"
+        plain.write_bytes(b"# Title\n---\n- Likes: 1\n")
+
+        empty_result = bulk_scan.scan_file(str(empty), {"metrics": METRICS}, digest=True)
+        plain_result = bulk_scan.scan_file(str(plain), {"metrics": METRICS})
+
+        assert empty_result.size == 0
+        assert empty_result.matches == {"metrics": []}
+        assert empty_result.digest == hashlib.sha1(b"").hexdigest()
+        assert plain_result.header == b""
+        assert plain_result.matches["metrics"] == [(b"Likes", b"1")]
+
+    def test_pool_matches_in_process(self, temp_dir):
+        """Test that the process pool returns the same results in input order."""
+        paths = sorted(str(p) for p in temp_dir.glob("*.md"))
+        paths.append(str(temp_dir / "missing.md"))
+
+        serial = bulk_scan.scan(paths, {"metrics": METRICS}, digest=True)
+        pooled = bulk_scan.scan(paths, {"metrics": METRICS}, digest=True, workers=2, threshold=1)
+
+        assert [r.path for r in serial] == paths[:-1]
+        assert pooled == serial
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,75 @@
+"""
+Unit tests for CursorStore
+
+Tests staged high-water marks, mark matching and counter deltas.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from cursor_store import CursorStore, counter_delta, reached_mark
+
+
+class TestCursorStore:
+    """Test suite for CursorStore."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for testing."""
+        temp_dir = tempfile.mkdtemp()
+        yield Path(temp_dir)
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def store(self, temp_dir):
+        """Create a CursorStore backed by a temp file."""
+        return CursorStore(str(temp_dir / "cursors.json"))
+
+    def test_staged_values_apply_on_commit(self, store, temp_dir):
+        """Test that staged cursors are invisible until committed."""
+        store.stage("messages", {"last_id": "m3"})
+        assert store.get("messages") is None
+
+        store.commit()
+
+        assert store.get("messages") == {"last_id": "m3"}
+        assert CursorStore(str(temp_dir / "cursors.json")).get("messages") == {"last_id": "m3"}
+
+    def test_discard_keeps_old_position(self, store):
+        """Test that a failed poll does not advance the cursor."""
+        store.stage("messages", {"last_id": "m1"})
+        store.commit()
+        store.stage("messages", {"last_id": "m2"})
+
+        store.discard()
+        store.commit()
+
+        assert store.get("messages") == {"last_id": "m1"}
+
+    def test_reached_mark(self):
+        """Test matching by ID and by timestamp."""
+        mark = {"last_id": "m5", "last_time": 1000}
+
+        assert reached_mark("m5", None, mark) is True
+        assert reached_mark("m4", 900, mark) is True
+        assert reached_mark("m6", 1100, mark) is False
+        assert reached_mark("m6", None, mark) is False
+        assert reached_mark("m1", 1, {}) is False
+
+    def test_counter_delta(self):
+        """Test that only changed counters are reported."""
+        previous = {"likes": 10, "comments": 2}
+
+        assert counter_delta(previous, {"likes": 10, "comments": 2}, ("likes", "comments")) == {}
+        assert counter_delta(previous, {"likes": 13, "comments": 2}, ("likes", "comments")) == {"likes": 3}
+        assert counter_delta(None, {"likes": 4, "comments": 0}, ("likes", "comments")) == {"likes": 4}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,224 @@
+"""
+Unit tests for the event-sourced dashboard renderer
+
+Tests event folding, render-on-change, log rotation and recovery from a
+missing state.
+"""
+
+import pytest
+import sys
+import json
+from pathlib import Path
+import tempfile
+import shutil
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import dashboard_renderer
+from dashboard_renderer import DashboardRenderer, record_event
+from approval_workflow import ApprovalWorkflow, Action, ApprovalStatus, RiskLevel
+
+
+class TestDashboardRenderer:
+    """Test suite for DashboardRenderer."""
+
+    @pytest.fixture
+    def temp_vault(self):
+        """Create a temporary vault with two Inbox items."""
+        temp_dir = tempfile.mkdtemp()
+        vault = Path(temp_dir)
+        for folder in dashboard_renderer.STAGES:
+            (vault / folder).mkdir()
+        (vault / "Inbox" / "a.md").write_text("---\nstatus: new\n---\n")
+        (vault / "Inbox" / "b.md").write_text("---\nstatus: new\n---\n")
+        yield vault
+        shutil.rmtree(temp_dir)
+
+    def test_first_update_scans_folders(self, temp_vault):
+        """Test that counts are seeded from the folders when there is no state."""
+        renderer = DashboardRenderer(str(temp_vault))
+
+        assert renderer.update() is True
+
+        content = (temp_vault / "Dashboard.md").read_text()
+        assert "| Inbox | 2 |" in content
+        snapshot = json.loads((temp_vault / "dashboard.json").read_text())
+        assert snapshot["counts"]["Inbox"] == 2
+
+    def test_events_update_counts_without_rescan(self, temp_vault):
+        """Test that moves are applied from the event log alone."""
+        DashboardRenderer(str(temp_vault)).update()
+
+        # A file added behind the renderer's back is not counted, which
+        # shows that counts come from events rather than a scan
+        (temp_vault / "Inbox" / "untracked.md").write_text("x")
+        (temp_vault / "Inbox" / "a.md").rename(temp_vault / "Done" / "a.md")
+        record_event(temp_vault, "moved", temp_vault / "Done" / "a.md", temp_vault / "Inbox" / "a.md")
+
+        renderer = DashboardRenderer(str(temp_vault))
+        renderer.update()
+
+        assert renderer.state["counts"]["Inbox"] == 1
+        assert renderer.state["counts"]["Done"] == 1
+        assert renderer.state["recent_completions"][0]["name"] == "a.md"
+        assert "moved: a.md (Inbox -> Done)" in (temp_vault / "Dashboard.md").read_text()
+
+        # rebuild() recounts from disk
+        renderer.rebuild()
+        assert renderer.state["counts"]["Inbox"] == 2
+
+    def test_unchanged_dashboard_is_not_rewritten(self, temp_vault):
+        """Test that an update with no new events leaves the file alone."""
+        DashboardRenderer(str(temp_vault)).update()
+        dashboard = temp_vault / "Dashboard.md"
+
+        # Same state, same rendered hash: a hand edit is not overwritten
+        dashboard.write_text("edited")
+        DashboardRenderer(str(temp_vault)).update()
+
+        assert dashboard.read_text() == "edited"
+        assert DashboardRenderer(str(temp_vault)).update(force=True) is True
+        assert "AI Employee Dashboard" in dashboard.read_text()
+
+    def test_hand_curated_dashboard_is_kept(self, temp_vault):
+        """Test that only the marked section of an existing dashboard is replaced."""
+        dashboard = temp_vault / "Dashboard.md"
+        dashboard.write_text("# My Dashboard\n\n## Notes\n\nKeep this.\n")
+
+        DashboardRenderer(str(temp_vault)).update()
+        (temp_vault / "Inbox" / "a.md").unlink()
+        record_event(temp_vault, "archived", None, temp_vault / "Inbox" / "a.md")
+        DashboardRenderer(str(temp_vault)).update()
+
+        content = dashboard.read_text()
+        assert content.startswith("# My Dashboard\n\n## Notes\n\nKeep this.\n")
+        assert content.count(dashboard_renderer.SECTION_BEGIN) == 1
+        assert "| Inbox | 1 |" in content and "| Inbox | 2 |" not in content
+
+    def test_stock_dashboard_template_is_replaced(self, temp_vault):
+        """Test that the shipped, unfilled Dashboard.md is replaced instead of appended to."""
+        shipped = Path(__file__).parent.parent.parent / "Dashboard.md"
+        dashboard = temp_vault / "Dashboard.md"
+        dashboard.write_text(shipped.read_text(encoding="utf-8"), encoding="utf-8")
+
+        DashboardRenderer(str(temp_vault)).update()
+
+        content = dashboard.read_text(encoding="utf-8")
+        assert content.startswith(dashboard_renderer.SECTION_BEGIN)
+        assert "{{date}}" not in content
+        assert content.count("# AI Employee Dashboard") == 1
+        assert "| Inbox | 2 |" in content
+
+    def test_reconcile_corrects_drift(self, temp_vault):
+        """Test that counts are reconciled with a folder scan once the interval passes."""
+        DashboardRenderer(str(temp_vault)).update()
+        (temp_vault / "Inbox" / "untracked.md").write_text("x")
+
+        renderer = DashboardRenderer(str(temp_vault))
+        renderer.update()
+        assert renderer.state["counts"]["Inbox"] == 2
+
+        renderer = DashboardRenderer(str(temp_vault), reconcile_interval=0)
+        renderer.update()
+        assert renderer.state["counts"]["Inbox"] == 3
+        assert "| Inbox | 3 |" in (temp_vault / "Dashboard.md").read_text()
+
+    def test_approval_workflow_tracks_pending(self, temp_vault):
+        """Test that approval requests appear and clear in Pending Actions."""
+        DashboardRenderer(str(temp_vault)).update()
+        workflow = ApprovalWorkflow(str(temp_vault))
+
+        request = workflow.create_approval_request(
+            Action(
+                id="test_001",
+                action_type="send_email",
+                tool_name="send_email",
+                arguments={"to": "test@example.com", "subject": "Test", "body": "Test body"},
+                risk_level=RiskLevel.MEDIUM,
+                requires_approval=True,
+                created_at=datetime.now(),
+                status=ApprovalStatus.PENDING,
+                reasoning="Test reasoning"
+            )
+        )
+        renderer = DashboardRenderer(str(temp_vault))
+        renderer.update()
+        assert renderer.state["pending"] == [request.name]
+        assert f"[[{request.stem}]]" in (temp_vault / "Dashboard.md").read_text()
+
+        workflow.process_approval(request)
+        renderer.update()
+        assert renderer.state["pending"] == []
+        assert renderer.state["counts"]["Needs_Action"] == 1
+        assert renderer.state["today"]["events"] == {"created": 1, "approved": 1}
+
+    def test_partial_and_bad_lines(self, temp_vault):
+        """Test that half-written lines wait and malformed lines are skipped."""
+        renderer = DashboardRenderer(str(temp_vault))
+        renderer.update()
+        events = temp_vault / dashboard_renderer.EVENTS_FILE
+        events.parent.mkdir(exist_ok=True)
+
+        with open(events, "a") as f:
+            f.write("not json\n")
+            f.write('{"ts": "2026-01-01T00:00:00", "event": "created", "name": "c.md", "from": null, "to": "Inbox"')
+
+        assert renderer.apply_pending() == 0
+
+        with open(events, "a") as f:
+            f.write("}\n")
+
+        assert renderer.apply_pending() == 1
+        assert renderer.state["counts"]["Inbox"] == 3
+
+
+    def test_rotation_keeps_late_events(self, temp_vault, monkeypatch):
+        """Test that events appended to the log while it is rotated are applied."""
+        monkeypatch.setattr(dashboard_renderer, "ROTATE_BYTES", 1)
+        renderer = DashboardRenderer(str(temp_vault))
+        renderer.update()
+        events = temp_vault / dashboard_renderer.EVENTS_FILE
+        record_event(temp_vault, "created", temp_vault / "Inbox" / "c.md")
+
+        # A writer that opened the log before the rename appends after the first re-read
+        read_events = renderer._read_events
+        late_writes = []
+
+        def read_then_append(path, offset):
+            result = read_events(path, offset)
+            if path != events and not late_writes:
+                late_writes.append(path)
+                with open(path, "a") as f:
+                    f.write(json.dumps({"ts": "2026-01-01T00:00:00", "event": "created",
+                                        "name": "d.md", "from": None, "to": "Inbox"}) + "\n")
+            return result
+
+        monkeypatch.setattr(renderer, "_read_events", read_then_append)
+
+        renderer.apply_pending()
+
+        assert late_writes
+        assert renderer.state["counts"]["Inbox"] == 4
+        assert renderer.state["offset"] == 0
+        assert not events.exists() and not late_writes[0].exists()
+        assert not list((temp_vault / ".index" / "claims").glob("*"))
+
+    def test_log_rotated_by_another_renderer(self, temp_vault, monkeypatch):
+        """Test that a log renamed away between the stat and the read is not an error."""
+        renderer = DashboardRenderer(str(temp_vault))
+        renderer.update()
+        record_event(temp_vault, "created", temp_vault / "Inbox" / "c.md")
+
+        def vanished(path, offset):
+            raise FileNotFoundError(path)
+
+        monkeypatch.setattr(renderer, "_read_events", vanished)
+
+        assert renderer.apply_pending() == 0
+        assert renderer.update() is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
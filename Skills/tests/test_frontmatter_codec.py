@@ -0,0 +1,126 @@
+"""
+Unit tests for the frontmatter codec
+
+Tests the flat fast path against YAML, serializer escaping and the parse
+cache.
+"""
+
+import pytest
+import sys
+import os
+from pathlib import Path
+import tempfile
+import shutil
+
+import yaml
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import frontmatter_codec
+
+
+SAMPLES = [
+    '---\nemail_id: "abc"\nsubject: "Re: \\"urgent\\" invoice"\nlabels: ["INBOX", "UNREAD"]\n---\n',
+    "---\ntype: whatsapp_message\nmessage_count: 3\nflag: true\nempty:\n---\n",
+    "---\ntask_id: x\ncreated: 2026-02-19T12:00:00\nrate: 1.5\n---\n",
+    "---\nnested:\n  a: 1\nitems:\n  - one\n  - two\n---\n",
+    "---\nanswer: yes\nquoted: 'it''s'\n---\n",
+]
+
+
+class TestFrontmatterCodec:
+    """Test suite for frontmatter_codec."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory and an empty parse cache."""
+        temp_dir = tempfile.mkdtemp()
+        frontmatter_codec.clear_cache()
+        yield Path(temp_dir)
+        shutil.rmtree(temp_dir)
+
+    @pytest.mark.parametrize("content", SAMPLES)
+    def test_parse_matches_yaml(self, content):
+        """Test that the fast path and the YAML fallback agree with yaml.safe_load."""
+        header, _ = frontmatter_codec.split(content)
+        assert frontmatter_codec.parse(content) == yaml.safe_load(header)
+
+    def test_split_and_extract(self):
+        """Test body splitting, empty headers and missing frontmatter."""
+        assert frontmatter_codec.extract("---\nstatus: done\n---\n\n# Body") == (
+            {"status": "done"}, "\n# Body"
+        )
+        assert frontmatter_codec.extract("---\n---\nBody") == ({}, "Body")
+        assert frontmatter_codec.extract("# No frontmatter") == ({}, "# No frontmatter")
+        assert frontmatter_codec.parse("---\n: [bad\n---\n") == {}
+        # A fence must start its own line
+        assert frontmatter_codec.split("---\nkey: a---\n")[0] is None
+
+    def test_serializer_round_trips_awkward_strings(self):
+        """Test that quotes, colons and reserved words survive a round trip."""
+        fields = {
+            "subject": 'He said "hi": call me # now',
+            "sender": "Name <me@example.com>",
+            "answer": "yes",
+            "path": "C:\\vault\\Inbox",
+            "count": 3,
+            "labels": ["INBOX", 'say "x"'],
+            "status": "pending",
+        }
+
+        for quote_strings in (False, True):
+            text = frontmatter_codec.serialize(fields, quote_strings=quote_strings)
+            assert frontmatter_codec.parse(text) == fields
+            assert yaml.safe_load(text.strip().strip("-")) == fields
+
+        assert "status: pending\n" in frontmatter_codec.serialize(fields)
+        assert 'status: "pending"\n' in frontmatter_codec.serialize(fields, quote_strings=True)
+
+    def test_update_keeps_body(self):
+        """Test that update merges fields without touching the body."""
+        content = "---\nstatus: pending\npriority: high\n---\n\n# Task\n"
+
+        updated = frontmatter_codec.update(content, {"status": "reviewed"})
+
+        assert updated.endswith("\n# Task\n")
+        assert frontmatter_codec.parse(updated) == {"status": "reviewed", "priority": "high"}
+
+    def test_read_header_stops_at_closing_fence(self, temp_dir):
+        """Test that header reads skip the body and respect the byte limit."""
+        large = temp_dir / "large.md"
+        large.write_text("---\npriority: high\n---\n" + "x" * 200000)
+        plain = temp_dir / "plain.md"
+        plain.write_text("# No frontmatter\n---\n")
+        long_header = temp_dir / "long.md"
+        long_header.write_text("---\n" + "".join(f"k{i}: v\n" for i in range(2000)) + "---\nBody")
+
+        assert frontmatter_codec.read_header_bytes(large) == b"---\npriority: high\n---\n"
+        assert frontmatter_codec.read_header(large) == {"priority": "high"}
+        assert frontmatter_codec.read_header(plain) == {}
+
+        # Oversized headers fall back to a full read
+        assert frontmatter_codec.read_header_bytes(long_header, max_bytes=1024) is None
+        assert len(frontmatter_codec.read_header(long_header, max_bytes=1024)) == 2000
+
+    def test_load_file_is_cached_until_changed(self, temp_dir):
+        """Test that unchanged files hit the cache and edits invalidate it."""
+        path = temp_dir / "task.md"
+        path.write_text("---\nstatus: pending\n---\nBody")
+
+        fields, body = frontmatter_codec.load_file(path)
+        fields["status"] = "mutated"
+        assert frontmatter_codec.load_file(path) == ({"status": "pending"}, "Body")
+        assert frontmatter_codec.cache_info()["hits"] == 1
+
+        path.write_text("---\nstatus: done\n---\nBody")
+        os.utime(path, ns=(path.stat().st_atime_ns, path.stat().st_mtime_ns + 10**9))
+
+        fields, _, content = frontmatter_codec.load_document(path)
+        assert fields == {"status": "done"}
+        assert content.startswith("---\nstatus: done")
+        assert frontmatter_codec.cache_info()["misses"] == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
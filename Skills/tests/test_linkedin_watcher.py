@@ -0,0 +1,170 @@
+"""
+Unit tests for LinkedInWatcher
+
+Feeds canned API responses through poll_once to test paginated scans and
+when high-water marks and response validators are committed.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("requests")
+
+from linkedin_watcher import LinkedInWatcher, LinkedInWatcherConfig
+
+
+class FakeResponse:
+    """Minimal stand-in for a requests Response."""
+
+    def __init__(self, status_code, body=None, etag=None):
+        self.status_code = status_code
+        self._body = body
+        self.headers = {'ETag': etag} if etag else {}
+
+    def json(self):
+        return self._body
+
+
+class FakeSession:
+    """Serves a newest-first "messages" collection and message details."""
+
+    def __init__(self, message_ids, page_size, fail_at=None):
+        self.message_ids = message_ids
+        self.page_size = page_size
+        self.fail_at = fail_at  # 'start' offset that answers 500
+        self.requests = []
+
+    def get(self, url, params=None, headers=None, timeout=None):
+        endpoint = url.rsplit('/v2/', 1)[1]
+        self.requests.append((endpoint, dict(params or {}), dict(headers or {})))
+
+        if endpoint.startswith("messages/"):
+            message_id = endpoint.split('/', 1)[1]
+            return FakeResponse(200, {'from': {'name': "Alice"}, 'subject': message_id, 'body': "Hi"})
+
+        start = params['start']
+        if start == self.fail_at:
+            return FakeResponse(500)
+        elements = [
+            {'id': message_id, 'createdAt': int(message_id[1:]) * 1000}
+            for message_id in self.message_ids[start:start + params['count']]
+        ]
+        etag = f'"{start}-{"-".join(self.message_ids)}"'
+        if headers and headers.get('If-None-Match') == etag:
+            return FakeResponse(304)
+        return FakeResponse(200, {'elements': elements}, etag=etag)
+
+    def close(self):
+        pass
+
+
+class TestLinkedInPaging:
+    """Test suite for paginated collection scans."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for testing."""
+        temp_dir = tempfile.mkdtemp()
+        yield Path(temp_dir)
+        shutil.rmtree(temp_dir)
+
+    def make_watcher(self, temp_dir, session, max_pages=5):
+        """Create a messages-only watcher that talks to the fake session."""
+        config = LinkedInWatcherConfig(
+            inbox_folder=str(temp_dir / "Inbox"),
+            needs_action_folder=str(temp_dir / "Needs_Action"),
+            log_folder=str(temp_dir / "Logs"),
+            index_path=str(temp_dir / ".index"),
+            access_token="token",
+            monitor_connections=False,
+            monitor_engagement=False,
+            use_http2=False,
+            max_concurrent_requests=1,
+            dedup_enabled=False,
+            page_size=session.page_size,
+            max_pages=max_pages
+        )
+        watcher = LinkedInWatcher(config)
+        watcher.session = session
+        return watcher
+
+    def page_requests(self, session):
+        """Collection page requests as (start, sent validator)."""
+        return [(params['start'], headers.get('If-None-Match'))
+                for endpoint, params, headers in session.requests if endpoint == "messages"]
+
+    def test_full_scan_commits_mark(self, temp_dir):
+        """Test that a scan ending on a short page commits the newest element."""
+        session = FakeSession(["m5", "m4", "m3"], page_size=2)
+        watcher = self.make_watcher(temp_dir, session)
+
+        stats = watcher.poll_once()
+
+        assert stats['errors'] == 0
+        assert stats['created'] == 3
+        assert watcher.cursors.get("messages") == {'last_id': "m5", 'last_time': 5000}
+
+        # Unchanged collection: page 0 answers 304 and nothing is re-read
+        session.requests.clear()
+        stats = watcher.poll_once()
+        assert stats['retrieved'] == 0 and stats['errors'] == 0
+        assert len(self.page_requests(session)) == 1
+
+    def test_failed_later_page_keeps_old_mark(self, temp_dir):
+        """Test that a page-2 failure discards the staged mark and page validators."""
+        session = FakeSession(["m6", "m5", "m4", "m3"], page_size=2, fail_at=2)
+        watcher = self.make_watcher(temp_dir, session)
+
+        stats = watcher.poll_once()
+
+        assert stats['errors'] == 1
+        assert stats['retrieved'] == 0
+        assert watcher.cursors.get("messages") is None
+        assert watcher.response_cache.entries == {}
+        assert list((temp_dir / "Needs_Action").glob("*.md")) == []
+
+        # Next poll re-reads page 0 in full instead of getting a 304
+        session.fail_at = None
+        session.requests.clear()
+        stats = watcher.poll_once()
+
+        assert stats['errors'] == 0
+        assert stats['created'] == 4
+        assert self.page_requests(session)[0] == (0, None)
+        assert watcher.cursors.get("messages")['last_id'] == "m6"
+
+    def test_page_cap_keeps_old_mark(self, temp_dir):
+        """Test that running out of pages before the mark keeps the old mark."""
+        session = FakeSession(["m2", "m1"], page_size=2)
+        watcher = self.make_watcher(temp_dir, session, max_pages=2)
+        watcher.poll_once()
+        assert watcher.cursors.get("messages")['last_id'] == "m2"
+
+        # Six new messages arrive; two pages of two cannot reach m2
+        session.message_ids = ["m8", "m7", "m6", "m5", "m4", "m3", "m2", "m1"]
+        stats = watcher.poll_once()
+
+        assert stats['errors'] == 1
+        assert stats['created'] == 4
+        assert watcher.cursors.get("messages")['last_id'] == "m2"
+        assert [start for start, _ in self.page_requests(session)][-2:] == [0, 2]
+
+        # With room for two more pages the scan reaches m2 and moves the mark
+        watcher.config.max_pages = 4
+        session.requests.clear()
+        stats = watcher.poll_once()
+
+        assert stats['errors'] == 0
+        assert stats['created'] == 2
+        assert [start for start, _ in self.page_requests(session)] == [0, 2, 4, 6]
+        assert watcher.cursors.get("messages")['last_id'] == "m8"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,134 @@
+"""
+Unit tests for the plan journal
+
+Tests appends, batched fsync, replay of interrupted runs and materialising
+journaled progress into plan files.
+"""
+
+import pytest
+import sys
+import os
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from plan_journal import PlanJournal, journal_path
+from plan_executor import PlanExecutor, PlanExecutorConfig
+from step_runners import DEFAULT_ACTION
+
+
+class TestPlanJournal:
+    """Test suite for PlanJournal."""
+
+    @pytest.fixture
+    def temp_vault(self):
+        """Create a temporary vault with a Plans folder."""
+        temp_dir = tempfile.mkdtemp()
+        vault = Path(temp_dir)
+        (vault / "Plans").mkdir()
+        yield vault
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def executor(self, temp_vault):
+        """Create an executor whose steps succeed instantly."""
+        executor = PlanExecutor(PlanExecutorConfig(
+            vault_path=str(temp_vault),
+            log_folder=str(temp_vault / "Logs" / "plan_executor")
+        ))
+        executor.executed = []
+        executor.runners.register(DEFAULT_ACTION, lambda step: executor.executed.append(step["number"]) or True)
+        return executor
+
+    def test_append_replay_and_batched_sync(self, temp_vault, monkeypatch):
+        """Test that entries replay in order and fsync runs once per batch."""
+        syncs = []
+        original = os.fsync
+        monkeypatch.setattr(os, "fsync", lambda fd: syncs.append(fd) or original(fd))
+
+        plan_path = temp_vault / "Plans" / "a_plan.md"
+        with PlanJournal(plan_path, sync_every=3, sync_interval=3600) as journal:
+            for step in (1, 2, 3, 4):
+                journal.append(step)
+            journal.append(2, "failed")
+            assert len(syncs) == 1
+
+        assert len(syncs) == 2  # the rest are synced on close
+        assert journal_path(plan_path).name == "a_plan.journal.jsonl"
+
+        # A torn last line from a crash is ignored
+        with open(journal_path(plan_path), 'a') as f:
+            f.write('{"ts":"2026-02-19","step":5,"ev')
+        assert PlanJournal(plan_path).replay() == {1: "completed", 2: "failed", 3: "completed", 4: "completed"}
+
+    def test_resume_replays_journal(self, temp_vault, executor):
+        """Test that completed steps from an interrupted run are not run again."""
+        plan_path = temp_vault / "Plans" / "task_plan.md"
+        plan_path.write_text(
+            "---\nstatus: pending\n---\n\n## Steps\n\n"
+            "- [ ] Review the task\n- [ ] Draft notes\n- [ ] Tidy up\n"
+        )
+        with PlanJournal(plan_path) as journal:
+            journal.append(1)
+
+        assert executor.read_plan(plan_path)['steps'][0]['completed'] is True
+        assert executor.execute_plan(plan_path) is True
+
+        assert executor.executed == [2, 3]
+        done = temp_vault / "Done" / "task_plan.md"
+        assert done.read_text().count("- [x]") == 3
+        assert 'progress: "3/3"' in done.read_text()
+        assert not journal_path(plan_path).exists()
+
+    def test_progress_written_once_per_cycle(self, temp_vault, executor, monkeypatch):
+        """Test that a cycle stopped by approval writes the plan file once."""
+        import plan_executor
+
+        writes = []
+        original = plan_executor.write_atomic
+        monkeypatch.setattr(plan_executor, "write_atomic", lambda *a, **k: writes.append(a[0]) or original(*a, **k))
+
+        plan_path = temp_vault / "Plans" / "task_plan.md"
+        plan_path.write_text(
+            "---\nstatus: pending\n---\n\n## Steps\n\n"
+            "- [ ] Review the task\n  - [ ] Draft notes\n- [ ] Send the reply\n"
+        )
+
+        assert executor.execute_plan(plan_path) is False
+
+        assert writes == [plan_path]
+        content = plan_path.read_text()
+        assert "- [x] Review the task" in content
+        assert "  - [x] Draft notes" in content
+        assert "- [ ] Send the reply" in content
+        assert not journal_path(plan_path).exists()
+
+    def test_numbered_checkboxes_ticked_and_plain_steps_keep_journal(self, temp_vault, executor):
+        """Test that "N. [ ]" steps are ticked and untickable progress stays journaled."""
+        plan_path = temp_vault / "Plans" / "task_plan.md"
+        plan_path.write_text(
+            "---\nstatus: pending\n---\n\n## Steps\n\n"
+            "1. [ ] Review the task\n2. [ ] Send the reply\n"
+        )
+
+        assert executor.execute_plan(plan_path) is False
+        content = plan_path.read_text()
+        assert "1. [x] Review the task" in content
+        assert "2. [ ] Send the reply" in content
+        assert not journal_path(plan_path).exists()
+
+        # Plain numbered steps have nowhere to record completion
+        plan_path.write_text(
+            "---\nstatus: pending\n---\n\n## Steps\n\n"
+            "1. Review the task\n2. Send the reply\n"
+        )
+        assert executor.execute_plan(plan_path) is False
+        assert journal_path(plan_path).exists()
+        assert executor.read_plan(plan_path)['steps'][0]['completed'] is True
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
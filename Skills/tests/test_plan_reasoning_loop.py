@@ -358,6 +358,121 @@ type: "task"
         # Should have multiple sensitive actions
         assert content.count("SENSITIVE") >= 3
         assert "Sensitive Actions Summary" in content
+    
+    def test_create_plans_for_all_skips_current_plans(self, loop, temp_dirs):
+        """Test batch planning with content-hash skipping."""
+        needs_action = Path(temp_dirs['needs_action'])
+        for name in ("a", "b", "c"):
+            (needs_action / f"{name}.md").write_text(f"---\nsubject: \"Task {name}\"\n---\n\nReview task {name}.\n")
+        
+        assert loop.create_plans_for_all() == {
+            'total': 3, 'created': 3, 'current': 0, 'claimed_elsewhere': 0, 'failed': 0
+        }
+        
+        # Progress on a current plan survives a second run
+        plan_a = Path(temp_dirs['plans']) / "a_plan.md"
+        plan_a.write_text(plan_a.read_text().replace("1. [ ]", "1. [x]"))
+        
+        stats = loop.create_plans_for_all()
+        assert stats['current'] == 3 and stats['created'] == 0
+        assert "1. [x]" in plan_a.read_text()
+        
+        # Only the edited task is planned again
+        (needs_action / "b.md").write_text("---\nsubject: \"Task b\"\n---\n\nReview task b again.\n")
+        stats = loop.create_plans_for_all()
+        assert stats['created'] == 1 and stats['current'] == 2
+        
+        assert loop.create_plans_for_all(force=True)['created'] == 3
+    
+    def test_executed_plan_in_done_is_current(self, loop, temp_dirs):
+        """Test that a plan moved to Done is not planned again for the same content."""
+        needs_action = Path(temp_dirs['needs_action'])
+        (needs_action / "a.md").write_text("---\nsubject: \"Task a\"\n---\n\nReview task a.\n")
+        loop.create_plans_for_all()
+        
+        # The executor moves finished plans into Done/
+        done = Path(temp_dirs['root']) / "Done"
+        done.mkdir()
+        plan_a = Path(temp_dirs['plans']) / "a_plan.md"
+        plan_a.rename(done / plan_a.name)
+        
+        stats = loop.create_plans_for_all()
+        assert stats['current'] == 1 and stats['created'] == 0
+        assert not plan_a.exists()
+        assert loop.create_plan(str(needs_action / "a.md")) == str(done / plan_a.name)
+        
+        # A changed task is planned again
+        (needs_action / "a.md").write_text("---\nsubject: \"Task a\"\n---\n\nReview task a again.\n")
+        assert loop.create_plans_for_all()['created'] == 1
+        assert plan_a.exists()
+    
+    def test_batch_lists_done_once(self, loop, temp_dirs, monkeypatch):
+        """Test that a batch looks plans up in one Done/ listing instead of a search per task."""
+        needs_action = Path(temp_dirs['needs_action'])
+        for name in ("a", "b", "c"):
+            (needs_action / f"{name}.md").write_text(f"---\nsubject: \"Task {name}\"\n---\n\nReview task {name}.\n")
+        loop.create_plans_for_all()
+        
+        done = Path(temp_dirs['root']) / "Done"
+        done.mkdir()
+        for name in ("a", "b"):
+            plan = Path(temp_dirs['plans']) / f"{name}_plan.md"
+            plan.rename(done / plan.name)
+        
+        listings = []
+        done_plans = loop.done_plans
+        monkeypatch.setattr(loop, "done_plans", lambda: listings.append(1) or done_plans())
+        monkeypatch.setattr(loop.layout, "find", lambda folder, name: pytest.fail("Done/ searched per task"))
+        
+        stats = loop.create_plans_for_all()
+        
+        assert stats['current'] == 3 and stats['created'] == 0
+        assert listings == [1]
+    
+    def test_executor_loads_plan_sidecar(self, loop, temp_dirs):
+        """Test that the executor reads the JSON sidecar and keeps the markdown in sync."""
+        from plan_reasoning_loop import ExecutionPlan, sidecar_path
+        from plan_executor import PlanExecutor, PlanExecutorConfig
+        
+        plan = ExecutionPlan(
+            task_id="sidecar_task",
+            task_file="Needs_Action/sidecar_task.md",
+            goal="Ship the 2. release",
+            steps=[
+                PlanStep(1, "Draft notes", False, False, estimated_time="10m"),
+                PlanStep(2, "Publish notes", True, True, dependencies=[1])
+            ],
+            created_at="2026-02-19T12:00:00"
+        )
+        plan_path = Path(loop.save_plan(plan))
+        assert sidecar_path(plan_path).exists()
+        
+        executor = PlanExecutor(PlanExecutorConfig(
+            vault_path=temp_dirs['root'],
+            log_folder=str(Path(temp_dirs['root']) / "Logs" / "plan_executor")
+        ))
+        loaded = executor.read_plan(plan_path)
+        
+        # Fields lost by markdown parsing survive, numbered lines elsewhere are ignored
+        assert loaded['plan'] is not None
+        assert [s['text'] for s in loaded['steps']] == ["Draft notes", "Publish notes"]
+        assert loaded['steps'][1]['dependencies'] == [1]
+        assert loaded['steps'][0]['estimated_time'] == "10m"
+        
+        loaded['steps'][0]['completed'] = True
+        executor._update_plan_progress(plan_path, loaded)
+        
+        assert "1. [x] Draft notes" in plan_path.read_text()
+        reloaded = executor.read_plan(plan_path)
+        assert reloaded['plan'] is not None
+        assert [s['completed'] for s in reloaded['steps']] == [True, False]
+        assert reloaded['frontmatter']['progress'] == "1/2"
+        
+        # A hand-edited markdown file is parsed instead of the stale sidecar
+        plan_path.write_text(plan_path.read_text().replace("2. [ ]", "2. [x]"))
+        edited = executor.read_plan(plan_path)
+        assert edited['plan'] is None
+        assert edited['steps'][1]['sensitive'] is True
 
 
 if __name__ == "__main__":
@@ -0,0 +1,166 @@
+"""
+Unit tests for the plan scheduler
+
+Tests dependency resolution, concurrent execution of independent steps,
+approval-blocked branches and per-plan concurrency limits.
+"""
+
+import pytest
+import sys
+import asyncio
+import time
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from plan_scheduler import PlanScheduler, DependencyCycleError, DuplicateStepError, resolve_dependencies
+
+
+def make_steps(*specs):
+    """Build step dictionaries from (number, dependencies, sensitive) tuples."""
+    return [
+        {'number': n, 'text': f"Step {n}", 'completed': False, 'sensitive': sensitive, 'dependencies': deps}
+        for n, deps, sensitive in specs
+    ]
+
+
+class TestPlanScheduler:
+    """Test suite for PlanScheduler."""
+
+    def test_resolve_dependencies(self):
+        """Test implicit previous-step dependencies, unknown steps and cycles."""
+        steps = make_steps((1, None, False), (2, None, False), (3, [1, 9], False), (4, [], False))
+        assert resolve_dependencies(steps) == {1: [], 2: [1], 3: [1], 4: []}
+
+        with pytest.raises(DependencyCycleError):
+            resolve_dependencies(make_steps((1, [2], False), (2, [1], False)))
+
+        with pytest.raises(DuplicateStepError):
+            resolve_dependencies(make_steps((1, None, False), (2, None, False), (1, None, False)))
+
+    def test_independent_steps_run_concurrently(self):
+        """Test that a diamond of steps runs in critical-path time."""
+        steps = make_steps((1, [], False), (2, [1], False), (3, [1], False), (4, [2, 3], False))
+        order = []
+
+        async def run_step(step):
+            order.append(('start', step['number']))
+            await asyncio.sleep(0.1)
+            order.append(('end', step['number']))
+            return True
+
+        start = time.monotonic()
+        result = asyncio.run(PlanScheduler(max_parallel=4).run(steps, run_step))
+        elapsed = time.monotonic() - start
+
+        assert result.finished
+        assert sorted(result.completed) == [1, 2, 3, 4]
+        assert elapsed < 0.35
+        # Steps 2 and 3 overlap; step 4 starts after both end
+        assert order.index(('start', 3)) < order.index(('end', 2))
+        assert order.index(('start', 4)) > max(order.index(('end', 2)), order.index(('end', 3)))
+
+    def test_sensitive_step_blocks_only_its_branch(self):
+        """Test that steps awaiting approval pause only their dependents."""
+        steps = make_steps((1, [], True), (2, [1], False), (3, [], False), (4, [3], False))
+        completed = []
+
+        async def run_step(step):
+            return True
+
+        result = asyncio.run(PlanScheduler().run(steps, run_step, on_complete=lambda s: completed.append(s['number'])))
+
+        assert result.awaiting_approval == [1]
+        assert result.blocked == [2]
+        assert completed == [3, 4]
+        assert not result.finished
+
+    def test_failed_step_and_concurrency_limit(self):
+        """Test that failures stop dependents and at most max_parallel steps run."""
+        steps = make_steps(*[(n, [], False) for n in range(1, 7)], (7, [2], False))
+        running = []
+        peak = []
+
+        async def run_step(step):
+            running.append(step['number'])
+            peak.append(len(running))
+            await asyncio.sleep(0.01)
+            running.remove(step['number'])
+            if step['number'] == 2:
+                raise RuntimeError("boom")
+            return True
+
+        result = asyncio.run(PlanScheduler(max_parallel=2).run(steps, run_step))
+
+        assert max(peak) == 2
+        assert result.failed == [2]
+        assert result.blocked == [7]
+        assert sorted(result.completed) == [1, 3, 4, 5, 6]
+
+    def test_executor_runs_plan_graph(self):
+        """Test that PlanExecutor completes a plan with declared dependencies."""
+        from plan_reasoning_loop import ExecutionPlan, PlanStep, write_plan
+        from plan_executor import PlanExecutor, PlanExecutorConfig
+        from step_runners import DEFAULT_ACTION
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            vault = Path(temp_dir)
+            executor = PlanExecutor(PlanExecutorConfig(
+                vault_path=temp_dir,
+                log_folder=str(vault / "Logs" / "plan_executor")
+            ))
+            executor.runners.register(DEFAULT_ACTION, lambda step: True)
+            plan_path = vault / "Plans" / "graph_plan.md"
+            write_plan(plan_path, ExecutionPlan(
+                task_id="graph",
+                task_file="Needs_Action/graph.md",
+                goal="Research and draft",
+                steps=[
+                    PlanStep(1, "Research topic", False, False, dependencies=[]),
+                    PlanStep(2, "Draft outline", False, False, dependencies=[]),
+                    PlanStep(3, "Combine into report", False, False, dependencies=[1, 2])
+                ],
+                created_at="2026-02-19T12:00:00"
+            ))
+
+            assert executor.execute_plan(plan_path) is True
+            assert not plan_path.exists()
+            assert (vault / "Done" / "graph_plan.md").exists()
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_executor_runs_hand_written_plan_with_two_lists(self):
+        """Test that repeated numbers in a markdown-only plan are renumbered, not a cycle."""
+        from plan_executor import PlanExecutor, PlanExecutorConfig
+        from step_runners import DEFAULT_ACTION
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            vault = Path(temp_dir)
+            executor = PlanExecutor(PlanExecutorConfig(
+                vault_path=temp_dir,
+                log_folder=str(vault / "Logs" / "plan_executor")
+            ))
+            executor.runners.register(DEFAULT_ACTION, lambda step: True)
+            plan_path = vault / "Plans" / "notes_plan.md"
+            plan_path.write_text(
+                "# Plan\n\n## Steps\n\n1. Research topic\n2. Draft outline\n3. Review draft\n\n"
+                "## Notes\n\n1. Keep it short\n2. Use the usual template\n",
+                encoding='utf-8'
+            )
+
+            steps = executor.read_plan(plan_path)['steps']
+            assert [step['number'] for step in steps] == [1, 2, 3, 4, 5]
+
+            assert executor.execute_plan(plan_path) is True
+            assert (vault / "Done" / "notes_plan.md").exists()
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,101 @@
+"""
+Unit tests for ResponseCache
+
+Tests cache keys, conditional request headers, persistence and Retry-After
+parsing.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from response_cache import ResponseCache, cache_key, parse_retry_after
+
+
+class TestResponseCache:
+    """Test suite for ResponseCache."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for testing."""
+        temp_dir = tempfile.mkdtemp()
+        yield Path(temp_dir)
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def cache(self, temp_dir):
+        """Create a ResponseCache backed by a temp file."""
+        return ResponseCache(str(temp_dir / "cache.json"))
+
+    def test_cache_key_ignores_param_order(self):
+        """Test that equivalent params produce the same key."""
+        assert cache_key("shares", {"start": 0, "count": 10}) == cache_key("shares", {"count": 10, "start": 0})
+        assert cache_key("shares") == "shares"
+
+    def test_conditional_headers(self, cache):
+        """Test that stored validators become conditional headers."""
+        assert cache.conditional_headers("messages") == {}
+
+        cache.store("messages", {"elements": []}, {"ETag": '"abc"', "Last-Modified": "Tue, 17 Feb 2026 10:00:00 GMT"})
+
+        assert cache.conditional_headers("messages") == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Tue, 17 Feb 2026 10:00:00 GMT"
+        }
+        assert cache.get("messages") == {"elements": []}
+
+    def test_responses_without_validators_are_not_cached(self, cache):
+        """Test that un-revalidatable responses are skipped."""
+        cache.store("messages", {"elements": []}, {})
+
+        assert cache.get("messages") is None
+
+    def test_persists_across_instances(self, cache, temp_dir):
+        """Test that save() writes entries that a new instance can read."""
+        cache.store("invitations", {"elements": [1]}, {"ETag": "v1"})
+        cache.save()
+
+        reloaded = ResponseCache(str(temp_dir / "cache.json"))
+
+        assert reloaded.get("invitations") == {"elements": [1]}
+
+    def test_discard_restores_saved_entries(self, cache, temp_dir):
+        """Test that discard() drops validators stored since the last save."""
+        cache.store("messages", {"elements": [1]}, {"ETag": "v1"})
+        cache.save()
+        cache.store("messages", {"elements": [2]}, {"ETag": "v2"})
+        cache.store("invitations", {"elements": []}, {"ETag": "v1"})
+
+        cache.discard()
+        cache.save()
+
+        assert cache.conditional_headers("messages") == {"If-None-Match": "v1"}
+        assert cache.get("invitations") is None
+        assert ResponseCache(str(temp_dir / "cache.json")).get("messages") == {"elements": [1]}
+
+    def test_dry_run_does_not_write(self, temp_dir):
+        """Test that dry-run mode never touches disk."""
+        cache = ResponseCache(str(temp_dir / "cache.json"), dry_run=True)
+        cache.store("shares", {}, {"ETag": "v1"})
+        cache.save()
+
+        assert not (temp_dir / "cache.json").exists()
+
+    def test_parse_retry_after(self):
+        """Test delay-seconds, HTTP-date and fallback values."""
+        assert parse_retry_after("120") == 120.0
+        assert parse_retry_after(None, default=30) == 30
+        assert parse_retry_after("garbage", default=5) == 5
+
+        now = 1771322400.0  # Tue, 17 Feb 2026 10:00:00 GMT
+        assert parse_retry_after("Tue, 17 Feb 2026 10:00:45 GMT", now=now) == pytest.approx(45)
+        assert parse_retry_after("Tue, 17 Feb 2026 09:00:00 GMT", now=now) == 0.0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,148 @@
+"""
+Unit tests for RetentionEngine
+
+Tests aged-file selection, packing, index lookup and extraction.
+"""
+
+import pytest
+import sys
+import os
+from pathlib import Path
+from datetime import datetime
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from retention import RetentionEngine, RetentionPolicy, RetentionRule, load_retention_policy
+
+
+NOW = datetime(2026, 6, 1, 12, 0)
+
+
+def _write(path: Path, content: str, when: datetime):
+    """Create a file with a given modification time."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    os.utime(path, (when.timestamp(), when.timestamp()))
+
+
+class TestRetentionEngine:
+    """Test suite for RetentionEngine."""
+
+    @pytest.fixture
+    def temp_vault(self):
+        """Create a temporary vault with old and recent files."""
+        temp_dir = tempfile.mkdtemp()
+        vault = Path(temp_dir)
+        _write(vault / "Done" / "old_task.md", "---\ntask_id: task_42\n---\nOld", datetime(2026, 4, 1))
+        _write(vault / "Done" / "recent_task.md", "---\ntask_id: task_43\n---\nNew", datetime(2026, 5, 25))
+        _write(vault / "Logs" / "gmail_watcher" / "old.log", "old log", datetime(2026, 1, 1))
+        _write(vault / "Logs" / "gmail_watcher" / "current.log", "current log", datetime(2026, 5, 31))
+        yield vault
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def engine(self, temp_vault):
+        """Create an engine with the default handbook policy."""
+        return RetentionEngine(str(temp_vault), RetentionPolicy())
+
+    def test_default_policy(self, temp_vault):
+        """Test that the handbook retention periods are the defaults."""
+        policy = load_retention_policy(str(temp_vault))
+        assert [(r.folder, r.max_age_days) for r in policy.rules] == [("Done", 30), ("Logs", 90)]
+
+    def test_dry_run_changes_nothing(self, temp_vault):
+        """Test that dry-run only reports."""
+        engine = RetentionEngine(str(temp_vault), RetentionPolicy(), dry_run=True)
+
+        assert engine.run(now=NOW) == {"Done": 1, "Logs": 1}
+        assert (temp_vault / "Done" / "old_task.md").exists()
+        assert not (temp_vault / "Archive").exists()
+
+    def test_run_packs_and_removes_aged_files(self, engine, temp_vault):
+        """Test that only aged files are packed and originals removed."""
+        assert engine.run(now=NOW) == {"Done": 1, "Logs": 1}
+
+        assert not (temp_vault / "Done" / "old_task.md").exists()
+        assert (temp_vault / "Done" / "recent_task.md").exists()
+        assert not (temp_vault / "Logs" / "gmail_watcher" / "old.log").exists()
+        assert (temp_vault / "Logs" / "gmail_watcher" / "current.log").exists()
+
+        packs = sorted(p.name for p in (temp_vault / "Archive").glob("*.tar.gz"))
+        assert packs == ["Done-20260601-120000.tar.gz", "Logs-20260601-120000.tar.gz"]
+
+        # Nothing left to archive
+        assert engine.run(now=NOW) == {"Done": 0, "Logs": 0}
+
+    def test_find_and_extract(self, engine, temp_vault):
+        """Test lookup by ID and name, and restoring a file."""
+        engine.run(now=NOW)
+
+        assert [e["path"] for e in engine.find("task_42")] == ["Done/old_task.md"]
+        assert [e["path"] for e in engine.find("old.log")] == ["Logs/gmail_watcher/old.log"]
+        assert engine.find("missing") == []
+
+        restored = engine.extract("task_42")
+        assert restored == [temp_vault / "Done" / "old_task.md"]
+        assert restored[0].read_text().endswith("Old")
+
+        target = temp_vault / "restore"
+        assert engine.extract("old.log", target) == [target / "Logs" / "gmail_watcher" / "old.log"]
+
+    def test_two_rules_on_one_folder_keep_separate_packs(self, temp_vault):
+        """Test that rules sharing a folder and timestamp never overwrite each other's pack."""
+        logs = temp_vault / "Logs" / "gmail_watcher"
+        _write(logs / "a.log", "log a", datetime(2026, 1, 1))
+        _write(logs / "b.json", "{}", datetime(2026, 1, 1))
+        engine = RetentionEngine(str(temp_vault), RetentionPolicy(rules=[
+            RetentionRule(folder="Logs", max_age_days=90, pattern="*.log", recursive=True),
+            RetentionRule(folder="Logs", max_age_days=90, pattern="*.json", recursive=True),
+        ]))
+
+        assert engine.run(now=NOW) == {"Logs (*.log)": 2, "Logs (*.json)": 1}
+        # A second run in the same second gets its own pack too
+        _write(logs / "c.log", "log c", datetime(2026, 1, 1))
+        assert engine.run(now=NOW)["Logs (*.log)"] == 1
+
+        packs = sorted(p.name for p in (temp_vault / "Archive").glob("*.tar.gz"))
+        assert packs == ["Logs-20260601-120000-2.tar.gz", "Logs-20260601-120000-3.tar.gz",
+                         "Logs-20260601-120000.tar.gz"]
+        assert not list((temp_vault / "Archive").glob(".*.tmp"))
+
+        restored = temp_vault / "restore"
+        for name in ("a.log", "b.json", "c.log", "old.log"):
+            assert len(engine.extract(name, restored)) == 1
+
+    def test_flat_done_uses_completion_timestamp(self, temp_vault):
+        """Test that flat Done files are aged by frontmatter, falling back to mtime."""
+        # Edited recently but completed long ago, and the other way round
+        _write(temp_vault / "Done" / "old_plan.md",
+               '---\nlast_updated: "2026-03-01T09:00:00+00:00Z"\n---\nPlan', datetime(2026, 5, 30))
+        _write(temp_vault / "Done" / "new_plan.md",
+               "---\ncompleted: 2026-05-28T09:00:00Z\n---\nPlan", datetime(2026, 1, 1))
+
+        engine = RetentionEngine(
+            str(temp_vault), RetentionPolicy(rules=[RetentionRule(folder="Done", max_age_days=30)])
+        )
+        aged = sorted(p.name for p in engine.aged_files(engine.policy.rules[0], now=NOW))
+
+        assert aged == ["old_plan.md", "old_task.md"]
+
+    def test_sharded_done(self, temp_vault):
+        """Test that shard directories are selected by date and cleaned up."""
+        (temp_vault / "config").mkdir()
+        (temp_vault / "config" / "vault_layout.yaml").write_text("shardedFolders: [Done]\n")
+        _write(temp_vault / "Done" / "2026" / "03" / "02" / "sharded.md", "x", NOW)
+
+        engine = RetentionEngine(
+            str(temp_vault), RetentionPolicy(rules=[RetentionRule(folder="Done", max_age_days=30)])
+        )
+
+        assert engine.run(now=NOW) == {"Done": 2}
+        assert not (temp_vault / "Done" / "2026").exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
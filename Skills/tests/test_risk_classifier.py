@@ -0,0 +1,79 @@
+"""
+Unit tests for the risk classifier
+
+Tests whole-word keyword matching, inflections, amount thresholds, batch
+classification and action-type rules.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from risk_classifier import RiskClassifier, RiskLevel, classify, classify_all, word_forms
+
+
+class TestRiskClassifier:
+    """Test suite for RiskClassifier."""
+
+    @pytest.fixture
+    def classifier(self):
+        """Create a classifier with the default rules."""
+        return RiskClassifier()
+
+    def test_whole_words_only(self, classifier):
+        """Test that keywords inside other words do not match."""
+        assert classifier.classify("Read email").level == RiskLevel.LOW
+        assert classifier.classify("Review compost report").level == RiskLevel.LOW
+        assert classifier.classify("Update the repayment schedule").level == RiskLevel.LOW
+        assert classifier.classify("Send email reply").level == RiskLevel.MEDIUM
+
+    def test_inflections_and_reasons(self, classifier):
+        """Test inflected forms and the reasons reported for a match."""
+        assessment = classifier.classify("Deleted old drafts and sent the summary")
+
+        assert assessment.level == RiskLevel.HIGH
+        assert assessment.reasons == ["'delete' (high)", "'send' (medium)"]
+        assert "paid" in word_forms("pay")
+        assert "replies" in word_forms("reply")
+
+    def test_email_as_verb(self, classifier):
+        """Test that 'email' is sensitive as an imperative verb but not as a noun."""
+        assert classifier.classify("Email the client the signed contract").level == RiskLevel.MEDIUM
+        assert classifier.classify("Email John the quarterly report").level == RiskLevel.MEDIUM
+        assert classifier.classify("Then email them the invoice").is_sensitive
+        assert classifier.classify("Read and analyze email content").level == RiskLevel.LOW
+        assert classifier.classify("Check email from John").level == RiskLevel.LOW
+
+        texts = ["Read email", "Email the client"]
+        assert [a.is_sensitive for a in classifier.classify_all(texts)] == [False, True]
+        assert RiskClassifier(medium_verbs=[]).classify("Email the client").level == RiskLevel.LOW
+
+    def test_amount_threshold(self, classifier):
+        """Test that only amounts above the threshold are high risk."""
+        assert classifier.classify("Prepare quote for $9,500").level == RiskLevel.LOW
+        assessment = classifier.classify("Prepare quote for $25,000.00")
+        assert assessment.level == RiskLevel.HIGH
+        assert "amount $25,000.00" in assessment.reasons[0]
+
+    def test_classify_all_matches_single(self):
+        """Test that batch classification agrees with one-by-one classification."""
+        texts = ["Analyze results", "Post to LinkedIn", "", "Make payment\nthen log it", "Read file"]
+
+        batch = classify_all(texts)
+
+        assert [a.level for a in batch] == [classify(t).level for t in texts]
+        assert [a.is_sensitive for a in batch] == [False, True, False, True, False]
+
+    def test_classify_action(self, classifier):
+        """Test action-type levels, external recipients and amounts."""
+        assert classifier.classify_action("send_email", {"to": "a@internal.com"}).level == RiskLevel.MEDIUM
+        assert classifier.classify_action("internal_notification", {}).level == RiskLevel.LOW
+        assert classifier.classify_action("notify", {"to": "a@example.com"}).level == RiskLevel.MEDIUM
+        assert classifier.classify_action("create_invoice_draft", {"amount": 50000}).level == RiskLevel.HIGH
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
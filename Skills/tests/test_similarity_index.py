@@ -0,0 +1,156 @@
+"""
+Unit tests for SimilarityIndex
+
+Tests SimHash fingerprinting, windowed near-duplicate lookup, and collapsing
+duplicates into existing watcher task files.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Any
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from similarity_index import (
+    SimilarityIndex, simhash, hamming_distance, normalize_text, append_duplicate_reference
+)
+from base_watcher import BaseWatcher, WatcherConfig
+
+
+JOB_ALERT = (
+    "Sales Development Associate at Shark Innovation Labs and 5 more Labs jobs in Karachi "
+    "UTF Labs, appearls, and Kodexo Labs have new jobs. Apply now to be one of the first "
+    "applicants. See all jobs https://www.indeed.com/jobs?q=labs&tk=1abc"
+)
+
+
+class FakeWatcher(BaseWatcher):
+    """Minimal watcher that serves items from a dictionary."""
+
+    def __init__(self, config: WatcherConfig, items: Dict[str, Dict[str, Any]]):
+        self.items = items
+        super().__init__(config, "FakeWatcher")
+
+    def authenticate(self) -> bool:
+        return True
+
+    def check_for_new_items(self) -> List[str]:
+        return list(self.items)
+
+    def get_item_content(self, item_id: str) -> Optional[Dict[str, Any]]:
+        return dict(self.items[item_id])
+
+    def is_important(self, item: Dict[str, Any]) -> bool:
+        return True
+
+    def detect_priority(self, item: Dict[str, Any]) -> str:
+        return 'high'
+
+    def generate_markdown(self, item: Dict[str, Any]) -> str:
+        return f"---\npriority: high\n---\n\n# {item['title']}\n\n{item['body']}\n"
+
+
+class TestSimilarityIndex:
+    """Test suite for SimilarityIndex."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for testing."""
+        temp_dir = tempfile.mkdtemp()
+        yield Path(temp_dir)
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def index(self, temp_dir):
+        """Create a SimilarityIndex backed by a temp file."""
+        return SimilarityIndex(str(temp_dir / "similarity.json"), window_seconds=3600)
+
+    def test_normalize_text_folds_noise(self):
+        """Test that URLs, tags and digits are normalised away."""
+        assert normalize_text("<b>5 more</b> jobs https://x.com/a?b=1") == "# more jobs"
+        assert normalize_text("7 more jobs") == normalize_text("12 more jobs")
+
+    def test_simhash_near_duplicates_are_close(self):
+        """Test that small edits produce nearby fingerprints."""
+        repeat = JOB_ALERT.replace("5 more", "7 more").replace("tk=1abc", "tk=9xyz")
+        assert hamming_distance(simhash(JOB_ALERT), simhash(repeat)) <= 3
+
+    def test_simhash_different_texts_are_far(self):
+        """Test that unrelated texts produce distant fingerprints."""
+        other = "Invoice 2231 is overdue, please arrange payment to the vendor by Friday"
+        assert hamming_distance(simhash(JOB_ALERT), simhash(other)) > 3
+
+    def test_find_similar_within_window(self, index):
+        """Test that a near-duplicate is found inside the window."""
+        index.add(JOB_ALERT, "email_1", "Needs_Action/a.md", now=1000.0)
+
+        match = index.find_similar(JOB_ALERT.replace("5 more", "6 more"), now=1010.0)
+
+        assert match is not None
+        assert match.item_id == "email_1"
+        assert match.filepath == "Needs_Action/a.md"
+
+    def test_find_similar_outside_window(self, index):
+        """Test that old entries no longer absorb duplicates."""
+        index.add(JOB_ALERT, "email_1", "Needs_Action/a.md", now=1000.0)
+
+        assert index.find_similar(JOB_ALERT, now=1000.0 + 7200) is None
+
+    def test_index_persists(self, index, temp_dir):
+        """Test that entries survive a reload."""
+        index.add(JOB_ALERT, "email_1", "Needs_Action/a.md")
+
+        reloaded = SimilarityIndex(str(temp_dir / "similarity.json"), window_seconds=3600)
+
+        assert reloaded.find_similar(JOB_ALERT) is not None
+
+    def test_max_distance_must_fit_bands(self, temp_dir):
+        """Test that unsupported distances are rejected."""
+        with pytest.raises(ValueError):
+            SimilarityIndex(str(temp_dir / "similarity.json"), max_distance=4)
+
+    def test_append_duplicate_reference(self, temp_dir):
+        """Test appending references to an existing task file."""
+        task = temp_dir / "task.md"
+        task.write_text("# Task\n")
+
+        assert append_duplicate_reference(str(task), "first") is True
+        assert append_duplicate_reference(str(task), "second") is True
+
+        content = task.read_text()
+        assert content.count("## Related Items") == 1
+        assert "- first" in content
+        assert "- second" in content
+        assert append_duplicate_reference(str(temp_dir / "missing.md"), "x") is False
+
+    def test_watcher_collapses_duplicates(self, temp_dir):
+        """Test that BaseWatcher writes one file for a burst of repeats."""
+        config = WatcherConfig(
+            inbox_folder=str(temp_dir / "Inbox"),
+            needs_action_folder=str(temp_dir / "Needs_Action"),
+            log_folder=str(temp_dir / "Logs"),
+            index_path=str(temp_dir / ".index")
+        )
+        items = {
+            "a": {"title": "Sales Development Associate", "body": JOB_ALERT},
+            "b": {"title": "Sales Development Associate", "body": JOB_ALERT.replace("5 more", "7 more")},
+            "c": {"title": "Quarterly invoice", "body": "Invoice 2231 is overdue, please arrange payment"}
+        }
+        watcher = FakeWatcher(config, items)
+
+        stats = watcher.poll_once()
+
+        assert stats["created"] == 2
+        assert stats["duplicates"] == 1
+        files = list((temp_dir / "Needs_Action").glob("*.md"))
+        assert len(files) == 2
+        assert any("`b`" in f.read_text() for f in files)
+        assert watcher.processed_items["b"]["duplicate_of"] == "a"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
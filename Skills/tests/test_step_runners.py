@@ -0,0 +1,208 @@
+"""
+Unit tests for step runners
+
+Tests runner resolution, sync and MCP runners, global and per-tool
+concurrency limits, timeouts and concurrent plan execution.
+"""
+
+import pytest
+import sys
+import asyncio
+import time
+from types import SimpleNamespace
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from step_runners import DEFAULT_ACTION, StepDispatcher, StepRunnerRegistry, mcp_tool_runner
+
+
+def step(number, text, action_type=None, arguments=None):
+    """Build a step dictionary."""
+    return {'number': number, 'text': text, 'action_type': action_type, 'arguments': arguments}
+
+
+class TestStepRunners:
+    """Test suite for StepRunnerRegistry and StepDispatcher."""
+
+    def test_resolve_by_action_type_keyword_and_fallback(self):
+        """Test that steps route by action type, then keywords, then the fallback."""
+        registry = StepRunnerRegistry()
+        registry.register("send_email", lambda s: True, keywords=["email", "reply"])
+        registry.register("research", lambda s: True, keywords=["research"])
+
+        assert registry.resolve(step(1, "Anything", "research")).action_type == "research"
+        assert registry.resolve(step(2, "Send the Reply")).action_type == "send_email"
+        assert registry.resolve(step(3, "Reread emails")).action_type == DEFAULT_ACTION
+        assert registry.resolve(step(4, "Tidy up", "unknown")).action_type == DEFAULT_ACTION
+
+    def test_sync_and_mcp_runners(self):
+        """Test that sync runners run in threads and MCP errors count as failure."""
+        class FakeServer:
+            async def execute_tool(self, tool_name, arguments):
+                if arguments.get("to"):
+                    return SimpleNamespace(type="text", text=f"Sent via {tool_name}")
+                return SimpleNamespace(type="text", text="Error: missing 'to'")
+
+        registry = StepRunnerRegistry()
+        registry.register("skill", lambda s: s['text'] == "ok")
+        registry.register("send_email", mcp_tool_runner(FakeServer(), "send_email"))
+        dispatcher = StepDispatcher(registry)
+
+        async def run_all():
+            return await asyncio.gather(
+                dispatcher.run(step(1, "ok", "skill")),
+                dispatcher.run(step(2, "bad", "skill")),
+                dispatcher.run(step(3, "mail", "send_email", {"to": "a@example.com"})),
+                dispatcher.run(step(4, "mail", "send_email", {}))
+            )
+
+        assert asyncio.run(run_all()) == [True, False, True, False]
+
+    def test_global_and_tool_limits(self):
+        """Test that concurrency stays within the global and per-tool limits."""
+        active = {"total": 0, "slow_api": 0}
+        peaks = {"total": 0, "slow_api": 0}
+
+        def make_runner(tool):
+            async def run(s):
+                active["total"] += 1
+                active[tool] = active.get(tool, 0) + 1
+                peaks["total"] = max(peaks["total"], active["total"])
+                peaks[tool] = max(peaks.get(tool, 0), active[tool])
+                await asyncio.sleep(0.01)
+                active["total"] -= 1
+                active[tool] -= 1
+                return True
+            return run
+
+        registry = StepRunnerRegistry()
+        registry.register("slow_api", make_runner("slow_api"))
+        registry.register("local", make_runner("local"))
+        dispatcher = StepDispatcher(registry, max_concurrency=4, tool_limits={"slow_api": 1})
+
+        async def run_all():
+            steps = [step(n, "x", "slow_api" if n % 2 else "local") for n in range(20)]
+            return await asyncio.gather(*(dispatcher.run(s) for s in steps))
+
+        assert all(asyncio.run(run_all()))
+        assert peaks["slow_api"] == 1
+        assert peaks["total"] <= 4
+        assert peaks["local"] >= 2
+
+        # A second event loop gets fresh semaphores
+        assert all(asyncio.run(run_all()))
+
+    def test_timeout_and_exception_fail_the_step(self):
+        """Test that timeouts and runner exceptions are reported as failures."""
+        async def hang(s):
+            await asyncio.sleep(10)
+
+        async def boom(s):
+            raise RuntimeError("boom")
+
+        registry = StepRunnerRegistry()
+        registry.register("hang", hang, timeout=0.05)
+        registry.register("boom", boom)
+        dispatcher = StepDispatcher(registry)
+
+        start = time.monotonic()
+        assert asyncio.run(dispatcher.run(step(1, "x", "hang"))) is False
+        assert time.monotonic() - start < 1
+        assert asyncio.run(dispatcher.run(step(2, "x", "boom"))) is False
+
+    def test_step_without_runner_fails(self):
+        """Test that a step no runner handles is not reported as done."""
+        dispatcher = StepDispatcher(StepRunnerRegistry())
+
+        assert asyncio.run(dispatcher.run(step(1, "Tidy up the office"))) is False
+
+    def test_execute_all_plans_runs_plans_concurrently(self):
+        """Test that plans run at the same time instead of one after another."""
+        from plan_reasoning_loop import ExecutionPlan, PlanStep, write_plan
+        from plan_executor import PlanExecutor, PlanExecutorConfig
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            vault = Path(temp_dir)
+            executor = PlanExecutor(PlanExecutorConfig(
+                vault_path=temp_dir,
+                log_folder=str(vault / "Logs" / "plan_executor"),
+                max_concurrent_plans=4
+            ))
+
+            async def research(s):
+                await asyncio.sleep(0.2)
+                return True
+
+            executor.runners.register("research", research, keywords=["research"])
+            for i in range(4):
+                write_plan(vault / "Plans" / f"p{i}_plan.md", ExecutionPlan(
+                    task_id=f"p{i}",
+                    task_file=f"Needs_Action/p{i}.md",
+                    goal="Research",
+                    steps=[PlanStep(1, "Research the topic", False, False)],
+                    created_at="2026-02-19T12:00:00"
+                ))
+
+            start = time.monotonic()
+            stats = executor.execute_all_plans()
+            elapsed = time.monotonic() - start
+
+            assert stats['completed'] == 4
+            assert elapsed < 0.6
+        finally:
+            shutil.rmtree(temp_dir)
+
+    def test_execute_all_plans_reports_each_outcome(self):
+        """Test that completed, failed and approval-waiting plans are counted apart."""
+        from plan_reasoning_loop import ExecutionPlan, PlanStep, write_plan
+        from plan_executor import PlanExecutor, PlanExecutorConfig
+
+        temp_dir = tempfile.mkdtemp()
+        try:
+            vault = Path(temp_dir)
+            executor = PlanExecutor(PlanExecutorConfig(
+                vault_path=temp_dir,
+                log_folder=str(vault / "Logs" / "plan_executor")
+            ))
+            (vault / "Needs_Action").mkdir()
+            (vault / "Needs_Action" / "invoice.md").write_text(
+                "---\ntype: email\n---\n# Invoice\nPlease pay invoice 22 by Friday.\n"
+            )
+
+            def plan(name, *steps):
+                write_plan(vault / "Plans" / f"{name}_plan.md", ExecutionPlan(
+                    task_id=name,
+                    task_file="Needs_Action/invoice.md",
+                    goal="Handle the invoice",
+                    steps=list(steps),
+                    created_at="2026-02-19T12:00:00"
+                ))
+
+            plan("skill", PlanStep(1, "Analyze the invoice", False, False))
+            plan("manual", PlanStep(1, "Tidy up the office", False, False))
+            plan("sensitive", PlanStep(1, "Pay the invoice", True, True))
+            (vault / "Plans" / "cycle_plan.md").write_text(
+                "# Plan\n\n"
+                "1. [ ] Analyze the invoice\n   - Depends on: Step(s) 2\n"
+                "2. [ ] Summarize the invoice\n   - Depends on: Step(s) 1\n"
+            )
+
+            stats = executor.execute_all_plans()
+
+            assert stats['total'] == 4
+            assert stats['completed'] == 1
+            assert stats['failed'] == 2
+            assert stats['pending_approval'] == 1
+            assert executor.runners.resolve(step(1, "Draft reply to the client")).action_type == "draft_reply"
+            assert executor.runners.resolve(step(2, "Post it", "post_to_linkedin")).tool == "social_media"
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,204 @@
+"""
+Unit tests for VaultCatalog
+
+Tests incremental refresh of flat and date-sharded folders, filtered
+listings and frontmatter and metric aggregation.
+"""
+
+import pytest
+import sys
+import os
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import vault_catalog
+from vault_catalog import VaultCatalog, parse_frontmatter, parse_metrics
+from vault_layout import VaultLayout, VaultLayoutConfig
+
+
+TRACKING_FILE = """---
+platform: {platform}
+post_id: {post_id}
+status: published
+---
+
+# Post
+
+## Engagement Metrics
+- Likes: {likes}
+- Comments: 2
+- Shares: 0
+- Views: 10
+"""
+
+
+class TestVaultCatalog:
+    """Test suite for VaultCatalog."""
+
+    @pytest.fixture
+    def temp_vault(self):
+        """Create a temporary vault for testing."""
+        temp_dir = tempfile.mkdtemp()
+        vault = Path(temp_dir)
+        for folder in ["Inbox", "Pending_Approval", "Social_Media_Tracking"]:
+            (vault / folder).mkdir()
+        yield vault
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def catalog(self, temp_vault):
+        """Create a VaultCatalog for the temp vault."""
+        catalog = VaultCatalog(str(temp_vault))
+        yield catalog
+        catalog.close()
+
+    def test_parse_helpers(self):
+        """Test frontmatter and metric parsing."""
+        assert parse_frontmatter("---\nstatus: pending\n---\n\n# Body") == {"status": "pending"}
+        assert parse_frontmatter("# No frontmatter") == {}
+        assert parse_frontmatter("---\n: [bad\n---\n") == {}
+        assert parse_metrics("- Likes: 5\n- Views: 7\n") == {"likes": 5, "views": 7}
+
+    def test_counts_and_listing(self, catalog, temp_vault):
+        """Test that refresh picks up files and counts them per folder."""
+        (temp_vault / "Inbox" / "a.md").write_text("---\nstatus: pending\n---\n")
+        (temp_vault / "Inbox" / "b.md").write_text("---\nstatus: done\n---\n")
+        (temp_vault / "Inbox" / "notes.txt").write_text("ignored")
+        (temp_vault / "Pending_Approval" / "approval_1.md").write_text("# A")
+        (temp_vault / "Pending_Approval" / "other.md").write_text("# B")
+
+        catalog.refresh(["Inbox", "Pending_Approval", "Missing"])
+
+        assert [catalog.count(folder) for folder in ["Inbox", "Pending_Approval", "Missing"]] == [2, 2, 0]
+        assert catalog.count("Inbox", status="pending") == 1
+        assert catalog.list_files("Pending_Approval", pattern="approval_*.md") == [
+            temp_vault / "Pending_Approval" / "approval_1.md"
+        ]
+
+    def test_refresh_only_rereads_changed_files(self, catalog, temp_vault, monkeypatch):
+        """Test that unchanged files are not read again."""
+        for i in range(5):
+            (temp_vault / "Inbox" / f"{i}.md").write_text(f"# {i}")
+        assert catalog.refresh(["Inbox"]) == 5
+
+        reads = []
+        original = VaultCatalog._row_for
+        monkeypatch.setattr(VaultCatalog, "_row_for",
+                            lambda self, rel, *args, **kw: reads.append(rel) or original(self, rel, *args, **kw))
+
+        assert catalog.refresh(["Inbox"]) == 0
+        assert reads == []
+
+        changed = temp_vault / "Inbox" / "3.md"
+        changed.write_text("---\nstatus: done\n---\n# changed")
+        os.utime(changed, ns=(changed.stat().st_atime_ns, changed.stat().st_mtime_ns + 10**9))
+        (temp_vault / "Inbox" / "4.md").unlink()
+
+        assert catalog.refresh(["Inbox"]) == 2
+        assert reads == ["Inbox/3.md"]
+        assert catalog.count("Inbox") == 4
+        assert catalog.count("Inbox", status="done") == 1
+
+    def test_update_and_remove_file(self, catalog, temp_vault):
+        """Test targeted updates without a folder refresh."""
+        path = temp_vault / "Inbox" / "task.md"
+        path.write_text("---\ntype: email\n---\n")
+
+        catalog.update_file(path)
+        assert catalog.entries("Inbox")[0]["type"] == "email"
+
+        catalog.remove_file(path)
+        assert catalog.count("Inbox") == 0
+
+    def test_group_counts_and_metrics(self, catalog, temp_vault):
+        """Test the aggregates used by the weekly social media summary."""
+        folder = temp_vault / "Social_Media_Tracking"
+        (folder / "l1.md").write_text(TRACKING_FILE.format(platform="linkedin", post_id="p1", likes=3))
+        (folder / "l2.md").write_text(TRACKING_FILE.format(platform="linkedin", post_id="p2", likes=4))
+        (folder / "t1.md").write_text(TRACKING_FILE.format(platform="twitter", post_id="p3", likes=1))
+
+        catalog.refresh(["Social_Media_Tracking"], read_body=True)
+
+        assert catalog.group_counts("Social_Media_Tracking", "platform") == {"linkedin": 2, "twitter": 1}
+        assert catalog.sum_metrics("Social_Media_Tracking") == {
+            "likes": 8, "comments": 6, "shares": 0, "views": 30
+        }
+
+    def test_header_only_refresh(self, catalog, temp_vault):
+        """Test that bodies are skipped unless metrics are requested."""
+        path = temp_vault / "Social_Media_Tracking" / "l1.md"
+        path.write_text(TRACKING_FILE.format(platform="linkedin", post_id="p1", likes=3) + "x" * 100000)
+
+        catalog.refresh(["Social_Media_Tracking"])
+        assert catalog.group_counts("Social_Media_Tracking", "platform") == {"linkedin": 1}
+        assert catalog.sum_metrics("Social_Media_Tracking")["likes"] == 0
+
+        # Header-only rows are re-read when metrics are needed
+        assert catalog.refresh(["Social_Media_Tracking"], read_body=True) == 1
+        assert catalog.sum_metrics("Social_Media_Tracking")["likes"] == 3
+
+    def test_unchanged_directory_is_not_listed(self, catalog, temp_vault, monkeypatch):
+        """Test that a refresh skips directories whose mtime has not changed."""
+        (temp_vault / "Inbox" / "a.md").write_text("# A")
+        catalog.refresh(["Inbox"])
+
+        listed = []
+        original = os.scandir
+        monkeypatch.setattr(vault_catalog.os, "scandir", lambda path: listed.append(path) or original(path))
+
+        assert catalog.refresh(["Inbox"]) == 0
+        assert listed == []
+        assert catalog.count("Inbox") == 1
+
+        (temp_vault / "Inbox" / "b.md").write_text("# B")
+        assert catalog.refresh(["Inbox"]) == 1
+        assert listed == [temp_vault / "Inbox"]
+
+    def test_sharded_folder(self, temp_vault):
+        """Test that day shards are catalogued under their folder."""
+        layout = VaultLayout(str(temp_vault), config=VaultLayoutConfig(sharded_folders=["Done"]))
+        catalog = VaultCatalog(str(temp_vault), layout=layout)
+        try:
+            day_dir = temp_vault / "Done" / "2026" / "02" / "17"
+            day_dir.mkdir(parents=True)
+            (temp_vault / "Done" / "old_plan.md").write_text("# Old")
+            (day_dir / "task_plan.md").write_text("---\nstatus: done\n---\n")
+
+            assert catalog.refresh(["Done"]) == 2
+            assert catalog.list_files("Done") == [temp_vault / "Done" / "old_plan.md", day_dir / "task_plan.md"]
+            assert catalog.count("Done", status="done") == 1
+
+            # Files in other days with the same name are separate rows
+            other_day = temp_vault / "Done" / "2026" / "02" / "18"
+            other_day.mkdir()
+            (other_day / "task_plan.md").write_text("# Again")
+            (day_dir / "task_plan.md").unlink()
+            assert catalog.refresh(["Done"]) == 2
+            assert catalog.list_files("Done", pattern="task_*") == [other_day / "task_plan.md"]
+
+            # Targeted updates map shard paths back to the folder
+            (other_day / "late_plan.md").write_text("# Late")
+            catalog.update_file(other_day / "late_plan.md")
+            assert catalog.count("Done") == 3
+        finally:
+            catalog.close()
+
+    def test_catalog_persists(self, catalog, temp_vault):
+        """Test that the database lives under .index and survives reopening."""
+        (temp_vault / "Inbox" / "a.md").write_text("# A")
+        catalog.refresh(["Inbox"])
+
+        reopened = VaultCatalog(str(temp_vault))
+        try:
+            assert (temp_vault / ".index" / "vault_catalog.db").exists()
+            assert reopened.count("Inbox") == 1
+        finally:
+            reopened.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,176 @@
+"""
+Unit tests for VaultEventDispatcher
+
+Tests the polling fallback, debouncing, burst coalescing and background jobs.
+"""
+
+import pytest
+import sys
+import threading
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vault_events import VaultEventDispatcher, VaultEventConfig, FolderPoller, CoalescedJob
+
+
+class TestVaultEventDispatcher:
+    """Test suite for VaultEventDispatcher."""
+
+    @pytest.fixture
+    def temp_vault(self):
+        """Create a temporary vault for testing."""
+        temp_dir = tempfile.mkdtemp()
+        yield Path(temp_dir)
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def dispatcher(self, temp_vault):
+        """Create a polling dispatcher with one recorded route."""
+        dispatcher = VaultEventDispatcher(
+            VaultEventConfig(vault_path=str(temp_vault), debounce_ms=300, use_watchdog=False)
+        )
+        dispatcher.calls = []
+        dispatcher.on("Inbox", lambda paths: dispatcher.calls.append([p.name for p in paths]))
+        return dispatcher
+
+    def test_poller_reports_new_files_only(self, temp_vault):
+        """Test that existing files form the baseline and only new ones are reported."""
+        folder = temp_vault / "Inbox"
+        folder.mkdir()
+        (folder / "old.md").write_text("old")
+
+        poller = FolderPoller([folder])
+        assert poller.poll() == []
+
+        (folder / "new.md").write_text("new")
+        (folder / ".tmp123.tmp").write_text("partial")
+
+        assert poller.poll() == [folder / "new.md"]
+        assert poller.poll() == []
+
+    def test_burst_is_coalesced_after_debounce(self, dispatcher, temp_vault):
+        """Test that a burst of files produces a single handler call."""
+        for name in ["a.md", "b.md", "c.md"]:
+            (temp_vault / "Inbox" / name).write_text(name)
+            dispatcher.notify(temp_vault / "Inbox" / name, now=100.0)
+
+        # Still inside the quiet period
+        assert dispatcher.dispatch_ready(now=100.1) == 0
+        assert dispatcher.calls == []
+
+        assert dispatcher.dispatch_ready(now=100.5) == 1
+        assert dispatcher.calls == [["a.md", "b.md", "c.md"]]
+
+    def test_new_event_extends_debounce(self, dispatcher, temp_vault):
+        """Test that events keep arriving reset the quiet period."""
+        (temp_vault / "Inbox" / "a.md").write_text("a")
+        (temp_vault / "Inbox" / "b.md").write_text("b")
+
+        dispatcher.notify(temp_vault / "Inbox" / "a.md", now=10.0)
+        dispatcher.notify(temp_vault / "Inbox" / "b.md", now=10.25)
+
+        assert dispatcher.dispatch_ready(now=10.4) == 0
+        assert dispatcher.dispatch_ready(now=10.6) == 1
+
+    def test_ignores_unrouted_and_vanished_files(self, dispatcher, temp_vault):
+        """Test that other folders, temp files and moved-away files are skipped."""
+        (temp_vault / "Other").mkdir()
+        dispatcher.notify(temp_vault / "Other" / "x.md", now=1.0)
+        dispatcher.notify(temp_vault / "Inbox" / ".x.tmp", now=1.0)
+        dispatcher.notify(temp_vault / "Inbox" / "gone.md", now=1.0)
+
+        dispatcher.dispatch_ready(now=5.0)
+
+        assert dispatcher.calls == []
+
+    def test_poll_once_feeds_dispatcher(self, dispatcher, temp_vault):
+        """Test the polling fallback end to end."""
+        dispatcher.start()
+        (temp_vault / "Inbox" / "task.md").write_text("task")
+
+        dispatcher.poll_once()
+        dispatcher.dispatch_ready(now=float("inf"))
+
+        assert dispatcher.calls == [["task.md"]]
+
+    def test_dry_run_skips_handlers(self, temp_vault):
+        """Test that dry-run mode only logs."""
+        calls = []
+        dispatcher = VaultEventDispatcher(
+            VaultEventConfig(vault_path=str(temp_vault), use_watchdog=False, dry_run=True)
+        )
+        dispatcher.on("Inbox", calls.append)
+        (temp_vault / "Inbox" / "a.md").write_text("a")
+        dispatcher.notify(temp_vault / "Inbox" / "a.md", now=0.0)
+
+        dispatcher.dispatch_ready(now=10.0)
+
+        assert calls == []
+
+
+class TestCoalescedJob:
+    """Test suite for CoalescedJob."""
+
+    def test_requests_during_a_run_coalesce_into_one_rerun(self):
+        """Test that a burst of requests neither blocks nor queues one run each."""
+        release = threading.Event()
+        started = threading.Event()
+
+        def job():
+            started.set()
+            assert release.wait(5)
+
+        coalesced = CoalescedJob(job, "test-job")
+        coalesced.request()
+        assert started.wait(5)
+
+        # The job is busy: these return at once and fold into one rerun
+        for _ in range(5):
+            coalesced.request()
+        assert coalesced.runs == 0
+
+        release.set()
+        coalesced.wait(5)
+
+        assert coalesced.runs == 2
+
+    def test_failed_run_does_not_stop_later_requests(self):
+        """Test that an exception is logged and the job can run again."""
+        calls = []
+
+        def job():
+            calls.append(1)
+            raise RuntimeError("boom")
+
+        coalesced = CoalescedJob(job, "test-job")
+        coalesced.request()
+        coalesced.wait(5)
+        coalesced.request()
+        coalesced.wait(5)
+
+        assert len(calls) == 2
+
+    def test_dispatcher_stop_waits_for_background_jobs(self):
+        """Test that stopping the dispatcher lets background work finish."""
+        done = []
+        release = threading.Event()
+        temp_dir = tempfile.mkdtemp()
+        try:
+            dispatcher = VaultEventDispatcher(VaultEventConfig(vault_path=temp_dir, use_watchdog=False))
+            job = dispatcher.background(lambda: release.wait(5) and done.append(1), "test-job")
+
+            job.request()
+            release.set()
+            dispatcher.stop()
+
+            assert done == [1]
+        finally:
+            shutil.rmtree(temp_dir)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,95 @@
+"""
+Unit tests for VaultLayout
+
+Tests shard placement, date-range listing, counting, lookup and migration.
+"""
+
+import pytest
+import sys
+import os
+from pathlib import Path
+from datetime import date, datetime
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vault_layout import VaultLayout, VaultLayoutConfig, load_layout_config
+
+
+def _touch(path: Path, when: datetime):
+    """Create a file with a given modification time."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(path.name)
+    os.utime(path, (when.timestamp(), when.timestamp()))
+
+
+class TestVaultLayout:
+    """Test suite for VaultLayout."""
+
+    @pytest.fixture
+    def temp_vault(self):
+        """Create a temporary vault for testing."""
+        temp_dir = tempfile.mkdtemp()
+        yield Path(temp_dir)
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def layout(self, temp_vault):
+        """Create a layout with Done sharded."""
+        return VaultLayout(str(temp_vault), VaultLayoutConfig(sharded_folders=["Done"]))
+
+    def test_config_file(self, temp_vault):
+        """Test that sharding is off by default and enabled from config."""
+        assert load_layout_config(str(temp_vault)).sharded_folders == []
+
+        (temp_vault / "config").mkdir()
+        (temp_vault / "config" / "vault_layout.yaml").write_text("shardedFolders:\n  - Done\n  - Logs\n")
+
+        layout = VaultLayout(str(temp_vault))
+        assert layout.is_sharded("Done")
+        assert not layout.is_sharded("Inbox")
+
+    def test_shard_paths(self, layout, temp_vault):
+        """Test destinations for sharded and flat folders."""
+        when = datetime(2026, 2, 17, 9, 30)
+
+        assert layout.shard_path("Done", "a.md", when) == temp_vault / "Done" / "2026" / "02" / "17" / "a.md"
+        assert layout.shard_path("Plans", "a.md", when) == temp_vault / "Plans" / "a.md"
+        assert layout.resolve_destination(temp_vault / "Inbox" / "a.md") == temp_vault / "Inbox" / "a.md"
+        assert layout.resolve_destination(temp_vault / "Done" / "a.md").parent.parent.parent.parent == temp_vault / "Done"
+
+    def test_range_listing_and_count(self, layout, temp_vault):
+        """Test that range queries include shards and legacy flat files."""
+        done = temp_vault / "Done"
+        _touch(done / "2026" / "01" / "31" / "jan.md", datetime(2026, 1, 31))
+        _touch(done / "2026" / "02" / "17" / "feb1.md", datetime(2026, 2, 17))
+        _touch(done / "2026" / "02" / "17" / "feb2.md", datetime(2026, 2, 17))
+        _touch(done / "2025" / "12" / "01" / "dec.md", datetime(2025, 12, 1))
+        _touch(done / "legacy.md", datetime(2026, 2, 1))
+
+        names = sorted(p.name for p in layout.iter_files("Done", date(2026, 2, 1), date(2026, 2, 28)))
+
+        assert names == ["feb1.md", "feb2.md", "legacy.md"]
+        assert layout.count("Done") == 5
+        assert layout.count("Done", start=date(2026, 1, 1)) == 4
+        assert layout.find("Done", "dec.md") == done / "2025" / "12" / "01" / "dec.md"
+        assert layout.find("Done", "missing.md") is None
+
+    def test_migrate(self, layout, temp_vault):
+        """Test that flat files move into the shard for their mtime."""
+        done = temp_vault / "Done"
+        _touch(done / "old.md", datetime(2026, 2, 17, 12))
+
+        assert layout.migrate("Done", dry_run=True) == 1
+        assert (done / "old.md").exists()
+
+        assert layout.migrate("Done") == 1
+        assert (done / "2026" / "02" / "17" / "old.md").exists()
+        assert not (done / "old.md").exists()
+        assert layout.migrate("Plans") == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
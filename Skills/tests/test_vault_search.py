@@ -0,0 +1,125 @@
+"""
+Unit tests for VaultSearch
+
+Tests BM25 ranking, incremental refresh, folder filters and query parsing.
+"""
+
+import pytest
+import sys
+import os
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vault_search import VaultSearch, build_query, document_fields
+
+
+class TestVaultSearch:
+    """Test suite for VaultSearch."""
+
+    @pytest.fixture
+    def temp_vault(self):
+        """Create a temporary vault with a few notes."""
+        temp_dir = tempfile.mkdtemp()
+        vault = Path(temp_dir)
+        for folder in ["Inbox", "Needs_Action", "Done/2026/02/17"]:
+            (vault / folder).mkdir(parents=True)
+
+        (vault / "Needs_Action" / "invoice.md").write_text(
+            '---\nsubject: "Invoice #123 overdue"\nsender: "billing@acme.com"\n---\n\n'
+            "Please pay the invoice for January.\n"
+        )
+        (vault / "Needs_Action" / "meeting.md").write_text(
+            "---\nsubject: Team meeting\n---\n\nAgenda mentions the invoice process briefly.\n"
+        )
+        (vault / "Done" / "2026" / "02" / "17" / "plan.md").write_text(
+            "# Execution Plan: Quarterly report\n\n1. [x] Collect numbers\n"
+        )
+        yield vault
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def index(self, temp_vault):
+        """Create a refreshed search index."""
+        index = VaultSearch(str(temp_vault))
+        index.refresh()
+        yield index
+        index.close()
+
+    def test_build_query(self):
+        """Test that punctuation cannot break the FTS5 query."""
+        assert build_query('invoice "#123" (acme)') == '"invoice" "123" "acme"*'
+        assert build_query("a-b", prefix=False) == '"a" "b"'
+        assert build_query("!!!") is None
+
+    def test_document_fields(self):
+        """Test title selection and frontmatter text."""
+        title, fields, body = document_fields("---\nsubject: Hello\nlabels: [A, B]\n---\nBody", "x")
+        assert title == "Hello"
+        assert fields == "subject Hello\nlabels A B"
+        assert body == "Body"
+        assert document_fields("# Heading\ntext", "x")[0] == "Heading"
+
+    def test_ranking_prefers_title_matches(self, index, temp_vault):
+        """Test that a title match outranks a passing body mention."""
+        results = index.search("invoice")
+
+        assert [r.path.name for r in results] == ["invoice.md", "meeting.md"]
+        assert results[0].title == "Invoice #123 overdue"
+        assert results[0].score > results[1].score
+        assert "**" in results[1].snippet
+
+    def test_fields_prefix_and_folder_filter(self, index):
+        """Test frontmatter search, prefix matching and folder filters."""
+        assert [r.path.name for r in index.search("billing acme")] == ["invoice.md"]
+        assert [r.path.name for r in index.search("quarter")] == ["plan.md"]
+        assert index.search("invoice", folder="Done") == []
+        assert index.search("nothing matches this") == []
+
+    def test_incremental_refresh(self, index, temp_vault):
+        """Test that only changed files are re-indexed."""
+        assert index.refresh() == 0
+
+        note = temp_vault / "Needs_Action" / "meeting.md"
+        note.write_text("---\nsubject: Team offsite\n---\n\nLocation TBD\n")
+        os.utime(note, ns=(note.stat().st_atime_ns, note.stat().st_mtime_ns + 10**9))
+        (temp_vault / "Needs_Action" / "invoice.md").unlink()
+
+        assert index.refresh() == 2
+        assert index.search("invoice") == []
+        assert [r.path.name for r in index.search("offsite")] == ["meeting.md"]
+        assert index.count() == 2
+
+    def test_update_and_remove_file(self, index, temp_vault):
+        """Test event-driven updates without a refresh."""
+        note = temp_vault / "Inbox" / "new.md"
+        note.write_text("# Contract renewal\n")
+
+        index.update_file(note)
+        assert [r.path.name for r in index.search("renewal")] == ["new.md"]
+
+        index.remove_file(note)
+        assert index.search("renewal") == []
+
+    def test_refresh_if_stale_is_throttled(self, index, temp_vault):
+        """Test that query-time refreshes only scan once the interval has passed."""
+        (temp_vault / "Inbox" / "late.md").write_text("# Quarterly audit\n")
+
+        # A fresh instance shares the last refresh time through the database
+        other = VaultSearch(str(temp_vault))
+        try:
+            assert other.refresh_if_stale() == 0
+            assert other.search("audit") == []
+
+            other.refresh_interval = 0
+            assert other.refresh_if_stale() == 1
+            assert [r.path.name for r in index.search("audit")] == ["late.md"]
+        finally:
+            other.close()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,114 @@
+"""
+Unit tests for vault statistics
+
+Tests counts, sizes, age extremes, priority breakdowns, shards and the
+per-directory mtime cache.
+"""
+
+import pytest
+import sys
+import os
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vault_layout import VaultLayout, VaultLayoutConfig
+from vault_stats import VaultStats, NO_PRIORITY
+
+
+class TestVaultStats:
+    """Test suite for VaultStats."""
+
+    @pytest.fixture
+    def temp_vault(self):
+        """Create a temporary vault with a few Inbox notes."""
+        temp_dir = tempfile.mkdtemp()
+        vault = Path(temp_dir)
+        inbox = vault / "Inbox"
+        inbox.mkdir()
+        for i, priority in enumerate(["high", "high", "low", None]):
+            header = f"priority: {priority}\n" if priority else "type: note\n"
+            path = inbox / f"note_{i}.md"
+            path.write_text(f"---\n{header}---\nBody {i}\n")
+            os.utime(path, (1_700_000_000 + i, 1_700_000_000 + i))
+        (inbox / ".gitkeep").write_text("")
+        (inbox / "image.png").write_bytes(b"x")
+        yield vault
+        shutil.rmtree(temp_dir)
+
+    def test_folder_stats(self, temp_vault):
+        """Test counts, bytes, oldest/newest and priority breakdown."""
+        stats = VaultStats(str(temp_vault)).folder_stats("Inbox")
+
+        assert stats.exists is True
+        assert stats.count == 4
+        assert stats.total_bytes == sum(p.stat().st_size for p in (temp_vault / "Inbox").glob("*.md"))
+        assert stats.oldest == "Inbox/note_0.md"
+        assert stats.newest == "Inbox/note_3.md"
+        assert stats.by_priority == {"high": 2, "low": 1, NO_PRIORITY: 1}
+
+    def test_missing_folder(self, temp_vault):
+        """Test that a missing folder reports zero and not existing."""
+        stats = VaultStats(str(temp_vault)).collect(["Inbox", "Done"])
+
+        assert stats["Done"].exists is False
+        assert stats["Done"].count == 0
+        assert VaultStats(str(temp_vault)).counts(["Inbox", "Done"]) == {"Inbox": 4, "Done": 0}
+
+    def test_cache_reused_until_directory_changes(self, temp_vault, monkeypatch):
+        """Test that unchanged directories are not scanned again."""
+        collector = VaultStats(str(temp_vault))
+        first = collector.folder_stats("Inbox")
+
+        scans = []
+        original = os.scandir
+        monkeypatch.setattr(os, "scandir", lambda path: scans.append(path) or original(path))
+
+        assert collector.folder_stats("Inbox") == first
+        assert scans == []
+
+        (temp_vault / "Inbox" / "new.md").write_text("---\npriority: high\n---\n")
+        os.utime(temp_vault / "Inbox", ns=(0, (temp_vault / "Inbox").stat().st_mtime_ns + 10**9))
+        updated = collector.folder_stats("Inbox")
+
+        assert len(scans) == 1
+        assert updated.count == 5
+        assert updated.by_priority["high"] == 3
+
+    def test_counts_do_not_read_headers(self, temp_vault, monkeypatch):
+        """Test that counts skip priority reads until the breakdown is asked for."""
+        import frontmatter_codec
+
+        reads = []
+        original = frontmatter_codec.read_header
+        monkeypatch.setattr(frontmatter_codec, "read_header", lambda path: reads.append(path) or original(path))
+        collector = VaultStats(str(temp_vault))
+
+        assert collector.counts(["Inbox"]) == {"Inbox": 4}
+        assert reads == []
+
+        assert collector.folder_stats("Inbox").by_priority == {"high": 2, "low": 1, NO_PRIORITY: 1}
+        assert len(reads) == 4
+        assert collector.counts(["Inbox"]) == {"Inbox": 4}
+        assert len(reads) == 4
+
+    def test_sharded_folder_includes_day_directories(self, temp_vault):
+        """Test that date shards are summed into their folder."""
+        layout = VaultLayout(str(temp_vault), config=VaultLayoutConfig(sharded_folders=["Done"]))
+        for day in ("01", "02"):
+            day_dir = temp_vault / "Done" / "2026" / "02" / day
+            day_dir.mkdir(parents=True)
+            (day_dir / f"task_{day}.md").write_text("---\npriority: medium\n---\n")
+        (temp_vault / "Done" / "legacy.md").write_text("no header\n")
+
+        stats = VaultStats(str(temp_vault), layout=layout).folder_stats("Done")
+
+        assert stats.count == 3
+        assert stats.by_priority == {"medium": 2, NO_PRIORITY: 1}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,102 @@
+"""
+Unit tests for VaultWriter
+
+Tests collision-proof naming, atomic writes and group commit.
+"""
+
+import pytest
+import sys
+from pathlib import Path
+from datetime import datetime
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import vault_writer
+from vault_writer import VaultWriter, sanitize_slug
+
+
+class TestVaultWriter:
+    """Test suite for VaultWriter."""
+
+    @pytest.fixture
+    def temp_dir(self):
+        """Create a temporary directory for testing."""
+        temp_dir = tempfile.mkdtemp()
+        yield Path(temp_dir)
+        shutil.rmtree(temp_dir)
+
+    @pytest.fixture
+    def writer(self):
+        """Create a VaultWriter instance."""
+        return VaultWriter()
+
+    def test_sanitize_slug(self):
+        """Test filename slug generation."""
+        assert sanitize_slug("Hello, World!  Again") == "hello-world-again"
+        assert sanitize_slug("!!!") == "untitled"
+        assert len(sanitize_slug("x" * 200)) == 50
+
+    def test_same_second_items_do_not_collide(self, writer, temp_dir):
+        """Test that similar items written in the same second get distinct names."""
+        stamp = datetime(2026, 2, 17, 18, 10, 11)
+        name_a = writer.make_filename("1 new UTF Labs job in Karachi", "body a", stamp)
+        name_b = writer.make_filename("1 new UTF Labs job in Karachi", "body b", stamp)
+
+        assert name_a != name_b
+        assert name_a.startswith("20260217_181011_1-new-utf-labs-job-in-karachi_")
+
+    def test_create_task_file(self, writer, temp_dir):
+        """Test writing a task file atomically."""
+        path = writer.create_task_file(temp_dir / "Needs_Action", "Task", "# Task\n")
+
+        assert path.exists()
+        assert path.read_text(encoding='utf-8') == "# Task\n"
+        # No temp files left behind
+        assert [p.name for p in path.parent.iterdir()] == [path.name]
+
+    def test_write_does_not_overwrite_different_content(self, writer, temp_dir):
+        """Test that an existing file with other content is never clobbered."""
+        first = writer.write(temp_dir, "task.md", "first")
+        second = writer.write(temp_dir, "task.md", "second")
+
+        assert first != second
+        assert first.read_text() == "first"
+        assert second.name == "task-1.md"
+
+    def test_write_same_content_is_idempotent(self, writer, temp_dir):
+        """Test that rewriting identical content reuses the same file."""
+        first = writer.write(temp_dir, "task.md", "same")
+        second = writer.write(temp_dir, "task.md", "same")
+
+        assert first == second
+        assert len(list(temp_dir.iterdir())) == 1
+
+    def test_batch_fsyncs_directory_once(self, writer, temp_dir, monkeypatch):
+        """Test that group commit flushes each folder once per batch."""
+        synced = []
+        monkeypatch.setattr(vault_writer, "_fsync_directory", lambda d: synced.append(d))
+
+        with writer.batch():
+            for i in range(20):
+                writer.create_task_file(temp_dir, f"Item {i}", f"content {i}")
+            assert synced == []
+
+        assert synced == [temp_dir]
+        assert len(list(temp_dir.glob("*.md"))) == 20
+
+    def test_unbatched_write_fsyncs_each_time(self, writer, temp_dir, monkeypatch):
+        """Test that writes outside a batch flush the folder immediately."""
+        synced = []
+        monkeypatch.setattr(vault_writer, "_fsync_directory", lambda d: synced.append(d))
+
+        writer.create_task_file(temp_dir, "One", "1")
+        writer.create_task_file(temp_dir, "Two", "2")
+
+        assert len(synced) == 2
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,311 @@
+"""
+Unit tests for WhatsAppWatcher
+
+Tests message identity, cursor slicing and cursor persistence. The watcher
+module needs Playwright at import time, so these tests are skipped without it.
+"""
+
+import pytest
+import sys
+import json
+from pathlib import Path
+import tempfile
+import shutil
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("playwright")
+
+from whatsapp_watcher import (
+    WhatsAppWatcher, WhatsAppWatcherConfig, message_key, messages_after_cursor, parse_message_meta,
+    SEARCH_RESULT_SCRIPT, CHAT_MESSAGES_SCRIPT, NAVIGATION_SCRIPT, PlaywrightError
+)
+
+
+def make_messages(*texts):
+    """Build keyed messages for one chat in chat order."""
+    return [
+        {'key': message_key("Alice", "Alice", f"10:{i:02d}, 2/17/2026", text), 'text': text}
+        for i, text in enumerate(texts)
+    ]
+
+
+class FakeElement:
+    """Stand-in for a Playwright element handle."""
+
+    def __init__(self, on_click=None):
+        self.value = ''
+        self.on_click = on_click
+
+    def click(self):
+        if self.on_click:
+            self.on_click()
+
+    def fill(self, value):
+        self.value = value
+
+    def as_element(self):
+        return self
+
+
+class FakePage:
+    """Stand-in for the WhatsApp Web page with a search box and chats."""
+
+    def __init__(self, chats):
+        self.chats = chats  # chat name -> raw messages ({'id', 'meta', 'text'})
+        self.search_box = FakeElement()
+        self.open_chat = None
+        self.opened = []
+        self.broken = set()
+        self.navigating = None
+        self.listener = None  # receives the DOM events opening a chat causes
+
+    def query_selector(self, selector):
+        return self.search_box
+
+    def wait_for_function(self, script, arg=None, timeout=None):
+        if script == SEARCH_RESULT_SCRIPT:
+            if arg in self.broken:
+                raise PlaywrightError(f"Timeout waiting for search result {arg}")
+            return FakeElement(on_click=lambda: self._open(arg))
+        return None
+
+    def wait_for_selector(self, selector, timeout=None):
+        return FakeElement()
+
+    def evaluate(self, script, arg=None):
+        if script == NAVIGATION_SCRIPT:
+            self.navigating = arg
+            return None
+        assert script == CHAT_MESSAGES_SCRIPT
+        return list(self.chats.get(self.open_chat, []))
+
+    def is_closed(self):
+        return False
+
+    def _open(self, chat_name):
+        self.open_chat = chat_name
+        self.opened.append(chat_name)
+        if self.listener:
+            # Rendering the conversation and re-rendering the chat list
+            rendered = self.chats.get(chat_name, [])
+            self.listener({
+                'chats': [{'name': chat_name, 'preview': rendered[-1]['text'] if rendered else ''}],
+                'messages': [{'chat': chat_name, 'text': raw['text']} for raw in rendered]
+            })
+
+
+def raw_message(index, text, sender="Alice"):
+    """Build a message as CHAT_MESSAGES_SCRIPT returns it."""
+    return {'id': f"msg-{index}", 'meta': f"[10:{index:02d}, 2/17/2026] {sender}: ", 'text': text}
+
+
+@pytest.fixture
+def temp_dir():
+    """Create a temporary directory for testing."""
+    temp_dir = tempfile.mkdtemp()
+    yield Path(temp_dir)
+    shutil.rmtree(temp_dir)
+
+
+@pytest.fixture
+def config(temp_dir):
+    """Create a watcher config rooted in the temp directory."""
+    return WhatsAppWatcherConfig(
+        inbox_folder=str(temp_dir / "Inbox"),
+        needs_action_folder=str(temp_dir / "Needs_Action"),
+        log_folder=str(temp_dir / "Logs"),
+        index_path=str(temp_dir / ".index"),
+        session_path=str(temp_dir / ".whatsapp_session")
+    )
+
+
+class TestMessageHelpers:
+    """Test suite for the module-level message helpers."""
+
+    def test_parse_message_meta(self):
+        """Test that the pre-plain-text attribute splits into timestamp and sender."""
+        meta = parse_message_meta("[10:32, 2/17/2026] Alice Smith: ")
+
+        assert meta == {'timestamp': "10:32, 2/17/2026", 'sender': "Alice Smith"}
+
+    def test_parse_message_meta_unknown(self):
+        """Test that missing or foreign attributes give empty fields."""
+        assert parse_message_meta("") == {'timestamp': '', 'sender': ''}
+        assert parse_message_meta(None) == {'timestamp': '', 'sender': ''}
+        assert parse_message_meta("no brackets here") == {'timestamp': '', 'sender': ''}
+
+    def test_message_key_is_stable(self):
+        """Test that the same message always gets the same key."""
+        key = message_key("Alice", "Alice", "10:32, 2/17/2026", "Invoice attached")
+
+        assert key == message_key("Alice", "Alice", "10:32, 2/17/2026", "Invoice attached")
+        assert len(key) == 16
+        assert key != message_key("Bob", "Alice", "10:32, 2/17/2026", "Invoice attached")
+        assert key != message_key("Alice", "Alice", "10:33, 2/17/2026", "Invoice attached")
+
+    def test_message_key_fields_do_not_run_together(self):
+        """Test that moving text between fields changes the key."""
+        assert message_key("Al", "ice", "t", "x") != message_key("Ali", "ce", "t", "x")
+
+    def test_messages_after_cursor(self):
+        """Test that only messages after the cursor are returned."""
+        messages = make_messages("one", "two", "three")
+
+        after = messages_after_cursor(messages, messages[0]['key'])
+
+        assert [m['text'] for m in after] == ["two", "three"]
+        assert messages_after_cursor(messages, messages[-1]['key']) == []
+
+    def test_messages_after_cursor_without_cursor(self):
+        """Test that a new chat or a cursor that scrolled away returns everything."""
+        messages = make_messages("one", "two")
+
+        assert messages_after_cursor(messages, None) == messages
+        assert messages_after_cursor(messages, "0" * 16) == messages
+
+    def test_messages_after_cursor_uses_last_match(self):
+        """Test that a repeated message resolves to its latest occurrence."""
+        messages = make_messages("ok", "later")
+        messages.append(dict(messages[0]))
+        messages.append({'key': "f" * 16, 'text': "newest"})
+
+        after = messages_after_cursor(messages, messages[0]['key'])
+
+        assert [m['text'] for m in after] == ["newest"]
+
+
+class TestWhatsAppCursors:
+    """Test suite for cursor persistence."""
+
+    def test_cursor_round_trip(self, config):
+        """Test that saved cursors are loaded by a new watcher."""
+        watcher = WhatsAppWatcher(config)
+        watcher._advance_cursor({
+            'id': "whatsapp_abc",
+            'chat_name': "Alice",
+            'cursor': {'key': "abc", 'message_id': "true_1@c.us_A1", 'timestamp': "10:32, 2/17/2026"}
+        })
+
+        reloaded = WhatsAppWatcher(config)
+
+        assert reloaded.cursors["Alice"]["key"] == "abc"
+        assert reloaded.cursors["Alice"]["message_id"] == "true_1@c.us_A1"
+        assert reloaded.processed_messages == {"Alice": ["whatsapp_abc"]}
+
+    def test_repeated_saves_overwrite_one_file(self, config):
+        """Test that every save replaces the cursor file instead of adding siblings."""
+        watcher = WhatsAppWatcher(config)
+        for key in ("first", "second", "third"):
+            watcher._advance_cursor({
+                'id': f"whatsapp_{key}",
+                'chat_name': "Alice",
+                'cursor': {'key': key, 'message_id': '', 'timestamp': ''}
+            })
+
+        cursor_file = Path(config.cursor_file)
+        assert [p.name for p in cursor_file.parent.glob("whatsapp-cursors*")] == [cursor_file.name]
+        assert json.loads(cursor_file.read_text())['chats']["Alice"]["key"] == "third"
+        assert WhatsAppWatcher(config).cursors["Alice"]["key"] == "third"
+
+
+class TestReadNewMessages:
+    """Test suite for opening chats on the shared page."""
+
+    def test_search_is_cleared_after_each_chat(self, config):
+        """Test that the chat search box is emptied once a chat has been read."""
+        watcher = WhatsAppWatcher(config)
+        page = FakePage({"Alice": [raw_message(1, "urgent: invoice overdue")]})
+
+        messages = watcher._read_new_messages(page, "Alice")
+
+        assert [m['text'] for m in messages] == ["urgent: invoice overdue"]
+        assert page.opened == ["Alice"]
+        assert page.search_box.value == ''
+
+    def test_search_is_cleared_when_reading_fails(self, config):
+        """Test that a chat that never shows up still leaves the search empty."""
+        watcher = WhatsAppWatcher(config)
+        page = FakePage({"Alice": [raw_message(1, "urgent")]})
+        page.broken.add("Alice")
+
+        with pytest.raises(PlaywrightError):
+            watcher._read_new_messages(page, "Alice")
+
+        assert page.search_box.value == ''
+
+    def test_only_messages_after_cursor_are_read(self, config):
+        """Test that messages at or before the saved cursor are skipped."""
+        watcher = WhatsAppWatcher(config)
+        page = FakePage({"Alice": [raw_message(1, "urgent one"), raw_message(2, "urgent two")]})
+        first = watcher._read_new_messages(page, "Alice")[0]
+        watcher.cursors["Alice"] = {'key': first['key'], 'message_id': ''}
+
+        messages = watcher._read_new_messages(page, "Alice")
+
+        assert [m['text'] for m in messages] == ["urgent two"]
+
+
+class TestDrainEvents:
+    """Test suite for turning streamed DOM events into items."""
+
+    @pytest.fixture
+    def streaming(self, config):
+        """Create a streaming watcher wired to a fake page."""
+        watcher = WhatsAppWatcher(config)
+        watcher._observer_installed = True
+        page = FakePage({
+            "Alice": [raw_message(1, "urgent: invoice overdue")],
+            "Bob": [raw_message(1, "lunch?", sender="Bob")]
+        })
+        page.listener = lambda payload: watcher._on_dom_event(None, payload)
+        return watcher, page
+
+    def test_events_become_items(self, streaming):
+        """Test that chat and message events are merged per chat and read once."""
+        watcher, page = streaming
+        watcher._on_dom_event(None, {'chats': [{'name': "Alice", 'preview': "hi"}], 'messages': []})
+        watcher._on_dom_event(None, {'chats': [{'name': "Bob", 'preview': "lunch?"}],
+                                     'messages': [{'chat': "Alice", 'text': "urgent: invoice overdue"}]})
+
+        item_ids = watcher._drain_events(page)
+
+        assert len(item_ids) == 1
+        assert watcher.get_item_content(item_ids[0])['chat_name'] == "Alice"
+        assert page.opened == ["Alice"]
+        assert page.navigating is False
+        assert page.search_box.value == ''
+
+    def test_own_navigation_does_not_requeue_chats(self, streaming):
+        """Test that events caused by opening a chat do not open it again."""
+        watcher, page = streaming
+        watcher._on_dom_event(None, {'chats': [{'name': "Alice", 'preview': "urgent: invoice overdue"}],
+                                     'messages': []})
+        watcher._drain_events(page)
+        assert page.opened == ["Alice"]
+        assert watcher._events  # opening Alice re-reported her chat and messages
+
+        for _ in range(3):
+            assert watcher._drain_events(page) == []
+
+        assert page.opened == ["Alice"]
+
+    def test_new_message_after_read_is_picked_up(self, streaming):
+        """Test that a genuinely new message in a just-read chat is still read."""
+        watcher, page = streaming
+        watcher._on_dom_event(None, {'chats': [{'name': "Alice", 'preview': "urgent: invoice overdue"}],
+                                     'messages': []})
+        first = watcher._drain_events(page)
+
+        page.chats["Alice"].append(raw_message(2, "urgent: payment failed too"))
+        watcher._on_dom_event(None, {'chats': [], 'messages': [{'chat': "Alice", 'text': "urgent: payment failed too"}]})
+        second = watcher._drain_events(page)
+
+        assert page.opened == ["Alice", "Alice"]
+        assert len(second) == 1 and second != first
+        assert watcher.get_item_content(second[0])['messages'][-1] == "urgent: payment failed too"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
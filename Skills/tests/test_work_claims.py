@@ -0,0 +1,125 @@
+"""
+Unit tests for work claims
+
+Tests exclusive claiming, heartbeats, release and takeover of expired or
+orphaned leases.
+"""
+
+import pytest
+import sys
+import json
+import time
+from pathlib import Path
+import tempfile
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+# Add parent directory to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from work_claims import WorkClaims
+from plan_executor import PlanExecutor, PlanExecutorConfig
+
+
+class TestWorkClaims:
+    """Test suite for WorkClaims."""
+
+    @pytest.fixture
+    def temp_vault(self):
+        """Create a temporary vault with one Needs_Action item."""
+        temp_dir = tempfile.mkdtemp()
+        vault = Path(temp_dir)
+        (vault / "Needs_Action").mkdir()
+        item = vault / "Needs_Action" / "task.md"
+        item.write_text("---\nstatus: pending\n---\n")
+        yield vault
+        shutil.rmtree(temp_dir)
+
+    def test_only_one_worker_wins(self, temp_vault):
+        """Test that concurrent claims on one item succeed exactly once."""
+        item = temp_vault / "Needs_Action" / "task.md"
+        workers = [WorkClaims(str(temp_vault), worker_id=f"w{i}") for i in range(8)]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            leases = list(pool.map(lambda w: w.try_claim(item), workers))
+
+        assert sum(1 for lease in leases if lease is not None) == 1
+        assert workers[0].is_claimed(item)
+
+    def test_release_and_heartbeat(self, temp_vault):
+        """Test that heartbeats extend a lease and release frees it."""
+        item = temp_vault / "Needs_Action" / "task.md"
+        claims = WorkClaims(str(temp_vault), worker_id="a", lease_seconds=30)
+
+        lease = claims.try_claim(item)
+        first_expiry = lease.expires_at
+        time.sleep(0.01)
+        assert claims.heartbeat(lease) is True
+        assert lease.expires_at > first_expiry
+
+        other = WorkClaims(str(temp_vault), worker_id="b")
+        assert other.try_claim(item) is None
+
+        claims.release(lease)
+        assert other.try_claim(item) is not None
+
+    def test_expired_lease_is_reclaimed(self, temp_vault):
+        """Test that an expired lease is taken over and the old owner notices."""
+        item = temp_vault / "Needs_Action" / "task.md"
+        old = WorkClaims(str(temp_vault), worker_id="old", lease_seconds=0.05)
+        lease = old.try_claim(item)
+
+        time.sleep(0.1)
+        new = WorkClaims(str(temp_vault), worker_id="new")
+        assert new.try_claim(item) is not None
+        assert old.heartbeat(lease) is False
+        assert lease.lost is True
+
+    def test_dead_owner_is_reclaimed(self, temp_vault):
+        """Test that a live-looking lease from a dead local process is stale."""
+        claims = WorkClaims(str(temp_vault), worker_id="a")
+        lease = claims.try_claim(temp_vault / "Needs_Action" / "task.md")
+
+        record = json.loads(lease.lock_path.read_text())
+        record["pid"] = 2 ** 22 + 7  # above pid_max, never a live process
+        lease.lock_path.write_text(json.dumps(record))
+
+        assert claims.reclaim_expired() == 1
+        assert not lease.lock_path.exists()
+
+    def test_hold_skips_claimed_item(self, temp_vault):
+        """Test the context manager and its release on exit."""
+        item = temp_vault / "Needs_Action" / "task.md"
+        a = WorkClaims(str(temp_vault), worker_id="a", lease_seconds=0.3)
+        b = WorkClaims(str(temp_vault), worker_id="b")
+
+        with a.hold(item) as lease:
+            assert lease is not None
+            # The heartbeat keeps the short lease alive while held
+            time.sleep(0.5)
+            with b.hold(item) as other:
+                assert other is None
+
+        assert not a.is_claimed(item)
+
+    def test_plan_executor_skips_claimed_plan(self, temp_vault):
+        """Test that execute_all_plans leaves plans claimed by other workers alone."""
+        plans = temp_vault / "Plans"
+        plans.mkdir()
+        plan = plans / "task_plan.md"
+        plan.write_text("---\nstatus: pending\n---\n\n## Steps\n\n- [ ] Review the task\n")
+
+        WorkClaims(str(temp_vault), worker_id="other").try_claim(plan)
+        executor = PlanExecutor(PlanExecutorConfig(
+            vault_path=str(temp_vault),
+            log_folder=str(temp_vault / "Logs" / "plan_executor")
+        ))
+        stats = executor.execute_all_plans()
+
+        assert stats["claimed_elsewhere"] == 1
+        assert stats["completed"] == 0
+        assert plan.exists()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,441 @@
+"""
+Vault Catalog
+
+Embedded SQLite catalog of the markdown files in the vault. Each row holds
+the file's folder, path, mtime, size, content hash, parsed frontmatter and
+engagement metrics, so folder counts, status filters and listings are single
+indexed queries instead of globbing and re-reading every file.
+
+The catalog is refreshed incrementally: a refresh lists each of the
+folder's directories (including date shards, see vault_layout) only when
+the directory's mtime changed since the last refresh, and only re-reads
+files whose mtime or size changed since they were last catalogued. Files
+edited in place do not touch their directory, so writers should use
+``update_file`` (or write atomically) to keep their rows current. By
+default only the frontmatter header of each file is read; the body is read
+only for folders whose engagement metrics are needed.
+
+Plain folder counts come from vault_stats; the catalog answers the
+filtered and aggregated queries that need frontmatter.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import bulk_scan
+import frontmatter_codec
+from vault_layout import VaultLayout
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    folder TEXT NOT NULL,
+    name TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL,
+    content_hash TEXT NOT NULL,
+    status TEXT,
+    type TEXT,
+    frontmatter TEXT NOT NULL DEFAULT '{}',
+    metrics TEXT NOT NULL DEFAULT '{}'
+);
+CREATE INDEX IF NOT EXISTS idx_files_folder ON files(folder, name);
+CREATE INDEX IF NOT EXISTS idx_files_folder_status ON files(folder, status);
+"""
+
+# Stored in the metrics column when only the header was read
+_METRICS_NOT_READ = 'null'
+# Engagement lines written by the social media tracker, e.g. "- Likes: 12"
+_METRIC_PATTERN = re.compile(r'^- (Likes|Comments|Shares|Views): (\d+)\s*$', re.MULTILINE)
+# The same lines matched over raw bytes by the bulk scanner
+_METRIC_BYTES_PATTERN = re.compile(_METRIC_PATTERN.pattern.encode('ascii'), re.MULTILINE)
+
+
+def parse_frontmatter(content: str) -> Dict[str, Any]:
+    """
+    Parse the YAML frontmatter block of a markdown file.
+
+    Args:
+        content: File content
+
+    Returns:
+        Frontmatter as a dictionary (empty if missing or invalid)
+    """
+    return frontmatter_codec.parse(content)
+
+
+def parse_metrics(content: str) -> Dict[str, int]:
+    """
+    Extract engagement metrics from a tracking file body.
+
+    Args:
+        content: File content
+
+    Returns:
+        Mapping like {"likes": 12, "comments": 3}
+    """
+    return {name.lower(): int(value) for name, value in _METRIC_PATTERN.findall(content)}
+
+
+class VaultCatalog:
+    """
+    SQLite-backed metadata catalog for vault markdown files.
+
+    Paths are stored relative to the vault root using forward slashes;
+    ``folder`` is the vault folder the file belongs to in the same form
+    (``Done`` for ``Done/2026/02/17/task.md`` when Done is sharded).
+    """
+
+    def __init__(self, vault_path: str = ".", db_path: Optional[str] = None,
+                 layout: Optional[VaultLayout] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize the catalog.
+
+        Args:
+            vault_path: Path to the Obsidian vault root directory
+            db_path: Database file (defaults to <vault>/.index/vault_catalog.db)
+            layout: Folder layout (loaded from the vault if omitted)
+            logger: Logger to use (defaults to "vault_catalog")
+        """
+        self.vault_path = Path(vault_path).absolute()
+        self.db_path = Path(db_path) if db_path else self.vault_path / ".index" / "vault_catalog.db"
+        self.logger = logger or logging.getLogger("vault_catalog")
+        self.layout = layout or VaultLayout(str(self.vault_path), logger=self.logger)
+        self._lock = threading.Lock()
+        # Directory mtimes as of the last refresh that listed them
+        self._dir_mtimes: Dict[str, int] = {}
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _relative(self, path: Path) -> str:
+        """Vault-relative posix path"""
+        path = Path(path)
+        if not path.is_absolute():
+            path = self.vault_path / path
+        return path.absolute().relative_to(self.vault_path).as_posix()
+
+    @staticmethod
+    def _folder_key(folder: str) -> str:
+        """Normalise a folder argument to the stored form"""
+        key = Path(folder).as_posix().strip('/')
+        return '' if key == '.' else key
+
+    def _catalog_folder(self, rel_path: str) -> str:
+        """Vault folder of a file, mapping day shards back to their folder"""
+        parent = rel_path.rpartition('/')[0]
+        root, *day = parent.rsplit('/', 3)
+        if len(day) == 3 and all(part.isdigit() for part in day) and self.layout.is_sharded(root):
+            return root
+        return parent
+
+    def _row_for(self, rel_path: str, folder: str, stat: os.stat_result, read_body: bool = False) -> tuple:
+        """
+        Read a file and build its catalog row.
+
+        Without ``read_body`` only the header is read; ``content_hash`` then
+        covers the header bytes and metrics are left unread.
+        """
+        full_path = self.vault_path / rel_path
+        raw = None if read_body else frontmatter_codec.read_header_bytes(full_path)
+        if raw is None:
+            return self._row_from_scan(rel_path, folder, stat, bulk_scan.scan_file(
+                str(full_path), {'metrics': _METRIC_BYTES_PATTERN}, digest=True
+            ))
+        return self._build_row(rel_path, folder, stat, hashlib.sha1(raw).hexdigest(), raw, _METRICS_NOT_READ)
+
+    def _row_from_scan(self, rel_path: str, folder: str, stat: os.stat_result,
+                       result: bulk_scan.FileScan) -> tuple:
+        """Build a full catalog row from a bulk scan of the file"""
+        metrics = {name.decode('ascii').lower(): int(value) for name, value in result.matches['metrics']}
+        return self._build_row(rel_path, folder, stat, result.digest, result.header, json.dumps(metrics))
+
+    @staticmethod
+    def _build_row(rel_path: str, folder: str, stat: os.stat_result, content_hash: str,
+                   header: bytes, metrics: str) -> tuple:
+        """Catalog row from a file's header bytes and metrics"""
+        frontmatter = parse_frontmatter(header.decode('utf-8', errors='replace'))
+        name = rel_path.rpartition('/')[2]
+
+        return (
+            rel_path,
+            folder,
+            name,
+            stat.st_mtime_ns,
+            stat.st_size,
+            content_hash,
+            str(frontmatter['status']) if frontmatter.get('status') is not None else None,
+            str(frontmatter['type']) if frontmatter.get('type') is not None else None,
+            json.dumps(frontmatter, default=str),
+            metrics
+        )
+
+    def refresh(self, folders: Iterable[str], read_body: bool = False) -> int:
+        """
+        Bring the catalog up to date for the given folders.
+
+        Files matching ``*.md`` directly in each folder, or in its day
+        directories if it is sharded, are catalogued. Directories whose
+        mtime is unchanged since they were last listed are skipped; files
+        are re-read only when their mtime or size changed; rows for deleted
+        files are dropped.
+
+        Args:
+            folders: Folder paths relative to the vault root
+            read_body: Also read file bodies so engagement metrics are
+                available (rows catalogued header-only are re-read)
+
+        Returns:
+            Number of rows added, updated or removed
+        """
+        if isinstance(folders, str):
+            folders = [folders]
+
+        changes = 0
+        listed: Dict[str, int] = {}
+        with self._lock:
+            for folder in folders:
+                key = self._folder_key(folder)
+
+                rows = self._conn.execute(
+                    "SELECT path, mtime_ns, size, metrics FROM files WHERE folder = ?", (key,)
+                ).fetchall()
+                known = {}
+                by_dir: Dict[str, List[str]] = {}
+                unread_dirs = set()
+                for row in rows:
+                    directory = row['path'].rpartition('/')[0]
+                    by_dir.setdefault(directory, []).append(row['path'])
+                    if read_body and row['metrics'] == _METRICS_NOT_READ:
+                        unread_dirs.add(directory)
+                    else:
+                        known[row['path']] = (row['mtime_ns'], row['size'])
+
+                changed = []
+                seen = set()
+                for directory in self.layout.directories(key):
+                    dir_key = self._folder_key(directory.relative_to(self.vault_path).as_posix())
+                    try:
+                        # Taken before listing, so changes made meanwhile show up next time
+                        mtime = directory.stat().st_mtime_ns
+                    except FileNotFoundError:
+                        continue
+                    if self._dir_mtimes.get(dir_key) == mtime and dir_key not in unread_dirs:
+                        seen.update(by_dir.get(dir_key, ()))
+                        continue
+                    try:
+                        with os.scandir(directory) as entries:
+                            for entry in entries:
+                                if not entry.name.endswith('.md') or entry.name.startswith('.'):
+                                    continue
+                                try:
+                                    if not entry.is_file():
+                                        continue
+                                    stat = entry.stat()
+                                except FileNotFoundError:
+                                    continue
+                                rel_path = f"{dir_key}/{entry.name}" if dir_key else entry.name
+                                seen.add(rel_path)
+                                if known.get(rel_path) == (stat.st_mtime_ns, stat.st_size):
+                                    continue
+                                changed.append((rel_path, stat))
+                    except FileNotFoundError:
+                        continue
+                    listed[dir_key] = mtime
+
+                upserts = []
+                if read_body:
+                    # Bodies are only needed for their metric lines: scan them
+                    # memory-mapped, in a process pool for large batches
+                    by_path = {
+                        os.path.join(self.vault_path, rel_path): (rel_path, stat)
+                        for rel_path, stat in changed
+                    }
+                    results = bulk_scan.scan(by_path, {'metrics': _METRIC_BYTES_PATTERN}, digest=True)
+                    for result in results:
+                        rel_path, stat = by_path[result.path]
+                        upserts.append(self._row_from_scan(rel_path, key, stat, result))
+                else:
+                    for rel_path, stat in changed:
+                        try:
+                            upserts.append(self._row_for(rel_path, key, stat))
+                        except OSError as e:
+                            self.logger.warning(f"Failed to catalog {rel_path}: {e}")
+
+                removed = [row['path'] for row in rows if row['path'] not in seen]
+
+                if upserts:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", upserts
+                    )
+                if removed:
+                    self._conn.executemany(
+                        "DELETE FROM files WHERE path = ?", [(path,) for path in removed]
+                    )
+                changes += len(upserts) + len(removed)
+
+            self._conn.commit()
+            self._dir_mtimes.update(listed)
+
+        if changes:
+            self.logger.debug(f"Catalog refresh applied {changes} change(s)")
+        return changes
+
+    def update_file(self, path: Path, read_body: bool = False):
+        """
+        Catalog a single file right away (e.g. after writing it).
+
+        Args:
+            path: File path (absolute or relative to the vault root)
+            read_body: Also read the body for engagement metrics
+        """
+        rel_path = self._relative(path)
+        full_path = self.vault_path / rel_path
+        with self._lock:
+            try:
+                row = self._row_for(rel_path, self._catalog_folder(rel_path), full_path.stat(),
+                                    read_body=read_body)
+            except FileNotFoundError:
+                self._conn.execute("DELETE FROM files WHERE path = ?", (rel_path,))
+            else:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row
+                )
+            self._conn.commit()
+
+    def remove_file(self, path: Path):
+        """
+        Drop a file from the catalog.
+
+        Args:
+            path: File path (absolute or relative to the vault root)
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM files WHERE path = ?", (self._relative(path),))
+            self._conn.commit()
+
+    def _select(self, columns: str, folder: str, pattern: Optional[str],
+                status: Optional[str], suffix: str = "") -> List[sqlite3.Row]:
+        """Run a filtered query against one folder"""
+        sql = f"SELECT {columns} FROM files WHERE folder = ?"
+        params: List[Any] = [self._folder_key(folder)]
+        if pattern:
+            sql += " AND name GLOB ?"
+            params.append(pattern)
+        if status is not None:
+            sql += " AND status = ?"
+            params.append(status)
+        with self._lock:
+            return self._conn.execute(sql + suffix, params).fetchall()
+
+    def count(self, folder: str, pattern: Optional[str] = None,
+              status: Optional[str] = None) -> int:
+        """
+        Count catalogued files in a folder.
+
+        Args:
+            folder: Folder path relative to the vault root
+            pattern: Optional filename glob (e.g. "approval_*.md")
+            status: Optional frontmatter status to match
+
+        Returns:
+            Number of matching files
+        """
+        return self._select("COUNT(*)", folder, pattern, status)[0][0]
+
+    def list_files(self, folder: str, pattern: Optional[str] = None,
+                   status: Optional[str] = None) -> List[Path]:
+        """
+        List catalogued files in a folder.
+
+        Args:
+            folder: Folder path relative to the vault root
+            pattern: Optional filename glob (e.g. "approval_*.md")
+            status: Optional frontmatter status to match
+
+        Returns:
+            Absolute file paths sorted by name
+        """
+        rows = self._select("path", folder, pattern, status, " ORDER BY name")
+        return [self.vault_path / row['path'] for row in rows]
+
+    def entries(self, folder: str, pattern: Optional[str] = None,
+                status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Catalog rows for a folder with frontmatter and metrics decoded.
+
+        Args:
+            folder: Folder path relative to the vault root
+            pattern: Optional filename glob
+            status: Optional frontmatter status to match
+
+        Returns:
+            List of row dictionaries
+        """
+        rows = self._select("*", folder, pattern, status, " ORDER BY name")
+        entries = []
+        for row in rows:
+            entry = dict(row)
+            entry['frontmatter'] = json.loads(entry['frontmatter'])
+            entry['metrics'] = json.loads(entry['metrics']) or {}
+            entry['full_path'] = self.vault_path / entry['path']
+            entries.append(entry)
+        return entries
+
+    def group_counts(self, folder: str, field: str) -> Dict[str, int]:
+        """
+        Count files in a folder grouped by a frontmatter field.
+
+        Args:
+            folder: Folder path relative to the vault root
+            field: Top-level frontmatter key (e.g. "platform")
+
+        Returns:
+            Mapping of field value to count (files without the field are skipped)
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT json_extract(frontmatter, ?) AS value, COUNT(*) FROM files "
+                "WHERE folder = ? AND value IS NOT NULL GROUP BY value",
+                (f"$.{field}", self._folder_key(folder))
+            ).fetchall()
+        return {str(row[0]): row[1] for row in rows}
+
+    def sum_metrics(self, folder: str, names: Iterable[str] = ('likes', 'comments', 'shares', 'views')) -> Dict[str, int]:
+        """
+        Total engagement metrics over a folder.
+
+        Args:
+            folder: Folder path relative to the vault root
+            names: Metric names to total
+
+        Returns:
+            Mapping of metric name to total
+        """
+        names = list(names)
+        columns = ', '.join(f"COALESCE(SUM(json_extract(metrics, '$.{name}')), 0)" for name in names)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {columns} FROM files WHERE folder = ?", (self._folder_key(folder),)
+            ).fetchone()
+        return {name: int(value) for name, value in zip(names, row)}
+
@@ -0,0 +1,440 @@
+"""
+Vault Event Dispatcher
+
+Moves work between vault stages as soon as files land, instead of waiting
+for the next scheduler run:
+
+- Inbox/          -> ClaudeCodeAgent.process_inbox()
+- Needs_Action/   -> PlanReasoningLoop.create_plan() for each new task
+- Approved/       -> ApprovalWorkflow.process_approval(), then resume plans
+                     in a background thread
+
+Filesystem events come from watchdog (inotify / FSEvents / ReadDirectoryChanges)
+when it is installed, otherwise from a scandir poller that only lists a
+folder when its directory mtime changes. Events are debounced per folder and
+coalesced, so a burst of files triggers one handler call.
+"""
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    WATCHDOG_AVAILABLE = True
+except ImportError:
+    WATCHDOG_AVAILABLE = False
+
+
+Handler = Callable[[List[Path]], None]
+
+
+def _is_vault_file(name: str) -> bool:
+    """True for markdown files, ignoring hidden and temp files"""
+    return name.endswith('.md') and not name.startswith('.')
+
+
+class CoalescedJob:
+    """
+    Runs a job in a background thread, coalescing requests.
+
+    Requests made while the job runs collapse into one more run after it, so
+    a burst of events costs at most two runs and never blocks the caller.
+    """
+
+    def __init__(self, job: Callable[[], object], name: str, logger: Optional[logging.Logger] = None):
+        """
+        Initialize the job.
+
+        Args:
+            job: Callable to run
+            name: Thread name, also used in log messages
+            logger: Logger to use (defaults to "vault_events")
+        """
+        self.job = job
+        self.name = name
+        self.logger = logger or logging.getLogger("vault_events")
+        self.runs = 0
+        self._lock = threading.Lock()
+        self._running = False
+        self._again = False
+        self._thread: Optional[threading.Thread] = None
+
+    def request(self):
+        """Run the job now, or once more after the current run"""
+        with self._lock:
+            if self._running:
+                self._again = True
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name=self.name)
+            self._thread.start()
+
+    def _run(self):
+        """Run the job until no further run was requested"""
+        while True:
+            try:
+                self.job()
+            except Exception as e:
+                self.logger.error(f"{self.name} failed: {e}")
+            with self._lock:
+                self.runs += 1
+                if not self._again:
+                    self._running = False
+                    return
+                self._again = False
+
+    def wait(self, timeout: Optional[float] = None):
+        """Wait for the current run (and any queued one) to finish"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+
+@dataclass
+class VaultEventConfig:
+    """Configuration for the vault event dispatcher"""
+    vault_path: str = "."
+    debounce_ms: int = 300  # Quiet period before a folder's events are dispatched
+    poll_interval_ms: int = 1000  # Scan interval when watchdog is unavailable
+    use_watchdog: bool = True
+    dry_run: bool = False
+
+
+class FolderPoller:
+    """
+    Polling fallback that reports files newly present in watched folders.
+
+    A folder is only listed when its directory mtime changed, which is what
+    happens when entries are created, deleted or renamed in it.
+    """
+
+    def __init__(self, folders: List[Path]):
+        """
+        Initialize the poller with the current folder contents as baseline.
+
+        Args:
+            folders: Absolute folder paths to watch
+        """
+        self.folders = folders
+        self._dir_mtimes: Dict[Path, int] = {}
+        self._names: Dict[Path, Set[str]] = {}
+        for folder in folders:
+            self._dir_mtimes[folder], self._names[folder] = self._snapshot(folder)
+
+    @staticmethod
+    def _snapshot(folder: Path) -> Tuple[int, Set[str]]:
+        """Directory mtime and markdown file names"""
+        try:
+            mtime = folder.stat().st_mtime_ns
+            with os.scandir(folder) as entries:
+                names = {e.name for e in entries if _is_vault_file(e.name) and e.is_file()}
+        except FileNotFoundError:
+            return -1, set()
+        return mtime, names
+
+    def poll(self) -> List[Path]:
+        """
+        Check all folders once.
+
+        Returns:
+            Paths of files that appeared since the previous poll
+        """
+        appeared = []
+        for folder in self.folders:
+            try:
+                mtime = folder.stat().st_mtime_ns
+            except FileNotFoundError:
+                mtime = -1
+            if mtime == self._dir_mtimes[folder]:
+                continue
+
+            self._dir_mtimes[folder], names = self._snapshot(folder)
+            appeared.extend(folder / name for name in sorted(names - self._names[folder]))
+            self._names[folder] = names
+        return appeared
+
+
+if WATCHDOG_AVAILABLE:
+    class _WatchdogHandler(FileSystemEventHandler):
+        """Forwards created and moved-in files to the dispatcher"""
+
+        def __init__(self, dispatcher: "VaultEventDispatcher"):
+            super().__init__()
+            self.dispatcher = dispatcher
+
+        def on_created(self, event):
+            if not event.is_directory:
+                self.dispatcher.notify(Path(event.src_path))
+
+        def on_moved(self, event):
+            if not event.is_directory:
+                self.dispatcher.notify(Path(event.dest_path))
+
+
+class VaultEventDispatcher:
+    """
+    Debouncing dispatcher from vault folders to stage handlers.
+    """
+
+    def __init__(self, config: VaultEventConfig, logger: Optional[logging.Logger] = None):
+        """
+        Initialize the dispatcher.
+
+        Args:
+            config: Dispatcher configuration
+            logger: Logger to use (defaults to "vault_events")
+        """
+        self.config = config
+        self.vault_path = Path(config.vault_path).absolute()
+        self.logger = logger or logging.getLogger("vault_events")
+
+        self._routes: Dict[Path, Handler] = {}
+        self._pending: Dict[Path, Set[Path]] = {}
+        self._last_event: Dict[Path, float] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._observer = None
+        self._poller: Optional[FolderPoller] = None
+        self._jobs: List[CoalescedJob] = []
+
+    def on(self, folder: str, handler: Handler):
+        """
+        Route new files in a folder to a handler.
+
+        Args:
+            folder: Folder relative to the vault root
+            handler: Called with the coalesced list of new file paths
+        """
+        folder_path = (self.vault_path / folder).absolute()
+        folder_path.mkdir(parents=True, exist_ok=True)
+        self._routes[folder_path] = handler
+
+    def background(self, job: Callable[[], object], name: str) -> CoalescedJob:
+        """
+        Wrap slow follow-up work so handlers can trigger it without blocking.
+
+        Args:
+            job: Callable to run off the dispatcher thread
+            name: Job name for the thread and log messages
+
+        Returns:
+            CoalescedJob; call ``request()`` to run it
+        """
+        coalesced = CoalescedJob(job, name, logger=self.logger)
+        self._jobs.append(coalesced)
+        return coalesced
+
+    def notify(self, path: Path, now: Optional[float] = None):
+        """
+        Record a file event (thread-safe).
+
+        Args:
+            path: Path of the created or moved-in file
+            now: Event time (defaults to time.monotonic())
+        """
+        path = Path(path).absolute()
+        if path.parent not in self._routes or not _is_vault_file(path.name):
+            return
+
+        with self._lock:
+            self._pending.setdefault(path.parent, set()).add(path)
+            self._last_event[path.parent] = now if now is not None else time.monotonic()
+
+    def dispatch_ready(self, now: Optional[float] = None) -> int:
+        """
+        Call handlers for folders whose events have settled.
+
+        Args:
+            now: Current time (defaults to time.monotonic())
+
+        Returns:
+            Number of handler calls made
+        """
+        now = now if now is not None else time.monotonic()
+        quiet = self.config.debounce_ms / 1000
+
+        ready: Dict[Path, List[Path]] = {}
+        with self._lock:
+            for folder in list(self._pending):
+                if now - self._last_event[folder] >= quiet:
+                    ready[folder] = sorted(self._pending.pop(folder))
+                    del self._last_event[folder]
+
+        for folder, paths in ready.items():
+            # Files may have been moved on again during the debounce window
+            paths = [p for p in paths if p.exists()]
+            if not paths:
+                continue
+
+            self.logger.info(f"{len(paths)} new file(s) in {folder.name}")
+            if self.config.dry_run:
+                self.logger.info(f"[DRY RUN] Would dispatch {[p.name for p in paths]}")
+                continue
+            try:
+                self._routes[folder](paths)
+            except Exception as e:
+                self.logger.error(f"Handler for {folder.name} failed: {e}")
+
+        return len(ready)
+
+    def start(self):
+        """Start watching with watchdog, or set up the polling fallback"""
+        folders = list(self._routes)
+
+        if self.config.use_watchdog and WATCHDOG_AVAILABLE:
+            self._observer = Observer()
+            handler = _WatchdogHandler(self)
+            for folder in folders:
+                self._observer.schedule(handler, str(folder), recursive=False)
+            self._observer.start()
+            self.logger.info(f"Watching {len(folders)} folder(s) with watchdog")
+        else:
+            self._poller = FolderPoller(folders)
+            self.logger.info(
+                f"Watching {len(folders)} folder(s) by polling every {self.config.poll_interval_ms}ms"
+            )
+
+    def poll_once(self):
+        """Run one polling pass (no-op when watchdog is in use)"""
+        if self._poller is None:
+            return
+        for path in self._poller.poll():
+            self.notify(path)
+
+    def run(self):
+        """Dispatch events until ``stop()`` is called or interrupted"""
+        self.start()
+
+        # Tick fast enough to honour the debounce window
+        tick = min(self.config.debounce_ms, self.config.poll_interval_ms) / 1000 / 2
+        next_poll = 0.0
+        try:
+            while not self._stop.is_set():
+                now = time.monotonic()
+                if self._poller is not None and now >= next_poll:
+                    self.poll_once()
+                    next_poll = now + self.config.poll_interval_ms / 1000
+                self.dispatch_ready()
+                self._stop.wait(tick)
+        except KeyboardInterrupt:
+            self.logger.info("Vault event dispatcher stopped by user")
+        finally:
+            self.stop()
+
+    def stop(self):
+        """Stop watching"""
+        self._stop.set()
+        if self._observer is not None:
+            self._observer.stop()
+            self._observer.join()
+            self._observer = None
+        # Let background work finish writing before the process exits
+        for job in self._jobs:
+            job.wait()
+
+
+def create_vault_dispatcher(vault_path: str = ".", dry_run: bool = False,
+                            use_watchdog: bool = True) -> VaultEventDispatcher:
+    """
+    Build a dispatcher wired to the standard vault pipeline.
+
+    Args:
+        vault_path: Path to vault root
+        dry_run: Log dispatches without running handlers
+        use_watchdog: Use watchdog if installed (otherwise poll)
+
+    Returns:
+        Configured VaultEventDispatcher
+    """
+    from claude_agent import create_agent
+    from plan_reasoning_loop import PlanReasoningLoop
+    from approval_workflow import ApprovalWorkflow
+    from plan_executor import PlanExecutor, PlanExecutorConfig
+    from vault_search import VaultSearch
+    from work_claims import ClaimError
+
+    vault = Path(vault_path).absolute()
+    dispatcher = VaultEventDispatcher(
+        VaultEventConfig(vault_path=str(vault), dry_run=dry_run, use_watchdog=use_watchdog)
+    )
+
+    agent = create_agent(str(vault), dry_run)
+    planner = PlanReasoningLoop(plans_dir=str(vault / "Plans"), needs_action_dir=str(vault / "Needs_Action"))
+    workflow = ApprovalWorkflow(str(vault))
+    executor = PlanExecutor(PlanExecutorConfig(vault_path=str(vault), dry_run=dry_run))
+    search_index = VaultSearch(str(vault))
+
+    def index_new(paths: List[Path]):
+        # Make new notes searchable right away; moved-away copies drop out
+        # on the next refresh
+        for path in paths:
+            search_index.update_file(path)
+
+    def on_inbox(paths: List[Path]):
+        index_new(paths)
+        agent.process_inbox()
+
+    def on_needs_action(paths: List[Path]):
+        index_new(paths)
+        for path in paths:
+            # create_plan keeps a plan generated from the task's current content
+            try:
+                planner.create_plan(str(path))
+            except ClaimError:
+                # Another worker is planning it; keep going with the rest
+                dispatcher.logger.info(f"Skipping {path.name}: claimed by another worker")
+
+    # Executing plans can take minutes; run it beside the dispatcher so
+    # other folders keep flowing, and fold approvals made meanwhile into one rerun
+    resume_plans = dispatcher.background(executor.execute_all_plans, "resume-plans")
+
+    def on_approved(paths: List[Path]):
+        index_new(paths)
+        for path in paths:
+            workflow.process_approval(path)
+        # Plans blocked on approval can continue now
+        resume_plans.request()
+
+    dispatcher.on("Inbox", on_inbox)
+    dispatcher.on("Needs_Action", on_needs_action)
+    dispatcher.on("Approved", on_approved)
+    return dispatcher
+
+
+# CLI interface
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vault event dispatcher for AI Employee")
+    parser.add_argument(
+        "--vault-path",
+        default=".",
+        help="Path to vault root directory"
+    )
+    parser.add_argument(
+        "--poll",
+        action="store_true",
+        help="Use scandir polling even if watchdog is installed"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Run in dry-run mode (no modifications)"
+    )
+
+    args = parser.parse_args()
+
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    dispatcher = create_vault_dispatcher(args.vault_path, args.dry_run, use_watchdog=not args.poll)
+    dispatcher.run()
@@ -0,0 +1,392 @@
+"""
+Vault Layout
+
+Optional date-sharded layout for folders that only ever grow, such as
+Done/ and Logs/. A sharded folder stores files under ``YYYY/MM/DD``
+subfolders (``Done/2026/02/17/task.md``), so no single directory gets
+large and date-range queries only open the day folders in range.
+
+Files still sitting directly in a sharded folder (written before sharding
+was enabled) are included in listings and lookups until ``migrate`` moves
+them into their shard.
+
+Sharding is enabled per folder in ``<vault>/config/vault_layout.yaml``:
+
+    shardedFolders:
+      - Done
+"""
+
+import fnmatch
+import logging
+import os
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import yaml
+
+
+LAYOUT_CONFIG_FILE = "config/vault_layout.yaml"
+
+
+@dataclass
+class VaultLayoutConfig:
+    """Configuration for the vault folder layout"""
+    sharded_folders: List[str] = field(default_factory=list)
+
+
+def load_layout_config(vault_path: str = ".") -> VaultLayoutConfig:
+    """
+    Load the layout configuration of a vault.
+
+    Args:
+        vault_path: Path to vault root
+
+    Returns:
+        Layout configuration (all folders flat if the file is missing)
+    """
+    config_path = Path(vault_path) / LAYOUT_CONFIG_FILE
+    if not config_path.exists():
+        return VaultLayoutConfig()
+
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config_dict = yaml.safe_load(f) or {}
+
+    return VaultLayoutConfig(
+        sharded_folders=list(config_dict.get('shardedFolders', []))
+    )
+
+
+def _numbered_dirs(path: Path, width: int) -> List[Tuple[int, Path]]:
+    """Subdirectories named with exactly ``width`` digits, sorted by number"""
+    try:
+        with os.scandir(path) as entries:
+            dirs = [
+                (int(e.name), Path(e.path)) for e in entries
+                if len(e.name) == width and e.name.isdigit() and e.is_dir()
+            ]
+    except FileNotFoundError:
+        return []
+    return sorted(dirs)
+
+
+class VaultLayout:
+    """
+    Resolves where files live in flat and date-sharded vault folders.
+    """
+
+    def __init__(self, vault_path: str = ".", config: Optional[VaultLayoutConfig] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize the layout.
+
+        Args:
+            vault_path: Path to vault root
+            config: Layout configuration (loaded from the vault if omitted)
+            logger: Logger to use (defaults to "vault_layout")
+        """
+        self.vault_path = Path(vault_path).absolute()
+        self.config = config or load_layout_config(str(self.vault_path))
+        self.logger = logger or logging.getLogger("vault_layout")
+        self._sharded = {Path(f).as_posix().strip('/') for f in self.config.sharded_folders}
+        # Per-directory file counts, reused while the directory mtime is unchanged
+        self._dir_counts: Dict[Tuple[Path, str], Tuple[int, int]] = {}
+
+    def is_sharded(self, folder: str) -> bool:
+        """True if the folder (relative to the vault root) uses date shards"""
+        return Path(folder).as_posix().strip('/') in self._sharded
+
+    def folder_path(self, folder: str) -> Path:
+        """Absolute path of a vault folder"""
+        return self.vault_path / folder
+
+    def shard_dir(self, folder: str, when: Optional[datetime] = None) -> Path:
+        """
+        Directory a new file in a folder should be written to.
+
+        Args:
+            folder: Folder relative to the vault root
+            when: Date that selects the shard (defaults to now)
+
+        Returns:
+            Day directory for sharded folders, the folder itself otherwise
+        """
+        root = self.folder_path(folder)
+        if not self.is_sharded(folder):
+            return root
+        when = when or datetime.now()
+        return root / f"{when.year:04d}" / f"{when.month:02d}" / f"{when.day:02d}"
+
+    def shard_path(self, folder: str, name: str, when: Optional[datetime] = None) -> Path:
+        """
+        Path a file named ``name`` should be written to in a folder.
+
+        Args:
+            folder: Folder relative to the vault root
+            name: File name
+            when: Date that selects the shard (defaults to now)
+
+        Returns:
+            Absolute destination path
+        """
+        return self.shard_dir(folder, when) / name
+
+    def resolve_destination(self, destination: Path) -> Path:
+        """
+        Redirect a destination directly inside a sharded folder to its shard.
+
+        Args:
+            destination: Absolute destination path
+
+        Returns:
+            Destination path to use
+        """
+        try:
+            folder = destination.parent.absolute().relative_to(self.vault_path).as_posix()
+        except ValueError:
+            return destination
+        if self.is_sharded(folder):
+            return self.shard_path(folder, destination.name)
+        return destination
+
+    def _day_dirs(self, root: Path, start: Optional[date], end: Optional[date],
+                  newest_first: bool = False) -> Iterator[Tuple[date, Path]]:
+        """Day shard directories of a folder within a date range"""
+        years = _numbered_dirs(root, 4)
+        if newest_first:
+            years.reverse()
+        for year, year_dir in years:
+            if (start and year < start.year) or (end and year > end.year):
+                continue
+            months = _numbered_dirs(year_dir, 2)
+            if newest_first:
+                months.reverse()
+            for month, month_dir in months:
+                if (start and (year, month) < (start.year, start.month)) or \
+                        (end and (year, month) > (end.year, end.month)):
+                    continue
+                days = _numbered_dirs(month_dir, 2)
+                if newest_first:
+                    days.reverse()
+                for day, day_dir in days:
+                    try:
+                        day_date = date(year, month, day)
+                    except ValueError:
+                        continue
+                    if (start and day_date < start) or (end and day_date > end):
+                        continue
+                    yield day_date, day_dir
+
+    @staticmethod
+    def _iter_dir(path: Path, pattern: str, start: Optional[date] = None,
+                  end: Optional[date] = None,
+                  date_of: Optional[Callable[[Path], Optional[date]]] = None) -> Iterator[Path]:
+        """Files in one directory, optionally filtered by date (modification date by default)"""
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if not fnmatch.fnmatch(entry.name, pattern) or not entry.is_file():
+                        continue
+                    if start or end:
+                        modified = date_of(Path(entry.path)) if date_of else None
+                        if modified is None:
+                            modified = date.fromtimestamp(entry.stat().st_mtime)
+                        if (start and modified < start) or (end and modified > end):
+                            continue
+                    yield Path(entry.path)
+        except FileNotFoundError:
+            return
+
+    def iter_files(self, folder: str, start: Optional[date] = None, end: Optional[date] = None,
+                   pattern: str = "*.md",
+                   date_of: Optional[Callable[[Path], Optional[date]]] = None) -> Iterator[Path]:
+        """
+        Iterate over the files of a folder, optionally within a date range.
+
+        In sharded folders only the day directories inside the range are
+        listed. Unsharded files are filtered by ``date_of(path)``, or by
+        modification date when it is omitted or returns None.
+
+        Args:
+            folder: Folder relative to the vault root
+            start: First date to include
+            end: Last date to include
+            pattern: Filename glob
+            date_of: Date of an unsharded file (e.g. from its frontmatter)
+
+        Yields:
+            Absolute file paths
+        """
+        root = self.folder_path(folder)
+        yield from self._iter_dir(root, pattern, start, end, date_of)
+        if not self.is_sharded(folder):
+            return
+        for _, day_dir in self._day_dirs(root, start, end):
+            yield from self._iter_dir(day_dir, pattern)
+
+    def directories(self, folder: str) -> Iterator[Path]:
+        """
+        Directories holding a folder's files.
+
+        Args:
+            folder: Folder relative to the vault root
+
+        Yields:
+            The folder itself, then its day directories if it is sharded
+        """
+        root = self.folder_path(folder)
+        yield root
+        if self.is_sharded(folder):
+            for _, day_dir in self._day_dirs(root, None, None):
+                yield day_dir
+
+    def _count_dir(self, path: Path, pattern: str) -> int:
+        """Count matching files in a directory, cached on its mtime"""
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return 0
+        cached = self._dir_counts.get((path, pattern))
+        if cached and cached[0] == mtime:
+            return cached[1]
+        count = sum(1 for _ in self._iter_dir(path, pattern))
+        self._dir_counts[(path, pattern)] = (mtime, count)
+        return count
+
+    def count(self, folder: str, start: Optional[date] = None, end: Optional[date] = None,
+              pattern: str = "*.md") -> int:
+        """
+        Count files in a folder, optionally within a date range.
+
+        Day directories whose mtime has not changed are not listed again.
+
+        Args:
+            folder: Folder relative to the vault root
+            start: First date to include
+            end: Last date to include
+            pattern: Filename glob
+
+        Returns:
+            Number of matching files
+        """
+        root = self.folder_path(folder)
+        if start or end:
+            total = sum(1 for _ in self._iter_dir(root, pattern, start, end))
+        else:
+            total = self._count_dir(root, pattern)
+        if self.is_sharded(folder):
+            total += sum(self._count_dir(day_dir, pattern) for _, day_dir in self._day_dirs(root, start, end))
+        return total
+
+    def find(self, folder: str, name: str) -> Optional[Path]:
+        """
+        Locate a file by name, newest shard first.
+
+        Args:
+            folder: Folder relative to the vault root
+            name: File name
+
+        Returns:
+            Absolute path, or None if not found
+        """
+        root = self.folder_path(folder)
+        if (root / name).is_file():
+            return root / name
+        if self.is_sharded(folder):
+            for _, day_dir in self._day_dirs(root, None, None, newest_first=True):
+                if (day_dir / name).is_file():
+                    return day_dir / name
+        return None
+
+    def migrate(self, folder: str, dry_run: bool = False) -> int:
+        """
+        Move files sitting directly in a sharded folder into date shards.
+
+        Each file goes to the shard for its modification date.
+
+        Args:
+            folder: Folder relative to the vault root
+            dry_run: Log the moves without making them
+
+        Returns:
+            Number of files moved (or that would be moved)
+        """
+        if not self.is_sharded(folder):
+            self.logger.warning(f"{folder} is not configured as sharded, nothing to migrate")
+            return 0
+
+        moved = 0
+        for path in list(self._iter_dir(self.folder_path(folder), "*")):
+            if path.name.startswith('.'):
+                continue
+            when = datetime.fromtimestamp(path.stat().st_mtime)
+            destination = self.shard_path(folder, path.name, when)
+            if destination.exists():
+                self.logger.warning(f"Skipping {path.name}: {destination} already exists")
+                continue
+
+            if dry_run:
+                self.logger.info(f"[DRY RUN] Would move {path.name} -> {destination}")
+            else:
+                destination.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(path, destination)
+            moved += 1
+
+        self.logger.info(f"Migrated {moved} file(s) in {folder}")
+        return moved
+
+
+# CLI interface
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Vault layout tools for AI Employee")
+    parser.add_argument(
+        "command",
+        choices=["migrate", "list", "count"],
+        help="Command to execute"
+    )
+    parser.add_argument(
+        "--folder",
+        default="Done",
+        help="Folder relative to the vault root (default: Done)"
+    )
+    parser.add_argument(
+        "--vault-path",
+        default=".",
+        help="Path to vault root directory"
+    )
+    parser.add_argument(
+        "--since",
+        type=date.fromisoformat,
+        help="First date to include (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--until",
+        type=date.fromisoformat,
+        help="Last date to include (YYYY-MM-DD)"
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Show moves without making them"
+    )
+
+    args = parser.parse_args()
+
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    layout = VaultLayout(args.vault_path)
+
+    if args.command == "migrate":
+        layout.migrate(args.folder, dry_run=args.dry_run)
+    elif args.command == "list":
+        for path in layout.iter_files(args.folder, args.since, args.until):
+            print(path.relative_to(layout.vault_path).as_posix())
+    elif args.command == "count":
+        print(layout.count(args.folder, args.since, args.until))
@@ -10,6 +10,10 @@ from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Optional
 
+from dashboard_renderer import DashboardRenderer
+from vault_layout import VaultLayout
+from vault_stats import VaultStats
+
 
 class VaultManager:
     """
@@ -50,6 +54,12 @@ class VaultManager:
             "Specs",
             "config"
         ]
+        
+        # Flat or date-sharded folder layout (Done/YYYY/MM/DD)
+        self.layout = VaultLayout(str(self.vault_path), logger=self.logger)
+        
+        # Folder statistics, cached per directory mtime
+        self.stats = VaultStats(str(self.vault_path), layout=self.layout, logger=self.logger)
     
     def initialize_vault(self) -> bool:
         """
@@ -462,23 +472,17 @@ This handbook contains the rules, guidelines, and context for your AI Employee.
         Returns:
             Dictionary with folder names and file counts
         """
-        stats = {}
-        
-        for folder in self.required_folders:
-            folder_path = self.vault_path / folder
-            if folder_path.exists():
-                # Count .md files (excluding .gitkeep)
-                md_files = list(folder_path.glob("*.md"))
-                stats[folder] = len(md_files)
-            else:
-                stats[folder] = 0
-        
-        return stats
+        # Count .md files (excluding .gitkeep) in one scandir pass per
+        # directory; date-sharded folders include their day directories
+        return self.stats.counts(self.required_folders)
     
     def update_dashboard_stats(self) -> bool:
         """
         Update Dashboard.md with current statistics.
         
+        Counters come from pipeline events recorded since the last update;
+        the folders are only scanned the first time.
+        
         Returns:
             True if successful, False otherwise
         """
@@ -488,30 +492,11 @@ This handbook contains the rules, guidelines, and context for your AI Employee.
             self.logger.warning("Dashboard.md does not exist, cannot update stats")
             return False
         
-        try:
-            # Get current stats
-            stats = self.get_folder_stats()
-            
-            # Read current dashboard
-            content = dashboard_path.read_text(encoding='utf-8')
-            
-            # Update timestamp
-            import re
-            content = re.sub(
-                r'\*\*Last Updated\*\*: .*',
-                f'**Last Updated**: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}',
-                content
-            )
-            
-            # Write back
-            dashboard_path.write_text(content, encoding='utf-8')
-            
+        renderer = DashboardRenderer(str(self.vault_path), logger=self.logger, stats=self.stats)
+        if renderer.update():
             self.logger.info("Dashboard stats updated")
             return True
-        
-        except Exception as e:
-            self.logger.error(f"Failed to update dashboard stats: {e}", exc_info=True)
-            return False
+        return False
 
 
 def initialize_vault(vault_path: str = ".") -> bool:
@@ -0,0 +1,382 @@
+"""
+Vault Search
+
+Full-text search over the vault's markdown files, backed by an SQLite FTS5
+inverted index under ``.index/`` and ranked with BM25. Titles and
+frontmatter values are weighted above body text.
+
+The index is incremental: ``refresh`` stats the indexed folders and only
+re-reads files whose mtime or size changed, and ``update_file`` /
+``remove_file`` keep it current from vault events without a scan. Query
+paths call ``refresh_if_stale``, which only scans when the last full
+refresh (recorded in the database, so shared by every instance) is older
+than ``refresh_interval``.
+"""
+
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import frontmatter_codec
+
+
+# Vault stages whose notes are searchable (searched recursively, so
+# date-sharded Done/ folders are included)
+DEFAULT_FOLDERS = ("Inbox", "Needs_Action", "Plans", "Pending_Approval", "Approved", "Done")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT UNIQUE NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs USING fts5(
+    title, fields, body, tokenize = 'porter unicode61'
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+# Seconds a full refresh stays fresh for refresh_if_stale()
+REFRESH_INTERVAL = 60.0
+
+# BM25 column weights for (title, fields, body)
+COLUMN_WEIGHTS = (5.0, 2.0, 1.0)
+
+_TOKEN_PATTERN = re.compile(r'\w+', re.UNICODE)
+_HEADING_PATTERN = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+# Frontmatter keys used as the document title, in order of preference
+TITLE_FIELDS = ("subject", "title", "goal")
+
+
+@dataclass
+class SearchResult:
+    """A ranked search hit"""
+    path: Path
+    title: str
+    score: float
+    snippet: str
+
+
+def build_query(text: str, prefix: bool = True) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query matching all of its words.
+
+    Args:
+        text: User query
+        prefix: Let the last word match as a prefix
+
+    Returns:
+        FTS5 MATCH expression, or None if the text has no words
+    """
+    tokens = _TOKEN_PATTERN.findall(text)
+    if not tokens:
+        return None
+    terms = [f'"{token}"' for token in tokens]
+    if prefix:
+        terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def document_fields(content: str, fallback_title: str) -> tuple:
+    """
+    Split a note into the indexed (title, fields, body) columns.
+
+    Args:
+        content: File content
+        fallback_title: Title to use when the note has none
+
+    Returns:
+        (title, frontmatter text, body)
+    """
+    fields, body = frontmatter_codec.extract(content)
+
+    title = next((str(fields[k]) for k in TITLE_FIELDS if fields.get(k)), None)
+    if title is None:
+        heading = _HEADING_PATTERN.search(body)
+        title = heading.group(1).strip() if heading else fallback_title
+
+    values = []
+    for key, value in fields.items():
+        if isinstance(value, (list, tuple)):
+            value = ' '.join(str(v) for v in value)
+        values.append(f"{key} {value}")
+
+    return title, '\n'.join(values), body
+
+
+class VaultSearch:
+    """
+    Incremental BM25 search index for the vault.
+    """
+
+    def __init__(self, vault_path: str = ".", db_path: Optional[str] = None,
+                 folders: Iterable[str] = DEFAULT_FOLDERS, logger: Optional[logging.Logger] = None,
+                 refresh_interval: float = REFRESH_INTERVAL):
+        """
+        Initialize the search index.
+
+        Args:
+            vault_path: Path to the Obsidian vault root directory
+            db_path: Database file (defaults to <vault>/.index/vault_search.db)
+            folders: Folders to index, relative to the vault root
+            logger: Logger to use (defaults to "vault_search")
+            refresh_interval: Seconds between full refreshes in refresh_if_stale()
+        """
+        self.vault_path = Path(vault_path).absolute()
+        self.db_path = Path(db_path) if db_path else self.vault_path / ".index" / "vault_search.db"
+        self.folders = list(folders)
+        self.logger = logger or logging.getLogger("vault_search")
+        self.refresh_interval = refresh_interval
+        self._lock = threading.Lock()
+
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._conn.commit()
+
+    def close(self):
+        """Close the database connection"""
+        with self._lock:
+            self._conn.close()
+
+    def _relative(self, path: Path) -> str:
+        """Vault-relative posix path"""
+        path = Path(path)
+        if not path.is_absolute():
+            path = self.vault_path / path
+        return path.absolute().relative_to(self.vault_path).as_posix()
+
+    def _scan(self, folder: str) -> Dict[str, os.stat_result]:
+        """Stat every markdown file under a folder"""
+        found = {}
+        root = self.vault_path / folder
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if not d.startswith('.')]
+            for name in filenames:
+                if name.endswith('.md') and not name.startswith('.'):
+                    path = Path(dirpath) / name
+                    try:
+                        found[path.relative_to(self.vault_path).as_posix()] = path.stat()
+                    except FileNotFoundError:
+                        continue
+        return found
+
+    def _index(self, rel_path: str, stat: os.stat_result, doc_id: Optional[int]):
+        """Write one file into the index (caller holds the lock)"""
+        content = (self.vault_path / rel_path).read_text(encoding='utf-8', errors='replace')
+        title, fields, body = document_fields(content, Path(rel_path).stem)
+
+        if doc_id is None:
+            cursor = self._conn.execute(
+                "INSERT INTO files (path, mtime_ns, size) VALUES (?, ?, ?)",
+                (rel_path, stat.st_mtime_ns, stat.st_size)
+            )
+            doc_id = cursor.lastrowid
+        else:
+            self._conn.execute(
+                "UPDATE files SET mtime_ns = ?, size = ? WHERE id = ?",
+                (stat.st_mtime_ns, stat.st_size, doc_id)
+            )
+            self._conn.execute("DELETE FROM docs WHERE rowid = ?", (doc_id,))
+
+        self._conn.execute(
+            "INSERT INTO docs (rowid, title, fields, body) VALUES (?, ?, ?, ?)",
+            (doc_id, title, fields, body)
+        )
+
+    def _delete(self, doc_id: int):
+        """Remove one document from the index (caller holds the lock)"""
+        self._conn.execute("DELETE FROM docs WHERE rowid = ?", (doc_id,))
+        self._conn.execute("DELETE FROM files WHERE id = ?", (doc_id,))
+
+    def refresh(self, folders: Optional[Iterable[str]] = None) -> int:
+        """
+        Bring the index up to date for the given folders.
+
+        Args:
+            folders: Folders relative to the vault root (defaults to all
+                indexed folders)
+
+        Returns:
+            Number of documents added, updated or removed
+        """
+        full = folders is None
+        folders = self.folders if full else list(folders)
+        changes = 0
+
+        with self._lock:
+            for folder in folders:
+                prefix = Path(folder).as_posix().strip('/') + '/'
+                known = {
+                    row[1]: (row[0], row[2], row[3])
+                    for row in self._conn.execute(
+                        "SELECT id, path, mtime_ns, size FROM files WHERE substr(path, 1, ?) = ?",
+                        (len(prefix), prefix)
+                    )
+                }
+                found = self._scan(folder)
+
+                for rel_path, stat in found.items():
+                    doc_id, mtime_ns, size = known.get(rel_path, (None, None, None))
+                    if (mtime_ns, size) == (stat.st_mtime_ns, stat.st_size):
+                        continue
+                    try:
+                        self._index(rel_path, stat, doc_id)
+                    except OSError as e:
+                        self.logger.warning(f"Failed to index {rel_path}: {e}")
+                        continue
+                    changes += 1
+
+                for rel_path, (doc_id, _, _) in known.items():
+                    if rel_path not in found:
+                        self._delete(doc_id)
+                        changes += 1
+
+            if full:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO meta (key, value) VALUES ('refreshed_at', ?)",
+                    (str(time.time()),)
+                )
+            self._conn.commit()
+
+        if changes:
+            self.logger.debug(f"Search index refresh applied {changes} change(s)")
+        return changes
+
+    def refresh_if_stale(self) -> int:
+        """
+        Refresh all indexed folders if the last full refresh is too old.
+
+        Between refreshes the index is kept current by ``update_file`` /
+        ``remove_file``; the periodic scan catches edits made outside the
+        pipeline.
+
+        Returns:
+            Number of documents changed (0 if no refresh was due)
+        """
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM meta WHERE key = 'refreshed_at'").fetchone()
+        if row and time.time() - float(row[0]) < self.refresh_interval:
+            return 0
+        return self.refresh()
+
+    def update_file(self, path: Path):
+        """
+        Index a single file right away (e.g. from a vault event).
+
+        Args:
+            path: File path (absolute or relative to the vault root)
+        """
+        rel_path = self._relative(path)
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM files WHERE path = ?", (rel_path,)).fetchone()
+            doc_id = row[0] if row else None
+            try:
+                self._index(rel_path, (self.vault_path / rel_path).stat(), doc_id)
+            except FileNotFoundError:
+                if doc_id is not None:
+                    self._delete(doc_id)
+            self._conn.commit()
+
+    def remove_file(self, path: Path):
+        """
+        Drop a file from the index.
+
+        Args:
+            path: File path (absolute or relative to the vault root)
+        """
+        rel_path = self._relative(path)
+        with self._lock:
+            row = self._conn.execute("SELECT id FROM files WHERE path = ?", (rel_path,)).fetchone()
+            if row:
+                self._delete(row[0])
+                self._conn.commit()
+
+    def search(self, query: str, limit: int = 10, folder: Optional[str] = None) -> List[SearchResult]:
+        """
+        Search the index.
+
+        All words of the query must match; the last word also matches as a
+        prefix. Results are ordered by BM25 relevance.
+
+        Args:
+            query: Free-text query
+            limit: Maximum number of results
+            folder: Only return notes under this folder
+
+        Returns:
+            Ranked search results
+        """
+        match = build_query(query)
+        if match is None:
+            return []
+
+        sql = (
+            "SELECT f.path, docs.title, bm25(docs, ?, ?, ?) AS score, "
+            "snippet(docs, 2, '**', '**', '...', 12) "
+            "FROM docs JOIN files f ON f.id = docs.rowid WHERE docs MATCH ?"
+        )
+        params: List[Any] = [*COLUMN_WEIGHTS, match]
+        if folder:
+            prefix = Path(folder).as_posix().strip('/') + '/'
+            sql += " AND substr(f.path, 1, ?) = ?"
+            params += [len(prefix), prefix]
+        sql += " ORDER BY score LIMIT ?"
+        params.append(limit)
+
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+
+        # bm25() is lower-is-better; report higher-is-better scores
+        return [
+            SearchResult(path=self.vault_path / row[0], title=row[1], score=-row[2], snippet=row[3])
+            for row in rows
+        ]
+
+    def count(self) -> int:
+        """Number of indexed documents"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM files").fetchone()[0]
+
+
+# CLI interface
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Full-text search over the vault")
+    parser.add_argument("query", help="Search query")
+    parser.add_argument(
+        "--vault-path",
+        default=".",
+        help="Path to vault root directory"
+    )
+    parser.add_argument(
+        "--folder",
+        help="Only search this folder"
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=10,
+        help="Maximum number of results"
+    )
+
+    args = parser.parse_args()
+
+    index = VaultSearch(args.vault_path)
+    index.refresh()
+    for result in index.search(args.query, limit=args.limit, folder=args.folder):
+        print(f"{result.score:6.2f}  {result.path.relative_to(index.vault_path).as_posix()}  {result.title}")
+        print(f"        {result.snippet}")
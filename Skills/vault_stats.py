@@ -0,0 +1,204 @@
+"""
+Vault Stats
+
+Folder statistics for the vault in a single ``os.scandir`` pass per
+directory: file counts, total bytes, oldest and newest items, and a
+breakdown by frontmatter ``priority`` (read header-only). Headers are only
+opened when the priority breakdown is asked for, so ``counts`` costs one
+``stat`` per file.
+
+Each directory's summary is cached on the directory mtime, so repeated
+calls within a cycle do not touch the disk beyond one ``stat`` per
+directory. Adding, removing or renaming a file bumps the mtime; an
+in-place edit of a file's priority is picked up on the next change to its
+directory.
+"""
+
+import logging
+import os
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Tuple
+
+import frontmatter_codec
+from vault_layout import VaultLayout
+
+
+# Folders reported by default
+DEFAULT_FOLDERS = ("Inbox", "Needs_Action", "Plans", "Pending_Approval", "Approved", "Done")
+
+# Priority bucket for notes without a priority field
+NO_PRIORITY = "none"
+
+
+@dataclass
+class FolderStats:
+    """Statistics for one vault folder"""
+    folder: str
+    exists: bool = False
+    count: int = 0
+    total_bytes: int = 0
+    oldest: Optional[str] = None
+    oldest_mtime: Optional[float] = None
+    newest: Optional[str] = None
+    newest_mtime: Optional[float] = None
+    by_priority: Dict[str, int] = field(default_factory=dict)
+
+    def merge(self, other: "FolderStats"):
+        """Add another directory's statistics into this one"""
+        self.exists = self.exists or other.exists
+        self.count += other.count
+        self.total_bytes += other.total_bytes
+        if other.oldest_mtime is not None and (self.oldest_mtime is None or other.oldest_mtime < self.oldest_mtime):
+            self.oldest, self.oldest_mtime = other.oldest, other.oldest_mtime
+        if other.newest_mtime is not None and (self.newest_mtime is None or other.newest_mtime > self.newest_mtime):
+            self.newest, self.newest_mtime = other.newest, other.newest_mtime
+        self.by_priority = dict(Counter(self.by_priority) + Counter(other.by_priority))
+
+
+class VaultStats:
+    """
+    Cached single-pass statistics for vault folders.
+    """
+
+    def __init__(self, vault_path: str = ".", layout: Optional[VaultLayout] = None,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize the statistics collector.
+
+        Args:
+            vault_path: Path to vault root
+            layout: Folder layout (loaded from the vault if omitted)
+            logger: Logger to use (defaults to "vault_stats")
+        """
+        self.vault_path = Path(vault_path).absolute()
+        self.logger = logger or logging.getLogger("vault_stats")
+        self.layout = layout or VaultLayout(str(self.vault_path), logger=self.logger)
+        # Per-directory summaries keyed by path, reused while the mtime is
+        # unchanged (with a flag for whether priorities were read)
+        self._dir_cache: Dict[str, Tuple[int, FolderStats, bool]] = {}
+
+    def _priority(self, path: str) -> str:
+        """Priority of a note from its header (NO_PRIORITY if unset)"""
+        try:
+            priority = frontmatter_codec.read_header(path).get('priority')
+        except OSError:
+            return NO_PRIORITY
+        return str(priority).lower() if priority else NO_PRIORITY
+
+    def _scan_dir(self, path: Path, folder: str, priority: bool = True) -> FolderStats:
+        """Summarize the markdown files directly in one directory (priorities only if asked)"""
+        key = str(path)
+        try:
+            mtime = os.stat(key).st_mtime_ns
+        except FileNotFoundError:
+            self._dir_cache.pop(key, None)
+            return FolderStats(folder=folder)
+
+        cached = self._dir_cache.get(key)
+        if cached and cached[0] == mtime and (cached[2] or not priority):
+            return cached[1]
+
+        stats = FolderStats(folder=folder, exists=True)
+        priorities = Counter()
+        with os.scandir(key) as entries:
+            for entry in entries:
+                if not entry.name.endswith('.md') or entry.name.startswith('.'):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+
+                rel_path = Path(entry.path).relative_to(self.vault_path).as_posix()
+                stats.count += 1
+                stats.total_bytes += stat.st_size
+                if stats.oldest_mtime is None or stat.st_mtime < stats.oldest_mtime:
+                    stats.oldest, stats.oldest_mtime = rel_path, stat.st_mtime
+                if stats.newest_mtime is None or stat.st_mtime > stats.newest_mtime:
+                    stats.newest, stats.newest_mtime = rel_path, stat.st_mtime
+                if priority:
+                    priorities[self._priority(entry.path)] += 1
+
+        stats.by_priority = dict(priorities)
+        self._dir_cache[key] = (mtime, stats, priority)
+        return stats
+
+    def folder_stats(self, folder: str, priority: bool = True) -> FolderStats:
+        """
+        Statistics for one folder, including date shards.
+
+        Args:
+            folder: Folder relative to the vault root
+            priority: Read note headers for the priority breakdown
+
+        Returns:
+            Folder statistics (by_priority is empty if priority is False)
+        """
+        total = FolderStats(folder=folder)
+        for directory in self.layout.directories(folder):
+            total.merge(self._scan_dir(directory, folder, priority))
+        return total
+
+    def collect(self, folders: Optional[Iterable[str]] = None,
+                priority: bool = True) -> Dict[str, FolderStats]:
+        """
+        Statistics for several folders.
+
+        Args:
+            folders: Folders relative to the vault root (defaults to the
+                pipeline stages)
+            priority: Read note headers for the priority breakdown
+
+        Returns:
+            Dictionary of folder name to statistics
+        """
+        folders = DEFAULT_FOLDERS if folders is None else folders
+        return {folder: self.folder_stats(folder, priority) for folder in folders}
+
+    def counts(self, folders: Optional[Iterable[str]] = None) -> Dict[str, int]:
+        """
+        File counts for several folders.
+
+        Args:
+            folders: Folders relative to the vault root
+
+        Returns:
+            Dictionary of folder name to markdown file count
+        """
+        return {folder: stats.count for folder, stats in self.collect(folders, priority=False).items()}
+
+
+# CLI interface
+if __name__ == "__main__":
+    import argparse
+    from datetime import datetime
+
+    parser = argparse.ArgumentParser(description="Vault folder statistics")
+    parser.add_argument(
+        "folders",
+        nargs="*",
+        help="Folders to report (default: pipeline stages)"
+    )
+    parser.add_argument(
+        "--vault-path",
+        default=".",
+        help="Path to vault root directory"
+    )
+
+    args = parser.parse_args()
+
+    collector = VaultStats(args.vault_path)
+    for folder, stats in collector.collect(args.folders or None).items():
+        if not stats.exists:
+            print(f"{folder}: missing")
+            continue
+        print(f"{folder}: {stats.count} files, {stats.total_bytes} bytes")
+        if stats.count:
+            print(f"  oldest: {stats.oldest} ({datetime.fromtimestamp(stats.oldest_mtime):%Y-%m-%d %H:%M})")
+            print(f"  newest: {stats.newest} ({datetime.fromtimestamp(stats.newest_mtime):%Y-%m-%d %H:%M})")
+            breakdown = ", ".join(f"{p}: {n}" for p, n in sorted(stats.by_priority.items()))
+            print(f"  priority: {breakdown}")
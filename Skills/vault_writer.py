@@ -0,0 +1,213 @@
+"""
+Vault Writer
+
+Shared, crash-safe writer for task files created in the vault.
+
+- Collision-proof names: ``<timestamp>_<slug>_<hash>.md`` where the hash is a
+  short digest of the content, so two similar items in the same second never
+  overwrite each other.
+- Atomic writes: content goes to a temp file in the target folder, is fsynced,
+  then renamed into place.
+- Group commit: inside ``batch()`` the directory fsync is deferred and issued
+  once per folder when the batch ends instead of once per file.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import tempfile
+from contextlib import contextmanager
+from datetime import datetime, UTC
+from pathlib import Path
+from typing import Iterator, Optional, Set
+
+
+def sanitize_slug(text: str, max_length: int = 50) -> str:
+    """
+    Sanitize text for use in a filename.
+
+    Args:
+        text: Text to sanitize
+        max_length: Maximum length of sanitized text
+
+    Returns:
+        Sanitized filename-safe string
+    """
+    text = text.lower()
+    text = re.sub(r'[^\w\s-]', '', text)
+    text = re.sub(r'[-\s]+', '-', text)
+    text = text[:max_length]
+    text = text.strip('-')
+    return text or 'untitled'
+
+
+def content_hash(content: str, length: int = 8) -> str:
+    """Short hex digest of file content"""
+    return hashlib.sha1(content.encode('utf-8')).hexdigest()[:length]
+
+
+def _fsync_directory(directory: Path):
+    """Flush directory entries to disk (no-op where unsupported, e.g. Windows)"""
+    try:
+        fd = os.open(str(directory), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_atomic(target: Path, content: str, fsync: bool = True):
+    """
+    Replace a file's content atomically.
+
+    Content goes to a temp file in the same folder, is optionally fsynced,
+    then renamed over the target, so readers and crashes see either the old
+    or the new file, never a partial one.
+
+    Args:
+        target: File to write
+        content: Content to write
+        fsync: Flush the file data to disk before the rename
+    """
+    target = Path(target)
+    fd, tmp_name = tempfile.mkstemp(dir=str(target.parent), prefix=".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='') as f:
+            f.write(content)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_name, target)
+    except BaseException:
+        try:
+            os.unlink(tmp_name)
+        except OSError:
+            pass
+        raise
+
+
+class VaultWriter:
+    """
+    Atomic, collision-free markdown writer with optional group commit.
+    """
+
+    def __init__(self, fsync: bool = True, logger: Optional[logging.Logger] = None):
+        """
+        Initialize the writer.
+
+        Args:
+            fsync: Flush file data and directory entries to disk on write
+            logger: Logger to use (defaults to "VaultWriter")
+        """
+        self.fsync = fsync
+        self.logger = logger or logging.getLogger("VaultWriter")
+        self._batch_depth = 0
+        self._dirty_dirs: Set[Path] = set()
+
+    def make_filename(self, title: str, content: str,
+                      timestamp: Optional[datetime] = None) -> str:
+        """
+        Build a collision-proof filename for a task.
+
+        Args:
+            title: Human-readable title (slugified)
+            content: File content (hashed into the name)
+            timestamp: Time to stamp the name with (defaults to now, UTC)
+
+        Returns:
+            Filename like ``20260217_181011_sales-associate_1a2b3c4d.md``
+        """
+        stamp = (timestamp or datetime.now(UTC)).strftime("%Y%m%d_%H%M%S")
+        return f"{stamp}_{sanitize_slug(title)}_{content_hash(content)}.md"
+
+    def write(self, folder: Path, filename: str, content: str) -> Path:
+        """
+        Atomically write ``content`` to ``folder/filename``.
+
+        If the name is already taken by a different file, a numeric suffix
+        is added rather than overwriting it.
+
+        Args:
+            folder: Destination folder
+            filename: Destination filename
+            content: Content to write
+
+        Returns:
+            Path of the written file
+        """
+        folder = Path(folder)
+        folder.mkdir(parents=True, exist_ok=True)
+        target = self._free_path(folder / filename, content)
+        write_atomic(target, content, fsync=self.fsync)
+
+        if self.fsync:
+            if self._batch_depth:
+                self._dirty_dirs.add(folder)
+            else:
+                _fsync_directory(folder)
+
+        return target
+
+    def create_task_file(self, folder: Path, title: str, content: str) -> Path:
+        """
+        Write a new task file under a collision-proof name.
+
+        Args:
+            folder: Destination folder
+            title: Title used for the filename slug
+            content: Markdown content
+
+        Returns:
+            Path of the written file
+        """
+        return self.write(folder, self.make_filename(title, content), content)
+
+    def _free_path(self, target: Path, content: str) -> Path:
+        """Return ``target`` or a suffixed sibling that does not clash"""
+        if not target.exists():
+            return target
+
+        # Identical content under the same name is an idempotent rewrite
+        try:
+            if target.read_text(encoding='utf-8') == content:
+                return target
+        except OSError:
+            pass
+
+        counter = 1
+        while True:
+            candidate = target.with_name(f"{target.stem}-{counter}{target.suffix}")
+            if not candidate.exists():
+                return candidate
+            counter += 1
+
+    @contextmanager
+    def batch(self) -> Iterator["VaultWriter"]:
+        """
+        Group-commit context: fsync each touched directory once on exit.
+
+        Example:
+            >>> with writer.batch():
+            ...     for item in items:
+            ...         writer.create_task_file(folder, item.title, item.content)
+        """
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.commit()
+
+    def commit(self):
+        """Flush directory entries for all folders written in the batch"""
+        dirty, self._dirty_dirs = self._dirty_dirs, set()
+        for folder in dirty:
+            _fsync_directory(folder)
+        if dirty:
+            self.logger.debug(f"Group commit flushed {len(dirty)} folder(s)")
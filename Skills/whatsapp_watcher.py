@@ -7,8 +7,10 @@ Uses Playwright for browser automation.
 IMPORTANT: This uses WhatsApp Web automation. Be aware of WhatsApp's terms of service.
 """
 
+import hashlib
 import logging
 import time
+from collections import deque
 from pathlib import Path
 from datetime import datetime, UTC
 from typing import Dict, List, Optional, Any
@@ -17,13 +19,228 @@ import json
 import re
 
 try:
-    from playwright.sync_api import sync_playwright, Browser, Page
+    from playwright.sync_api import sync_playwright, Browser, Page, Route, Error as PlaywrightError
 except ImportError:
     print("Playwright not installed. Install with: pip install playwright")
     print("Then run: playwright install chromium")
     exit(1)
 
+import frontmatter_codec
 from base_watcher import BaseWatcher, WatcherConfig
+from vault_writer import write_atomic
+
+
+WHATSAPP_URL = 'https://web.whatsapp.com'
+CHAT_LIST_SELECTOR = '[data-testid="chat-list"]'
+MESSAGE_SELECTOR = '[data-testid="msg-container"]'
+EVENT_BINDING = '__aiEmployeeNotify'
+
+# Handled item IDs remembered per chat; older ones sit below the cursor anyway
+PROCESSED_PER_CHAT = 20
+
+# Reads every unread chat row (name + preview) in a single round trip
+UNREAD_CHATS_SCRIPT = """
+() => Array.from(document.querySelectorAll('[aria-label*="unread"]')).map(el => {
+    const row = el.closest('[data-testid="cell-frame-container"]') || el;
+    const title = row.querySelector('[data-testid="cell-frame-title"]');
+    const preview = row.querySelector('[data-testid="last-msg-text"]');
+    return {
+        name: title ? title.innerText.trim() : 'Unknown',
+        preview: preview ? preview.innerText : ''
+    };
+})
+"""
+
+# Reads messages of the open chat newer than ``after`` (a data-id) in a
+# single round trip, capped at the last ``limit`` messages
+CHAT_MESSAGES_SCRIPT = """
+({limit, after}) => {
+    let nodes = Array.from(document.querySelectorAll('[data-testid="msg-container"]'));
+    if (after) {
+        const seen = nodes.findIndex(el => {
+            const row = el.closest('[data-id]');
+            return row && row.getAttribute('data-id') === after;
+        });
+        if (seen >= 0) nodes = nodes.slice(seen + 1);
+    }
+    return nodes.slice(-limit).map(el => {
+        const row = el.closest('[data-id]');
+        const meta = el.querySelector('[data-pre-plain-text]');
+        return {
+            id: row ? row.getAttribute('data-id') : null,
+            meta: meta ? meta.getAttribute('data-pre-plain-text') : '',
+            text: el.innerText
+        };
+    });
+}
+"""
+
+# Search result row for a chat, once the search results pane has rendered
+# (chat-list rows outside the pane never match)
+SEARCH_RESULT_SCRIPT = """
+(name) => {
+    const pane = document.querySelector('[aria-label="Search results."]');
+    if (!pane) return null;
+    const rows = Array.from(pane.querySelectorAll('[data-testid="cell-frame-container"]'));
+    const exact = rows.find(row => {
+        const title = row.querySelector('[data-testid="cell-frame-title"]');
+        return title && title.innerText.trim() === name;
+    });
+    return exact || rows[0] || null;
+}
+"""
+
+# data-pre-plain-text looks like "[10:32, 2/17/2026] Alice: "
+_META_PATTERN = re.compile(r'^\[(?P<timestamp>[^\]]*)\]\s*(?P<sender>[^:]*):?')
+
+# True once the conversation header shows the requested chat
+CHAT_OPEN_SCRIPT = """
+(name) => {
+    const header = document.querySelector('#main header');
+    return !!header && header.innerText.includes(name);
+}
+"""
+
+# Set while the watcher itself opens a chat, so the observer does not report
+# the messages that opening renders
+NAVIGATION_SCRIPT = """
+(active) => { window.__aiEmployeeNavigating = active; }
+"""
+
+# Pushes unread chats and messages arriving in the open chat to Python.
+# The unread list is only re-read when an unread badge changes; mutations
+# are coalesced per animation frame into one binding call.
+OBSERVER_SCRIPT = """
+() => {
+    if (window.__aiEmployeeObserver) return;
+    const UNREAD = '[aria-label*="unread"]';
+    let scheduled = false;
+    let chatsDirty = true;
+    let messages = [];
+
+    // Mutation target inside an unread badge
+    const inUnread = (node) => {
+        const el = node && (node.nodeType === 1 ? node : node.parentElement);
+        return !!el && !!el.closest(UNREAD);
+    };
+    // Added or removed node that is, or contains, an unread badge
+    const hasUnread = (node) => node.nodeType === 1 && (node.matches(UNREAD) || !!node.querySelector(UNREAD));
+
+    const flush = () => {
+        scheduled = false;
+        let chats = [];
+        if (chatsDirty) {
+            chatsDirty = false;
+            chats = Array.from(document.querySelectorAll(UNREAD)).map(el => {
+                const row = el.closest('[data-testid="cell-frame-container"]') || el;
+                const title = row.querySelector('[data-testid="cell-frame-title"]');
+                const preview = row.querySelector('[data-testid="last-msg-text"]');
+                return {
+                    name: title ? title.innerText.trim() : 'Unknown',
+                    preview: preview ? preview.innerText : ''
+                };
+            });
+        }
+        const batch = messages;
+        messages = [];
+        if (chats.length || batch.length) {
+            window.__aiEmployeeNotify({chats: chats, messages: batch});
+        }
+    };
+
+    const observer = new MutationObserver(mutations => {
+        for (const mutation of mutations) {
+            if (!chatsDirty) {
+                chatsDirty = inUnread(mutation.target)
+                    || Array.from(mutation.addedNodes).some(hasUnread)
+                    || Array.from(mutation.removedNodes).some(hasUnread);
+            }
+            if (window.__aiEmployeeNavigating) continue;
+            for (const node of mutation.addedNodes) {
+                if (node.nodeType !== 1 || !node.closest('#main')) continue;
+                const found = node.matches('[data-testid="msg-container"]')
+                    ? [node] : node.querySelectorAll('[data-testid="msg-container"]');
+                const header = document.querySelector('#main header [title]');
+                for (const el of found) {
+                    messages.push({
+                        chat: header ? header.getAttribute('title') : 'Unknown',
+                        text: el.innerText
+                    });
+                }
+            }
+        }
+        if (!scheduled && (chatsDirty || messages.length)) {
+            scheduled = true;
+            requestAnimationFrame(flush);
+        }
+    });
+
+    observer.observe(document.body, {
+        childList: true, subtree: true, characterData: true,
+        attributes: true, attributeFilter: ['aria-label']
+    });
+    window.__aiEmployeeObserver = observer;
+    flush();
+}
+"""
+
+
+def parse_message_meta(meta: str) -> Dict[str, str]:
+    """
+    Split WhatsApp's ``data-pre-plain-text`` attribute into timestamp and sender.
+    
+    Args:
+        meta: Attribute value, e.g. "[10:32, 2/17/2026] Alice: "
+        
+    Returns:
+        Dictionary with 'timestamp' and 'sender' (empty strings if unknown)
+    """
+    match = _META_PATTERN.match(meta or '')
+    if not match:
+        return {'timestamp': '', 'sender': ''}
+    return {
+        'timestamp': match.group('timestamp').strip(),
+        'sender': match.group('sender').strip()
+    }
+
+
+def message_key(chat_name: str, sender: str, timestamp: str, text: str) -> str:
+    """
+    Content-derived identity of a message.
+    
+    The same message always gets the same key, no matter when or how often
+    it is seen, so re-reading a chat never produces a new item.
+    
+    Args:
+        chat_name: Chat the message belongs to
+        sender: Message author
+        timestamp: Timestamp as shown by WhatsApp
+        text: Message text
+        
+    Returns:
+        16-character hex key
+    """
+    raw = '\x1f'.join([chat_name, sender, timestamp, text])
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+def messages_after_cursor(messages: List[Dict[str, str]], cursor_key: Optional[str]) -> List[Dict[str, str]]:
+    """
+    Return the messages that come after the cursor.
+    
+    Args:
+        messages: Messages in chat order, each with a 'key'
+        cursor_key: Key of the last message already handled (None for a new chat)
+        
+    Returns:
+        Messages newer than the cursor (all of them if the cursor is not found)
+    """
+    if not cursor_key:
+        return messages
+    for position in range(len(messages) - 1, -1, -1):
+        if messages[position]['key'] == cursor_key:
+            return messages[position + 1:]
+    return messages
 
 
 @dataclass
@@ -32,11 +249,23 @@ class WhatsAppWatcherConfig(WatcherConfig):
     session_path: str = ".whatsapp_session"
     keywords: List[str] = None
     polling_interval_ms: int = 30000  # 30 seconds
+    headless: bool = True
+    blocked_resource_types: List[str] = None
+    page_load_timeout_ms: int = 30000
+    ui_timeout_ms: int = 5000  # Max wait for search results / chat to open
+    streaming: bool = False  # Push messages via a DOM MutationObserver instead of polling
+    stream_flush_ms: int = 250  # How often queued DOM events are handed to the pipeline
+    max_messages_per_chat: int = 50  # Upper bound on new messages read from one chat per poll
+    cursor_file: str = None  # Per-chat last-seen cursors (defaults to <index_path>/whatsapp-cursors.json)
     
     def __post_init__(self):
-        super().__post_init__()
         if self.keywords is None:
             self.keywords = ['urgent', 'asap', 'invoice', 'payment', 'help', 'important']
+        if self.blocked_resource_types is None:
+            # Text is all we read; skip the heavy assets
+            self.blocked_resource_types = ['image', 'font', 'media']
+        if self.cursor_file is None:
+            self.cursor_file = str(Path(self.index_path) / "whatsapp-cursors.json")
 
 
 class WhatsAppWatcher(BaseWatcher):
@@ -52,11 +281,128 @@ class WhatsAppWatcher(BaseWatcher):
         self.config: WhatsAppWatcherConfig = config
         self.session_path = Path(config.session_path)
         self.keywords = config.keywords
-        self.processed_messages: set = set()
+        self.processed_messages: Dict[str, List[str]] = {}
+        
+        # Last message handled per chat, and items read but not yet processed
+        self.cursors: Dict[str, Dict[str, str]] = {}
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._load_cursors()
+        
+        # Long-lived browser session shared across polls
+        self._playwright = None
+        self._context = None
+        self._page: Optional[Page] = None
+        
+        # Streaming mode: DOM events pushed from the page observer
+        self._observer_installed = False
+        self._events: deque = deque()
+        # Message texts shown by the chats opened in the last scan; their DOM events are our own
+        self._just_read: Dict[str, set] = {}
         
         # Ensure session directory exists
         self.session_path.mkdir(parents=True, exist_ok=True)
     
+    def _load_cursors(self):
+        """Load per-chat cursors and processed message IDs from disk"""
+        cursor_file = Path(self.config.cursor_file)
+        if not cursor_file.exists():
+            return
+        
+        try:
+            with open(cursor_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.cursors = data.get('chats', {})
+            processed = data.get('processed', {})
+            # Older files kept one unbounded list for all chats; the cursors cover it
+            self.processed_messages = processed if isinstance(processed, dict) else {}
+        except Exception as e:
+            self.logger.error(f"Failed to load WhatsApp cursors: {e}")
+    
+    def _save_cursors(self):
+        """Persist per-chat cursors and processed message IDs"""
+        if self.config.dry_run:
+            return
+        
+        data = {
+            'chats': self.cursors,
+            'processed': self.processed_messages
+        }
+        cursor_file = Path(self.config.cursor_file)
+        try:
+            # Replace in place; VaultWriter.write would add a suffixed sibling instead
+            cursor_file.parent.mkdir(parents=True, exist_ok=True)
+            write_atomic(cursor_file, json.dumps(data, indent=2))
+        except Exception as e:
+            self.logger.error(f"Failed to save WhatsApp cursors: {e}")
+    
+    def _route_request(self, route: Route):
+        """Abort requests for resource types the watcher never reads"""
+        if route.request.resource_type in self.config.blocked_resource_types:
+            route.abort()
+        else:
+            route.continue_()
+    
+    def _ensure_page(self) -> Page:
+        """
+        Return the live WhatsApp Web page, starting the browser if needed.
+        
+        The persistent context and page are reused across polls; a cold start
+        only happens on first use or after a failure closed the session.
+        
+        Returns:
+            Page with the chat list loaded
+        """
+        if self._page is not None and not self._page.is_closed():
+            return self._page
+        
+        self._close_session()
+        self.logger.info("Starting WhatsApp Web browser session")
+        
+        self._playwright = sync_playwright().start()
+        self._context = self._playwright.chromium.launch_persistent_context(
+            str(self.session_path),
+            headless=self.config.headless
+        )
+        if self.config.blocked_resource_types:
+            self._context.route("**/*", self._route_request)
+        
+        self._page = self._context.pages[0] if self._context.pages else self._context.new_page()
+        self._page.goto(WHATSAPP_URL, wait_until='domcontentloaded')
+        self._page.wait_for_selector(CHAT_LIST_SELECTOR, timeout=self.config.page_load_timeout_ms)
+        return self._page
+    
+    def _close_session(self):
+        """Close the browser session (safe to call when nothing is open)"""
+        try:
+            if self._context is not None:
+                self._context.close()
+            if self._playwright is not None:
+                self._playwright.stop()
+        except Exception as e:
+            self.logger.debug(f"Error closing browser session: {e}")
+        finally:
+            self._playwright = None
+            self._context = None
+            self._page = None
+            self._observer_installed = False
+    
+    def _with_page(self, action):
+        """
+        Run ``action(page)`` on the shared page, reconnecting once on failure.
+        
+        Args:
+            action: Callable taking the page
+            
+        Returns:
+            Result of the action
+        """
+        try:
+            return action(self._ensure_page())
+        except PlaywrightError as e:
+            self.logger.warning(f"Browser session failed ({e}), reconnecting")
+            self._close_session()
+            return action(self._ensure_page())
+    
     def authenticate(self) -> bool:
         """
         Authenticate with WhatsApp Web.
@@ -70,6 +416,9 @@ class WhatsAppWatcher(BaseWatcher):
         try:
             self.logger.info("Authenticating with WhatsApp Web...")
             
+            # The session directory can only be opened by one browser at a time
+            self._close_session()
+            
             with sync_playwright() as p:
                 browser = p.chromium.launch_persistent_context(
                     str(self.session_path),
@@ -105,106 +454,281 @@ class WhatsAppWatcher(BaseWatcher):
             List of message IDs to process
         """
         try:
-            with sync_playwright() as p:
-                browser = p.chromium.launch_persistent_context(
-                    str(self.session_path),
-                    headless=True
-                )
-                page = browser.pages[0]
-                page.goto('https://web.whatsapp.com', wait_until='networkidle')
-                
-                # Wait for chat list to load
-                page.wait_for_selector('[data-testid="chat-list"]', timeout=10000)
-                
-                # Find unread chats
-                unread_chats = page.query_selector_all('[aria-label*="unread"]')
-                
-                message_ids = []
-                for chat in unread_chats:
-                    try:
-                        # Get chat name and preview text
-                        chat_name = self._get_chat_name(chat)
-                        preview_text = self._get_preview_text(chat)
-                        
-                        # Check if message contains keywords
-                        if self._contains_keywords(preview_text):
-                            message_id = f"{chat_name}_{int(time.time())}"
-                            if message_id not in self.processed_messages:
-                                message_ids.append(message_id)
-                                self.logger.info(f"Found important message from {chat_name}")
-                    except Exception as e:
-                        self.logger.warning(f"Error processing chat: {e}")
-                        continue
-                
-                browser.close()
-                return message_ids
+            return self._with_page(self._find_important_chats)
         
         except Exception as e:
             self.logger.error(f"Failed to check for new messages: {e}")
             return []
     
+    def _find_important_chats(self, page: Page) -> List[str]:
+        """Scan the chat list on an already-loaded page"""
+        # Read all unread chats in one evaluate call
+        unread_chats = page.evaluate(UNREAD_CHATS_SCRIPT)
+        return self._collect_new_messages(page, unread_chats)
+    
+    def _collect_new_messages(self, page: Page, chats: List[Dict[str, str]]) -> List[str]:
+        """
+        Read messages newer than each chat's cursor for chats mentioning keywords.
+        
+        Each chat with new messages becomes one item whose ID is the key of
+        its newest message, so the same messages always map to the same ID.
+        
+        Args:
+            page: Loaded WhatsApp Web page
+            chats: Unread chat rows with 'name' and 'preview'
+            
+        Returns:
+            List of item IDs to process
+        """
+        message_ids = []
+        seen_chats = set()
+        self._just_read = {}
+        for chat in chats:
+            chat_name = chat.get('name', 'Unknown')
+            if chat_name in seen_chats or chat_name == 'Unknown':
+                continue
+            seen_chats.add(chat_name)
+            
+            # Check if message contains keywords
+            if not self._contains_keywords(chat.get('preview', '')):
+                continue
+            
+            # One slow or broken chat must not abort the whole poll
+            try:
+                new_messages = self._read_new_messages(page, chat_name)
+            except Exception as e:
+                if page.is_closed():
+                    raise
+                self.logger.warning(f"Error reading chat {chat_name}: {e}")
+                continue
+            if not new_messages:
+                continue
+            
+            message_id = f"whatsapp_{new_messages[-1]['key']}"
+            if message_id in self.processed_messages.get(chat_name, ()):
+                continue
+            
+            self._pending[message_id] = {
+                'id': message_id,
+                'chat_name': chat_name,
+                'messages': [m['text'] for m in new_messages],
+                'message_keys': [m['key'] for m in new_messages],
+                'cursor': {
+                    'key': new_messages[-1]['key'],
+                    'message_id': new_messages[-1].get('id') or '',
+                    'timestamp': new_messages[-1]['timestamp']
+                },
+                'timestamp': datetime.now(UTC).isoformat() + 'Z',
+                'source': 'whatsapp'
+            }
+            message_ids.append(message_id)
+            self.logger.info(f"Found {len(new_messages)} new message(s) from {chat_name}")
+        
+        return message_ids
+    
     def get_item_content(self, item_id: str) -> Optional[Dict[str, Any]]:
         """
         Fetch full content for a specific WhatsApp message.
         
+        Messages are read while checking for new items, so this is a lookup.
+        
         Args:
-            item_id: Message identifier (format: chatname_timestamp)
+            item_id: Message identifier (format: whatsapp_<message key>)
             
         Returns:
             Dictionary with message metadata and content
         """
+        item = self._pending.get(item_id)
+        if item is None:
+            self.logger.error(f"No pending messages for item: {item_id}")
+            return None
+        return dict(item)
+    
+    def _read_new_messages(self, page: Page, chat_name: str) -> List[Dict[str, str]]:
+        """
+        Open a chat on the shared page and read messages newer than its cursor.
+        
+        Args:
+            page: Loaded WhatsApp Web page
+            chat_name: Chat to open
+            
+        Returns:
+            New messages in chat order, each with 'key', 'id', 'sender',
+            'timestamp' and 'text'
+        """
+        # Search for the chat
+        search_box = page.query_selector('[data-testid="chat-list-search"]')
+        if not search_box:
+            return []
+        
+        if self._observer_installed:
+            page.evaluate(NAVIGATION_SCRIPT, True)
+        search_box.click()
+        search_box.fill(chat_name)
         try:
-            chat_name = item_id.split('_')[0]
+            # Click the matching result once the search results pane renders
+            handle = page.wait_for_function(SEARCH_RESULT_SCRIPT, arg=chat_name, timeout=self.config.ui_timeout_ms)
+            first_result = handle.as_element()
+            if not first_result:
+                return []
             
-            with sync_playwright() as p:
-                browser = p.chromium.launch_persistent_context(
-                    str(self.session_path),
-                    headless=True
-                )
-                page = browser.pages[0]
-                page.goto('https://web.whatsapp.com', wait_until='networkidle')
-                page.wait_for_selector('[data-testid="chat-list"]', timeout=10000)
+            first_result.click()
+            
+            # Wait until the conversation for this chat is open and has messages
+            page.wait_for_function(CHAT_OPEN_SCRIPT, arg=chat_name, timeout=self.config.ui_timeout_ms)
+            page.wait_for_selector(MESSAGE_SELECTOR, timeout=self.config.ui_timeout_ms)
+            
+            # Only extract messages after the last one we handled
+            cursor = self.cursors.get(chat_name, {})
+            raw_messages = page.evaluate(CHAT_MESSAGES_SCRIPT, {
+                'limit': self.config.max_messages_per_chat,
+                'after': cursor.get('message_id') or None
+            })
+            
+            messages = []
+            rendered = self._just_read.setdefault(chat_name, set())
+            for raw in raw_messages:
+                text = raw.get('text') or ''
+                if not text:
+                    continue
+                rendered.add(text)
+                meta = parse_message_meta(raw.get('meta', ''))
+                messages.append({
+                    'key': message_key(chat_name, meta['sender'], meta['timestamp'], text),
+                    'id': raw.get('id'),
+                    'sender': meta['sender'],
+                    'timestamp': meta['timestamp'],
+                    'text': text
+                })
+            
+            # The data-id slice can miss if WhatsApp re-rendered; the key check cannot
+            return messages_after_cursor(messages, cursor.get('key'))
+        finally:
+            # A leftover query keeps the chat list filtered for the next chat and the observer
+            self._clear_search(search_box)
+            if self._observer_installed and not page.is_closed():
+                page.evaluate(NAVIGATION_SCRIPT, False)
+    
+    def _clear_search(self, search_box):
+        """Empty the chat search box so the full chat list shows again"""
+        try:
+            search_box.fill('')
+        except PlaywrightError as e:
+            self.logger.debug(f"Could not clear chat search: {e}")
+    
+    def _advance_cursor(self, item: Dict[str, Any]):
+        """Move the chat's cursor past the messages of a handled item"""
+        self.cursors[item['chat_name']] = {
+            **item['cursor'],
+            'updated_at': datetime.now(UTC).isoformat() + 'Z'
+        }
+        handled = self.processed_messages.setdefault(item['chat_name'], [])
+        handled.append(item['id'])
+        del handled[:-PROCESSED_PER_CHAT]
+        self._save_cursors()
+    
+    def process_item(self, item_id: str) -> bool:
+        """
+        Process an item, then advance its chat cursor.
+        
+        The cursor moves once the messages have either produced a task file
+        or been filtered out, so they are never read again. Failed items
+        keep the old cursor and are retried on the next poll.
+        
+        Args:
+            item_id: Message identifier
+            
+        Returns:
+            True if processed successfully, False otherwise
+        """
+        created = super().process_item(item_id)
+        
+        item = self._pending.pop(item_id, None)
+        if item and (item_id in self.processed_items or not self.is_important(item)):
+            self._advance_cursor(item)
+        
+        return created
+    
+    def _on_dom_event(self, source, payload: Dict[str, Any]):
+        """Binding target for the injected MutationObserver"""
+        self._events.append(payload)
+    
+    def _install_observer(self, page: Page):
+        """Expose the event binding and start the MutationObserver on the page"""
+        if self._observer_installed:
+            return
+        
+        self._context.expose_binding(EVENT_BINDING, self._on_dom_event)
+        # Re-install after WhatsApp Web reloads itself
+        self._context.add_init_script(
+            f"window.addEventListener('load', () => ({OBSERVER_SCRIPT})());"
+        )
+        page.evaluate(OBSERVER_SCRIPT)
+        self._observer_installed = True
+        self.logger.info("Streaming mode: DOM observer installed")
+    
+    def _drain_events(self, page: Page) -> List[str]:
+        """
+        Convert queued DOM events into item IDs for important chats.
+        
+        Opening a chat renders its messages and re-renders the chat list, so
+        the observer reports the chats the last scan just read. Events that
+        only repeat text already read from that chat are dropped; otherwise
+        each scan would queue the same chats again.
+        """
+        just_read = self._just_read
+        chats: Dict[str, Dict[str, str]] = {}
+        while self._events:
+            payload = self._events.popleft()
+            for chat in payload.get('chats', []):
+                name = chat.get('name', 'Unknown')
+                if self._already_read(just_read, name, chat.get('preview', '')):
+                    continue
+                chats[name] = chat
+            for message in payload.get('messages', []):
+                name = message.get('chat', 'Unknown')
+                if self._already_read(just_read, name, message.get('text', '')):
+                    continue
+                previous = chats.get(name, {}).get('preview', '')
+                chats[name] = {'name': name, 'preview': f"{previous} {message.get('text', '')}"}
+        
+        return self._collect_new_messages(page, list(chats.values()))
+    
+    @staticmethod
+    def _already_read(just_read: Dict[str, set], chat_name: str, text: str) -> bool:
+        """True if the text was on screen when the chat was last opened"""
+        text = (text or '').strip()
+        return bool(text) and any(text in seen for seen in just_read.get(chat_name, ()))
+    
+    def stream(self):
+        """
+        Run in streaming mode until interrupted.
+        
+        Instead of re-scanning the chat list every polling interval, a
+        MutationObserver inside WhatsApp Web pushes unread chats and new
+        messages into Python. Queued events are processed every
+        ``stream_flush_ms`` milliseconds.
+        """
+        self.logger.info(f"Streaming WhatsApp messages (flush: {self.config.stream_flush_ms}ms)")
+        
+        while True:
+            try:
+                page = self._ensure_page()
+                self._install_observer(page)
                 
-                # Search for the chat
-                search_box = page.query_selector('[data-testid="chat-list-search"]')
-                if search_box:
-                    search_box.click()
-                    search_box.fill(chat_name)
-                    time.sleep(1)
-                    
-                    # Click first result
-                    first_result = page.query_selector('[data-testid="cell-frame-container"]')
-                    if first_result:
-                        first_result.click()
-                        time.sleep(1)
-                        
-                        # Get recent messages
-                        messages = page.query_selector_all('[data-testid="msg-container"]')
-                        recent_messages = []
-                        
-                        for msg in messages[-5:]:  # Last 5 messages
-                            try:
-                                text = msg.inner_text()
-                                recent_messages.append(text)
-                            except:
-                                continue
-                        
-                        browser.close()
-                        
-                        return {
-                            'id': item_id,
-                            'chat_name': chat_name,
-                            'messages': recent_messages,
-                            'timestamp': datetime.now(UTC).isoformat() + 'Z',
-                            'source': 'whatsapp'
-                        }
+                # Yields to Playwright so binding calls are dispatched
+                page.wait_for_timeout(self.config.stream_flush_ms)
                 
-                browser.close()
-                return None
-        
-        except Exception as e:
-            self.logger.error(f"Failed to get message content: {e}")
-            return None
+                for item_id in self._drain_events(page):
+                    try:
+                        self.process_item(item_id)
+                    except Exception as e:
+                        self.logger.error(f"Error processing item {item_id}: {e}")
+            
+            except PlaywrightError as e:
+                self.logger.warning(f"Browser session failed ({e}), reconnecting")
+                self._close_session()
+                time.sleep(self.config.stream_flush_ms / 1000)
     
     def is_important(self, item: Dict[str, Any]) -> bool:
         """
@@ -264,16 +788,18 @@ class WhatsAppWatcher(BaseWatcher):
             f"> {msg}" for msg in item.get('messages', [])
         ])
         
-        content = f"""---
-type: whatsapp_message
-chat_name: "{item.get('chat_name', 'Unknown')}"
-timestamp: "{item.get('timestamp', '')}"
-priority: "{priority}"
-status: "pending"
-source: "whatsapp"
-message_id: "{item.get('id', '')}"
----
-
+        content = frontmatter_codec.serialize({
+            'type': 'whatsapp_message',
+            'chat_name': item.get('chat_name', 'Unknown'),
+            'timestamp': item.get('timestamp', ''),
+            'priority': priority,
+            'status': 'pending',
+            'source': 'whatsapp',
+            'message_id': item.get('id', ''),
+            'message_count': len(item.get('messages', []))
+        }, quote_strings=True)
+        
+        content += f"""
 # WhatsApp: {item.get('chat_name', 'Unknown')}
 
 **Priority**: {priority_emoji.get(priority, '⚪')} {priority.capitalize()}  
@@ -301,25 +827,26 @@ message_id: "{item.get('id', '')}"
 """
         return content
     
-    def _get_chat_name(self, chat_element) -> str:
-        """Extract chat name from chat element"""
-        try:
-            name_element = chat_element.query_selector('[data-testid="cell-frame-title"]')
-            if name_element:
-                return name_element.inner_text()
-        except:
-            pass
-        return "Unknown"
-    
-    def _get_preview_text(self, chat_element) -> str:
-        """Extract preview text from chat element"""
+    def start(self):
+        """Start polling (or streaming), closing the browser session on exit"""
         try:
-            preview_element = chat_element.query_selector('[data-testid="last-msg-text"]')
-            if preview_element:
-                return preview_element.inner_text()
-        except:
-            pass
-        return ""
+            if not self.config.streaming:
+                super().start()
+                return
+            
+            if not self.authenticate():
+                self.logger.error("Authentication failed, cannot start watcher")
+                return
+            self.stream()
+        except KeyboardInterrupt:
+            self.logger.info(f"{self.watcher_name} stopped by user")
+        finally:
+            self.stop()
+    
+    def stop(self):
+        """Stop the watcher and close the long-lived browser session"""
+        super().stop()
+        self._close_session()
     
     def _contains_keywords(self, text: str) -> bool:
         """Check if text contains any important keywords"""
@@ -334,7 +861,7 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="WhatsApp Watcher for AI Employee")
     parser.add_argument(
         "command",
-        choices=["auth", "poll", "start"],
+        choices=["auth", "poll", "start", "stream"],
         help="Command to execute"
     )
     parser.add_argument(
@@ -365,7 +892,8 @@ if __name__ == "__main__":
     config = WhatsAppWatcherConfig(
         vault_path=args.vault_path,
         session_path=args.session_path,
-        dry_run=args.dry_run
+        dry_run=args.dry_run,
+        streaming=args.command == "stream"
     )
     
     # Create watcher
@@ -385,12 +913,14 @@ if __name__ == "__main__":
             exit(1)
         
         stats = watcher.poll_once()
+        watcher.stop()
         print(f"\nPoll Results:")
         print(f"  Retrieved: {stats['retrieved']}")
         print(f"  Processed: {stats['processed']}")
         print(f"  Filtered: {stats['filtered']}")
         print(f"  Created: {stats['created']}")
+        print(f"  Duplicates: {stats['duplicates']}")
         print(f"  Errors: {stats['errors']}")
     
-    elif args.command == "start":
+    elif args.command in ("start", "stream"):
         watcher.start()
@@ -0,0 +1,349 @@
+"""
+Work Claims
+
+Lease-based claiming of vault work items, so several workers (or
+overlapping main_loop runs) can share one vault without processing the
+same Needs_Action file or plan twice.
+
+A claim is a lock file under ``.index/claims/`` created with
+``O_CREAT | O_EXCL``, so exactly one worker wins. The lock records the
+owner and an expiry time; the owner extends it with heartbeats while it
+works. A lease that has expired, or whose owner process is gone (same
+host), is taken over by the next worker that asks for it.
+
+Files are never moved by a claim, so links to them stay valid.
+
+Usage:
+
+    claims = WorkClaims(vault_path)
+    with claims.hold(path) as lease:
+        if lease is None:
+            return  # another worker has it
+        ...
+"""
+
+import hashlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+
+CLAIMS_DIR = ".index/claims"
+DEFAULT_LEASE_SECONDS = 300
+
+
+class ClaimError(RuntimeError):
+    """Raised when a work item is claimed by another worker"""
+
+
+def default_worker_id() -> str:
+    """Worker id for this process (host and pid)"""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+@dataclass
+class Lease:
+    """A held claim on a work item"""
+    path: str
+    lock_path: Path
+    worker_id: str
+    token: str
+    expires_at: float
+    lost: bool = False
+
+
+def _process_alive(pid: int) -> bool:
+    """True if a local process with this pid exists"""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class WorkClaims:
+    """
+    Claims work items with expiring lock-file leases.
+    """
+
+    def __init__(self, vault_path: str = ".", worker_id: Optional[str] = None,
+                 lease_seconds: float = DEFAULT_LEASE_SECONDS,
+                 logger: Optional[logging.Logger] = None):
+        """
+        Initialize work claims.
+
+        Args:
+            vault_path: Path to vault root
+            worker_id: Name of this worker (defaults to host-pid)
+            lease_seconds: How long a lease lasts without a heartbeat
+            logger: Logger to use (defaults to "work_claims")
+        """
+        self.vault_path = Path(vault_path).absolute()
+        self.claims_dir = self.vault_path / CLAIMS_DIR
+        self.worker_id = worker_id or default_worker_id()
+        self.lease_seconds = lease_seconds
+        self.logger = logger or logging.getLogger("work_claims")
+        self._host = socket.gethostname()
+
+    def _relative(self, path) -> str:
+        """Vault-relative posix path used as the claim key"""
+        path = Path(path)
+        if not path.is_absolute():
+            path = Path.cwd() / path
+        try:
+            return path.absolute().relative_to(self.vault_path).as_posix()
+        except ValueError:
+            return path.absolute().as_posix()
+
+    def _lock_path(self, rel_path: str) -> Path:
+        """Lock file for a claim key"""
+        return self.claims_dir / f"{hashlib.sha1(rel_path.encode('utf-8')).hexdigest()}.lock"
+
+    def _record(self, rel_path: str, token: str, expires_at: float) -> Dict[str, Any]:
+        """Lock file contents"""
+        return {
+            "path": rel_path,
+            "worker": self.worker_id,
+            "host": self._host,
+            "pid": os.getpid(),
+            "token": token,
+            "expires_at": expires_at,
+        }
+
+    @staticmethod
+    def _read_lock(lock_path: Path) -> Optional[Dict[str, Any]]:
+        """Read a lock file (None if missing or unreadable)"""
+        try:
+            with open(lock_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _is_stale(self, record: Optional[Dict[str, Any]], lock_path: Path) -> bool:
+        """True if a lock can be taken over"""
+        if record is None:
+            # Half-written lock: stale once it is older than a lease
+            try:
+                return time.time() - lock_path.stat().st_mtime > self.lease_seconds
+            except FileNotFoundError:
+                return True
+        if record.get("expires_at", 0) < time.time():
+            return True
+        if record.get("host") == self._host and not _process_alive(int(record.get("pid", 0))):
+            return True
+        return False
+
+    def _create(self, lock_path: Path, record: Dict[str, Any]) -> bool:
+        """Create a lock file exclusively"""
+        try:
+            fd = os.open(lock_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o644)
+        except FileExistsError:
+            return False
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(record, f)
+        return True
+
+    def _break(self, lock_path: Path, stale: Optional[Dict[str, Any]]) -> bool:
+        """
+        Remove a stale lock unless another worker replaced it first.
+
+        The lock is renamed aside before it is checked, so two workers
+        breaking the same lock cannot both succeed.
+        """
+        aside = lock_path.with_name(f"{lock_path.name}.{uuid.uuid4().hex}.stale")
+        try:
+            os.rename(lock_path, aside)
+        except FileNotFoundError:
+            return True
+        current = self._read_lock(aside)
+        if current is not None and current.get("token") != (stale or {}).get("token"):
+            # Renamed a fresh lock; put it back if nobody has claimed since
+            try:
+                os.link(aside, lock_path)
+            except FileExistsError:
+                pass
+            aside.unlink(missing_ok=True)
+            return False
+        aside.unlink(missing_ok=True)
+        if stale is not None:
+            self.logger.warning(f"Reclaimed stale lease on {stale.get('path')} from {stale.get('worker')}")
+        return True
+
+    def try_claim(self, path) -> Optional[Lease]:
+        """
+        Claim a work item if nobody else holds it.
+
+        Args:
+            path: Work item path (absolute or relative to the working directory)
+
+        Returns:
+            Lease, or None if another worker holds a live claim
+        """
+        rel_path = self._relative(path)
+        lock_path = self._lock_path(rel_path)
+        self.claims_dir.mkdir(parents=True, exist_ok=True)
+
+        token = uuid.uuid4().hex
+        expires_at = time.time() + self.lease_seconds
+        record = self._record(rel_path, token, expires_at)
+
+        if not self._create(lock_path, record):
+            # Leases are not re-entrant: a live lease held by this worker
+            # refuses a second claim like any other
+            existing = self._read_lock(lock_path)
+            if not self._is_stale(existing, lock_path):
+                return None
+            if not self._break(lock_path, existing) or not self._create(lock_path, record):
+                return None
+
+        self.logger.debug(f"Claimed {rel_path} as {self.worker_id}")
+        return Lease(path=rel_path, lock_path=lock_path, worker_id=self.worker_id,
+                     token=token, expires_at=expires_at)
+
+    def _owns(self, lease: Lease) -> bool:
+        """True if the lock file still carries this lease's token"""
+        record = self._read_lock(lease.lock_path)
+        return record is not None and record.get("token") == lease.token
+
+    def heartbeat(self, lease: Lease) -> bool:
+        """
+        Extend a lease.
+
+        Args:
+            lease: Lease to extend
+
+        Returns:
+            True if extended, False if the lease was lost to another worker
+        """
+        if lease.lost or not self._owns(lease):
+            lease.lost = True
+            return False
+
+        expires_at = time.time() + self.lease_seconds
+        temp_path = lease.lock_path.with_name(f"{lease.lock_path.name}.{lease.token}.tmp")
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._record(lease.path, lease.token, expires_at), f)
+        os.replace(temp_path, lease.lock_path)
+        lease.expires_at = expires_at
+        return True
+
+    def release(self, lease: Lease):
+        """
+        Give up a lease.
+
+        Args:
+            lease: Lease to release
+        """
+        if self._owns(lease):
+            lease.lock_path.unlink(missing_ok=True)
+            self.logger.debug(f"Released {lease.path}")
+
+    def is_claimed(self, path) -> bool:
+        """True if a live claim exists on a work item"""
+        lock_path = self._lock_path(self._relative(path))
+        if not lock_path.exists():
+            return False
+        return not self._is_stale(self._read_lock(lock_path), lock_path)
+
+    def reclaim_expired(self) -> int:
+        """
+        Remove leases that expired or whose owner died.
+
+        Returns:
+            Number of leases removed
+        """
+        removed = 0
+        if not self.claims_dir.exists():
+            return 0
+        for lock_path in self.claims_dir.glob("*.lock"):
+            record = self._read_lock(lock_path)
+            if self._is_stale(record, lock_path) and self._break(lock_path, record):
+                removed += 1
+        return removed
+
+    @contextmanager
+    def hold(self, path) -> Iterator[Optional[Lease]]:
+        """
+        Claim a work item for the duration of a ``with`` block.
+
+        A background heartbeat extends the lease every third of its
+        length. If the lease is lost anyway, ``lease.lost`` becomes True.
+
+        Args:
+            path: Work item path
+
+        Yields:
+            Lease, or None if another worker holds it
+        """
+        lease = self.try_claim(path)
+        if lease is None:
+            yield None
+            return
+
+        stop = threading.Event()
+
+        def beat():
+            while not stop.wait(self.lease_seconds / 3):
+                try:
+                    if not self.heartbeat(lease):
+                        self.logger.warning(f"Lost lease on {lease.path}")
+                        return
+                except OSError as e:
+                    self.logger.warning(f"Heartbeat failed for {lease.path}: {e}")
+
+        heart = threading.Thread(target=beat, name=f"lease-{lease.path}", daemon=True)
+        heart.start()
+        try:
+            yield lease
+        finally:
+            stop.set()
+            heart.join()
+            self.release(lease)
+
+
+# CLI interface
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Inspect and clean work claims")
+    parser.add_argument(
+        "command",
+        choices=["list", "reclaim"],
+        help="Command to execute"
+    )
+    parser.add_argument(
+        "--vault-path",
+        default=".",
+        help="Path to vault root directory"
+    )
+
+    args = parser.parse_args()
+
+    # Configure logging
+    logging.basicConfig(
+        level=logging.INFO,
+        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+    )
+
+    claims = WorkClaims(args.vault_path)
+
+    if args.command == "list":
+        for lock_path in sorted(claims.claims_dir.glob("*.lock")):
+            record = claims._read_lock(lock_path) or {}
+            state = "stale" if claims._is_stale(record or None, lock_path) else "live"
+            remaining = record.get("expires_at", 0) - time.time()
+            print(f"{record.get('path', lock_path.name)}  {record.get('worker', '?')}  {state}  {remaining:.0f}s")
+    elif args.command == "reclaim":
+        print(f"Removed {claims.reclaim_expired()} stale lease(s)")
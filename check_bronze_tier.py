@@ -8,6 +8,9 @@ import sys
 from pathlib import Path
 import importlib.util
 
+# Add Skills directory to path
+sys.path.insert(0, str(Path(__file__).parent / "Skills"))
+
 
 def print_header(text):
     """Print a formatted header."""
@@ -33,11 +36,23 @@ def check_vault_structure():
         "Pending_Approval": "Items awaiting approval"
     }
     
+    try:
+        from vault_stats import VaultStats
+        stats = VaultStats(".").collect(required_folders)
+    except ImportError:
+        # Dependencies are reported by check_dependencies()
+        stats = None
+    
     all_exist = True
     for folder, description in required_folders.items():
-        folder_path = Path(folder)
-        exists = folder_path.exists() and folder_path.is_dir()
-        print(f"{check_mark(exists)} {folder}/ - {description}")
+        if stats is None:
+            folder_path = Path(folder)
+            exists = folder_path.exists() and folder_path.is_dir()
+            items = ""
+        else:
+            exists = stats[folder].exists
+            items = f" ({stats[folder].count} items)" if exists else ""
+        print(f"{check_mark(exists)} {folder}/ - {description}{items}")
         if not exists:
             all_exist = False
     
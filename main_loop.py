@@ -8,7 +8,6 @@ Triggered by the scheduler every 5 minutes.
 import sys
 import logging
 from pathlib import Path
-from datetime import datetime
 
 # Add Skills directory to path
 sys.path.insert(0, str(Path(__file__).parent / "Skills"))
@@ -83,60 +82,17 @@ def execute_plans():
 def update_dashboard():
     """
     Update Dashboard.md with current status.
-    """
-    logger.info("Updating dashboard...")
     
-    # TODO: Implement dashboard update logic
-    # For now, this is a placeholder
+    The dashboard is rendered from pipeline events and only rewritten
+    when its content changes.
+    """
+    from dashboard_renderer import DashboardRenderer
     
-    dashboard_path = Path("Dashboard.md")
+    logger.info("Updating dashboard...")
     
-    if not dashboard_path.exists():
-        # Create initial dashboard
-        dashboard_content = f"""# AI Employee Dashboard
-
-**Last Updated**: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-## System Status
-- Main Loop: Running
-- Last Execution: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
-
-## Today's Activity
-- Watchers: Active
-- Inbox Items: 0
-- Plans Executed: 0
-
-## Pending Actions
-(None)
-
-## Recent Completions
-(None)
-
----
-*Auto-generated by Main Loop*
-"""
-        dashboard_path.write_text(dashboard_content)
-        logger.info("Dashboard created")
-    else:
-        # Update existing dashboard
-        content = dashboard_path.read_text()
-        
-        # Update timestamp
-        import re
-        content = re.sub(
-            r'\*\*Last Updated\*\*: .*',
-            f'**Last Updated**: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}',
-            content
-        )
-        
-        # Update last execution
-        content = re.sub(
-            r'- Last Execution: .*',
-            f'- Last Execution: {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}',
-            content
-        )
-        
-        dashboard_path.write_text(content)
+    renderer = DashboardRenderer(".", logger=logger)
+    renderer.set_status("Main Loop", "Running")
+    if renderer.update():
         logger.info("Dashboard updated")
 
 